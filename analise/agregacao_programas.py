@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agregação por Programa - Sistema de Análise UNA-SUS
+===================================================
+
+Agregações por programa de governo calculadas em uma única passada
+agrupada sobre o índice longo de programas (ver indice_multivalorado),
+compartilhadas pelo mapeamento de programas e pela cobertura
+programática.
+"""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from analise.indice_multivalorado import explodir_coluna
+
+# Contagens de valores distintos por programa (nome do agregado -> coluna)
+COLUNAS_DISTINTAS = {
+    "cursos_unicos": "no_curso",
+    "ofertas_unicas": "id_oferta",
+    "instituicoes": "no_orgao",
+    "areas_tematicas": "area_tematica",
+    "niveis": "no_nivel",
+    "modalidades": "no_formato",
+}
+
+
+def identificar_coluna_programas(dados: pd.DataFrame) -> Optional[str]:
+    """
+    Identifica a coluna de programas de governo.
+
+    Args:
+        dados: DataFrame com os dados
+
+    Returns:
+        Nome da coluna ou None
+    """
+    for col in dados.columns:
+        if "programa" in col.lower():
+            return col
+    return None
+
+
+def agregar_por_programa(
+    dados: pd.DataFrame, coluna_programas: str, indice: pd.DataFrame = None
+) -> pd.DataFrame:
+    """
+    Calcula os agregados de todos os programas em uma única passada.
+
+    Registros com vários programas ("UNA-SUS, Especialização") contam para
+    cada um deles.
+
+    Args:
+        dados: DataFrame com os dados
+        coluna_programas: Coluna com os programas de governo
+        indice: Índice longo da coluna (``explodir_coluna``), se já montado
+
+    Returns:
+        DataFrame indexado pelo programa (ordem de primeira ocorrência) com
+        as colunas registros, total_vagas, media_vagas e as contagens de
+        ``COLUNAS_DISTINTAS`` (0 quando a coluna de origem não existe)
+    """
+    if indice is None:
+        indice = explodir_coluna(dados[coluna_programas])
+    presentes = {
+        nome: coluna
+        for nome, coluna in COLUNAS_DISTINTAS.items()
+        if coluna in dados.columns
+    }
+
+    tabela = _tabela_por_programa(
+        dados, indice, list(dict.fromkeys(presentes.values()))
+    )
+    tabela["_vagas"] = (
+        pd.to_numeric(dados["vagas"], errors="coerce").to_numpy()[
+            indice["registro"].to_numpy()
+        ]
+        if "vagas" in dados.columns
+        else float("nan")
+    )
+
+    agregados = tabela.groupby("_programa", sort=False, observed=True).agg(
+        registros=("_programa", "size"),
+        total_vagas=("_vagas", "sum"),
+        media_vagas=("_vagas", "mean"),
+        **{nome: (coluna, "nunique") for nome, coluna in presentes.items()},
+    )
+    agregados.index = agregados.index.astype(object)
+
+    for nome in COLUNAS_DISTINTAS:
+        if nome not in agregados.columns:
+            agregados[nome] = 0
+    if "vagas" not in dados.columns:
+        agregados["media_vagas"] = 0
+
+    agregados.index.name = coluna_programas
+    return agregados
+
+
+def contagens_por_programa(
+    dados: pd.DataFrame, coluna_programas: str, coluna: str, indice: pd.DataFrame = None
+) -> Dict[str, Dict]:
+    """
+    Conta os valores de uma coluna dentro de cada programa.
+
+    Equivale a ``value_counts()`` por programa, mas com um único agrupamento.
+
+    Args:
+        dados: DataFrame com os dados
+        coluna_programas: Coluna com os programas de governo
+        coluna: Coluna cujos valores são contados
+        indice: Índice longo da coluna de programas, se já montado
+
+    Returns:
+        Dicionário programa -> {valor: quantidade} (maiores primeiro)
+    """
+    if indice is None:
+        indice = explodir_coluna(dados[coluna_programas])
+    contagens = (
+        _tabela_por_programa(dados, indice, [coluna])
+        .groupby(["_programa", coluna], sort=False, observed=True)
+        .size()
+        .sort_values(ascending=False, kind="stable")
+    )
+    return {
+        programa: serie.droplevel(0).to_dict()
+        for programa, serie in contagens.groupby(level=0, sort=False, observed=True)
+    }
+
+
+def _tabela_por_programa(
+    dados: pd.DataFrame, indice: pd.DataFrame, colunas: List[str]
+) -> pd.DataFrame:
+    """Colunas de ``dados`` repetidas para cada par (registro, programa)."""
+    tabela = dados[colunas].iloc[indice["registro"].to_numpy()].reset_index(drop=True)
+    tabela["_programa"] = indice["valor"]
+    return tabela
@@ -15,7 +15,15 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 
+from analise.carregamento import (
+    COLUNAS_VOLUMOSAS,
+    carregar_csv,
+    carregar_sqlite,
+    ler_colunas,
+    relatorio_memoria,
+)
 from analise.cobertura_programatica import CoberturaProgramatica
+from analise.contexto_analise import ContextoAnalise, obter_contexto
 from analise.distribuicao_geografica import DistribuicaoGeografica
 from analise.estatisticas_basicas import (
     calcular_estatisticas_categoricas,
@@ -24,6 +32,12 @@ from analise.estatisticas_basicas import (
     identificar_colunas_problematicas,
 )
 from analise.mapeamento_programas import MapeamentoProgramas
+from analise.snapshot import (
+    carregar_snapshot,
+    colunas_snapshot,
+    listar_snapshots,
+    pyarrow_disponivel,
+)
 
 
 class AnalisadorGeral:
@@ -31,20 +45,38 @@ class AnalisadorGeral:
     Analisador geral do banco de dados UNA-SUS.
     """
 
-    def __init__(self):
-        """Inicializa o analisador."""
+    def __init__(self, incluir_volumosas: bool = False):
+        """
+        Inicializa o analisador.
+
+        Args:
+            incluir_volumosas: Carrega também as colunas volumosas
+                (metadados da coleta, campos processados, imagem)
+        """
         self.dados = None
+        self.snapshot_path = None
         self.database_path = None
         self.csv_path = None
+        self.tabela_principal = None
+        self.incluir_volumosas = incluir_volumosas
         self.estatisticas = {}
+        self.memoria = {}
+        self.contexto = None
 
     def carregar_dados(self) -> bool:
         """
-        Carrega os dados do banco de dados ou CSV.
+        Carrega os dados do snapshot Parquet mais recente, do banco de dados
+        ou do CSV, nessa ordem.
 
         Returns:
             True se os dados foram carregados com sucesso
         """
+        # Snapshot colunar gravado pela coleta (requer pyarrow)
+        snapshots = listar_snapshots() if pyarrow_disponivel() else []
+        if snapshots:
+            self.snapshot_path = snapshots[-1]
+            return self._carregar_snapshot()
+
         # Procurar por arquivos de dados na raiz e na pasta data/
         diretorios = [".", "data"]
         arquivos_db = []
@@ -82,8 +114,68 @@ class AnalisadorGeral:
             print("💡 Execute primeiro a varredura completa")
             return False
 
+    def _carregar_snapshot(self) -> bool:
+        """Carrega dados do snapshot (ou reaproveita o contexto do arquivo)."""
+        return self._definir_contexto(
+            obter_contexto(
+                self.snapshot_path, self._ler_snapshot, self._variante_carregamento()
+            )
+        )
+
     def _carregar_database(self) -> bool:
-        """Carrega dados do SQLite."""
+        """Carrega dados do SQLite (ou reaproveita o contexto do arquivo)."""
+        return self._definir_contexto(
+            obter_contexto(
+                self.database_path, self._ler_database, self._variante_carregamento()
+            )
+        )
+
+    def _carregar_csv(self) -> bool:
+        """Carrega dados do CSV (ou reaproveita o contexto do arquivo)."""
+        return self._definir_contexto(
+            obter_contexto(self.csv_path, self._ler_csv, self._variante_carregamento())
+        )
+
+    def _variante_carregamento(self) -> str:
+        """Distingue no cache de contextos as opções que mudam os dados lidos."""
+        return "completo" if self.incluir_volumosas else "compacto"
+
+    def _definir_contexto(self, contexto: Optional[ContextoAnalise]) -> bool:
+        """Passa a usar os dados e cálculos de um contexto."""
+        if contexto is None:
+            return False
+
+        self.contexto = contexto
+        self.dados = contexto.dados
+        self.tabela_principal = contexto.resultado(
+            "tabela_principal", lambda: self.tabela_principal
+        )
+        print(f"✅ Dados carregados: {len(self.dados)} registros")
+        self.memoria = contexto.resultado(
+            "memoria", lambda: relatorio_memoria(self.dados)
+        )
+        return True
+
+    def _obter_contexto(self) -> ContextoAnalise:
+        """Contexto dos dados atuais (recriado se ``self.dados`` foi trocado)."""
+        if self.contexto is None or self.contexto.dados is not self.dados:
+            self.contexto = ContextoAnalise(self.dados)
+        return self.contexto
+
+    def _ler_snapshot(self) -> Optional[pd.DataFrame]:
+        """Lê os dados do snapshot Parquet."""
+        try:
+            print(f"📊 Carregando snapshot: {self.snapshot_path}")
+            return carregar_snapshot(
+                self.snapshot_path, incluir_volumosas=self.incluir_volumosas
+            )
+
+        except Exception as e:
+            print(f"❌ Erro ao carregar snapshot: {e}")
+            return None
+
+    def _ler_database(self) -> Optional[pd.DataFrame]:
+        """Lê os dados do SQLite."""
         try:
             print(f"📊 Carregando database: {self.database_path}")
 
@@ -92,39 +184,84 @@ class AnalisadorGeral:
 
             # Verificar tabelas
             cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'view');"
+            )
             tabelas = cursor.fetchall()
 
             if not tabelas:
                 print("❌ Nenhuma tabela encontrada no database!")
-                return False
-
-            # Carregar dados da primeira tabela (assumindo que é a principal)
-            tabela_principal = tabelas[0][0]
-            self.dados = pd.read_sql_query(f"SELECT * FROM {tabela_principal}", conn)
+                return None
 
             conn.close()
 
-            print(f"✅ Dados carregados: {len(self.dados)} registros")
-            return True
+            # Visão dados_completos (uma linha por oferta) quando existir;
+            # senão, a primeira tabela (assumindo que é a principal)
+            nomes = [tabela[0] for tabela in tabelas]
+            self.tabela_principal = (
+                "dados_completos" if "dados_completos" in nomes else nomes[0]
+            )
+            return carregar_sqlite(
+                self.database_path, self.tabela_principal, self.incluir_volumosas
+            )
 
         except Exception as e:
             print(f"❌ Erro ao carregar database: {e}")
-            return False
+            return None
 
-    def _carregar_csv(self) -> bool:
-        """Carrega dados do CSV."""
+    def _ler_csv(self) -> Optional[pd.DataFrame]:
+        """Lê os dados do CSV."""
         try:
             print(f"📊 Carregando CSV: {self.csv_path}")
-
-            self.dados = pd.read_csv(self.csv_path)
-
-            print(f"✅ Dados carregados: {len(self.dados)} registros")
-            return True
+            return carregar_csv(self.csv_path, self.incluir_volumosas)
 
         except Exception as e:
             print(f"❌ Erro ao carregar CSV: {e}")
-            return False
+            return None
+
+    def carregar_colunas_volumosas(self, colunas: List[str] = None) -> pd.DataFrame:
+        """
+        Lê sob demanda colunas deixadas fora do carregamento compacto.
+
+        Args:
+            colunas: Colunas a ler (padrão: todas as volumosas presentes)
+
+        Returns:
+            DataFrame com as colunas, alinhado a ``self.dados``
+        """
+        if self.dados is None:
+            print("❌ Dados não carregados!")
+            return pd.DataFrame()
+
+        if self.snapshot_path:
+            if colunas is None:
+                presentes = colunas_snapshot(self.snapshot_path)
+                colunas = [c for c in COLUNAS_VOLUMOSAS if c in presentes]
+            dados = carregar_snapshot(self.snapshot_path, colunas=colunas)
+        elif self.database_path:
+            dados = ler_colunas(
+                self.database_path,
+                colunas or self._colunas_volumosas_sqlite(),
+                self.tabela_principal,
+            )
+        else:
+            if colunas is None:
+                cabecalho = pd.read_csv(self.csv_path, nrows=0, encoding="utf-8-sig")
+                colunas = [c for c in COLUNAS_VOLUMOSAS if c in cabecalho.columns]
+            dados = ler_colunas(self.csv_path, colunas)
+
+        dados.index = self.dados.index
+        return dados
+
+    def _colunas_volumosas_sqlite(self) -> List[str]:
+        """Colunas volumosas presentes na tabela principal do banco."""
+        conn = sqlite3.connect(self.database_path)
+        try:
+            cursor = conn.execute(f'PRAGMA table_info("{self.tabela_principal}")')
+            presentes = {linha[1] for linha in cursor.fetchall()}
+        finally:
+            conn.close()
+        return [coluna for coluna in COLUNAS_VOLUMOSAS if coluna in presentes]
 
     def gerar_estatisticas_basicas(self) -> Dict:
         """
@@ -138,48 +275,22 @@ class AnalisadorGeral:
             return {}
 
         print("📊 Gerando estatísticas básicas...")
+        contexto = self._obter_contexto()
 
         stats = {
             "total_registros": len(self.dados),
             "total_colunas": len(self.dados.columns),
             "colunas": list(self.dados.columns),
             "tipos_dados": self.dados.dtypes.to_dict(),
-            "valores_nulos": self.dados.isnull().sum().to_dict(),
-            "memoria_uso": self.dados.memory_usage(deep=True).sum(),
+            "valores_nulos": contexto.nulos().to_dict(),
+            "memoria_uso": contexto.memoria_uso(),
             "timestamp_analise": datetime.now().isoformat(),
         }
 
         # Estatísticas por coluna
-        stats["colunas_info"] = {}
-        for coluna in self.dados.columns:
-            col_info = {
-                "tipo": str(self.dados[coluna].dtype),
-                "valores_unicos": self.dados[coluna].nunique(),
-                "valores_nulos": self.dados[coluna].isnull().sum(),
-                "percentual_nulos": (
-                    self.dados[coluna].isnull().sum() / len(self.dados)
-                )
-                * 100,
-            }
-
-            # Para colunas numéricas
-            if pd.api.types.is_numeric_dtype(self.dados[coluna]):
-                col_info.update(
-                    {
-                        "min": self.dados[coluna].min(),
-                        "max": self.dados[coluna].max(),
-                        "media": self.dados[coluna].mean(),
-                        "mediana": self.dados[coluna].median(),
-                    }
-                )
-
-            # Para colunas de texto
-            elif pd.api.types.is_string_dtype(self.dados[coluna]):
-                col_info["valores_mais_comuns"] = (
-                    self.dados[coluna].value_counts().head(5).to_dict()
-                )
-
-            stats["colunas_info"][coluna] = col_info
+        stats["colunas_info"] = {
+            coluna: contexto.perfil(coluna) for coluna in self.dados.columns
+        }
 
         self.estatisticas = stats
         print("✅ Estatísticas geradas!")
@@ -198,6 +309,7 @@ class AnalisadorGeral:
             return {}
 
         print("📚 Analisando cursos...")
+        contexto = self._obter_contexto()
 
         analise = {
             "total_cursos": 0,
@@ -227,29 +339,25 @@ class AnalisadorGeral:
 
         if "no_curso" in self.dados.columns:
             analise["total_cursos"] = len(self.dados)
-            analise["cursos_unicos"] = self.dados["no_curso"].nunique()
+            analise["cursos_unicos"] = contexto.valores_unicos()["no_curso"]
 
             # Análise por área temática
             if "area_tematica" in self.dados.columns:
-                analise["areas_tematicas"] = (
-                    self.dados["area_tematica"].value_counts().to_dict()
-                )
+                analise["areas_tematicas"] = contexto.contagens(
+                    "area_tematica"
+                ).to_dict()
 
             # Análise por nível
             if "no_nivel" in self.dados.columns:
-                analise["niveis"] = self.dados["no_nivel"].value_counts().to_dict()
+                analise["niveis"] = contexto.contagens("no_nivel").to_dict()
 
             # Análise por instituição
             if "no_orgao" in self.dados.columns:
-                analise["instituicoes"] = (
-                    self.dados["no_orgao"].value_counts().to_dict()
-                )
+                analise["instituicoes"] = contexto.contagens("no_orgao").to_dict()
 
             # Análise por categoria/formato
             if "no_formato" in self.dados.columns:
-                analise["categorias"] = (
-                    self.dados["no_formato"].value_counts().to_dict()
-                )
+                analise["categorias"] = contexto.contagens("no_formato").to_dict()
 
         print("✅ Análise de cursos concluída!")
         return analise
@@ -266,6 +374,7 @@ class AnalisadorGeral:
             return {}
 
         print("🎯 Analisando ofertas...")
+        contexto = self._obter_contexto()
 
         analise = {
             "total_ofertas": 0,
@@ -279,30 +388,32 @@ class AnalisadorGeral:
         # Identificar colunas de oferta
         if "id_oferta" in self.dados.columns:
             analise["total_ofertas"] = len(self.dados)
-            analise["ofertas_unicas"] = self.dados["id_oferta"].nunique()
+            analise["ofertas_unicas"] = contexto.valores_unicos()["id_oferta"]
 
             # Análise de vagas
             if "vagas" in self.dados.columns:
-                vagas_numericas = pd.to_numeric(self.dados["vagas"], errors="coerce")
+                vagas_numericas = contexto.numerica("vagas")
                 analise["vagas_disponiveis"] = vagas_numericas.sum()
                 analise["media_vagas"] = vagas_numericas.mean()
 
             # Análise por local
             if "local_oferta" in self.dados.columns:
-                analise["locais_oferta"] = (
-                    self.dados["local_oferta"].value_counts().to_dict()
-                )
+                analise["locais_oferta"] = contexto.contagens("local_oferta").to_dict()
 
             # Análise por formato
             if "formato" in self.dados.columns:
-                analise["formatos_oferta"] = (
-                    self.dados["formato"].value_counts().to_dict()
-                )
+                analise["formatos_oferta"] = contexto.contagens("formato").to_dict()
 
             # Análise por público-alvo
             if "publico_alvo" in self.dados.columns:
                 analise["publicos_alvo"] = (
-                    self.dados["publico_alvo"].value_counts().head(10).to_dict()
+                    contexto.contagens("publico_alvo").head(10).to_dict()
+                )
+
+            # Programas, temas, DeCS e palavras-chave contados individualmente
+            for campo in contexto.indices.campos():
+                analise[f"{campo}_mais_frequentes"] = (
+                    contexto.indices.contagens(campo).head(10).to_dict()
                 )
 
         print("✅ Análise de ofertas concluída!")
@@ -327,20 +438,30 @@ class AnalisadorGeral:
             "distribuicao_geografica": {},
         }
 
+        # Índice de programas e agregação compartilhados pelas análises
+        contexto = self._obter_contexto()
+        agregados = contexto.agregados_programas()
+
         # Mapeamento de programas
         mapeador = MapeamentoProgramas()
         mapeador.carregar_dados(self.dados)
-        analise["mapeamento_programas"] = mapeador.mapear_programas()
+        analise["mapeamento_programas"] = mapeador.mapear_programas(
+            agregados, contexto.indices
+        )
 
         # Cobertura programática
         cobertura = CoberturaProgramatica()
         cobertura.carregar_dados(self.dados)
-        analise["cobertura_programatica"] = cobertura.analisar_cobertura()
+        analise["cobertura_programatica"] = cobertura.analisar_cobertura(
+            agregados, contexto.indices
+        )
 
         # Distribuição geográfica
         distribuicao = DistribuicaoGeografica()
         distribuicao.carregar_dados(self.dados)
-        analise["distribuicao_geografica"] = distribuicao.analisar_distribuicao()
+        analise["distribuicao_geografica"] = distribuicao.analisar_distribuicao(
+            contexto.indices
+        )
 
         print("✅ Análise de programas de governo concluída!")
         return analise
@@ -354,17 +475,30 @@ class AnalisadorGeral:
         """
         print("📋 Gerando relatório completo...")
 
+        # Seções já calculadas para os mesmos dados são reaproveitadas
+        contexto = self._obter_contexto()
         relatorio = {
             "metadata": {
                 "timestamp": datetime.now().isoformat(),
-                "arquivo_dados": self.database_path or self.csv_path,
+                "arquivo_dados": self.snapshot_path
+                or self.database_path
+                or self.csv_path,
                 "versao_analisador": "1.0.0",
             },
-            "estatisticas_basicas": self.gerar_estatisticas_basicas(),
-            "analise_cursos": self.analisar_cursos(),
-            "analise_ofertas": self.analisar_ofertas(),
-            "analise_programas": self.analisar_programas_governo(),
+            "estatisticas_basicas": contexto.resultado(
+                "estatisticas_basicas", self.gerar_estatisticas_basicas
+            ),
+            "analise_cursos": contexto.resultado(
+                "analise_cursos", self.analisar_cursos
+            ),
+            "analise_ofertas": contexto.resultado(
+                "analise_ofertas", self.analisar_ofertas
+            ),
+            "analise_programas": contexto.resultado(
+                "analise_programas", self.analisar_programas_governo
+            ),
         }
+        self.estatisticas = relatorio["estatisticas_basicas"]
 
         print("✅ Relatório completo gerado!")
         return relatorio
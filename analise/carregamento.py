@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Carregamento - Sistema de Análise UNA-SUS
+=========================================
+
+Leitura dos dados coletados com esquema explícito, para que vários
+snapshots caibam em memória:
+- campos de poucos valores distintos (instituição, status, nível...) como
+  categóricos, guardando cada texto uma única vez
+- identificadores, carga horária e vagas como inteiros anuláveis, com um
+  tipo fixo por coluna
+- colunas volumosas (metadados da coleta, campos processados, imagem)
+  fora do carregamento padrão, lidas sob demanda por ``ler_colunas``
+"""
+
+import sqlite3
+import sys
+import warnings
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Campos com poucos valores distintos
+COLUNAS_CATEGORICAS = [
+    "sg_orgao",
+    "no_orgao",
+    "no_formato",
+    "no_nivel",
+    "no_modalidade",
+    "status",
+    "local_oferta",
+    "formato",
+    "programas_governo",
+    "temas",
+    "decs",
+    "erro",
+]
+
+# Campos inteiros (com valores ausentes nos cursos sem oferta), cada um com
+# um tipo anulável fixo para que todos os snapshots tenham o mesmo esquema:
+# identificadores em Int64, contagens e códigos em Int32
+COLUNAS_INTEIRAS = {
+    "co_seq_curso": "Int64",
+    "qt_carga_horaria_total": "Int32",
+    "co_seq_orgao": "Int64",
+    "status_ordem": "Int32",
+    "rank": "Int32",
+    "id_oferta": "Int64",
+    "codigo_oferta": "Int64",
+    "vagas": "Int32",
+    "id_curso": "Int64",
+}
+
+# Campos volumosos que nenhuma análise usa: só carregados sob demanda
+COLUNAS_VOLUMOSAS = ["metadata_coleta", "campos_processados", "ds_imagem"]
+
+
+def _para_inteiro(serie: pd.Series, tipo: str) -> pd.Series:
+    """
+    Converte uma coluna para o inteiro anulável do esquema.
+
+    Valores vazios viram NA. Valores preenchidos que não são inteiros
+    (texto, decimais, fora da faixa do tipo) também, com um aviso que
+    informa quantos foram descartados.
+
+    Args:
+        serie: Coluna lida sem tipos
+        tipo: Tipo anulável de destino ("Int32" ou "Int64")
+
+    Returns:
+        Coluna com o tipo pedido
+    """
+    if serie.dtype == tipo:
+        return serie
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype(object)
+
+    numeros = pd.to_numeric(serie, errors="coerce")
+    limite = np.iinfo(tipo.lower()).max
+    inteiros = numeros.notna() & (numeros % 1 == 0) & (numeros.abs() <= limite)
+    vazios = serie.isna() | serie.astype(str).str.strip().eq("")
+
+    descartados = int((~vazios & ~inteiros).sum())
+    if descartados:
+        warnings.warn(
+            f"{serie.name}: {descartados} valores não inteiros convertidos em nulo",
+            stacklevel=3,
+        )
+    return numeros.where(inteiros).astype(tipo)
+
+
+def aplicar_esquema(dados: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica o esquema compacto a um DataFrame já carregado.
+
+    Args:
+        dados: DataFrame lido sem tipos
+
+    Returns:
+        DataFrame com categóricos e inteiros anuláveis
+    """
+    for coluna, tipo in COLUNAS_INTEIRAS.items():
+        if coluna in dados.columns:
+            dados[coluna] = _para_inteiro(dados[coluna], tipo)
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in dados.columns and not isinstance(
+            dados[coluna].dtype, pd.CategoricalDtype
+        ):
+            dados[coluna] = dados[coluna].astype("category")
+    return dados
+
+
+def carregar_csv(caminho: str, incluir_volumosas: bool = False) -> pd.DataFrame:
+    """
+    Lê um CSV da coleta com o esquema compacto.
+
+    Os categóricos são montados durante a leitura, sem materializar a
+    coluna de textos.
+
+    Args:
+        caminho: Arquivo CSV
+        incluir_volumosas: Carrega também ``COLUNAS_VOLUMOSAS``
+
+    Returns:
+        DataFrame compacto
+    """
+    cabecalho = pd.read_csv(caminho, nrows=0, encoding="utf-8-sig").columns
+    colunas = [
+        coluna
+        for coluna in cabecalho
+        if incluir_volumosas or coluna not in COLUNAS_VOLUMOSAS
+    ]
+    tipos = {coluna: "category" for coluna in COLUNAS_CATEGORICAS if coluna in colunas}
+
+    dados = pd.read_csv(caminho, usecols=colunas, dtype=tipos, encoding="utf-8-sig")
+    return aplicar_esquema(dados[colunas])
+
+
+def carregar_sqlite(
+    caminho: str, tabela: str, incluir_volumosas: bool = False
+) -> pd.DataFrame:
+    """
+    Lê uma tabela SQLite com o esquema compacto.
+
+    Args:
+        caminho: Arquivo do banco
+        tabela: Tabela com os registros
+        incluir_volumosas: Carrega também ``COLUNAS_VOLUMOSAS``
+
+    Returns:
+        DataFrame compacto
+    """
+    conn = sqlite3.connect(caminho)
+    try:
+        cursor = conn.execute(f'PRAGMA table_info("{tabela}")')
+        colunas = [
+            linha[1]
+            for linha in cursor.fetchall()
+            if incluir_volumosas or linha[1] not in COLUNAS_VOLUMOSAS
+        ]
+        selecao = ", ".join(f'"{coluna}"' for coluna in colunas)
+        dados = pd.read_sql_query(f'SELECT {selecao} FROM "{tabela}"', conn)
+    finally:
+        conn.close()
+    return aplicar_esquema(dados)
+
+
+def ler_colunas(
+    caminho: str, colunas: List[str], tabela: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Lê sob demanda colunas deixadas fora do carregamento (ex.: volumosas).
+
+    As linhas seguem a mesma ordem do carregamento principal.
+
+    Args:
+        caminho: Arquivo CSV ou banco SQLite
+        colunas: Colunas a ler
+        tabela: Tabela do banco (obrigatória para SQLite)
+
+    Returns:
+        DataFrame só com as colunas pedidas
+    """
+    if tabela is None:
+        return pd.read_csv(caminho, usecols=colunas, encoding="utf-8-sig")[colunas]
+
+    conn = sqlite3.connect(caminho)
+    try:
+        selecao = ", ".join(f'"{coluna}"' for coluna in colunas)
+        return pd.read_sql_query(f'SELECT {selecao} FROM "{tabela}"', conn)
+    finally:
+        conn.close()
+
+
+def memoria_por_coluna(dados: pd.DataFrame) -> Dict[str, int]:
+    """Bytes ocupados por coluna (contando o conteúdo dos textos)."""
+    return dados.memory_usage(deep=True, index=False).to_dict()
+
+
+def memoria_sem_esquema(dados: pd.DataFrame) -> int:
+    """
+    Estima os bytes que os mesmos dados ocupariam lidos sem tipos.
+
+    Categóricos viram textos (um objeto Python por linha) e inteiros
+    anuláveis viram float64.
+
+    Args:
+        dados: DataFrame compacto
+
+    Returns:
+        Estimativa em bytes
+    """
+    total = 0
+    for coluna in dados.columns:
+        serie = dados[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            tamanhos = np.array(
+                [sys.getsizeof(valor) for valor in serie.cat.categories], dtype=np.int64
+            )
+            codigos = serie.cat.codes.to_numpy()
+            ausentes = int((codigos < 0).sum())
+            total += int(tamanhos[codigos[codigos >= 0]].sum())
+            total += ausentes * sys.getsizeof(np.nan) + 8 * len(serie)
+        elif isinstance(serie.dtype, pd.api.extensions.ExtensionDtype) and (
+            pd.api.types.is_integer_dtype(serie.dtype)
+        ):
+            total += 8 * len(serie)
+        else:
+            total += int(serie.memory_usage(deep=True, index=False))
+    return total
+
+
+def relatorio_memoria(dados: pd.DataFrame, antes: int = None) -> Dict:
+    """
+    Mede a memória dos dados carregados e a compara com a leitura sem tipos.
+
+    Args:
+        dados: DataFrame compacto
+        antes: Bytes medidos antes da compactação (estimados se None)
+
+    Returns:
+        Dicionário com bytes antes/depois, redução e bytes por coluna
+    """
+    depois = int(sum(memoria_por_coluna(dados).values()))
+    if antes is None:
+        antes = memoria_sem_esquema(dados)
+
+    relatorio = {
+        "memoria_antes": antes,
+        "memoria_depois": depois,
+        "reducao": antes / depois if depois else 0,
+        "memoria_por_coluna": memoria_por_coluna(dados),
+        "tipos": {coluna: str(tipo) for coluna, tipo in dados.dtypes.items()},
+    }
+
+    print(
+        f"💾 Memória: {antes / 1024 ** 2:.1f} MB sem esquema → "
+        f"{depois / 1024 ** 2:.1f} MB compacto ({relatorio['reducao']:.1f}x menor)"
+    )
+    return relatorio
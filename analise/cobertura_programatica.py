@@ -8,10 +8,17 @@ Módulo para análise de cobertura programática.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 import pandas as pd
 
+from analise.agregacao_programas import (
+    agregar_por_programa,
+    contagens_por_programa,
+    identificar_coluna_programas,
+)
+from analise.indice_multivalorado import IndiceMultivalorado
+
 
 class CoberturaProgramatica:
     """
@@ -27,15 +34,25 @@ class CoberturaProgramatica:
         """
         self.dados = dados
         self.cobertura = {}
+        self.indices = None
 
     def carregar_dados(self, dados: pd.DataFrame):
         """Carrega dados para análise."""
         self.dados = dados
 
-    def analisar_cobertura(self) -> Dict[str, Any]:
+    def analisar_cobertura(
+        self, agregados: pd.DataFrame = None, indices: IndiceMultivalorado = None
+    ) -> Dict[str, Any]:
         """
         Analisa a cobertura programática.
 
+        Registros com vários programas contam para cada um deles.
+
+        Args:
+            agregados: Resultado de ``agregar_por_programa`` já calculado
+                (evita refazer a agregação)
+            indices: Índices multivalorados já montados para ``self.dados``
+
         Returns:
             Dicionário com análise de cobertura
         """
@@ -45,11 +62,7 @@ class CoberturaProgramatica:
         print("📊 Analisando cobertura programática...")
 
         # Identificar coluna de programas
-        coluna_programas = None
-        for col in self.dados.columns:
-            if "programa" in col.lower() or "programas" in col.lower():
-                coluna_programas = col
-                break
+        coluna_programas = identificar_coluna_programas(self.dados)
 
         if coluna_programas is None:
             print("⚠️ Coluna de programas não encontrada!")
@@ -68,21 +81,38 @@ class CoberturaProgramatica:
             "timestamp_analise": datetime.now().isoformat(),
         }
 
-        # Contar programas únicos
-        programas_unicos = self.dados[coluna_programas].dropna().unique()
+        # Agregados e contagens de todos os programas em passadas agrupadas
+        self.indices = indices or IndiceMultivalorado(self.dados)
+        indice_programas = self.indices.indice(coluna_programas)
+        if agregados is None:
+            agregados = agregar_por_programa(
+                self.dados, coluna_programas, indice_programas
+            )
+        dimensoes = [
+            (
+                "no_orgao",
+                "cobertura_institucional",
+                "total_instituicoes",
+                "instituicoes",
+            ),
+            ("area_tematica", "cobertura_tematica", "total_areas", "areas_tematicas"),
+            ("no_nivel", "cobertura_nivel", "total_niveis", "niveis"),
+            ("no_formato", "cobertura_modalidade", "total_modalidades", "modalidades"),
+        ]
+        contagens = {
+            coluna: contagens_por_programa(
+                self.dados, coluna_programas, coluna, indice_programas
+            )
+            for coluna, _, _, _ in dimensoes
+            if coluna in self.dados.columns
+        }
 
         # Analisar cobertura de cada programa
-        for programa in programas_unicos:
-            if pd.isna(programa) or programa == "":
-                continue
-
-            # Filtrar dados do programa
-            dados_programa = self.dados[self.dados[coluna_programas] == programa]
-
+        for programa, linha in agregados.to_dict("index").items():
             # Análise de cobertura do programa
             cobertura_programa = {
-                "quantidade_cursos": len(dados_programa),
-                "quantidade_ofertas": len(dados_programa),
+                "quantidade_cursos": int(linha["registros"]),
+                "quantidade_ofertas": int(linha["registros"]),
                 "cobertura_geografica": {},
                 "cobertura_institucional": {},
                 "cobertura_tematica": {},
@@ -90,40 +120,14 @@ class CoberturaProgramatica:
                 "cobertura_modalidade": {},
             }
 
-            # Cobertura geográfica
-            if "no_orgao" in dados_programa.columns:
-                instituicoes = dados_programa["no_orgao"].value_counts()
-                cobertura_programa["cobertura_institucional"] = instituicoes.to_dict()
-                cobertura_programa["total_instituicoes"] = len(instituicoes)
-
-            # Cobertura temática
-            if "area_tematica" in dados_programa.columns:
-                areas = dados_programa["area_tematica"].value_counts()
-                cobertura_programa["cobertura_tematica"] = areas.to_dict()
-                cobertura_programa["total_areas"] = len(areas)
-
-            # Cobertura por nível
-            if "no_nivel" in dados_programa.columns:
-                niveis = dados_programa["no_nivel"].value_counts()
-                cobertura_programa["cobertura_nivel"] = niveis.to_dict()
-                cobertura_programa["total_niveis"] = len(niveis)
-
-            # Cobertura por modalidade
-            if "no_formato" in dados_programa.columns:
-                modalidades = dados_programa["no_formato"].value_counts()
-                cobertura_programa["cobertura_modalidade"] = modalidades.to_dict()
-                cobertura_programa["total_modalidades"] = len(modalidades)
-
-            # Calcular vagas
-            if "vagas" in dados_programa.columns:
-                vagas_numericas = pd.to_numeric(
-                    dados_programa["vagas"], errors="coerce"
-                )
-                cobertura_programa["total_vagas"] = vagas_numericas.sum()
-                cobertura_programa["media_vagas"] = vagas_numericas.mean()
-            else:
-                cobertura_programa["total_vagas"] = 0
-                cobertura_programa["media_vagas"] = 0
+            # Cobertura institucional, temática, por nível e por modalidade
+            for coluna, chave, chave_total, agregado in dimensoes:
+                if coluna in contagens:
+                    cobertura_programa[chave] = contagens[coluna].get(programa, {})
+                    cobertura_programa[chave_total] = int(linha[agregado])
+
+            cobertura_programa["total_vagas"] = linha["total_vagas"]
+            cobertura_programa["media_vagas"] = linha["media_vagas"]
 
             # Classificar cobertura
             if cobertura_programa["quantidade_cursos"] > 0:
@@ -263,7 +267,9 @@ class CoberturaProgramatica:
                 texto.append("   📋 Registros individuais:")
 
                 # Buscar registros específicos deste programa
-                dados_programa = self.dados[self.dados["programas_governo"] == programa]
+                dados_programa = self.indices.registros(
+                    self.cobertura["coluna_programas"], programa
+                )
 
                 for idx, (_, registro) in enumerate(dados_programa.iterrows(), 1):
                     curso = registro.get("no_curso", "N/A")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contexto de Análise - Sistema de Análise UNA-SUS
+================================================
+
+Cálculos compartilhados por todas as análises de um mesmo conjunto de
+dados (perfil das colunas, colunas numéricas convertidas, índices
+multivalorados e agregados por programa). Cada cálculo é feito na
+primeira consulta e reaproveitado depois.
+
+Os contextos ficam em memória indexados pelo hash do arquivo de dados
+(com o ``-wal`` de bancos SQLite em modo WAL): as opções do menu que
+recarregam o mesmo arquivo reaproveitam os dados e tudo o que já foi
+calculado; um arquivo novo ou alterado gera um contexto novo.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from analise.agregacao_programas import (
+    agregar_por_programa,
+    identificar_coluna_programas,
+)
+from analise.indice_multivalorado import IndiceMultivalorado
+
+# Contextos já montados (hash do arquivo -> contexto)
+_CONTEXTOS: Dict[str, "ContextoAnalise"] = {}
+
+# Hash já calculado por arquivo (assinaturas (caminho, mtime, tamanho) -> hash)
+_HASHES: Dict[Tuple[Tuple[str, float, int], ...], str] = {}
+
+
+def hash_arquivo(caminho: str) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo.
+
+    Em bancos SQLite em modo WAL, alterações já confirmadas podem estar só
+    no arquivo ``<caminho>-wal``, que entra no hash quando existe. O
+    resultado é memorizado enquanto os arquivos não mudarem de data de
+    modificação ou tamanho.
+
+    Args:
+        caminho: Arquivo de dados (.db ou .csv)
+
+    Returns:
+        Hash hexadecimal do conteúdo
+    """
+    arquivos = [caminho]
+    if os.path.exists(f"{caminho}-wal"):
+        arquivos.append(f"{caminho}-wal")
+
+    assinatura = []
+    for arquivo in arquivos:
+        info = os.stat(arquivo)
+        assinatura.append((os.path.abspath(arquivo), info.st_mtime, info.st_size))
+    assinatura = tuple(assinatura)
+    if assinatura not in _HASHES:
+        resumo = hashlib.sha256()
+        for arquivo in arquivos:
+            with open(arquivo, "rb") as f:
+                for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                    resumo.update(bloco)
+        _HASHES[assinatura] = resumo.hexdigest()
+    return _HASHES[assinatura]
+
+
+def obter_contexto(
+    caminho: str,
+    carregar: Callable[[], Optional[pd.DataFrame]],
+    variante: str = "",
+) -> Optional["ContextoAnalise"]:
+    """
+    Devolve o contexto do arquivo, carregando os dados só se necessário.
+
+    Args:
+        caminho: Arquivo de dados
+        carregar: Função que lê o arquivo e devolve o DataFrame (ou None)
+        variante: Opções de leitura que mudam os dados carregados
+
+    Returns:
+        Contexto do arquivo ou None se o carregamento falhar
+    """
+    chave = f"{hash_arquivo(caminho)}:{variante}" if variante else hash_arquivo(caminho)
+    if chave in _CONTEXTOS:
+        print("♻️ Dados já carregados, reaproveitando análises anteriores")
+        return _CONTEXTOS[chave]
+
+    dados = carregar()
+    if dados is None:
+        return None
+
+    # Um único contexto por vez: o arquivo anterior não é mais usado
+    _CONTEXTOS.clear()
+    _CONTEXTOS[chave] = ContextoAnalise(dados, chave)
+    return _CONTEXTOS[chave]
+
+
+def limpar_contextos():
+    """Descarta todos os contextos em memória."""
+    _CONTEXTOS.clear()
+    _HASHES.clear()
+
+
+class ContextoAnalise:
+    """
+    Cálculos memorizados sobre um DataFrame carregado.
+
+    Os dados não devem ser alterados depois de criado o contexto.
+    """
+
+    def __init__(self, dados: pd.DataFrame, chave: str = None):
+        """
+        Inicializa o contexto.
+
+        Args:
+            dados: DataFrame com os dados carregados
+            chave: Hash do arquivo de origem (None para dados em memória)
+        """
+        self.dados = dados
+        self.chave = chave
+        self.indices = IndiceMultivalorado(dados)
+        self._cache: Dict[Tuple, object] = {}
+
+    def _memorizar(self, chave: Tuple, calcular: Callable[[], object]):
+        """Calcula um valor na primeira consulta e o reaproveita depois."""
+        if chave not in self._cache:
+            self._cache[chave] = calcular()
+        return self._cache[chave]
+
+    def resultado(self, nome: str, calcular: Callable[[], Dict]) -> Dict:
+        """
+        Resultado de uma análise completa, calculado uma única vez.
+
+        Args:
+            nome: Identificador da análise (ex.: "analise_cursos")
+            calcular: Função que executa a análise
+
+        Returns:
+            Resultado memorizado da análise; ao ser reaproveitado, o
+            ``timestamp_analise`` é o da consulta
+        """
+        chave = ("resultado", nome)
+        if chave not in self._cache:
+            return self._memorizar(chave, calcular)
+
+        resultado = self._cache[chave]
+        if isinstance(resultado, dict) and "timestamp_analise" in resultado:
+            return {**resultado, "timestamp_analise": datetime.now().isoformat()}
+        return resultado
+
+    def nulos(self) -> pd.Series:
+        """Quantidade de valores nulos por coluna."""
+        return self._memorizar(("nulos",), lambda: self.dados.isnull().sum())
+
+    def valores_unicos(self) -> pd.Series:
+        """Quantidade de valores distintos por coluna."""
+        return self._memorizar(("unicos",), lambda: self.dados.nunique())
+
+    def memoria_uso(self) -> int:
+        """Memória ocupada pelos dados, em bytes."""
+        return self._memorizar(
+            ("memoria",), lambda: int(self.dados.memory_usage(deep=True).sum())
+        )
+
+    def contagens(self, coluna: str) -> pd.Series:
+        """
+        Frequência de cada valor de uma coluna (``value_counts``).
+
+        Args:
+            coluna: Nome da coluna
+
+        Returns:
+            Série valor -> quantidade, em ordem decrescente
+        """
+        return self._memorizar(
+            ("contagens", coluna), lambda: self.dados[coluna].value_counts()
+        )
+
+    def numerica(self, coluna: str) -> pd.Series:
+        """
+        Coluna convertida para número (valores inválidos viram NaN).
+
+        Args:
+            coluna: Nome da coluna
+
+        Returns:
+            Série numérica com o mesmo índice dos dados
+        """
+        return self._memorizar(
+            ("numerica", coluna),
+            lambda: pd.to_numeric(self.dados[coluna], errors="coerce"),
+        )
+
+    def perfil(self, coluna: str) -> Dict:
+        """
+        Perfil de uma coluna: tipo, nulos, valores distintos e, conforme o
+        tipo, resumo numérico ou valores mais comuns.
+
+        Args:
+            coluna: Nome da coluna
+
+        Returns:
+            Dicionário no formato de ``colunas_info`` das estatísticas básicas
+        """
+        return self._memorizar(("perfil", coluna), lambda: self._perfil(coluna))
+
+    def _perfil(self, coluna: str) -> Dict:
+        """Calcula o perfil de uma coluna (sem memoização)."""
+        serie = self.dados[coluna]
+        nulos = self.nulos()[coluna]
+        perfil = {
+            "tipo": str(serie.dtype),
+            "valores_unicos": self.valores_unicos()[coluna],
+            "valores_nulos": nulos,
+            "percentual_nulos": (nulos / len(self.dados)) * 100,
+        }
+
+        if pd.api.types.is_numeric_dtype(serie):
+            perfil.update(
+                {
+                    "min": serie.min(),
+                    "max": serie.max(),
+                    "media": serie.mean(),
+                    "mediana": serie.median(),
+                }
+            )
+        elif pd.api.types.is_string_dtype(serie) or isinstance(
+            serie.dtype, pd.CategoricalDtype
+        ):
+            perfil["valores_mais_comuns"] = self.contagens(coluna).head(5).to_dict()
+
+        return perfil
+
+    def coluna_programas(self) -> Optional[str]:
+        """Coluna de programas de governo (ou None)."""
+        return self._memorizar(
+            ("coluna_programas",), lambda: identificar_coluna_programas(self.dados)
+        )
+
+    def agregados_programas(self) -> Optional[pd.DataFrame]:
+        """
+        Agregados por programa (``agregar_por_programa``) sobre o índice
+        multivalorado da coluna de programas.
+
+        Returns:
+            DataFrame indexado pelo programa ou None sem coluna de programas
+        """
+        coluna = self.coluna_programas()
+        if coluna is None:
+            return None
+        return self._memorizar(
+            ("agregados_programas",),
+            lambda: agregar_por_programa(
+                self.dados, coluna, self.indices.indice(coluna)
+            ),
+        )
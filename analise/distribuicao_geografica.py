@@ -7,12 +7,15 @@ Distribuição Geográfica - Sistema de Análise UNA-SUS
 Módulo para análise de distribuição geográfica de programas.
 """
 
-import re
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 import pandas as pd
 
+from analise.agregacao_programas import identificar_coluna_programas
+from analise.geolocalizacao import REGIAO_POR_ESTADO, REGIOES, LocalizadorEstados
+from analise.indice_multivalorado import IndiceMultivalorado
+
 
 class DistribuicaoGeografica:
     """
@@ -28,6 +31,7 @@ class DistribuicaoGeografica:
         """
         self.dados = dados
         self.distribuicao = {}
+        self.localizador = LocalizadorEstados()
 
     def carregar_dados(self, dados: pd.DataFrame):
         """Carrega dados para análise."""
@@ -43,53 +47,17 @@ class DistribuicaoGeografica:
         Returns:
             Sigla do estado ou "Não identificado"
         """
-        if pd.isna(texto) or texto == "":
-            return "Não identificado"
-
-        texto = str(texto).upper()
-
-        # Mapeamento de estados
-        estados = {
-            "AC": ["ACRE", "AC"],
-            "AL": ["ALAGOAS", "AL"],
-            "AP": ["AMAPA", "AP"],
-            "AM": ["AMAZONAS", "AM"],
-            "BA": ["BAHIA", "BA"],
-            "CE": ["CEARA", "CE"],
-            "DF": ["DISTRITO FEDERAL", "DF", "BRASILIA"],
-            "ES": ["ESPIRITO SANTO", "ES"],
-            "GO": ["GOIAS", "GO"],
-            "MA": ["MARANHAO", "MA"],
-            "MT": ["MATO GROSSO", "MT"],
-            "MS": ["MATO GROSSO DO SUL", "MS"],
-            "MG": ["MINAS GERAIS", "MG"],
-            "PA": ["PARA", "PA"],
-            "PB": ["PARAIBA", "PB"],
-            "PR": ["PARANA", "PR"],
-            "PE": ["PERNAMBUCO", "PE"],
-            "PI": ["PIAUI", "PI"],
-            "RJ": ["RIO DE JANEIRO", "RJ"],
-            "RN": ["RIO GRANDE DO NORTE", "RN"],
-            "RS": ["RIO GRANDE DO SUL", "RS"],
-            "RO": ["RONDONIA", "RO"],
-            "RR": ["RORAIMA", "RR"],
-            "SC": ["SANTA CATARINA", "SC"],
-            "SP": ["SAO PAULO", "SP"],
-            "SE": ["SERGIPE", "SE"],
-            "TO": ["TOCANTINS", "TO"],
-        }
-
-        for sigla, variacoes in estados.items():
-            for variacao in variacoes:
-                if variacao in texto:
-                    return sigla
+        return self.localizador.localizar(texto)
 
-        return "Não identificado"
-
-    def analisar_distribuicao(self) -> Dict[str, Any]:
+    def analisar_distribuicao(
+        self, indices: IndiceMultivalorado = None
+    ) -> Dict[str, Any]:
         """
         Analisa a distribuição geográfica.
 
+        Args:
+            indices: Índices multivalorados já montados para ``self.dados``
+
         Returns:
             Dicionário com análise de distribuição
         """
@@ -99,11 +67,7 @@ class DistribuicaoGeografica:
         print("📊 Analisando distribuição geográfica...")
 
         # Identificar coluna de programas
-        coluna_programas = None
-        for col in self.dados.columns:
-            if "programa" in col.lower() or "programas" in col.lower():
-                coluna_programas = col
-                break
+        coluna_programas = identificar_coluna_programas(self.dados)
 
         if coluna_programas is None:
             print("⚠️ Coluna de programas não encontrada!")
@@ -124,179 +88,59 @@ class DistribuicaoGeografica:
             "timestamp_analise": datetime.now().isoformat(),
         }
 
-        # Mapeamento de regiões
-        regioes = {
-            "NORTE": ["AC", "AP", "AM", "PA", "RO", "RR", "TO"],
-            "NORDESTE": ["AL", "BA", "CE", "MA", "PB", "PE", "PI", "RN", "SE"],
-            "CENTRO-OESTE": ["DF", "GO", "MT", "MS"],
-            "SUDESTE": ["ES", "MG", "RJ", "SP"],
-            "SUL": ["PR", "RS", "SC"],
-        }
+        # Resolver o estado uma única vez por valor distinto: nome da
+        # instituição, depois sigla e, por fim, local da oferta
+        estados = self.localizador.localizar_colunas(
+            self.dados, ["no_orgao", "sg_orgao", "local_oferta"]
+        )
 
-        # Contar programas únicos
-        programas_unicos = self.dados[coluna_programas].dropna().unique()
-
-        # Inicializar contadores
-        for estado in [
-            "AC",
-            "AL",
-            "AP",
-            "AM",
-            "BA",
-            "CE",
-            "DF",
-            "ES",
-            "GO",
-            "MA",
-            "MT",
-            "MS",
-            "MG",
-            "PA",
-            "PB",
-            "PR",
-            "PE",
-            "PI",
-            "RJ",
-            "RN",
-            "RS",
-            "RO",
-            "RR",
-            "SC",
-            "SP",
-            "SE",
-            "TO",
-        ]:
-            distribuicao["distribuicao_por_estado"][estado] = {
-                "cursos": 0,
-                "ofertas": 0,
-                "vagas": 0,
-                "instituicoes": set(),
-                "programas": set(),
-                "cursos_unicos": set(),
-            }
+        # Tabela enxuta com as colunas usadas nas agregações
+        tabela = pd.DataFrame(
+            {
+                "estado": estados,
+                "regiao": estados.map(REGIAO_POR_ESTADO),
+                "vagas": (
+                    pd.to_numeric(self.dados["vagas"], errors="coerce")
+                    if "vagas" in self.dados.columns
+                    else float("nan")
+                ),
+                "instituicoes": self.dados.get("no_orgao"),
+                "cursos_unicos": self.dados.get("no_curso"),
+            },
+            index=self.dados.index,
+        )
+        identificados = tabela[tabela["regiao"].notna()]
+        distribuicao["estados_sem_identificacao"] = int(
+            len(tabela) - len(identificados)
+        )
 
-        for regiao in regioes.keys():
-            distribuicao["distribuicao_por_regiao"][regiao] = {
-                "cursos": 0,
-                "ofertas": 0,
-                "vagas": 0,
-                "estados": regioes[regiao],
-                "instituicoes": set(),
-                "programas": set(),
-                "cursos_unicos": set(),  # Para contar cursos únicos
+        # Um par (registro, programa) por programa de cada registro
+        indices = indices or IndiceMultivalorado(self.dados)
+        indice_programas = indices.indice(coluna_programas)
+        posicoes = indice_programas["registro"].to_numpy()
+        programas = pd.DataFrame(
+            {
+                "estado": tabela["estado"].to_numpy()[posicoes],
+                "regiao": tabela["regiao"].to_numpy()[posicoes],
+                "programas": indice_programas["valor"].astype(object).to_numpy(),
             }
+        )
+        programas = programas[programas["regiao"].notna()]
 
-        # Analisar cada registro
-        for _, registro in self.dados.iterrows():
-            programa = registro.get(coluna_programas, "")
-
-            # Extrair estado da instituição
-            estado = "Não identificado"
-            if "no_orgao" in registro:
-                estado = self.extrair_estado(registro["no_orgao"])
-
-            # Contar por estado
-            if estado in distribuicao["distribuicao_por_estado"]:
-                distribuicao["distribuicao_por_estado"][estado]["cursos"] += 1
-                distribuicao["distribuicao_por_estado"][estado]["ofertas"] += 1
-
-                # Adicionar curso único
-                if "no_curso" in registro:
-                    distribuicao["distribuicao_por_estado"][estado][
-                        "cursos_unicos"
-                    ].add(registro["no_curso"])
-
-                if "no_orgao" in registro:
-                    distribuicao["distribuicao_por_estado"][estado]["instituicoes"].add(
-                        registro["no_orgao"]
-                    )
-
-                if programa:
-                    distribuicao["distribuicao_por_estado"][estado]["programas"].add(
-                        programa
-                    )
-
-                # Calcular vagas
-                if "vagas" in registro:
-                    vagas = pd.to_numeric(registro["vagas"], errors="coerce")
-                    if not pd.isna(vagas):
-                        distribuicao["distribuicao_por_estado"][estado][
-                            "vagas"
-                        ] += vagas
-
-                # Contar por região
-                for regiao, estados_regiao in regioes.items():
-                    if estado in estados_regiao:
-                        distribuicao["distribuicao_por_regiao"][regiao]["cursos"] += 1
-                        distribuicao["distribuicao_por_regiao"][regiao]["ofertas"] += 1
-
-                        # Adicionar curso único
-                        if "no_curso" in registro:
-                            distribuicao["distribuicao_por_regiao"][regiao][
-                                "cursos_unicos"
-                            ].add(registro["no_curso"])
-
-                        if "no_orgao" in registro:
-                            distribuicao["distribuicao_por_regiao"][regiao][
-                                "instituicoes"
-                            ].add(registro["no_orgao"])
-
-                        if programa:
-                            distribuicao["distribuicao_por_regiao"][regiao][
-                                "programas"
-                            ].add(programa)
-
-                        if "vagas" in registro:
-                            vagas = pd.to_numeric(registro["vagas"], errors="coerce")
-                            if not pd.isna(vagas):
-                                distribuicao["distribuicao_por_regiao"][regiao][
-                                    "vagas"
-                                ] += vagas
-                        break
-            else:
-                distribuicao["estados_sem_identificacao"] += 1
-
-        # Converter sets para listas para serialização
-        for estado in distribuicao["distribuicao_por_estado"]:
-            distribuicao["distribuicao_por_estado"][estado]["instituicoes"] = list(
-                distribuicao["distribuicao_por_estado"][estado]["instituicoes"]
-            )
-            distribuicao["distribuicao_por_estado"][estado]["programas"] = list(
-                distribuicao["distribuicao_por_estado"][estado]["programas"]
-            )
-            distribuicao["distribuicao_por_estado"][estado]["cursos_unicos"] = list(
-                distribuicao["distribuicao_por_estado"][estado]["cursos_unicos"]
-            )
-            distribuicao["distribuicao_por_estado"][estado]["total_instituicoes"] = len(
-                distribuicao["distribuicao_por_estado"][estado]["instituicoes"]
-            )
-            distribuicao["distribuicao_por_estado"][estado]["total_programas"] = len(
-                distribuicao["distribuicao_por_estado"][estado]["programas"]
-            )
-            distribuicao["distribuicao_por_estado"][estado]["total_cursos_unicos"] = (
-                len(distribuicao["distribuicao_por_estado"][estado]["cursos_unicos"])
-            )
+        por_estado = self._agregar_grupos(identificados, "estado", programas)
+        por_regiao = self._agregar_grupos(identificados, "regiao", programas)
 
-        for regiao in distribuicao["distribuicao_por_regiao"]:
-            distribuicao["distribuicao_por_regiao"][regiao]["instituicoes"] = list(
-                distribuicao["distribuicao_por_regiao"][regiao]["instituicoes"]
-            )
-            distribuicao["distribuicao_por_regiao"][regiao]["programas"] = list(
-                distribuicao["distribuicao_por_regiao"][regiao]["programas"]
-            )
-            distribuicao["distribuicao_por_regiao"][regiao]["cursos_unicos"] = list(
-                distribuicao["distribuicao_por_regiao"][regiao]["cursos_unicos"]
-            )
-            distribuicao["distribuicao_por_regiao"][regiao]["total_instituicoes"] = len(
-                distribuicao["distribuicao_por_regiao"][regiao]["instituicoes"]
-            )
-            distribuicao["distribuicao_por_regiao"][regiao]["total_programas"] = len(
-                distribuicao["distribuicao_por_regiao"][regiao]["programas"]
-            )
-            distribuicao["distribuicao_por_regiao"][regiao]["total_cursos_unicos"] = (
-                len(distribuicao["distribuicao_por_regiao"][regiao]["cursos_unicos"])
+        for estado in sorted(REGIAO_POR_ESTADO):
+            distribuicao["distribuicao_por_estado"][estado] = por_estado.get(
+                estado, self._grupo_vazio()
             )
 
+        for regiao, estados_regiao in REGIOES.items():
+            distribuicao["distribuicao_por_regiao"][regiao] = {
+                "estados": estados_regiao,
+                **por_regiao.get(regiao, self._grupo_vazio()),
+            }
+
         # Identificar polos educacionais (estados com mais de 100 cursos)
         for estado, dados in distribuicao["distribuicao_por_estado"].items():
             if dados["cursos"] > 100:
@@ -335,6 +179,68 @@ class DistribuicaoGeografica:
 
         return distribuicao
 
+    @staticmethod
+    def _grupo_vazio() -> Dict[str, Any]:
+        """Agregado de um estado/região sem registros."""
+        return {
+            "cursos": 0,
+            "ofertas": 0,
+            "vagas": 0,
+            "instituicoes": [],
+            "programas": [],
+            "cursos_unicos": [],
+            "total_instituicoes": 0,
+            "total_programas": 0,
+            "total_cursos_unicos": 0,
+        }
+
+    @staticmethod
+    def _agregar_grupos(
+        tabela: pd.DataFrame, chave: str, programas: pd.DataFrame
+    ) -> Dict[str, Dict]:
+        """
+        Agrega contagens, vagas e valores únicos por estado ou região.
+
+        Args:
+            tabela: Registros identificados (estado, regiao, vagas, instituicoes,
+                cursos_unicos)
+            chave: Coluna de agrupamento ("estado" ou "regiao")
+            programas: Pares identificados (estado, regiao, programas), um por
+                programa de cada registro
+
+        Returns:
+            Dicionário chave -> agregados no formato de ``_grupo_vazio``
+        """
+        grupos = tabela.groupby(chave, sort=False)
+        registros = grupos.size()
+        vagas = grupos["vagas"].sum()
+
+        # Valores únicos por grupo sem percorrer linha a linha
+        unicos = {}
+        fontes = {
+            "instituicoes": tabela,
+            "programas": programas,
+            "cursos_unicos": tabela,
+        }
+        for coluna, fonte in fontes.items():
+            pares = fonte[[chave, coluna]].dropna().drop_duplicates()
+            pares[coluna] = pares[coluna].astype(object)
+            unicos[coluna] = pares.groupby(chave, sort=False)[coluna].agg(list)
+
+        resultado = {}
+        for grupo, total in registros.items():
+            listas = {coluna: unicos[coluna].get(grupo, []) for coluna in unicos}
+            resultado[grupo] = {
+                "cursos": int(total),
+                "ofertas": int(total),
+                "vagas": float(vagas[grupo]),
+                **listas,
+                "total_instituicoes": len(listas["instituicoes"]),
+                "total_programas": len(listas["programas"]),
+                "total_cursos_unicos": len(listas["cursos_unicos"]),
+            }
+        return resultado
+
     def gerar_resumo_distribuicao(self) -> str:
         """
         Gera resumo textual da distribuição.
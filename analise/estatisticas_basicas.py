@@ -141,3 +141,141 @@ def identificar_colunas_problematicas(
             problematicas["colunas_vazias"].append(coluna)
 
     return problematicas
+
+
+def contar_preenchidos(dados: pd.DataFrame) -> Dict[str, int]:
+    """
+    Conta os valores preenchidos de cada coluna (não nulos e não vazios).
+
+    Args:
+        dados: DataFrame com os dados
+
+    Returns:
+        Dicionário coluna -> quantidade de valores preenchidos
+    """
+    preenchidos = dados.notna()
+    textos = dados.select_dtypes(include=["object", "string"])
+    if not textos.empty:
+        preenchidos[textos.columns] &= textos.ne("").to_numpy()
+    return {coluna: int(total) for coluna, total in preenchidos.sum().items()}
+
+
+def distribuicao_tipos(dados: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+    """
+    Distribuição dos tipos Python dos valores de cada coluna.
+
+    Colunas com dtype fixo são resolvidas pelo dtype; só as colunas
+    ``object`` são inspecionadas valor a valor.
+
+    Args:
+        dados: DataFrame com os dados
+
+    Returns:
+        Dicionário coluna -> {tipo: quantidade}, com os nulos em "nulo"
+    """
+    nulos = dados.isna().sum()
+    distribuicao = {}
+
+    for coluna in dados.columns:
+        serie = dados[coluna]
+        if serie.dtype == object:
+            contagem = serie.dropna().map(type).value_counts()
+            tipos = {tipo.__name__: int(total) for tipo, total in contagem.items()}
+        else:
+            tipos = {str(serie.dtype): int(len(serie) - nulos[coluna])}
+        if nulos[coluna]:
+            tipos["nulo"] = int(nulos[coluna])
+        distribuicao[coluna] = {tipo: total for tipo, total in tipos.items() if total}
+
+    return distribuicao
+
+
+def tamanho_colunas(dados: pd.DataFrame) -> Dict[str, int]:
+    """
+    Memória ocupada por coluna, incluindo o conteúdo dos textos.
+
+    Args:
+        dados: DataFrame com os dados
+
+    Returns:
+        Dicionário coluna -> bytes
+    """
+    tamanhos = dados.memory_usage(index=False, deep=True)
+    return {coluna: int(total) for coluna, total in tamanhos.items()}
+
+
+class EstatisticasColunas:
+    """
+    Estatísticas por coluna somadas lote a lote, para descrever uma coleta
+    grande sem carregá-la inteira (ver ``contar_preenchidos``,
+    ``distribuicao_tipos`` e ``tamanho_colunas``).
+    """
+
+    def __init__(self, colunas_numericas: List[str] = None):
+        """
+        Inicializa as somas.
+
+        Args:
+            colunas_numericas: Colunas cujos valores positivos são resumidos
+                em conjunto (soma, quantidade, mínimo e máximo)
+        """
+        self.colunas_numericas = list(colunas_numericas or [])
+        self.linhas = 0
+        self.preenchidos: Dict[str, int] = {}
+        self.tipos: Dict[str, Dict[str, int]] = {}
+        self.bytes: Dict[str, int] = {}
+        self.numericos = {"soma": 0.0, "quantidade": 0, "minimo": None, "maximo": None}
+
+    def adicionar(self, dados: pd.DataFrame):
+        """
+        Soma as estatísticas de um lote.
+
+        Args:
+            dados: Lote com os dados
+        """
+        novas = [coluna for coluna in dados.columns if coluna not in self.tipos]
+        ausentes = [coluna for coluna in self.tipos if coluna not in dados.columns]
+
+        for soma, valores in (
+            (self.preenchidos, contar_preenchidos(dados)),
+            (self.bytes, tamanho_colunas(dados)),
+        ):
+            for coluna, total in valores.items():
+                soma[coluna] = soma.get(coluna, 0) + total
+        for coluna, contagem in distribuicao_tipos(dados).items():
+            tipos = self.tipos.setdefault(coluna, {})
+            for tipo, total in contagem.items():
+                tipos[tipo] = tipos.get(tipo, 0) + total
+
+        # Linhas de lotes em que a coluna não existia contam como nulas
+        for coluna, nulos in [(c, self.linhas) for c in novas] + [
+            (c, len(dados)) for c in ausentes
+        ]:
+            if nulos:
+                tipos = self.tipos.setdefault(coluna, {})
+                tipos["nulo"] = tipos.get("nulo", 0) + nulos
+        self.linhas += len(dados)
+
+        self._somar_numericos(dados)
+
+    def _somar_numericos(self, dados: pd.DataFrame):
+        """Acumula os valores positivos das colunas numéricas de um lote."""
+        colunas = [c for c in self.colunas_numericas if c in dados.columns]
+        if not colunas:
+            return
+        valores = pd.concat(
+            [pd.to_numeric(dados[coluna], errors="coerce") for coluna in colunas],
+            ignore_index=True,
+        )
+        valores = valores[valores > 0]
+        if valores.empty:
+            return
+
+        numericos = self.numericos
+        numericos["soma"] += float(valores.sum())
+        numericos["quantidade"] += int(len(valores))
+        minimo, maximo = float(valores.min()), float(valores.max())
+        if numericos["minimo"] is not None:
+            minimo = min(minimo, numericos["minimo"])
+            maximo = max(maximo, numericos["maximo"])
+        numericos["minimo"], numericos["maximo"] = minimo, maximo
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geolocalização - Sistema de Análise UNA-SUS
+===========================================
+
+Identificação do estado (UF) a partir de nomes de instituições, siglas e
+locais de oferta, com padrões compilados uma única vez:
+- nomes de estados e capitais, sem acentos e com limite de palavra
+  (evita "PA" em "PARANA" ou "AL" em "FEDERAL")
+- siglas de instituições (UFMG, UNIFESP, UFRGS...)
+- siglas de UF isoladas e em maiúsculas ("SES-BA", "FIOCRUZ - MS")
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable
+
+import pandas as pd
+
+NAO_IDENTIFICADO = "Não identificado"
+
+# Regiões e suas UFs
+REGIOES = {
+    "NORTE": ["AC", "AP", "AM", "PA", "RO", "RR", "TO"],
+    "NORDESTE": ["AL", "BA", "CE", "MA", "PB", "PE", "PI", "RN", "SE"],
+    "CENTRO-OESTE": ["DF", "GO", "MT", "MS"],
+    "SUDESTE": ["ES", "MG", "RJ", "SP"],
+    "SUL": ["PR", "RS", "SC"],
+}
+
+REGIAO_POR_ESTADO = {
+    estado: regiao for regiao, estados in REGIOES.items() for estado in estados
+}
+
+# Nomes (sem acentos, maiúsculos) que identificam cada UF.
+# "PARA" só vale precedido de "DO" para não casar com a preposição.
+NOMES_ESTADOS = {
+    "AC": ["ACRE", "RIO BRANCO"],
+    "AL": ["ALAGOAS", "MACEIO"],
+    "AP": ["AMAPA", "MACAPA"],
+    "AM": ["AMAZONAS", "MANAUS"],
+    "BA": ["BAHIA", "SALVADOR"],
+    "CE": ["CEARA", "FORTALEZA"],
+    "DF": ["DISTRITO FEDERAL", "BRASILIA"],
+    "ES": ["ESPIRITO SANTO"],
+    "GO": ["GOIAS", "GOIANIA"],
+    "MA": ["MARANHAO", "SAO LUIS"],
+    "MT": ["MATO GROSSO", "CUIABA"],
+    "MS": ["MATO GROSSO DO SUL", "CAMPO GRANDE"],
+    "MG": ["MINAS GERAIS", "BELO HORIZONTE", "OURO PRETO", "JUIZ DE FORA"],
+    "PA": ["DO PARA", "BELEM"],
+    "PB": ["PARAIBA", "JOAO PESSOA"],
+    "PR": ["PARANA", "CURITIBA"],
+    "PE": ["PERNAMBUCO", "RECIFE"],
+    "PI": ["PIAUI", "TERESINA"],
+    "RJ": ["RIO DE JANEIRO", "FLUMINENSE", "NITEROI"],
+    "RN": ["RIO GRANDE DO NORTE"],
+    "RS": ["RIO GRANDE DO SUL", "PORTO ALEGRE", "PELOTAS", "SANTA MARIA"],
+    "RO": ["RONDONIA", "PORTO VELHO"],
+    "RR": ["RORAIMA", "BOA VISTA"],
+    "SC": ["SANTA CATARINA", "FLORIANOPOLIS"],
+    "SP": ["SAO PAULO", "CAMPINAS"],
+    "SE": ["SERGIPE", "ARACAJU"],
+    "TO": ["TOCANTINS"],
+}
+
+# Siglas de instituições que não seguem o padrão UF<sigla>/UE<sigla>
+SIGLAS_INSTITUICOES = {
+    "UNB": "DF",
+    "UFG": "GO",
+    "UFC": "CE",
+    "UEA": "AM",
+    "UFS": "SE",
+    "UFT": "TO",
+    "UFF": "RJ",
+    "UERJ": "RJ",
+    "UNIRIO": "RJ",
+    "UFRRJ": "RJ",
+    "UNIFESP": "SP",
+    "USP": "SP",
+    "UNICAMP": "SP",
+    "UFSCAR": "SP",
+    "UFOP": "MG",
+    "UFJF": "MG",
+    "UFU": "MG",
+    "UFTM": "MG",
+    "UFRGS": "RS",
+    "UFPEL": "RS",
+    "UFCSPA": "RS",
+    "UFSM": "RS",
+    "UFCG": "PB",
+    "UFERSA": "RN",
+    "UNIFAP": "AP",
+    "UNIVASF": "PE",
+}
+
+
+def remover_acentos(texto: str) -> str:
+    """
+    Remove os acentos (marcas combinantes do NFKD), mantendo maiúsculas.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Texto sem acentos
+    """
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    )
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Remove acentos, converte para maiúsculas e troca pontuação por espaço.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Texto normalizado, com espaços simples
+    """
+    sem_acentos = remover_acentos(str(texto))
+    return " ".join(re.sub(r"[^0-9A-Z]+", " ", sem_acentos.upper()).split())
+
+
+class LocalizadorEstados:
+    """
+    Localizador de UF com padrões pré-compilados e memoização.
+
+    A ordem de confiança é: nome de estado/capital, sigla de instituição e,
+    por último, sigla de UF isolada. Em cada etapa vale a ocorrência mais
+    à esquerda do texto.
+    """
+
+    def __init__(self):
+        """Compila os padrões e inicializa o cache de resultados."""
+        estado_por_nome = {
+            nome: sigla for sigla, nomes in NOMES_ESTADOS.items() for nome in nomes
+        }
+        self._estado_por_nome = estado_por_nome
+        # Nomes mais longos primeiro: "MATO GROSSO DO SUL" antes de "MATO GROSSO"
+        self._padrao_nomes = re.compile(
+            r"\b("
+            + "|".join(
+                re.escape(nome)
+                for nome in sorted(estado_por_nome, key=len, reverse=True)
+            )
+            + r")\b"
+        )
+
+        siglas_uf = "|".join(REGIAO_POR_ESTADO)
+        self._padrao_instituicao = re.compile(r"\b(?:UF|UE)(" + siglas_uf + r")\b")
+        self._padrao_siglas = re.compile(
+            r"(?<![A-Za-z0-9])(" + siglas_uf + r")(?![A-Za-z0-9/])"
+        )
+        self._memo: Dict[str, str] = {}
+
+    def localizar(self, texto) -> str:
+        """
+        Identifica a UF mencionada em um texto.
+
+        Args:
+            texto: Nome de instituição, sigla ou local de oferta
+
+        Returns:
+            Sigla da UF ou "Não identificado"
+        """
+        if texto is None or (not isinstance(texto, str) and pd.isna(texto)):
+            return NAO_IDENTIFICADO
+
+        texto = str(texto)
+        if texto not in self._memo:
+            self._memo[texto] = self._localizar(texto)
+        return self._memo[texto]
+
+    def _localizar(self, texto: str) -> str:
+        """Aplica os padrões em ordem de confiança (sem memoização)."""
+        normalizado = normalizar_texto(texto)
+        if not normalizado:
+            return NAO_IDENTIFICADO
+
+        encontrado = self._padrao_nomes.search(normalizado)
+        if encontrado:
+            return self._estado_por_nome[encontrado.group(1)]
+
+        for palavra in normalizado.split():
+            if palavra in SIGLAS_INSTITUICOES:
+                return SIGLAS_INSTITUICOES[palavra]
+        encontrado = self._padrao_instituicao.search(normalizado)
+        if encontrado:
+            return encontrado.group(1)
+
+        # Siglas isoladas só em maiúsculas no texto original ("se" é palavra).
+        # As marcas de acento do NFKD são removidas para que "SÉRIE" e
+        # "PÁGINA" continuem sendo uma palavra só
+        encontrado = self._padrao_siglas.search(remover_acentos(texto))
+        if encontrado:
+            return encontrado.group(1)
+
+        return NAO_IDENTIFICADO
+
+    def localizar_serie(self, valores: pd.Series) -> pd.Series:
+        """
+        Identifica a UF de cada valor, avaliando cada valor distinto uma vez.
+
+        Args:
+            valores: Série de textos
+
+        Returns:
+            Série de siglas (mesmo índice)
+        """
+        distintos = {
+            valor: self.localizar(valor) for valor in valores.dropna().unique()
+        }
+        return valores.astype(object).map(distintos).fillna(NAO_IDENTIFICADO)
+
+    def localizar_colunas(
+        self, dados: pd.DataFrame, colunas: Iterable[str]
+    ) -> pd.Series:
+        """
+        Identifica a UF de cada registro usando colunas em ordem de prioridade.
+
+        Uma coluna só é consultada para os registros que as anteriores não
+        identificaram.
+
+        Args:
+            dados: DataFrame com os registros
+            colunas: Colunas a consultar (ex.: no_orgao, sg_orgao, local_oferta)
+
+        Returns:
+            Série de siglas (mesmo índice de ``dados``)
+        """
+        estados = pd.Series(NAO_IDENTIFICADO, index=dados.index, dtype=object)
+        for coluna in colunas:
+            if coluna not in dados.columns:
+                continue
+            pendentes = estados == NAO_IDENTIFICADO
+            if not pendentes.any():
+                break
+            estados[pendentes] = self.localizar_serie(dados.loc[pendentes, coluna])
+        return estados
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice Multivalorado - Sistema de Análise UNA-SUS
+=================================================
+
+A coleta grava programas de governo, temas, DeCS e palavras-chave como
+textos separados por vírgula ("UNA-SUS, Especialização"). Este módulo
+monta, uma única vez por conjunto de dados, índices em formato longo
+com uma linha por (registro, valor) e valores categóricos, de modo que
+as análises agrupem por códigos inteiros e contem cada valor separado.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Colunas gravadas como listas separadas por vírgula
+CAMPOS_MULTIVALORADOS = ["programas_governo", "temas", "decs", "palavras_chave"]
+
+SEPARADOR = ","
+
+
+def explodir_coluna(valores: pd.Series) -> pd.DataFrame:
+    """
+    Converte uma coluna multivalorada para o formato longo.
+
+    Args:
+        valores: Coluna com textos separados por vírgula
+
+    Returns:
+        DataFrame com ``registro`` (posição da linha de origem, int32) e
+        ``valor`` (categórico), sem valores vazios nem pares repetidos
+    """
+    serie = pd.Series(valores.to_numpy(), index=pd.RangeIndex(len(valores)))
+    partes = serie.dropna().astype(str).str.split(SEPARADOR).explode().str.strip()
+    partes = partes[partes.notna() & (partes != "")]
+
+    indice = pd.DataFrame(
+        {
+            "registro": partes.index.to_numpy(dtype=np.int32),
+            "valor": partes.to_numpy(dtype=object),
+        }
+    ).drop_duplicates()
+    indice["valor"] = indice["valor"].astype("category")
+    return indice.reset_index(drop=True)
+
+
+class IndiceMultivalorado:
+    """
+    Índices em formato longo das colunas multivaloradas de um DataFrame.
+
+    Cada índice é montado na primeira consulta e reaproveitado depois.
+    """
+
+    def __init__(self, dados: pd.DataFrame):
+        """
+        Inicializa os índices.
+
+        Args:
+            dados: DataFrame com os dados carregados
+        """
+        self.dados = dados
+        self._indices: Dict[str, pd.DataFrame] = {}
+
+    def campos(self) -> List[str]:
+        """Colunas multivaloradas presentes nos dados."""
+        return [campo for campo in CAMPOS_MULTIVALORADOS if campo in self.dados.columns]
+
+    def indice(self, campo: str) -> pd.DataFrame:
+        """
+        Índice longo de uma coluna (montado uma única vez).
+
+        Args:
+            campo: Coluna multivalorada
+
+        Returns:
+            DataFrame com ``registro`` e ``valor`` (ver ``explodir_coluna``)
+        """
+        if campo not in self._indices:
+            self._indices[campo] = explodir_coluna(self.dados[campo])
+        return self._indices[campo]
+
+    def contagens(self, campo: str) -> pd.Series:
+        """
+        Quantidade de registros por valor, via contagem dos códigos.
+
+        Args:
+            campo: Coluna multivalorada
+
+        Returns:
+            Série valor -> quantidade, em ordem decrescente
+        """
+        valores = self.indice(campo)["valor"]
+        quantidades = np.bincount(
+            valores.cat.codes.to_numpy(), minlength=len(valores.cat.categories)
+        )
+        contagens = pd.Series(quantidades, index=valores.cat.categories, name=campo)
+        return contagens[contagens > 0].sort_values(ascending=False, kind="stable")
+
+    def registros(self, campo: str, valor: str) -> pd.DataFrame:
+        """
+        Registros que contêm um valor.
+
+        Args:
+            campo: Coluna multivalorada
+            valor: Valor procurado (ex.: um programa)
+
+        Returns:
+            Linhas de ``dados`` que contêm o valor
+        """
+        indice = self.indice(campo)
+        posicoes = indice.loc[indice["valor"] == valor, "registro"].to_numpy()
+        return self.dados.iloc[posicoes]
@@ -8,10 +8,16 @@ Módulo para mapeamento de cursos por programa de governo.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 import pandas as pd
 
+from analise.agregacao_programas import (
+    agregar_por_programa,
+    identificar_coluna_programas,
+)
+from analise.indice_multivalorado import IndiceMultivalorado
+
 
 class MapeamentoProgramas:
     """
@@ -32,10 +38,19 @@ class MapeamentoProgramas:
         """Carrega dados para análise."""
         self.dados = dados
 
-    def mapear_programas(self) -> Dict[str, Any]:
+    def mapear_programas(
+        self, agregados: pd.DataFrame = None, indices: IndiceMultivalorado = None
+    ) -> Dict[str, Any]:
         """
         Mapeia todos os programas de governo encontrados.
 
+        Registros com vários programas contam para cada um deles.
+
+        Args:
+            agregados: Resultado de ``agregar_por_programa`` já calculado
+                (evita refazer a agregação)
+            indices: Índices multivalorados já montados para ``self.dados``
+
         Returns:
             Dicionário com mapeamento completo
         """
@@ -45,11 +60,7 @@ class MapeamentoProgramas:
         print("📊 Mapeando programas de governo...")
 
         # Identificar coluna de programas
-        coluna_programas = None
-        for col in self.dados.columns:
-            if "programa" in col.lower() or "programas" in col.lower():
-                coluna_programas = col
-                break
+        coluna_programas = identificar_coluna_programas(self.dados)
 
         if coluna_programas is None:
             print("⚠️ Coluna de programas não encontrada!")
@@ -68,65 +79,28 @@ class MapeamentoProgramas:
             "timestamp_analise": datetime.now().isoformat(),
         }
 
-        # Contar programas únicos
-        programas_unicos = self.dados[coluna_programas].dropna().unique()
-        mapeamento["programas_unicos"] = len(programas_unicos)
-
-        # Mapear cada programa
-        for programa in programas_unicos:
-            if pd.isna(programa) or programa == "":
-                continue
-
-            # Filtrar dados do programa
-            dados_programa = self.dados[self.dados[coluna_programas] == programa]
+        # Agregados de todos os programas em uma única passada
+        if agregados is None:
+            indices = indices or IndiceMultivalorado(self.dados)
+            agregados = agregar_por_programa(
+                self.dados, coluna_programas, indices.indice(coluna_programas)
+            )
+        mapeamento["programas_unicos"] = len(agregados)
 
-            # Estatísticas do programa
+        for programa, linha in agregados.to_dict("index").items():
             stats_programa = {
-                "quantidade_cursos": len(dados_programa),
-                "quantidade_ofertas": len(dados_programa),
-                "cursos_unicos": (
-                    dados_programa.get("no_curso", pd.Series()).nunique()
-                    if "no_curso" in dados_programa.columns
-                    else 0
-                ),
-                "ofertas_unicas": (
-                    dados_programa.get("id_oferta", pd.Series()).nunique()
-                    if "id_oferta" in dados_programa.columns
-                    else 0
-                ),
-                "instituicoes": (
-                    dados_programa.get("no_orgao", pd.Series()).nunique()
-                    if "no_orgao" in dados_programa.columns
-                    else 0
-                ),
-                "areas_tematicas": (
-                    dados_programa.get("area_tematica", pd.Series()).nunique()
-                    if "area_tematica" in dados_programa.columns
-                    else 0
-                ),
-                "niveis": (
-                    dados_programa.get("no_nivel", pd.Series()).nunique()
-                    if "no_nivel" in dados_programa.columns
-                    else 0
-                ),
-                "modalidades": (
-                    dados_programa.get("no_formato", pd.Series()).nunique()
-                    if "no_formato" in dados_programa.columns
-                    else 0
-                ),
+                "quantidade_cursos": int(linha["registros"]),
+                "quantidade_ofertas": int(linha["registros"]),
+                "cursos_unicos": int(linha["cursos_unicos"]),
+                "ofertas_unicas": int(linha["ofertas_unicas"]),
+                "instituicoes": int(linha["instituicoes"]),
+                "areas_tematicas": int(linha["areas_tematicas"]),
+                "niveis": int(linha["niveis"]),
+                "modalidades": int(linha["modalidades"]),
+                "total_vagas": linha["total_vagas"],
+                "media_vagas_por_oferta": linha["media_vagas"],
             }
 
-            # Calcular vagas se disponível
-            if "vagas" in dados_programa.columns:
-                vagas_numericas = pd.to_numeric(
-                    dados_programa["vagas"], errors="coerce"
-                )
-                stats_programa["total_vagas"] = vagas_numericas.sum()
-                stats_programa["media_vagas_por_oferta"] = vagas_numericas.mean()
-            else:
-                stats_programa["total_vagas"] = 0
-                stats_programa["media_vagas_por_oferta"] = 0
-
             # Adicionar ao mapeamento
             mapeamento["programas_encontrados"][programa] = stats_programa
 
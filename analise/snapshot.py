@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshot - Sistema de Análise UNA-SUS
+=====================================
+
+Snapshot colunar (Parquet) de cada coleta, gravado uma única vez e lido
+por padrão pelas análises:
+
+    data/snapshots/data_coleta=2025-07-29/coleta=20250729_222308/dados.parquet
+
+- o particionamento por data permite ler várias coletas filtrando pela
+  data sem abrir os demais arquivos
+- ``colunas`` lê só as colunas pedidas e ``filtros`` descarta linhas na
+  leitura (usando as estatísticas do Parquet)
+- CSV e Excel passam a ser exportações sob demanda (``exportar_snapshot``)
+- os metadados da coleta são gravados uma única vez, nos metadados do
+  arquivo (``metadados_snapshot``), e não em cada linha
+- ``EscritorSnapshot`` grava a coleta lote a lote, com esquema fixo, sem
+  mantê-la inteira em memória
+
+Requer pyarrow; sem ele a coleta continua gravando CSV.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set
+
+import pandas as pd
+
+from analise.carregamento import (
+    COLUNAS_CATEGORICAS,
+    COLUNAS_INTEIRAS,
+    COLUNAS_VOLUMOSAS,
+    aplicar_esquema,
+)
+
+DIRETORIO_SNAPSHOTS = os.path.join("data", "snapshots")
+
+NOME_ARQUIVO = "dados.parquet"
+
+# Chave dos metadados da coleta no esquema do Parquet
+CHAVE_METADADOS = b"unasus.metadados_coleta"
+
+# Linhas por lote nas exportações a partir do snapshot
+TAMANHO_LOTE_EXPORTACAO = 10000
+
+
+def pyarrow_disponivel() -> bool:
+    """Indica se o pyarrow (necessário para o Parquet) está instalado."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def caminho_snapshot(timestamp: str, diretorio: str = DIRETORIO_SNAPSHOTS) -> str:
+    """
+    Caminho do snapshot de uma coleta.
+
+    Args:
+        timestamp: Timestamp da coleta (``%Y%m%d_%H%M%S``)
+        diretorio: Raiz dos snapshots
+
+    Returns:
+        Caminho do arquivo Parquet
+    """
+    data_coleta = datetime.strptime(timestamp, "%Y%m%d_%H%M%S").date().isoformat()
+    return os.path.join(
+        diretorio, f"data_coleta={data_coleta}", f"coleta={timestamp}", NOME_ARQUIVO
+    )
+
+
+def _texto(valor):
+    """Converte valores não textuais de colunas livres para texto."""
+    if valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, float) and valor != valor:
+        return None
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, ensure_ascii=False, default=str)
+    return str(valor)
+
+
+def _preparar_colunas(dados: pd.DataFrame) -> pd.DataFrame:
+    """Aplica o esquema e normaliza colunas de texto com tipos mistos."""
+    dados = aplicar_esquema(dados.copy())
+    for coluna in dados.columns:
+        if dados[coluna].dtype == object:
+            dados[coluna] = dados[coluna].map(_texto)
+    return dados
+
+
+def _metadados_arquivo(metadados: Dict) -> Dict[bytes, bytes]:
+    """Metadados da coleta no formato do esquema Parquet."""
+    texto = json.dumps(metadados, ensure_ascii=False, default=str)
+    return {CHAVE_METADADOS: texto.encode("utf-8")}
+
+
+def _tipo_arrow(coluna: str, tipos: Set[type]):
+    """
+    Tipo Parquet de uma coluna: o do esquema de carregamento para inteiros
+    e categóricos e, nas demais, o dos valores vistos (texto se mistos).
+    """
+    import pyarrow as pa
+
+    if coluna in COLUNAS_INTEIRAS:
+        return pa.int64() if COLUNAS_INTEIRAS[coluna] == "Int64" else pa.int32()
+    if coluna not in COLUNAS_CATEGORICAS and tipos:
+        if tipos <= {bool}:
+            return pa.bool_()
+        if tipos <= {int}:
+            return pa.int64()
+        if tipos <= {int, float}:
+            return pa.float64()
+    return pa.string()
+
+
+class EscritorSnapshot:
+    """
+    Grava o snapshot de uma coleta lote a lote (``pyarrow.ParquetWriter``).
+
+    O esquema é fixado na criação a partir das colunas e dos tipos dos
+    valores da coleta (ver ``scrapers.registros.tipos_visao_plana``), de
+    modo que todos os lotes são gravados com os mesmos tipos: colunas
+    ausentes em um lote ficam nulas. O arquivo só aparece no lugar final
+    em ``fechar`` (tmp + rename).
+    """
+
+    def __init__(
+        self,
+        timestamp: str,
+        tipos: Dict[str, Set[type]],
+        diretorio: str = DIRETORIO_SNAPSHOTS,
+        metadados: Optional[Dict] = None,
+    ):
+        """
+        Inicializa o escritor.
+
+        Args:
+            timestamp: Timestamp da coleta (``%Y%m%d_%H%M%S``)
+            tipos: Coluna -> tipos Python dos valores não nulos
+            diretorio: Raiz dos snapshots
+            metadados: Metadados da execução, gravados uma vez no arquivo
+
+        Raises:
+            ImportError: se o pyarrow não estiver instalado
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.caminho = caminho_snapshot(timestamp, diretorio)
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+
+        self.esquema = pa.schema(
+            [pa.field(coluna, _tipo_arrow(coluna, t)) for coluna, t in tipos.items()]
+        )
+        if metadados:
+            self.esquema = self.esquema.with_metadata(_metadados_arquivo(metadados))
+        self.linhas_escritas = 0
+        self._temporario = f"{self.caminho}.tmp"
+        self._escritor = pq.ParquetWriter(
+            self._temporario, self.esquema, compression="zstd"
+        )
+
+    def escrever(self, dados: pd.DataFrame) -> int:
+        """
+        Grava um lote como um grupo de linhas do arquivo.
+
+        Args:
+            dados: Lote na visão plana
+
+        Returns:
+            Número de linhas gravadas
+        """
+        import pyarrow as pa
+
+        dados = dados.copy()
+        textos = [
+            campo.name
+            for campo in self.esquema
+            if pa.types.is_string(campo.type) and campo.name in dados.columns
+        ]
+        for coluna in textos:
+            dados[coluna] = dados[coluna].astype(object).map(_texto)
+        dados = aplicar_esquema(dados)
+
+        colunas = []
+        for campo in self.esquema:
+            if campo.name not in dados.columns:
+                colunas.append(pa.nulls(len(dados), campo.type))
+                continue
+            serie = dados[campo.name]
+            if campo.name in textos:
+                serie = serie.astype(object)
+            colunas.append(pa.array(serie, type=campo.type, from_pandas=True))
+
+        self._escritor.write_table(pa.Table.from_arrays(colunas, schema=self.esquema))
+        self.linhas_escritas += len(dados)
+        return len(dados)
+
+    def fechar(self) -> str:
+        """
+        Conclui o arquivo e o move para o lugar final.
+
+        Returns:
+            Caminho do snapshot gravado
+        """
+        self._escritor.close()
+        os.replace(self._temporario, self.caminho)
+        return self.caminho
+
+    def descartar(self):
+        """Abandona um snapshot incompleto, removendo o arquivo temporário."""
+        self._escritor.close()
+        if os.path.exists(self._temporario):
+            os.remove(self._temporario)
+
+
+def salvar_snapshot(
+    dados: pd.DataFrame,
+    timestamp: str,
+    diretorio: str = DIRETORIO_SNAPSHOTS,
+    metadados: Optional[Dict] = None,
+) -> str:
+    """
+    Grava o snapshot Parquet de uma coleta (tmp + rename).
+
+    Args:
+        dados: Registros da coleta
+        timestamp: Timestamp da coleta (``%Y%m%d_%H%M%S``)
+        diretorio: Raiz dos snapshots
+        metadados: Metadados da execução, gravados uma vez no arquivo
+
+    Returns:
+        Caminho do arquivo gravado
+
+    Raises:
+        ImportError: se o pyarrow não estiver instalado
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    caminho = caminho_snapshot(timestamp, diretorio)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+    tabela = pa.Table.from_pandas(_preparar_colunas(dados), preserve_index=False)
+    if metadados:
+        tabela = tabela.replace_schema_metadata(
+            {**(tabela.schema.metadata or {}), **_metadados_arquivo(metadados)}
+        )
+    temporario = f"{caminho}.tmp"
+    pq.write_table(tabela, temporario, compression="zstd")
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def listar_snapshots(diretorio: str = DIRETORIO_SNAPSHOTS) -> List[str]:
+    """
+    Lista os snapshots gravados, do mais antigo para o mais recente.
+
+    Args:
+        diretorio: Raiz dos snapshots
+
+    Returns:
+        Caminhos dos arquivos Parquet
+    """
+    if not os.path.isdir(diretorio):
+        return []
+
+    snapshots = []
+    for raiz, _, arquivos in os.walk(diretorio):
+        if NOME_ARQUIVO in arquivos:
+            snapshots.append(os.path.join(raiz, NOME_ARQUIVO))
+    # O diretório coleta=<timestamp> ordena cronologicamente
+    return sorted(snapshots, key=lambda c: os.path.basename(os.path.dirname(c)))
+
+
+def metadados_snapshot(caminho: str) -> Dict:
+    """
+    Metadados da coleta gravados em um snapshot.
+
+    Args:
+        caminho: Arquivo Parquet do snapshot
+
+    Returns:
+        Dicionário com os metadados (vazio em snapshots sem metadados)
+    """
+    import pyarrow.parquet as pq
+
+    metadados = pq.read_schema(caminho).metadata or {}
+    if CHAVE_METADADOS not in metadados:
+        return {}
+    return json.loads(metadados[CHAVE_METADADOS].decode("utf-8"))
+
+
+def colunas_snapshot(caminho: str) -> List[str]:
+    """
+    Colunas disponíveis em um snapshot (ou na raiz dos snapshots).
+
+    Args:
+        caminho: Arquivo Parquet ou diretório particionado
+
+    Returns:
+        Nomes das colunas (incluindo as de partição, se for diretório)
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    if not os.path.isdir(caminho):
+        return pq.read_schema(caminho).names
+    return ds.dataset(caminho, format="parquet", partitioning="hive").schema.names
+
+
+def carregar_snapshot(
+    caminho: Optional[str] = None,
+    colunas: Optional[Sequence[str]] = None,
+    filtros: Optional[List] = None,
+    incluir_volumosas: bool = False,
+) -> pd.DataFrame:
+    """
+    Lê um snapshot (ou vários, a partir de um diretório particionado).
+
+    Args:
+        caminho: Arquivo Parquet ou diretório; padrão: o snapshot mais
+            recente. Diretórios incluem as colunas ``data_coleta`` e
+            ``coleta``
+        colunas: Colunas a ler (padrão: todas, menos as volumosas)
+        filtros: Predicados no formato do pyarrow, aplicados na leitura,
+            ex.: ``[("data_coleta", ">=", "2025-07-01"), ("vagas", ">", 0)]``
+        incluir_volumosas: Com ``colunas`` omitido, lê também
+            ``COLUNAS_VOLUMOSAS``
+
+    Returns:
+        DataFrame compacto (ver ``analise.carregamento``)
+
+    Raises:
+        FileNotFoundError: se não houver snapshot
+    """
+    import pyarrow.parquet as pq
+
+    if caminho is None:
+        snapshots = listar_snapshots()
+        if not snapshots:
+            raise FileNotFoundError(
+                f"Nenhum snapshot encontrado em {DIRETORIO_SNAPSHOTS}"
+            )
+        caminho = snapshots[-1]
+
+    if colunas is None:
+        colunas = [
+            coluna
+            for coluna in colunas_snapshot(caminho)
+            if incluir_volumosas or coluna not in COLUNAS_VOLUMOSAS
+        ]
+
+    tabela = pq.read_table(
+        caminho,
+        columns=list(colunas),
+        filters=filtros,
+        partitioning="hive" if os.path.isdir(caminho) else None,
+    )
+    return aplicar_esquema(tabela.to_pandas())
+
+
+def exportar_snapshot(
+    caminho: str, formatos: Sequence[str] = ("csv",), destino: str = "data"
+) -> Dict[str, str]:
+    """
+    Exporta um snapshot para CSV e/ou Excel.
+
+    O CSV é gravado lote a lote, sem carregar o snapshot inteiro; o Excel
+    não pode ser gravado em fluxo e lê o snapshot de uma vez.
+
+    Args:
+        caminho: Arquivo Parquet do snapshot
+        formatos: "csv" e/ou "xlsx"
+        destino: Diretório dos arquivos exportados
+
+    Returns:
+        Dicionário formato -> caminho do arquivo gerado
+    """
+    import pyarrow.parquet as pq
+
+    timestamp = os.path.basename(os.path.dirname(caminho)).split("=", 1)[-1]
+    base = os.path.join(destino, f"unasus_database_geral_{timestamp}")
+    os.makedirs(destino, exist_ok=True)
+
+    exportados = {}
+    for formato in formatos:
+        if formato == "csv":
+            with open(f"{base}.csv", "w", newline="", encoding="utf-8-sig") as f:
+                lotes = pq.ParquetFile(caminho).iter_batches(TAMANHO_LOTE_EXPORTACAO)
+                for numero, lote in enumerate(lotes):
+                    aplicar_esquema(lote.to_pandas()).to_csv(
+                        f, index=False, header=numero == 0
+                    )
+            exportados["csv"] = f"{base}.csv"
+        elif formato == "xlsx":
+            dados = carregar_snapshot(caminho, incluir_volumosas=True)
+            dados.to_excel(f"{base}.xlsx", index=False)
+            exportados["excel"] = f"{base}.xlsx"
+        else:
+            raise ValueError(f"Formato não suportado: {formato}")
+    return exportados
@@ -23,15 +23,21 @@ no diretório raiz, criando um database geral sem análises.
 📁 LOCALIZAÇÃO: Diretório raiz (junto com scraper_unasus.py)
 """
 
+import argparse
 import json
 import logging
 import os
+import queue
 import re
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List
 
 from bs4 import BeautifulSoup
 
@@ -41,14 +47,14 @@ def instalar_dependencias():
     """Instala automaticamente as dependências necessárias."""
     print("🔧 Verificando e instalando dependências...")
 
-    # Lista de dependências essenciais
-    dependencias = ["pandas", "requests", "beautifulsoup4"]
+    # Dependências essenciais: pacote do pip -> módulo importado
+    dependencias = {"pandas": "pandas", "requests": "requests", "beautifulsoup4": "bs4"}
 
     dependencias_faltando = []
 
-    for dep in dependencias:
+    for dep, modulo in dependencias.items():
         try:
-            __import__(dep)
+            __import__(modulo)
             print(f"  ✅ {dep} já está instalado")
         except ImportError:
             dependencias_faltando.append(dep)
@@ -85,6 +91,54 @@ if not instalar_dependencias():
 import pandas as pd
 import requests
 
+# Camada HTTP compartilhada com os scrapers em src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from analise.estatisticas_basicas import EstatisticasColunas
+from analise.snapshot import EscritorSnapshot, exportar_snapshot, pyarrow_disponivel
+from scrapers.gravacao import (
+    adicionar_opcoes_transporte,
+    criar_adaptador,
+    criar_cache,
+)
+from scrapers.persistencia import (
+    EscritorCSVIncremental,
+    EscritorJSONL,
+    ler_jsonl,
+    ler_jsonl_em_lotes,
+    reparar_jsonl,
+)
+from scrapers.registro_ofertas import RegistroOfertas
+from scrapers.registros import (
+    CAMPOS_OFERTA,
+    linhas_planas,
+    registro_curso,
+    separar_registro_plano,
+    tipos_visao_plana,
+    visao_plana,
+)
+from scrapers.textos import ArmazemTextos, extrair_texto_visivel
+from scrapers.utils import ClienteHTTP
+
+# Status da busca para cursos cujas ofertas já foram todas encerradas
+STATUS_ENCERRADO = "com oferta encerrada"
+
+# Formatos aceitos como coleta de referência do modo incremental, do
+# menos para o mais preferido
+PREFERENCIA_REFERENCIA = [".csv", ".json", ".jsonl.gz"]
+
+# Registros acumulados em memória antes de cada gravação no arquivo parcial
+TAMANHO_BUFFER_REGISTROS = 500
+
+# Páginas da listagem buscadas à frente dos cursos (tamanho da fila)
+PAGINAS_ANTECIPADAS = 2
+
+# Campos com o número de vagas (normalizados e resumidos no relatório)
+CAMPOS_VAGAS = ["vagas", "numero_vagas", "qt_vagas", "vagas_disponiveis"]
+
+# Marca o fim da listagem na fila de páginas
+_FIM_LISTAGEM = object()
+
 
 class ColetorDatabaseGeral:
     """
@@ -93,21 +147,69 @@ class ColetorDatabaseGeral:
     Coleta TODOS os dados disponíveis sem filtros ou processamentos.
     """
 
-    def __init__(self, logger: logging.Logger = None):
+    def __init__(
+        self,
+        logger: logging.Logger = None,
+        max_workers: int = 8,
+        requisicoes_por_segundo: float = 4.0,
+        cache_ttl_horas: float = 0,
+        gravar: str = None,
+        reproduzir: str = None,
+        exportar: List[str] = None,
+        paginas_antecipadas: int = PAGINAS_ANTECIPADAS,
+    ):
         """
         Inicializa o coletor de database geral.
 
         Args:
             logger: Logger para acompanhamento
+            max_workers: Número máximo de requisições simultâneas
+            requisicoes_por_segundo: Orçamento global de requisições ao portal
+            cache_ttl_horas: Validade do cache HTTP em disco (0 desativa;
+                ignorado nos modos de gravação e reprodução)
+            gravar: Arquivo .jsonl onde gravar as respostas do portal
+            reproduzir: Arquivo .jsonl gravado para coletar offline
+            exportar: Formatos exportados além do snapshot ("csv", "xlsx")
+            paginas_antecipadas: Páginas da listagem buscadas à frente dos
+                cursos em processamento
         """
         # Criar diretórios necessários ANTES de configurar o logger
         self._criar_diretorios()
 
         self.logger = logger or self._configurar_logger()
-        self.dados_coletados = []
-        self.pagina_atual = 1
-        self.total_paginas = 0
-        self.cursos_encontrados = 0
+        self.formatos_exportacao = list(exportar or [])
+        self._lock_estatisticas = threading.Lock()
+
+        # Motor de coleta concorrente: cursos de uma página e ofertas de um
+        # curso são buscados em pools separados (evita deadlock entre níveis),
+        # e o limitador do cliente substitui as pausas fixas entre requisições.
+        self.max_workers = max(1, max_workers)
+        self.cliente = ClienteHTTP(
+            requisicoes_por_segundo=requisicoes_por_segundo,
+            max_conexoes=2 * self.max_workers,
+            logger=self.logger,
+            cache=criar_cache(cache_ttl_horas, gravar=gravar, reproduzir=reproduzir),
+            adaptador=criar_adaptador(
+                gravar=gravar, reproduzir=reproduzir, max_conexoes=2 * self.max_workers
+            ),
+        )
+
+        # Pipeline produtor/consumidor: uma thread percorre a listagem pelo
+        # cursor ``proximo`` e enche uma fila limitada enquanto os workers
+        # processam os cursos das páginas anteriores
+        self.paginas_antecipadas = max(1, paginas_antecipadas)
+
+        # Texto completo de cada página de curso, comprimido, para
+        # reclassificar DEIA offline sem nova coleta
+        self.textos = ArmazemTextos()
+
+        # Pools e registro de ofertas são liberados ao fim de cada coleta e
+        # reabertos na seguinte (ver _abrir_recursos)
+        self._executor_cursos = None
+        self._executor_ofertas = None
+        self.registro_ofertas = None
+        self._reiniciar_estado()
+        self._abrir_recursos()
 
         # Configurações da UNA-SUS (baseadas no scraper original que funciona)
         self.url_base = "https://www.unasus.gov.br/cursos/rest/busca"
@@ -145,6 +247,78 @@ class ColetorDatabaseGeral:
             "proximo": 0,
         }
 
+    def _reiniciar_estado(self):
+        """Zera o estado de uma coleta (contadores, retomada, estatísticas)."""
+        self.total_registros = 0
+        self.caminho_dados = None
+        self.inicio_coleta = None
+        self.pagina_atual = 1
+        self.total_paginas = 0
+        self.cursos_encontrados = 0
+
+        # Estado de retomada: cada curso concluído é anexado (em lotes) ao
+        # arquivo parcial comprimido e o checkpoint guarda o cursor da
+        # página em andamento; nenhum registro fica acumulado em memória
+        self.id_execucao = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.caminho_parcial = (
+            f"data/parcial_database_geral_{self.id_execucao}.jsonl.gz"
+        )
+        self.caminho_checkpoint = (
+            f"checkpoints/coleta_database_geral_checkpoint_{self.id_execucao}.json"
+        )
+        self.cursos_concluidos = set()
+        self._escritor_parcial = None
+        self._parar_listagem = None
+
+        # Modo incremental: índice da última coleta salva, por curso
+        self.snapshot_anterior = {}
+        self.estatisticas_incremental = {
+            "cursos_reaproveitados": 0,
+            "ofertas_reaproveitadas": 0,
+            "ofertas_buscadas": 0,
+        }
+
+        self.estatisticas_pipeline = {
+            "paginas_listadas": 0,
+            "tempo_listagem": 0.0,
+            "listagem_bloqueada": 0.0,
+            "cursos_processados": 0,
+            "tempo_cursos": 0.0,
+            "espera_por_paginas": 0.0,
+        }
+        self.vazao = {}
+
+    def _abrir_recursos(self):
+        """Abre os pools de threads e o registro de ofertas, se fechados."""
+        if self._executor_cursos is None:
+            self._executor_cursos = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="curso"
+            )
+        if self._executor_ofertas is None:
+            self._executor_ofertas = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="oferta"
+            )
+
+        # Registro global das ofertas: cada oferta é buscada no máximo uma
+        # vez por coleta, mesmo que apareça em vários cursos
+        if self.registro_ofertas is None:
+            self.registro_ofertas = RegistroOfertas(self.id_execucao)
+
+    def _fechar_recursos(self):
+        """Libera pools, conexões e registro de ofertas ao fim da coleta."""
+        if self._parar_listagem is not None:
+            self._parar_listagem.set()
+        for executor in (self._executor_cursos, self._executor_ofertas):
+            if executor is not None:
+                executor.shutdown(wait=False)
+        self._executor_cursos = self._executor_ofertas = None
+        self.cliente.fechar()
+        if self.registro_ofertas is not None:
+            self.registro_ofertas.fechar()
+            self.registro_ofertas = None
+        if self._escritor_parcial is not None:
+            self._escritor_parcial.fechar()
+
     def _criar_diretorios(self):
         """Cria diretórios necessários para o funcionamento."""
         diretorios = ["data", "logs", "checkpoints"]
@@ -189,30 +363,230 @@ class ColetorDatabaseGeral:
 
         return logger
 
-    def coletar_dados_completos(self) -> List[Dict]:
+    def coletar_dados_completos(
+        self, retomar: bool = False, incremental: bool = False, snapshot: str = None
+    ) -> Iterator[Dict]:
         """
         📊 Coleta TODOS os dados disponíveis da UNA-SUS.
 
+        No modo incremental a listagem completa é percorrida normalmente,
+        mas cursos encerrados e inalterados desde a última coleta são
+        reaproveitados sem nenhuma requisição, e ofertas já encerradas não
+        são buscadas de novo.
+
+        A listagem roda em uma thread própria, buscando até
+        ``paginas_antecipadas`` páginas à frente dos cursos em
+        processamento, de modo que a latência da busca não atrasa os
+        workers.
+
+        Args:
+            retomar: Continua a partir do último checkpoint em andamento
+            incremental: Compara com a última coleta salva e busca só o que mudou
+            snapshot: Arquivo da coleta de referência (padrão: o mais recente)
+
         Returns:
-            Lista completa de dados coletados
+            Iterador preguiçoso dos registros coletados na visão plana (uma
+            linha por oferta), lidos do arquivo gravado em
+            ``coletor.caminho_dados``
         """
+        if self.inicio_coleta is not None:
+            # Nova coleta com o mesmo coletor: o estado da anterior é zerado
+            self._reiniciar_estado()
+        self._abrir_recursos()
+
+        self.inicio_coleta = datetime.now().isoformat()
         self.logger.info("🚀 INICIANDO COLETA COMPLETA DE DADOS UNA-SUS")
         self.logger.info("📋 PRINCÍPIO: Coletar TODOS os dados sem filtros")
         self.logger.info("📁 LOCALIZAÇÃO: Diretório raiz")
 
         try:
-            # Inicializar coleta
-            self.logger.info("🔍 Iniciando coleta de dados...")
-
-            # Coletar dados página por página (baseado no scraper original)
             pagina = 0
             payload = self.payload.copy()
 
-            while True:
-                self.logger.info(f"📄 Processando página {pagina + 1}")
+            checkpoint = self._carregar_checkpoint() if retomar else None
+            if checkpoint:
+                pagina = self._retomar_de_checkpoint(checkpoint)
+                payload["proximo"] = checkpoint["proximo"]
+            else:
+                if retomar:
+                    self.logger.info("ℹ️ Nenhum checkpoint em andamento encontrado")
+                self.logger.info("🔍 Iniciando coleta de dados...")
+
+            if incremental:
+                self.snapshot_anterior = self._carregar_snapshot_anterior(snapshot)
+
+            self._escritor_parcial = EscritorJSONL(
+                self.caminho_parcial, tamanho_buffer=TAMANHO_BUFFER_REGISTROS
+            )
+            inicio_coleta = time.perf_counter()
+            pagina = self._executar_pipeline(payload, pagina)
+
+            self.logger.info(
+                f"✅ COLETA COMPLETA FINALIZADA: {self.total_registros} cursos"
+            )
+            self._salvar_checkpoint(pagina + 1, None, status="concluida")
+            self._registrar_vazao(time.perf_counter() - inicio_coleta)
+            self._registrar_reaproveitamento(incremental)
+
+            # Salvar dados completos
+            self._salvar_dados_completos()
+
+            if not self.caminho_dados:
+                return iter(())
+            return iter(self.carregar_dados_existentes(self.caminho_dados))
+
+        except Exception as e:
+            self.logger.error(f"❌ ERRO NA COLETA: {str(e)}")
+            # Fecha o arquivo parcial, que fica no lugar para a retomada
+            self._salvar_dados_completos(concluida=False)
+            raise
+
+        finally:
+            self._fechar_recursos()
+
+    def _executar_pipeline(self, payload: Dict, pagina: int) -> int:
+        """
+        🔄 Percorre a listagem e processa os cursos (produtor/consumidor).
+
+        Uma thread produtora busca as páginas à frente e os workers
+        processam os cursos de várias páginas ao mesmo tempo, mas cada
+        página é registrada (e o checkpoint salvo) em ordem, só depois de
+        concluída. Um erro da listagem só interrompe a coleta depois que as
+        páginas já recebidas forem concluídas.
+
+        Args:
+            payload: Payload da busca, com o cursor da primeira página
+            pagina: Índice (base 0) da primeira página
+
+        Returns:
+            Índice da última página recebida
+        """
+        fila = queue.Queue(maxsize=self.paginas_antecipadas)
+        self._parar_listagem = threading.Event()
+        produtor = threading.Thread(
+            target=self._produzir_paginas,
+            args=(payload, pagina, fila, self._parar_listagem),
+            name="listagem",
+            daemon=True,
+        )
+        produtor.start()
+
+        em_andamento = deque()
+        while True:
+            inicio_espera = time.perf_counter()
+            item = fila.get()
+            with self._lock_estatisticas:
+                self.estatisticas_pipeline["espera_por_paginas"] += (
+                    time.perf_counter() - inicio_espera
+                )
+
+            if item is _FIM_LISTAGEM:
+                break
+            if isinstance(item, Exception):
+                # Cursos já recebidos são concluídos antes de interromper
+                self._concluir_paginas(em_andamento, todas=True)
+                raise item
+
+            pagina, itens, proximo = item
+            em_andamento.append(self._enviar_pagina(pagina, itens, proximo))
+            self._concluir_paginas(em_andamento)
+
+        self._concluir_paginas(em_andamento, todas=True)
+        return pagina
+
+    def _enviar_pagina(self, pagina: int, itens: List[Dict], proximo) -> tuple:
+        """
+        📤 Envia aos workers os cursos de uma página ainda não concluídos.
+
+        Args:
+            pagina: Índice (base 0) da página
+            itens: Cursos da página
+            proximo: Cursor da página seguinte
+
+        Returns:
+            Página em andamento: ``(pagina, pendentes, futuros, proximo)``
+        """
+        self.logger.info(f"📄 Processando página {pagina + 1}")
+        self.pagina_atual = pagina + 1
+
+        # Cursos já concluídos (retomada) não são buscados de novo
+        pendentes = [
+            curso
+            for curso in itens
+            if str(curso.get("co_seq_curso", "")) not in self.cursos_concluidos
+        ]
+        futuros = [
+            self._executor_cursos.submit(
+                self._processar_curso_medido, curso, pagina + 1
+            )
+            for curso in pendentes
+        ]
+        return pagina, pendentes, futuros, proximo
+
+    def _concluir_paginas(self, em_andamento: deque, todas: bool = False):
+        """
+        ✅ Registra, em ordem, as páginas do início da fila já concluídas.
+
+        Também limita as páginas em processamento: se houver mais que
+        ``paginas_antecipadas``, a mais antiga é aguardada, liberando
+        memória e avançando o checkpoint.
 
-                # Fazer requisição
-                response = requests.post(
+        Args:
+            em_andamento: Páginas enviadas aos workers, na ordem da listagem
+            todas: Aguarda e registra todas as páginas
+        """
+        while em_andamento and (
+            todas
+            or len(em_andamento) > self.paginas_antecipadas
+            or all(futuro.done() for futuro in em_andamento[0][2])
+        ):
+            self._concluir_pagina(*em_andamento.popleft())
+
+    def _registrar_reaproveitamento(self, incremental: bool):
+        """
+        🧾 Registra no log as ofertas buscadas e o que foi reaproveitado.
+
+        Args:
+            incremental: Se a coleta foi incremental
+        """
+        ofertas = self.registro_ofertas.estatisticas()
+        self.logger.info(
+            f"🧾 Ofertas: {ofertas['buscadas']} buscadas, "
+            f"{ofertas['repetidas'] + ofertas['reaproveitadas']} repetições "
+            f"evitadas, {ofertas['erros']} com erro"
+        )
+        if incremental:
+            estatisticas = self.estatisticas_incremental
+            self.logger.info(
+                "♻️ Modo incremental: "
+                f"{estatisticas['cursos_reaproveitados']} cursos reaproveitados, "
+                f"{estatisticas['ofertas_reaproveitadas']} ofertas reaproveitadas, "
+                f"{estatisticas['ofertas_buscadas']} ofertas buscadas"
+            )
+
+    def _produzir_paginas(
+        self, payload: Dict, pagina: int, fila: queue.Queue, parar: threading.Event
+    ):
+        """
+        📥 Percorre a listagem pelo cursor ``proximo``, à frente dos cursos.
+
+        Cada página vai para a fila como ``(índice, itens, proximo)``; a fila
+        limitada segura a listagem quando os cursos não acompanham. O fim da
+        listagem (ou o erro que a interrompeu) também é entregue pela fila.
+
+        Args:
+            payload: Payload da busca, com o cursor da primeira página
+            pagina: Índice (base 0) da primeira página
+            fila: Fila limitada de páginas
+            parar: Sinal de interrupção enviado pelo consumidor
+        """
+        try:
+            falhas_consecutivas = 0
+            payload = payload.copy()
+            while not parar.is_set():
+                # Erros transitórios são retentados pelo cliente
+                inicio = time.perf_counter()
+                response = self.cliente.post(
                     self.url_base,
                     data=payload,
                     headers=self.headers,
@@ -221,121 +595,312 @@ class ColetorDatabaseGeral:
                 )
 
                 if response.status_code != 200:
+                    falhas_consecutivas += 1
+                    espera = self.cliente.calcular_espera(falhas_consecutivas)
                     self.logger.warning(
-                        f"⚠️ Status {response.status_code}. Tentando novamente..."
+                        f"⚠️ Status {response.status_code}. "
+                        f"Tentando novamente em {espera:.1f}s..."
                     )
-                    time.sleep(30)
+                    time.sleep(espera)
                     continue
 
-                data = response.json()
-                results = data.get("results", {})
+                falhas_consecutivas = 0
+
+                results = response.json().get("results", {})
                 itens = results.get("itens", [])
+                proximo = results.get("proximo")
+                with self._lock_estatisticas:
+                    self.estatisticas_pipeline["paginas_listadas"] += 1
+                    self.estatisticas_pipeline["tempo_listagem"] += (
+                        time.perf_counter() - inicio
+                    )
 
                 if not itens:
                     self.logger.info("📄 Nenhum item encontrado. Finalizando.")
                     break
 
-                # Processar cada curso da página
-                for curso in itens:
-                    # Processar curso e suas ofertas
-                    registros_curso = self._processar_curso_completo(curso)
-                    self.dados_coletados.extend(registros_curso)
-
-                self.logger.info(
-                    f"✅ Página {pagina + 1}: {len(itens)} cursos coletados"
-                )
+                self._entregar_pagina(fila, (pagina, itens, proximo), parar)
 
-                # Checkpoint a cada 10 páginas
-                if (pagina + 1) % 10 == 0:
-                    self._salvar_checkpoint(pagina + 1)
-
-                # Verificar se há próxima página
-                proximo = results.get("proximo")
                 if not proximo:
                     self.logger.info("📄 Última página alcançada. Finalizando.")
                     break
 
-                # Atualizar payload para próxima página
                 payload["proximo"] = proximo
                 pagina += 1
 
-                # Pausa para não sobrecarregar o servidor
-                time.sleep(1)
+            self._entregar_pagina(fila, _FIM_LISTAGEM, parar)
+        except Exception as e:
+            self._entregar_pagina(fila, e, parar)
 
-            self.logger.info(
-                f"✅ COLETA COMPLETA FINALIZADA: {len(self.dados_coletados)} cursos"
+    def _entregar_pagina(self, fila: queue.Queue, item, parar: threading.Event):
+        """Coloca um item na fila, aguardando vaga (ou a interrupção)."""
+        inicio = time.perf_counter()
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+        with self._lock_estatisticas:
+            self.estatisticas_pipeline["listagem_bloqueada"] += (
+                time.perf_counter() - inicio
             )
 
-            # Salvar dados completos
-            self._salvar_dados_completos()
+    def _processar_curso_medido(self, curso: Dict, pagina: int) -> Dict:
+        """Processa um curso contabilizando o tempo gasto pelo worker."""
+        inicio = time.perf_counter()
+        try:
+            return self._processar_curso_completo(curso, pagina)
+        finally:
+            with self._lock_estatisticas:
+                self.estatisticas_pipeline["cursos_processados"] += 1
+                self.estatisticas_pipeline["tempo_cursos"] += (
+                    time.perf_counter() - inicio
+                )
 
-            return self.dados_coletados
+    def _concluir_pagina(
+        self, pagina: int, pendentes: List[Dict], futuros: List, proximo
+    ):
+        """
+        ✅ Registra os cursos de uma página, na ordem da listagem, e salva o
+        checkpoint apontando para a página seguinte.
 
-        except Exception as e:
-            self.logger.error(f"❌ ERRO NA COLETA: {str(e)}")
-            # Salvar dados coletados até o momento
-            self._salvar_dados_completos()
-            raise
+        Args:
+            pagina: Índice (base 0) da página
+            pendentes: Cursos da página enviados aos workers
+            futuros: Resultados dos workers, na mesma ordem
+            proximo: Cursor da página seguinte
+        """
+        for curso, futuro in zip(pendentes, futuros):
+            self._registrar_curso_concluido(curso, futuro.result())
+
+        self.logger.info(f"✅ Página {pagina + 1}: {len(pendentes)} cursos coletados")
+        self._salvar_checkpoint(pagina + 1, proximo)
 
-    def _processar_curso_completo(self, curso: Dict) -> List[Dict]:
+    def _resumo_vazao(self, duracao: float) -> Dict:
         """
-        🔧 Processa um curso e suas ofertas, criando registros separados.
+        Vazão de cada etapa do pipeline de coleta.
 
         Args:
-            curso: Dados brutos do curso
+            duracao: Tempo total da coleta, em segundos
 
         Returns:
-            Lista de registros (um para cada oferta + um para o curso base)
+            Dicionário com tempos (s) e vazões por etapa
         """
-        # Criar cópia completa dos dados originais
-        curso_processado = curso.copy()
+        with self._lock_estatisticas:
+            estatisticas = dict(self.estatisticas_pipeline)
 
-        # Adicionar metadados de coleta
-        curso_processado["metadata_coleta"] = {
-            "timestamp_coleta": datetime.now().isoformat(),
-            "pagina_coleta": self.pagina_atual,
-            "versao_coletor": "1.0.0",
-            "tipo_coleta": "database_geral_sem_filtros",
-            "localizacao": "diretorio_raiz",
+        def _taxa(quantidade: float, tempo: float) -> float:
+            return quantidade / tempo if tempo > 0 else 0.0
+
+        return {
+            **{
+                chave: round(valor, 3) if isinstance(valor, float) else valor
+                for chave, valor in estatisticas.items()
+            },
+            "duracao": round(duracao, 3),
+            "paginas_por_segundo": round(
+                _taxa(estatisticas["paginas_listadas"], estatisticas["tempo_listagem"]),
+                3,
+            ),
+            "cursos_por_segundo": round(
+                _taxa(estatisticas["cursos_processados"], duracao), 3
+            ),
+            "workers_ocupados": round(_taxa(estatisticas["tempo_cursos"], duracao), 2),
         }
 
-        # Garantir que todos os campos estejam presentes
-        campos_obrigatorios = [
-            "id",
-            "titulo",
-            "descricao",
-            "carga_horaria",
-            "status",
-            "categoria",
-            "publico_alvo",
-            "palavras_chave",
-            "link",
-            "vagas",
-            "numero_vagas",
-            "qt_vagas",
-            "vagas_disponiveis",
-            "inicio_inscricao",
-            "fim_inscricao",
-            "data_inicio",
-            "data_fim",
-            "modalidade",
-            "tipo_curso",
-            "nivel",
-            "area_tematica",
-            "instituicao",
-            "coordenador",
-            "tutores",
-            "certificacao",
-            "pre_requisitos",
-            "objetivos",
-            "metodologia",
-            "avaliacao",
-            "bibliografia",
-        ]
+    def _registrar_vazao(self, duracao: float):
+        """
+        📈 Registra no log a vazão de cada etapa da coleta.
+
+        Args:
+            duracao: Tempo total da coleta, em segundos
+        """
+        self.vazao = self._resumo_vazao(duracao)
+        self.logger.info(
+            f"📈 Listagem: {self.vazao['paginas_listadas']} páginas "
+            f"({self.vazao['paginas_por_segundo']:.2f} páginas/s), "
+            f"aguardou os cursos por {self.vazao['listagem_bloqueada']:.1f}s"
+        )
+        self.logger.info(
+            f"📈 Cursos: {self.vazao['cursos_processados']} em "
+            f"{self.vazao['duracao']:.1f}s "
+            f"({self.vazao['cursos_por_segundo']:.2f} cursos/s, "
+            f"{self.vazao['workers_ocupados']:.1f} workers ocupados em média), "
+            f"aguardaram a listagem por {self.vazao['espera_por_paginas']:.1f}s"
+        )
+
+    def _registrar_curso_concluido(self, curso: Dict, registro: Dict):
+        """
+        💾 Registra um curso concluído: arquivo parcial e IDs.
+
+        Args:
+            curso: Dados brutos do curso (da busca)
+            registro: Registro enxuto gerado para o curso
+        """
+        self._escritor_parcial.escrever([registro])
+        self._contabilizar_registro(registro)
+
+        id_curso = curso.get("co_seq_curso")
+        if id_curso:
+            self.cursos_concluidos.add(str(id_curso))
+
+    def _contabilizar_registro(self, registro: Dict):
+        """Conta as linhas da visão plana de um registro."""
+        # Linhas planas antigas (retomada de coletas anteriores) valem uma
+        if "ofertas" in registro:
+            self.total_registros += max(1, len(registro["ofertas"]))
+        else:
+            self.total_registros += 1
+
+    @staticmethod
+    def _normalizar_id(valor) -> str:
+        """Normaliza IDs lidos de JSON/CSV (int, float ou texto) para texto."""
+        if valor is None or (isinstance(valor, float) and valor != valor):
+            return ""
+        if isinstance(valor, float) and valor.is_integer():
+            return str(int(valor))
+        return str(valor).strip()
+
+    def _carregar_snapshot_anterior(self, caminho: str = None) -> Dict[str, Dict]:
+        """
+        📂 Indexa a última coleta salva para o modo incremental.
+
+        Args:
+            caminho: Arquivo JSON Lines/JSON/CSV de referência (padrão: o
+                mais recente em data/)
+
+        Returns:
+            Dicionário id_curso -> status, status_ordem, registros e ofertas
+            encerradas reaproveitáveis
+        """
+        if caminho is None:
+            candidatos = [
+                f
+                for f in os.listdir("data")
+                if f.startswith("unasus_database_geral_")
+                and f.endswith(tuple(PREFERENCIA_REFERENCIA))
+            ]
+            if not candidatos:
+                self.logger.warning(
+                    "⚠️ Nenhuma coleta anterior encontrada. Executando coleta completa."
+                )
+                return {}
+            # Mais recente pelo timestamp do nome; JSON Lines preferido
+            candidatos.sort(
+                key=lambda f: (
+                    f.split(".", 1)[0],
+                    PREFERENCIA_REFERENCIA.index("." + f.split(".", 1)[1]),
+                )
+            )
+            caminho = os.path.join("data", candidatos[-1])
+
+        self.logger.info(f"♻️ Coleta de referência (incremental): {caminho}")
+        registros = self.carregar_dados_existentes(caminho)
+
+        indice = {}
+        for registro in registros:
+            # Valores vazios do CSV (NaN) e IDs numéricos voltam ao formato
+            # gravado pela coleta
+            registro = {
+                campo: "" if isinstance(valor, float) and pd.isna(valor) else valor
+                for campo, valor in registro.items()
+            }
+            for campo in ("id_oferta", "codigo_oferta", "vagas"):
+                if campo in registro:
+                    registro[campo] = self._normalizar_id(registro[campo])
+
+            id_curso = self._normalizar_id(registro.get("co_seq_curso"))
+            if not id_curso:
+                continue
+
+            entrada = indice.setdefault(
+                id_curso,
+                {
+                    "status": registro.get("status"),
+                    "status_ordem": self._normalizar_id(registro.get("status_ordem")),
+                    "registros": [],
+                    "ofertas_encerradas": {},
+                },
+            )
+            entrada["registros"].append(registro)
+
+            # Ofertas de curso encerrado não mudam mais: podem ser reaproveitadas
+            id_oferta = registro.get("id_oferta")
+            if (
+                id_oferta
+                and entrada["status"] == STATUS_ENCERRADO
+                and not registro.get("erro")
+            ):
+                entrada["ofertas_encerradas"][id_oferta] = {
+                    campo: registro[campo]
+                    for campo in CAMPOS_OFERTA
+                    if campo in registro
+                }
+
+        self.logger.info(f"♻️ {len(indice)} cursos indexados da coleta anterior")
+        return indice
+
+    def _reaproveitar_curso(self, curso: Dict) -> Dict:
+        """
+        ♻️ Retorna o registro da coleta anterior se o curso não mudou.
+
+        Um curso é reaproveitado quando continua encerrado com o mesmo status
+        e ordem: uma oferta nova o faria voltar a "com oferta aberta".
+
+        Args:
+            curso: Dados brutos do curso (da busca)
+
+        Returns:
+            Registro reaproveitado ou None se o curso precisa ser buscado
+        """
+        anterior = self.snapshot_anterior.get(
+            self._normalizar_id(curso.get("co_seq_curso"))
+        )
+        if (
+            not anterior
+            or curso.get("status") != STATUS_ENCERRADO
+            or anterior["status"] != curso.get("status")
+            or anterior["status_ordem"]
+            != self._normalizar_id(curso.get("status_ordem"))
+        ):
+            return None
+
+        with self._lock_estatisticas:
+            self.estatisticas_incremental["cursos_reaproveitados"] += 1
+
+        # Campos da listagem atual prevalecem sobre os da coleta anterior
+        return separar_registro_plano(
+            [{**registro, **curso} for registro in anterior["registros"]]
+        )
+
+    def _processar_curso_completo(self, curso: Dict, pagina: int = None) -> Dict:
+        """
+        🔧 Processa um curso e suas ofertas no modelo enxuto.
+
+        Os campos do curso são gravados uma única vez; cada oferta guarda só
+        os próprios campos (ver ``scrapers.registros``).
+
+        Args:
+            curso: Dados brutos do curso
+            pagina: Página da listagem em que o curso apareceu
+
+        Returns:
+            Registro do curso com a lista ``ofertas``
+        """
+        pagina = pagina or self.pagina_atual
+        if self.snapshot_anterior:
+            registro = self._reaproveitar_curso(curso)
+            if registro is not None:
+                registro["pagina_coleta"] = pagina
+                return registro
+
+        # Criar cópia completa dos dados originais
+        curso_processado = curso.copy()
+        curso_processado["pagina_coleta"] = pagina
 
         # Normalizar campos numéricos
-        campos_numericos = ["vagas", "numero_vagas", "qt_vagas", "vagas_disponiveis"]
-        for campo in campos_numericos:
+        for campo in CAMPOS_VAGAS:
             if campo in curso_processado:
                 try:
                     valor = curso_processado[campo]
@@ -354,73 +919,23 @@ class ColetorDatabaseGeral:
                 if not valor or valor == "":
                     curso_processado[campo] = None
 
-                # Extrair ofertas do curso
+        # Extrair ofertas do curso
         id_curso = curso_processado.get("co_seq_curso", "")
-        registros = []
-
-        if id_curso:
-            ofertas = self._extrair_ofertas_do_curso(id_curso)
-            self.logger.info(f"📊 Curso {id_curso}: {len(ofertas)} ofertas encontradas")
-
-            # Criar um registro para cada oferta
-            for oferta in ofertas:
-                registro_oferta = curso_processado.copy()
-                registro_oferta.update(oferta)
-                registros.append(registro_oferta)
-
-            # Se não há ofertas, criar pelo menos um registro do curso
-            if not ofertas:
-                registro_curso = curso_processado.copy()
-                registro_curso.update(
-                    {"id_oferta": "", "erro": "Sem ofertas encontradas"}
-                )
-                registros.append(registro_curso)
-
-            # Pausa para não sobrecarregar o servidor
-            time.sleep(2)
-        else:
-            # Se não há ID do curso, criar um registro básico
-            registro_curso = curso_processado.copy()
-            registro_curso.update(
-                {"id_oferta": "", "erro": "ID do curso não encontrado"}
-            )
-            registros.append(registro_curso)
+        if not id_curso:
             self.logger.warning(
                 "⚠️ ID do curso não encontrado para extração de ofertas"
             )
+            return registro_curso(curso_processado, [], "ID do curso não encontrado")
 
-        # Adicionar campos processados se não existirem
-        for registro in registros:
-            if "campos_processados" not in registro:
-                registro["campos_processados"] = {
-                    "id": registro.get("co_seq_curso", ""),
-                    "titulo": registro.get("no_curso", ""),
-                    "descricao": registro.get("ds_curso", ""),
-                    "carga_horaria": registro.get("qt_carga_horaria_total", 0),
-                    "categoria": registro.get("no_formato", ""),
-                    "publico_alvo": registro.get("publico_alvo", ""),
-                    "palavras_chave": registro.get("palavras_chave", ""),
-                    "link": (
-                        f"https://www.unasus.gov.br/cursos/curso/"
-                        f"{registro.get('co_seq_curso', '')}"
-                    ),
-                    "vagas": registro.get("vagas", 0),
-                    "numero_vagas": registro.get("numero_vagas", 0),
-                    "qt_vagas": registro.get("qt_vagas", 0),
-                    "nivel": registro.get("no_nivel", ""),
-                    "area_tematica": registro.get("area_tematica", ""),
-                    "instituicao": registro.get("no_orgao", ""),
-                    "coordenador": registro.get("coordenador", ""),
-                    "tutores": registro.get("tutores", ""),
-                    "certificacao": registro.get("certificacao", ""),
-                    "pre_requisitos": registro.get("pre_requisitos", ""),
-                    "objetivos": registro.get("objetivos", ""),
-                    "metodologia": registro.get("metodologia", ""),
-                    "avaliacao": registro.get("avaliacao", ""),
-                    "bibliografia": registro.get("bibliografia", ""),
-                }
+        ofertas = self._extrair_ofertas_do_curso(id_curso)
+        self.logger.info(f"📊 Curso {id_curso}: {len(ofertas)} ofertas encontradas")
 
-        return registros
+        # Sem ofertas, o curso continua registrado (com o motivo)
+        return registro_curso(
+            curso_processado,
+            ofertas,
+            None if ofertas else "Sem ofertas encontradas",
+        )
 
     def _extrair_ofertas_do_curso(self, id_curso: str) -> List[Dict]:
         """
@@ -437,7 +952,7 @@ class ColetorDatabaseGeral:
 
         try:
             self.logger.info(f"🔍 Buscando ofertas do curso {id_curso}...")
-            resp = requests.get(url_curso, headers=self.headers, timeout=30)
+            resp = self.cliente.get(url_curso, headers=self.headers, timeout=30)
 
             if resp.status_code != 200:
                 self.logger.warning(
@@ -446,24 +961,42 @@ class ColetorDatabaseGeral:
                 return []
 
             soup = BeautifulSoup(resp.text, "html.parser")
+            self.textos.salvar(
+                id_curso, {"texto_pagina_inicial": extrair_texto_visivel(soup)}
+            )
 
-            # Buscar links de ofertas
-            for link in soup.find_all("a", href=True):
-                href = link["href"]
-
-                # Verifica diferentes padrões de URL de oferta
-                if any(
-                    pattern in href
-                    for pattern in ["/cursos/oferta/", "../oferta/", "oferta/"]
-                ):
-                    # Extrai o ID da oferta do final da URL
-                    id_oferta = href.split("/")[-1]
-                    if id_oferta.isdigit():
-                        oferta_data = self._extrair_dados_oferta(id_oferta)
-                        if oferta_data:
-                            oferta_data["id_curso"] = id_curso
-                            ofertas.append(oferta_data)
-                            self.logger.info(f"  ✅ Oferta encontrada: {id_oferta}")
+            ids_oferta = self._ids_ofertas(soup)
+
+            # Ofertas já encerradas na coleta anterior não são buscadas de novo
+            anterior = self.snapshot_anterior.get(self._normalizar_id(id_curso), {})
+            encerradas = anterior.get("ofertas_encerradas", {})
+            a_buscar = [i for i in ids_oferta if i not in encerradas]
+            if self.snapshot_anterior:
+                with self._lock_estatisticas:
+                    estatisticas = self.estatisticas_incremental
+                    estatisticas["ofertas_reaproveitadas"] += len(ids_oferta) - len(
+                        a_buscar
+                    )
+                    estatisticas["ofertas_buscadas"] += len(a_buscar)
+
+            # Buscar os detalhes das ofertas em paralelo (ordem preservada);
+            # ofertas já buscadas nesta coleta vêm do registro
+            buscadas = iter(
+                self._executor_ofertas.map(
+                    self.registro_ofertas.obter,
+                    a_buscar,
+                    repeat(id_curso),
+                    repeat(self._extrair_dados_oferta),
+                )
+            )
+            for id_oferta in ids_oferta:
+                if id_oferta in encerradas:
+                    oferta_data = dict(encerradas[id_oferta])
+                else:
+                    oferta_data = next(buscadas)
+                if oferta_data:
+                    ofertas.append(oferta_data)
+                    self.logger.info(f"  ✅ Oferta encontrada: {id_oferta}")
 
             self.logger.info(
                 f"📊 Total de ofertas encontradas para curso {id_curso}: {len(ofertas)}"
@@ -474,6 +1007,32 @@ class ColetorDatabaseGeral:
             self.logger.error(f"❌ Erro ao extrair ofertas do curso {id_curso}: {e}")
             return []
 
+    @staticmethod
+    def _ids_ofertas(soup: BeautifulSoup) -> List[str]:
+        """
+        🔗 Lista os IDs das ofertas linkadas na página do curso.
+
+        Args:
+            soup: Página do curso
+
+        Returns:
+            IDs das ofertas, cada um uma única vez, na ordem da página
+        """
+        ids_oferta = []
+        for link in soup.find_all("a", href=True):
+            href = link["href"]
+
+            # Verifica diferentes padrões de URL de oferta
+            if any(
+                pattern in href
+                for pattern in ["/cursos/oferta/", "../oferta/", "oferta/"]
+            ):
+                # Extrai o ID da oferta do final da URL
+                id_oferta = href.split("/")[-1]
+                if id_oferta.isdigit():
+                    ids_oferta.append(id_oferta)
+        return list(dict.fromkeys(ids_oferta))
+
     def _extrair_dados_oferta(self, id_oferta: str) -> Dict:
         """
         🔍 Extrai dados de uma oferta específica.
@@ -505,7 +1064,7 @@ class ColetorDatabaseGeral:
             }
 
             try:
-                resp_api = requests.get(url_api, headers=api_headers, timeout=30)
+                resp_api = self.cliente.get(url_api, headers=api_headers, timeout=30)
                 if resp_api.status_code == 200:
                     response_data = resp_api.json()
                     self.logger.info("    ✅ Dados obtidos via API REST")
@@ -566,7 +1125,7 @@ class ColetorDatabaseGeral:
 
             # Fallback: tentar extrair da página HTML
             self.logger.info("    🔄 Tentando extração da página HTML...")
-            resp = requests.get(url_oferta, headers=self.headers, timeout=30)
+            resp = self.cliente.get(url_oferta, headers=self.headers, timeout=30)
             soup = BeautifulSoup(resp.text, "html.parser")
 
             # Buscar o div principal com os dados da oferta
@@ -643,86 +1202,313 @@ class ColetorDatabaseGeral:
             )
             return {"id_oferta": id_oferta, "erro": str(e)}
 
-    def _salvar_checkpoint(self, pagina_atual: int):
+    def _salvar_checkpoint(
+        self, pagina_atual: int, proximo, status: str = "em_andamento"
+    ):
         """
-        💾 Salva checkpoint da coleta.
+        💾 Salva checkpoint da coleta com o estado completo do cursor.
+
+        O arquivo da execução é sobrescrito de forma atômica, de modo que
+        sempre exista um checkpoint íntegro para a retomada. O checkpoint
+        tem tamanho fixo: os cursos concluídos são lidos do arquivo parcial
+        na retomada e as ofertas já buscadas ficam no registro de ofertas.
 
         Args:
-            pagina_atual: Página atual sendo processada
+            pagina_atual: Última página concluída
+            proximo: Cursor ``proximo`` da página seguinte (None ao final)
+            status: "em_andamento" ou "concluida"
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Tudo que o checkpoint referencia precisa estar no disco antes dele
+        self._escritor_parcial.sincronizar()
+
         checkpoint_data = {
             "timestamp": datetime.now().isoformat(),
+            "id_execucao": self.id_execucao,
+            "status": status,
             "pagina_atual": pagina_atual,
-            "cursos_coletados": len(self.dados_coletados),
+            "proximo": proximo,
+            "cursos_coletados": self.total_registros,
+            "arquivo_parcial": self.caminho_parcial,
             "versao_coletor": "1.0.0",
             "tipo_coleta": "database_geral",
         }
 
-        checkpoint_path = (
-            f"checkpoints/coleta_database_geral_checkpoint_{timestamp}.json"
+        temporario = f"{self.caminho_checkpoint}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(checkpoint_data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.caminho_checkpoint)
+
+        self.logger.info(f"💾 Checkpoint salvo: {self.caminho_checkpoint}")
+
+    def _carregar_checkpoint(self) -> Dict:
+        """
+        📂 Localiza o checkpoint em andamento mais recente.
+
+        Checkpoints antigos (sem cursor) e coletas concluídas são ignorados.
+
+        Returns:
+            Dados do checkpoint ou None
+        """
+        candidatos = [
+            os.path.join("checkpoints", f)
+            for f in os.listdir("checkpoints")
+            if f.startswith("coleta_database_geral_checkpoint_") and f.endswith(".json")
+        ]
+        candidatos.sort(key=os.path.getmtime, reverse=True)
+
+        for caminho in candidatos:
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    checkpoint = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"⚠️ Checkpoint ilegível {caminho}: {e}")
+                continue
+
+            if "proximo" in checkpoint and checkpoint.get("status") == "em_andamento":
+                checkpoint["caminho"] = caminho
+                return checkpoint
+
+        return None
+
+    def _retomar_de_checkpoint(self, checkpoint: Dict) -> int:
+        """
+        🔄 Restaura o estado da coleta a partir de um checkpoint.
+
+        Os cursos concluídos vêm do arquivo parcial, inclusive os gravados
+        após o último checkpoint, para que nenhum curso seja buscado
+        novamente; ofertas já buscadas com sucesso são reaproveitadas pelo
+        registro de ofertas.
+
+        Args:
+            checkpoint: Dados retornados por ``_carregar_checkpoint``
+
+        Returns:
+            Índice (base 0) da página a ser buscada
+        """
+        self.id_execucao = checkpoint["id_execucao"]
+        self.caminho_checkpoint = checkpoint["caminho"]
+        self.caminho_parcial = checkpoint["arquivo_parcial"]
+        self.registro_ofertas.coleta = self.id_execucao
+        # Checkpoints antigos ainda trazem a lista de cursos concluídos
+        self.cursos_concluidos = set(checkpoint.get("cursos_concluidos", []))
+
+        if os.path.exists(self.caminho_parcial):
+            reparar_jsonl(self.caminho_parcial)
+            for registro in ler_jsonl(self.caminho_parcial):
+                if registro.get("co_seq_curso"):
+                    self.cursos_concluidos.add(str(registro["co_seq_curso"]))
+                self._contabilizar_registro(registro)
+
+        self.logger.info(
+            f"🔄 Retomando coleta {self.id_execucao} na página "
+            f"{checkpoint['pagina_atual'] + 1}: {len(self.cursos_concluidos)} cursos "
+            f"e {self.total_registros} registros já coletados"
         )
-        with open(checkpoint_path, "w", encoding="utf-8") as f:
-            json.dump(checkpoint_data, f, ensure_ascii=False, indent=2)
+        return checkpoint["pagina_atual"]
 
-        self.logger.info(f"💾 Checkpoint salvo: {checkpoint_path}")
+    def _metadados_coleta(self) -> Dict:
+        """
+        Metadados da execução, gravados uma única vez por snapshot.
 
-    def _salvar_dados_completos(self):
+        Returns:
+            Dicionário com execução, horários, versão e tipo da coleta
         """
-        💾 Salva dados completos em múltiplos formatos.
+        return {
+            "id_execucao": self.id_execucao,
+            "inicio_coleta": self.inicio_coleta,
+            "fim_coleta": datetime.now().isoformat(),
+            "versao_coletor": "1.0.0",
+            "tipo_coleta": "database_geral_sem_filtros",
+            "localizacao": "diretorio_raiz",
+            "total_registros": self.total_registros,
+        }
+
+    def _salvar_dados_completos(self, concluida: bool = True):
         """
-        if not self.dados_coletados:
+        💾 Salva a coleta: JSON Lines comprimido (referência do modo
+        incremental) e snapshot Parquet lido pelas análises. CSV/Excel só
+        quando pedidos em ``exportar`` (ou CSV quando o pyarrow não está
+        instalado).
+
+        Os registros já estão no arquivo parcial, gravado durante a coleta:
+        ao final ele só é renomeado, e a visão plana é montada e gravada
+        lote a lote, sem carregar a coleta inteira.
+
+        Args:
+            concluida: False quando a coleta foi interrompida por erro: o
+                arquivo parcial só é fechado e fica no lugar para a
+                retomada, sem snapshot, exportações nem relatório (que
+                seriam tomados pela última coleta completa)
+        """
+        if not self.total_registros:
             self.logger.warning("⚠️ Nenhum dado para salvar")
             return
 
+        # Fecha o fluxo comprimido (grava o buffer e o final do gzip)
+        if self._escritor_parcial is not None:
+            self._escritor_parcial.fechar()
+
+        if not concluida:
+            self.caminho_dados = self.caminho_parcial
+            self.logger.info(
+                f"💾 Coleta incompleta mantida para retomada: {self.caminho_parcial}"
+            )
+            return
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        jsonl_path = f"data/unasus_database_geral_{timestamp}.jsonl.gz"
+        os.replace(self.caminho_parcial, jsonl_path)
+        self.caminho_dados = jsonl_path
+        arquivos = {"jsonl": jsonl_path}
 
-        # Salvar em JSON
-        json_path = f"data/unasus_database_geral_{timestamp}.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(self.dados_coletados, f, ensure_ascii=False, indent=2)
+        self.logger.info(f"💾 Dados salvos em JSON Lines: {jsonl_path}")
 
-        self.logger.info(f"💾 Dados salvos em JSON: {json_path}")
+        estatisticas = EstatisticasColunas(CAMPOS_VAGAS)
+        lotes = self._lotes_visao_plana(jsonl_path, estatisticas)
+        if pyarrow_disponivel():
+            self._gravar_snapshot(lotes, timestamp, arquivos)
+        else:
+            self._gravar_csv(lotes, timestamp, arquivos)
 
-        # Salvar em CSV
-        csv_path = f"data/unasus_database_geral_{timestamp}.csv"
-        df = pd.DataFrame(self.dados_coletados)
-        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        for formato, caminho in arquivos.items():
+            if formato in ("csv", "excel"):
+                self.logger.info(f"💾 Dados exportados em {formato.upper()}: {caminho}")
+
+        # Gerar relatório de coleta
+        self._gerar_relatorio_coleta(timestamp, arquivos, estatisticas)
+
+    def _lotes_visao_plana(
+        self, caminho: str, estatisticas: EstatisticasColunas = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Visão plana da coleta gravada, lote a lote.
 
-        self.logger.info(f"💾 Dados salvos em CSV: {csv_path}")
+        Args:
+            caminho: Arquivo JSON Lines da coleta
+            estatisticas: Estatísticas do relatório, somadas a cada lote
 
-        # Salvar em Excel (opcional)
+        Yields:
+            DataFrame de cada lote (uma linha por oferta)
+        """
+        for lote in ler_jsonl_em_lotes(caminho):
+            dados = visao_plana(lote)
+            if estatisticas is not None:
+                estatisticas.adicionar(dados)
+            yield dados
+
+    def _gravar_snapshot(
+        self, lotes: Iterable[pd.DataFrame], timestamp: str, arquivos: Dict[str, str]
+    ):
+        """
+        💾 Grava o snapshot Parquet lote a lote e as exportações pedidas.
+
+        Args:
+            lotes: Visão plana da coleta em lotes
+            timestamp: Timestamp da coleta
+            arquivos: Arquivos gravados (formato -> caminho), atualizado
+        """
+        # Esquema fixo para todos os lotes, lido dos registros sem montá-los
+        escritor = EscritorSnapshot(
+            timestamp,
+            tipos_visao_plana(ler_jsonl(self.caminho_dados)),
+            metadados=self._metadados_coleta(),
+        )
         try:
-            excel_path = f"data/unasus_database_geral_{timestamp}.xlsx"
-            df.to_excel(excel_path, index=False)
-            self.logger.info(f"💾 Dados salvos em Excel: {excel_path}")
+            for dados in lotes:
+                escritor.escrever(dados)
+        except Exception:
+            escritor.descartar()
+            raise
+        snapshot_path = escritor.fechar()
+        arquivos["parquet"] = snapshot_path
+        self.logger.info(f"💾 Snapshot salvo em Parquet: {snapshot_path}")
+
+        # Exportações sob demanda a partir do snapshot
+        try:
+            if self.formatos_exportacao:
+                arquivos.update(
+                    exportar_snapshot(snapshot_path, self.formatos_exportacao)
+                )
         except ImportError:
-            self.logger.info("ℹ️ openpyxl não instalado. Pulando salvamento Excel.")
+            self.logger.info("ℹ️ openpyxl não instalado. Pulando exportação Excel.")
 
-        # Gerar relatório de coleta
-        self._gerar_relatorio_coleta(timestamp)
+    def _gravar_csv(
+        self, lotes: Iterable[pd.DataFrame], timestamp: str, arquivos: Dict[str, str]
+    ):
+        """
+        💾 Grava a coleta em CSV, anexando lote a lote (sem pyarrow).
+
+        Args:
+            lotes: Visão plana da coleta em lotes
+            timestamp: Timestamp da coleta
+            arquivos: Arquivos gravados (formato -> caminho), atualizado
+        """
+        self.logger.info("ℹ️ pyarrow não instalado. Salvando CSV no lugar do Parquet.")
 
-    def _gerar_relatorio_coleta(self, timestamp: str):
+        csv_path = f"data/unasus_database_geral_{timestamp}.csv"
+        escritor = EscritorCSVIncremental(csv_path)
+        for dados in lotes:
+            dados = dados.astype(object)
+            escritor.escrever_lote(dados.where(dados.notna(), None).to_dict("records"))
+        arquivos["csv"] = csv_path
+
+        if "xlsx" in self.formatos_exportacao:
+            # O Excel não é gravado em fluxo: lê o CSV de uma vez
+            try:
+                excel_path = f"data/unasus_database_geral_{timestamp}.xlsx"
+                pd.read_csv(csv_path, encoding="utf-8-sig").to_excel(
+                    excel_path, index=False
+                )
+                arquivos["excel"] = excel_path
+            except ImportError:
+                self.logger.info("ℹ️ openpyxl não instalado. Pulando salvamento Excel.")
+
+    def _gerar_relatorio_coleta(
+        self,
+        timestamp: str,
+        arquivos: Dict[str, str] = None,
+        estatisticas: EstatisticasColunas = None,
+    ):
         """
         📊 Gera relatório detalhado da coleta.
 
+        As estatísticas são calculadas por coluna sobre a visão plana
+        (uma linha por oferta), somadas lote a lote.
+
         Args:
             timestamp: Timestamp da coleta
+            arquivos: Arquivos gravados (formato -> caminho)
+            estatisticas: Estatísticas já somadas (padrão: calculadas a
+                partir do arquivo gravado)
         """
+        if estatisticas is None:
+            estatisticas = EstatisticasColunas(CAMPOS_VAGAS)
+            if self.caminho_dados:
+                for _ in self._lotes_visao_plana(self.caminho_dados, estatisticas):
+                    pass
+
+        total_linhas = estatisticas.linhas
+        vagas = estatisticas.numericos
+
         relatorio = {
             "resumo_geral": {
-                "total_cursos": len(self.dados_coletados),
+                "total_cursos": self.total_registros,
                 "timestamp_coleta": datetime.now().isoformat(),
                 "versao_coletor": "1.0.0",
                 "tipo_coleta": "database_geral_sem_filtros",
                 "localizacao": "diretorio_raiz",
             },
             "estatisticas": {
-                "campos_disponiveis": (
-                    list(self.dados_coletados[0].keys()) if self.dados_coletados else []
-                ),
-                "campos_preenchidos": {},
-                "percentual_preenchimento": {},
+                "campos_disponiveis": list(estatisticas.tipos),
+                "campos_preenchidos": estatisticas.preenchidos,
+                "percentual_preenchimento": {
+                    campo: (quantidade / total_linhas) * 100 if total_linhas else 0
+                    for campo, quantidade in estatisticas.preenchidos.items()
+                },
+                "tipos_por_campo": estatisticas.tipos,
+                "bytes_por_campo": estatisticas.bytes,
                 "vagas_estatisticas": {
                     "total_vagas": 0,
                     "media_vagas": 0,
@@ -732,45 +1518,27 @@ class ColetorDatabaseGeral:
                     "percentual_preenchido": 0,
                 },
             },
-            "arquivos_gerados": {
-                "json": f"data/unasus_database_geral_{timestamp}.json",
-                "csv": f"data/unasus_database_geral_{timestamp}.csv",
-                "excel": f"data/unasus_database_geral_{timestamp}.xlsx",
+            "arquivos_gerados": arquivos
+            or {"jsonl": f"data/unasus_database_geral_{timestamp}.jsonl.gz"},
+            "bytes_arquivos": {
+                formato: os.path.getsize(caminho)
+                for formato, caminho in (arquivos or {}).items()
+                if os.path.exists(caminho)
             },
+            "metadados_coleta": self._metadados_coleta(),
+            "vazao_etapas": self.vazao,
+            "registro_ofertas": self.registro_ofertas.estatisticas(),
         }
 
-        # Calcular estatísticas de preenchimento
-        if self.dados_coletados:
-            for campo in self.dados_coletados[0].keys():
-                preenchidos = sum(
-                    1 for curso in self.dados_coletados if curso.get(campo)
-                )
-                relatorio["estatisticas"]["campos_preenchidos"][campo] = preenchidos
-                relatorio["estatisticas"]["percentual_preenchimento"][campo] = (
-                    preenchidos / len(self.dados_coletados)
-                ) * 100
-
-            # Calcular estatísticas de vagas
-            vagas_campos = ["vagas", "numero_vagas", "qt_vagas", "vagas_disponiveis"]
-            vagas_valores = []
-            for curso in self.dados_coletados:
-                for campo in vagas_campos:
-                    valor = curso.get(campo, 0)
-                    if isinstance(valor, (int, float)) and valor > 0:
-                        vagas_valores.append(valor)
-
-            if vagas_valores:
-                relatorio["estatisticas"]["vagas_estatisticas"] = {
-                    "total_vagas": sum(vagas_valores),
-                    "media_vagas": sum(vagas_valores) / len(vagas_valores),
-                    "min_vagas": min(vagas_valores),
-                    "max_vagas": max(vagas_valores),
-                    "cursos_com_vagas": len(vagas_valores),
-                    "percentual_preenchido": (
-                        len(vagas_valores) / len(self.dados_coletados)
-                    )
-                    * 100,
-                }
+        if vagas["quantidade"]:
+            relatorio["estatisticas"]["vagas_estatisticas"] = {
+                "total_vagas": vagas["soma"],
+                "media_vagas": vagas["soma"] / vagas["quantidade"],
+                "min_vagas": vagas["minimo"],
+                "max_vagas": vagas["maximo"],
+                "cursos_com_vagas": vagas["quantidade"],
+                "percentual_preenchido": (vagas["quantidade"] / total_linhas) * 100,
+            }
 
         # Salvar relatório
         relatorio_path = f"data/relatorio_coleta_database_geral_{timestamp}.json"
@@ -789,25 +1557,33 @@ class ColetorDatabaseGeral:
         print(f"⏰ Timestamp: {relatorio['resumo_geral']['timestamp_coleta']}")
         print(f"📁 Localização: {relatorio['resumo_geral']['localizacao']}")
         print(f"💾 Arquivos gerados:")
-        print(f"   - JSON: {relatorio['arquivos_gerados']['json']}")
-        print(f"   - CSV: {relatorio['arquivos_gerados']['csv']}")
-        if "excel" in relatorio["arquivos_gerados"]:
-            print(f"   - Excel: {relatorio['arquivos_gerados']['excel']}")
+        for formato, caminho in relatorio["arquivos_gerados"].items():
+            print(f"   - {formato.upper()}: {caminho}")
         print("=" * 60)
 
-    def carregar_dados_existentes(self, caminho_arquivo: str) -> List[Dict]:
+    def carregar_dados_existentes(self, caminho_arquivo: str) -> Iterable[Dict]:
         """
         📂 Carrega dados existentes de arquivo.
 
+        Arquivos JSON Lines (.jsonl ou .jsonl.gz) são lidos de forma
+        preguiçosa e devolvidos na visão plana (uma linha por oferta).
+
         Args:
             caminho_arquivo: Caminho para o arquivo de dados
 
         Returns:
-            Lista de dados carregados
+            Registros carregados
         """
         if not os.path.exists(caminho_arquivo):
             raise FileNotFoundError(f"Arquivo não encontrado: {caminho_arquivo}")
 
+        if caminho_arquivo.lower().endswith((".jsonl", ".jsonl.gz")):
+            return (
+                linha
+                for registro in ler_jsonl(caminho_arquivo)
+                for linha in linhas_planas(registro)
+            )
+
         extensao = caminho_arquivo.lower().split(".")[-1]
 
         if extensao == "json":
@@ -828,10 +1604,58 @@ class ColetorDatabaseGeral:
             raise ValueError(f"Formato não suportado: {extensao}")
 
 
-def main():
+def main(argv: List[str] = None):
     """
     🚀 Função principal para execução do coletor.
+
+    Args:
+        argv: Argumentos de linha de comando (padrão: sys.argv)
     """
+    parser = argparse.ArgumentParser(description="Coletor Database Geral UNA-SUS")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Número máximo de requisições simultâneas (padrão: 8)",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=4.0,
+        help="Orçamento global de requisições por segundo (padrão: 4.0)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma a última coleta interrompida a partir do checkpoint",
+    )
+    adicionar_opcoes_transporte(parser)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Busca apenas cursos novos/alterados e ofertas abertas",
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Coleta de referência do modo incremental (padrão: a mais recente)",
+    )
+    parser.add_argument(
+        "--exportar",
+        nargs="+",
+        choices=["csv", "xlsx"],
+        default=[],
+        help="Exporta também para CSV/Excel (o snapshot Parquet é sempre gravado)",
+    )
+    parser.add_argument(
+        "--paginas-antecipadas",
+        type=int,
+        default=PAGINAS_ANTECIPADAS,
+        help="Páginas da listagem buscadas à frente dos cursos "
+        f"(padrão: {PAGINAS_ANTECIPADAS})",
+    )
+    args = parser.parse_args(argv)
+
     print("🚀 COLETOR DATABASE GERAL UNA-SUS")
     print("=" * 50)
     print("📋 Este script coleta TODOS os dados UNA-SUS sem filtros")
@@ -841,14 +1665,24 @@ def main():
 
     try:
         # Inicializar coletor
-        coletor = ColetorDatabaseGeral()
+        coletor = ColetorDatabaseGeral(
+            max_workers=args.workers,
+            requisicoes_por_segundo=0 if args.reproduzir else args.rps,
+            cache_ttl_horas=args.cache_ttl,
+            gravar=args.gravar,
+            reproduzir=args.reproduzir,
+            exportar=args.exportar,
+            paginas_antecipadas=args.paginas_antecipadas,
+        )
 
         # Executar coleta
-        dados = coletor.coletar_dados_completos()
+        coletor.coletar_dados_completos(
+            retomar=args.resume, incremental=args.incremental, snapshot=args.snapshot
+        )
 
         print(f"\n✅ COLETA FINALIZADA COM SUCESSO!")
-        print(f"📊 Total de cursos coletados: {len(dados)}")
-        print(f"💾 Dados salvos em: data/")
+        print(f"📊 Total de cursos coletados: {coletor.total_registros}")
+        print(f"💾 Dados salvos em: {coletor.caminho_dados}")
 
     except Exception as e:
         print(f"\n❌ ERRO NA COLETA: {str(e)}")
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de Execução - Reclassificação DEIA Offline
+=================================================
+
+Refaz a classificação DEIA de um snapshot ou CSV já coletado, sem acessar
+o portal. Exemplo:
+
+    python run_reclassificar_deia.py data/unasus_database_geral_<ts>.csv \\
+        --descritores descritores.txt --processos 4
+"""
+
+import os
+import sys
+
+# Adicionar src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from scrapers.reclassificacao import main
+
+if __name__ == "__main__":
+    print("🏷️ Executando Reclassificação DEIA UNA-SUS...")
+    main()
@@ -7,6 +7,7 @@ Script de Execução - Scraper Melhorado UNA-SUS
 Script simples para executar o scraper melhorado.
 """
 
+import argparse
 import os
 import sys
 
@@ -14,7 +15,12 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
 from scrapers.enhanced import main
+from scrapers.gravacao import adicionar_opcoes_transporte
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraper Melhorado UNA-SUS")
+    adicionar_opcoes_transporte(parser)
+    args = parser.parse_args()
+
     print("🕷️ Executando Scraper Melhorado UNA-SUS...")
-    main()
+    main(gravar=args.gravar, reproduzir=args.reproduzir, cache_ttl_horas=args.cache_ttl)
@@ -4,26 +4,180 @@
 DATABASE COMPLETO UNA-SUS
 ========================
 
-Sistema de database que mantém TODOS os dados originais em uma estrutura completa,
-sem separação em tabelas, preservando a visão geral dos dados.
+Sistema de database que mantém TODOS os dados originais, normalizados em
+instituições, cursos e ofertas, com a visão ``dados_completos`` preservando
+a visão geral dos dados (uma linha por oferta).
 """
 
 import json
 import logging
 import os
+import re
 import sqlite3
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 
 import pandas as pd
 
+# Pragmas de cada conexão: WAL permite ler durante a carga, synchronous
+# NORMAL basta com WAL e o cache de 64 MB evita releituras do disco
+PRAGMAS = [
+    "journal_mode = WAL",
+    "synchronous = NORMAL",
+    "cache_size = -64000",
+    "temp_store = MEMORY",
+    "foreign_keys = ON",
+]
+
+# Registros por lote na exportação (memória constante)
+TAMANHO_LOTE_EXPORTACAO = 10000
+
+COLUNAS_INSTITUICAO = ["co_seq_orgao", "sg_orgao", "no_orgao"]
+
+# Colunas que formam as chaves das tabelas normalizadas
+COLUNAS_CHAVE = ["co_seq_curso", "co_seq_orgao", "id_oferta"]
+
+COLUNAS_CURSO = [
+    "co_seq_curso",
+    "no_curso",
+    "qt_carga_horaria_total",
+    "co_seq_orgao",
+    "no_formato",
+    "no_nivel",
+    "no_modalidade",
+    "ds_imagem",
+    "status",
+    "status_ordem",
+    "rank",
+    "tem_deia",
+    "deia_encontrado",
+]
+
+COLUNAS_OFERTA = [
+    "co_seq_curso",
+    "id_oferta",
+    "url_oferta",
+    "codigo_oferta",
+    "vagas",
+    "publico_alvo",
+    "local_oferta",
+    "formato",
+    "programas_governo",
+    "temas",
+    "decs",
+    "descricao_oferta",
+    "palavras_chave",
+]
+
+
+# Campos de texto indexados na busca textual (um documento por curso, com
+# os textos distintos de todas as suas ofertas)
+COLUNAS_BUSCA = [
+    "no_curso",
+    "descricao_oferta",
+    "publico_alvo",
+    "temas",
+    "palavras_chave",
+]
+
+# Pesos do bm25 por campo de COLUNAS_BUSCA (o nome do curso pesa mais)
+PESOS_BUSCA = [10.0, 1.0, 1.0, 3.0, 3.0]
+
+# Colunas da visão dados_completos (ordem da antiga tabela única)
+COLUNAS_DADOS_COMPLETOS = [
+    "co_seq_curso",
+    "no_curso",
+    "qt_carga_horaria_total",
+    "co_seq_orgao",
+    "sg_orgao",
+    "no_orgao",
+    "no_formato",
+    "no_nivel",
+    "no_modalidade",
+    "ds_imagem",
+    "status",
+    "status_ordem",
+    "rank",
+    "tem_deia",
+    "deia_encontrado",
+    "id_oferta",
+    "url_oferta",
+    "codigo_oferta",
+    "vagas",
+    "publico_alvo",
+    "local_oferta",
+    "formato",
+    "programas_governo",
+    "temas",
+    "decs",
+    "descricao_oferta",
+    "palavras_chave",
+]
+
+
+def _sql_upsert(tabela: str, colunas: List[str], chave: List[str]) -> str:
+    """
+    Monta o INSERT ... ON CONFLICT que só regrava linhas alteradas.
+
+    Args:
+        tabela: Tabela de destino
+        colunas: Colunas inseridas
+        chave: Colunas da chave primária
+
+    Returns:
+        Comando SQL com um parâmetro por coluna
+    """
+    valores = [coluna for coluna in colunas if coluna not in chave]
+    sql = (
+        f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+        f"VALUES ({', '.join('?' for _ in colunas)}) "
+        f"ON CONFLICT ({', '.join(chave)}) DO "
+    )
+    if not valores:
+        return sql + "NOTHING"
+
+    atribuicoes = ", ".join(f"{coluna} = excluded.{coluna}" for coluna in valores)
+    alteradas = " OR ".join(
+        f"{tabela}.{coluna} IS NOT excluded.{coluna}" for coluna in valores
+    )
+    return (
+        sql + f"UPDATE SET {atribuicoes}, updated_at = CURRENT_TIMESTAMP "
+        f"WHERE {alteradas}"
+    )
+
+
+def _valor_sql(valor):
+    """Converte valores do pandas (NaN, floats inteiros, numpy) para o SQLite."""
+    if valor is None or (isinstance(valor, float) and valor != valor):
+        return None
+    if hasattr(valor, "item"):
+        valor = valor.item()
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _chave_sql(valor):
+    """Texto vazio em coluna de chave (cursos sem oferta) conta como ausente."""
+    if isinstance(valor, str) and not valor.strip():
+        return None
+    return valor
+
+
+def _consulta_fts(texto: str) -> str:
+    """
+    Converte texto livre em uma consulta FTS5 segura: cada palavra vira um
+    termo entre aspas com busca por prefixo, todos obrigatórios.
+    """
+    return " ".join(f'"{palavra}"*' for palavra in re.findall(r"\w+", texto))
+
 
 class DatabaseCompleto:
     """
     Sistema de database completo para dados UNA-SUS.
 
-    Mantém todos os dados originais em uma estrutura única,
-    preservando a visão geral e facilitando análises.
+    Mantém todos os dados originais em tabelas normalizadas, com uma
+    visão única que preserva a visão geral e facilita análises.
     """
 
     def __init__(self, db_path: str = "database_completo.db"):
@@ -35,6 +189,7 @@ class DatabaseCompleto:
         """
         self.db_path = db_path
         self.logger = self._configurar_logger()
+        self.busca_disponivel = False
 
         # Criar diretório se não existir
         os.makedirs(
@@ -51,24 +206,58 @@ class DatabaseCompleto:
         )
         return logging.getLogger(__name__)
 
+    def _conectar(self) -> sqlite3.Connection:
+        """
+        Abre uma conexão com os pragmas de carga e as chaves estrangeiras.
+
+        Returns:
+            Conexão SQLite
+        """
+        conn = sqlite3.connect(self.db_path)
+        for pragma in PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
     def _criar_tabela_completa(self):
-        """Cria uma tabela única com todos os dados."""
+        """
+        Cria o esquema normalizado (instituições, cursos e ofertas) e a
+        visão ``dados_completos`` com uma linha por oferta, como a antiga
+        tabela única.
+        """
         self.logger.info("🔧 Criando tabela completa...")
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conectar() as conn:
             cursor = conn.cursor()
 
-            # Tabela única com todos os campos originais
+            # Tabela única de versões anteriores: vira a visão de compatibilidade
+            cursor.execute(
+                "SELECT type FROM sqlite_master WHERE name = 'dados_completos'"
+            )
+            legado = cursor.fetchone()
+            if legado and legado[0] == "table":
+                cursor.execute(
+                    "ALTER TABLE dados_completos RENAME TO dados_completos_legado"
+                )
+
             cursor.execute(
                 """
-                CREATE TABLE IF NOT EXISTS dados_completos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    co_seq_curso INTEGER,
-                    no_curso TEXT,
-                    qt_carga_horaria_total INTEGER,
-                    co_seq_orgao INTEGER,
+                CREATE TABLE IF NOT EXISTS instituicoes (
+                    co_seq_orgao INTEGER PRIMARY KEY,
                     sg_orgao TEXT,
                     no_orgao TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cursos (
+                    co_seq_curso INTEGER PRIMARY KEY,
+                    no_curso TEXT,
+                    qt_carga_horaria_total INTEGER,
+                    co_seq_orgao INTEGER REFERENCES instituicoes(co_seq_orgao),
                     no_formato TEXT,
                     no_nivel TEXT,
                     no_modalidade TEXT,
@@ -78,7 +267,18 @@ class DatabaseCompleto:
                     rank INTEGER,
                     tem_deia TEXT,
                     deia_encontrado TEXT,
-                    id_oferta INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ofertas (
+                    co_seq_curso INTEGER NOT NULL
+                        REFERENCES cursos(co_seq_curso) ON DELETE CASCADE,
+                    id_oferta INTEGER NOT NULL,
                     url_oferta TEXT,
                     codigo_oferta TEXT,
                     vagas INTEGER,
@@ -91,7 +291,8 @@ class DatabaseCompleto:
                     descricao_oferta TEXT,
                     palavras_chave TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (co_seq_curso, id_oferta)
                 )
             """
             )
@@ -111,64 +312,390 @@ class DatabaseCompleto:
 
             # Índices para melhor performance
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_curso ON dados_completos(co_seq_curso)"
+                "CREATE INDEX IF NOT EXISTS idx_cursos_orgao ON cursos(co_seq_orgao)"
             )
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_orgao ON dados_completos(co_seq_orgao)"
+                "CREATE INDEX IF NOT EXISTS idx_cursos_status ON cursos(status)"
             )
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_status ON dados_completos(status)"
+                "CREATE INDEX IF NOT EXISTS idx_cursos_modalidade "
+                "ON cursos(no_modalidade)"
             )
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_modalidade ON dados_completos(no_modalidade)"
+                "CREATE INDEX IF NOT EXISTS idx_ofertas_oferta ON ofertas(id_oferta)"
+            )
+            # Índice de cobertura dos resumos por instituição e por curso: os
+            # agregados leem só o índice, sem as linhas largas de cursos
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_cursos_resumo ON cursos(
+                    co_seq_orgao, status, tem_deia, qt_carga_horaria_total,
+                    no_modalidade, no_curso
+                )
+            """
+            )
+
+            # Visão com uma linha por oferta (cursos sem oferta: uma linha),
+            # com as colunas da antiga tabela única
+            origem = {coluna: "o" for coluna in COLUNAS_OFERTA}
+            origem.update({coluna: "i" for coluna in COLUNAS_INSTITUICAO})
+            origem.update({coluna: "c" for coluna in COLUNAS_CURSO})
+            selecao = ",\n".join(
+                f"{origem[coluna]}.{coluna}" for coluna in COLUNAS_DADOS_COMPLETOS
+            )
+            cursor.execute(
+                f"""
+                CREATE VIEW IF NOT EXISTS dados_completos AS
+                SELECT
+                    {selecao},
+                    COALESCE(o.created_at, c.created_at) AS created_at,
+                    COALESCE(o.updated_at, c.updated_at) AS updated_at
+                FROM cursos c
+                LEFT JOIN instituicoes i ON i.co_seq_orgao = c.co_seq_orgao
+                LEFT JOIN ofertas o ON o.co_seq_curso = c.co_seq_curso
+            """
             )
 
+            self._criar_indice_busca(conn)
+
+            if legado and legado[0] == "table":
+                self._migrar_tabela_legada(conn)
+            self._atualizar_busca(conn)
+
             conn.commit()
             self.logger.info("✅ Tabela completa criada com sucesso!")
 
+    def _criar_indice_busca(self, conn: sqlite3.Connection):
+        """
+        Cria o índice de busca textual (FTS5) e os gatilhos que marcam os
+        cursos a reindexar sempre que um curso ou oferta muda.
+
+        A tokenização ignora acentos ("saude" encontra "Saúde"). Sem FTS5
+        no SQLite a busca fica desativada e o restante funciona normalmente.
+
+        Args:
+            conn: Conexão com o database
+        """
+        existia = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'busca_cursos'"
+        ).fetchone()
+        try:
+            conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS busca_cursos USING fts5(
+                    {", ".join(COLUNAS_BUSCA)},
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """
+            )
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"⚠️ Busca textual indisponível (FTS5): {e}")
+            return
+
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS busca_pendentes (
+                co_seq_curso INTEGER PRIMARY KEY
+            )
+        """
+        )
+        for tabela in ("cursos", "ofertas"):
+            for evento, linha in (
+                ("INSERT", "NEW"),
+                ("UPDATE", "NEW"),
+                ("DELETE", "OLD"),
+            ):
+                conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS
+                        busca_{tabela}_{evento.lower()}
+                    AFTER {evento} ON {tabela}
+                    BEGIN
+                        INSERT OR IGNORE INTO busca_pendentes
+                        VALUES ({linha}.co_seq_curso);
+                    END
+                """
+                )
+
+        # Índice novo em um database já populado: indexar todos os cursos
+        if not existia:
+            conn.execute(
+                "INSERT OR IGNORE INTO busca_pendentes SELECT co_seq_curso FROM cursos"
+            )
+        self.busca_disponivel = True
+
+    def _atualizar_busca(self, conn: sqlite3.Connection) -> int:
+        """
+        Reindexa os cursos marcados pelos gatilhos desde a última atualização.
+
+        Args:
+            conn: Conexão (a transação é confirmada por quem chama)
+
+        Returns:
+            Quantidade de cursos reindexados
+        """
+        if not self.busca_disponivel:
+            return 0
+
+        pendentes = conn.execute("SELECT COUNT(*) FROM busca_pendentes").fetchone()[0]
+        if not pendentes:
+            return 0
+
+        campos_oferta = ",\n".join(
+            f"group_concat(DISTINCT o.{coluna})" for coluna in COLUNAS_BUSCA[1:]
+        )
+        conn.execute(
+            """
+            DELETE FROM busca_cursos
+            WHERE rowid IN (SELECT co_seq_curso FROM busca_pendentes)
+        """
+        )
+        conn.execute(
+            f"""
+            INSERT INTO busca_cursos (rowid, {", ".join(COLUNAS_BUSCA)})
+            SELECT
+                c.co_seq_curso,
+                c.no_curso,
+                {campos_oferta}
+            FROM cursos c
+            LEFT JOIN ofertas o ON o.co_seq_curso = c.co_seq_curso
+            WHERE c.co_seq_curso IN (SELECT co_seq_curso FROM busca_pendentes)
+            GROUP BY c.co_seq_curso
+        """
+        )
+        conn.execute("DELETE FROM busca_pendentes")
+        self.logger.info(f"🔎 Índice de busca atualizado: {pendentes} cursos")
+        return pendentes
+
+    def buscar(
+        self, texto: str, limite: int = 20, sintaxe_fts: bool = False
+    ) -> List[Dict]:
+        """
+        Busca cursos por assunto no índice textual, do mais ao menos
+        relevante.
+
+        Consulta só o SQLite (sem carregar DataFrame). Por padrão cada
+        palavra do texto precisa aparecer em algum campo, como prefixo e
+        sem diferenciar acentos ou maiúsculas.
+
+        Args:
+            texto: Termos procurados (ex.: "saude mental")
+            limite: Quantidade máxima de resultados
+            sintaxe_fts: Usa ``texto`` como expressão FTS5 (OR, NEAR,
+                aspas, ``coluna:termo``...)
+
+        Returns:
+            Lista de cursos com co_seq_curso, no_curso, no_orgao, status,
+            total_ofertas, trecho (com os termos entre colchetes) e
+            relevancia (bm25; menor é mais relevante)
+        """
+        if not self.busca_disponivel:
+            self.logger.warning("⚠️ Busca textual indisponível neste SQLite")
+            return []
+
+        consulta = texto if sintaxe_fts else _consulta_fts(texto)
+        if not consulta:
+            return []
+
+        with self._conectar() as conn:
+            conn.row_factory = sqlite3.Row
+            linhas = conn.execute(
+                f"""
+                SELECT
+                    c.co_seq_curso,
+                    c.no_curso,
+                    i.no_orgao,
+                    c.status,
+                    (
+                        SELECT COUNT(*) FROM ofertas o
+                        WHERE o.co_seq_curso = c.co_seq_curso
+                    ) AS total_ofertas,
+                    snippet(busca_cursos, -1, '[', ']', '…', 12) AS trecho,
+                    bm25(busca_cursos, {", ".join(map(str, PESOS_BUSCA))})
+                        AS relevancia
+                FROM busca_cursos
+                JOIN cursos c ON c.co_seq_curso = busca_cursos.rowid
+                LEFT JOIN instituicoes i ON i.co_seq_orgao = c.co_seq_orgao
+                WHERE busca_cursos MATCH ?
+                ORDER BY relevancia
+                LIMIT ?
+            """,
+                (consulta, limite),
+            ).fetchall()
+
+        return [dict(linha) for linha in linhas]
+
+    def _migrar_tabela_legada(self, conn: sqlite3.Connection):
+        """Move os dados da antiga tabela única para o esquema normalizado."""
+        df = pd.read_sql_query("SELECT * FROM dados_completos_legado", conn)
+        self.logger.info(f"🔄 Migrando {len(df)} registros da tabela única...")
+        self._upsert(df, conn)
+        conn.execute("DROP TABLE dados_completos_legado")
+
+    def _ler_dados(self, origem: Union[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Lê os registros da coleta na visão plana (uma linha por oferta).
+
+        Args:
+            origem: DataFrame, snapshot Parquet, JSON Lines (.jsonl ou
+                .jsonl.gz, registros enxutos ou planos) ou CSV
+
+        Returns:
+            DataFrame com nulos como None (tipos aceitos pelo SQLite)
+        """
+        if isinstance(origem, pd.DataFrame):
+            df = origem
+        elif origem.endswith(".parquet"):
+            df = pd.read_parquet(origem)
+        elif origem.endswith((".jsonl", ".jsonl.gz")):
+            from scrapers.persistencia import ler_jsonl_em_lotes
+            from scrapers.registros import visao_plana
+
+            lotes = [visao_plana(lote) for lote in ler_jsonl_em_lotes(origem)]
+            df = pd.concat(lotes, ignore_index=True) if lotes else pd.DataFrame()
+        else:
+            df = pd.read_csv(origem)
+
+        # Categorias e tipos anuláveis do snapshot viram valores Python
+        df = df.astype(object)
+        return df.where(df.notna(), None)
+
     def carregar_dados_completos(
-        self, arquivo_csv: str = "unasus_ofertas_detalhadas.csv"
+        self, origem: Union[str, pd.DataFrame] = "unasus_ofertas_detalhadas.csv"
     ):
         """
-        Carrega todos os dados originais para o database.
+        Carrega os dados para o database de forma incremental.
+
+        Cursos, instituições e ofertas são inseridos ou atualizados pela
+        chave (``co_seq_curso``, ``id_oferta``), em uma única transação;
+        linhas sem alteração não são regravadas. As ofertas que deixaram de
+        existir nos cursos do arquivo são removidas.
 
         Args:
-            arquivo_csv: Caminho para o arquivo CSV
+            origem: DataFrame ou caminho do snapshot Parquet, JSON Lines da
+                coleta ou CSV
         """
-        if not os.path.exists(arquivo_csv):
-            self.logger.error(f"❌ Arquivo {arquivo_csv} não encontrado!")
+        if not isinstance(origem, pd.DataFrame) and not os.path.exists(origem):
+            self.logger.error(f"❌ Arquivo {origem} não encontrado!")
             return False
 
-        self.logger.info(f"📁 Carregando dados completos de: {arquivo_csv}")
+        if not isinstance(origem, pd.DataFrame):
+            self.logger.info(f"📁 Carregando dados completos de: {origem}")
 
         try:
-            # Carregar CSV original
-            df = pd.read_csv(arquivo_csv)
+            df = self._ler_dados(origem)
             self.logger.info(f"📊 {len(df)} registros carregados")
 
-            with sqlite3.connect(self.db_path) as conn:
-                # Limpar tabela existente
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM dados_completos")
-
-                # Inserir todos os dados
-                df.to_sql("dados_completos", conn, if_exists="append", index=False)
+            with self._conectar() as conn:
+                resultado = self._upsert(df, conn)
+                self._atualizar_busca(conn)
+                # Estatísticas para o planejador escolher os índices
+                conn.execute("PRAGMA optimize")
 
                 # Registrar log
                 self._registrar_log(
-                    "CARGA_COMPLETA",
-                    f"Dados completos carregados: {len(df)} registros",
+                    "CARGA_INCREMENTAL",
+                    f"Dados completos carregados: {len(df)} registros "
+                    f"({resultado['inseridos']} novos, "
+                    f"{resultado['atualizados']} atualizados, "
+                    f"{resultado['removidos']} ofertas removidas)",
                     len(df),
                     conn,
                 )
 
-            self.logger.info("✅ Dados completos carregados com sucesso!")
+            self.logger.info(
+                f"✅ Dados completos carregados com sucesso! "
+                f"{resultado['inseridos']} novos, "
+                f"{resultado['atualizados']} atualizados, "
+                f"{resultado['removidos']} ofertas removidas"
+            )
             return True
 
         except Exception as e:
             self.logger.error(f"❌ Erro ao carregar dados: {e}")
             return False
 
+    def _upsert(self, df: pd.DataFrame, conn: sqlite3.Connection) -> Dict[str, int]:
+        """
+        Insere ou atualiza os registros de um DataFrame (uma linha por
+        oferta) nas tabelas normalizadas.
+
+        Args:
+            df: Registros no formato da coleta
+            conn: Conexão (a transação é confirmada por quem chama)
+
+        Returns:
+            Contagens de linhas inseridas, atualizadas e ofertas removidas
+        """
+        resultado = {"inseridos": 0, "atualizados": 0, "removidos": 0}
+        if "co_seq_curso" not in df.columns:
+            raise ValueError("Coluna co_seq_curso ausente")
+
+        # A visão plana grava id_oferta "" nos cursos sem oferta: sem isso
+        # cada um deles viraria uma oferta falsa
+        chaves = [c for c in COLUNAS_CHAVE if c in df.columns]
+        df = df.assign(**{coluna: df[coluna].map(_chave_sql) for coluna in chaves})
+        df = df[df["co_seq_curso"].notna()]
+        tabelas = [
+            ("instituicoes", COLUNAS_INSTITUICAO, ["co_seq_orgao"]),
+            ("cursos", COLUNAS_CURSO, ["co_seq_curso"]),
+            ("ofertas", COLUNAS_OFERTA, ["co_seq_curso", "id_oferta"]),
+        ]
+
+        for tabela, colunas, chave in tabelas:
+            colunas = [coluna for coluna in colunas if coluna in df.columns]
+            if not set(chave) <= set(colunas):
+                continue
+
+            linhas = (
+                df[colunas]
+                .dropna(subset=chave)
+                .drop_duplicates(subset=chave, keep="last")
+            )
+            antes = conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+            cursor = conn.executemany(
+                _sql_upsert(tabela, colunas, chave),
+                (
+                    tuple(_valor_sql(valor) for valor in linha)
+                    for linha in linhas.itertuples(index=False, name=None)
+                ),
+            )
+            depois = conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+            resultado["inseridos"] += depois - antes
+            resultado["atualizados"] += max(cursor.rowcount, 0) - (depois - antes)
+
+        # Ofertas que sumiram dos cursos presentes no arquivo
+        if "id_oferta" in df.columns:
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS _carga "
+                "(co_seq_curso INTEGER, id_oferta INTEGER)"
+            )
+            conn.execute("DELETE FROM _carga")
+            conn.executemany(
+                "INSERT INTO _carga VALUES (?, ?)",
+                (
+                    tuple(_valor_sql(valor) for valor in linha)
+                    for linha in df[["co_seq_curso", "id_oferta"]].itertuples(
+                        index=False, name=None
+                    )
+                ),
+            )
+            cursor = conn.execute(
+                """
+                DELETE FROM ofertas
+                WHERE co_seq_curso IN (SELECT co_seq_curso FROM _carga)
+                AND NOT EXISTS (
+                    SELECT 1 FROM _carga k
+                    WHERE k.co_seq_curso = ofertas.co_seq_curso
+                    AND k.id_oferta = ofertas.id_oferta
+                )
+            """
+            )
+            resultado["removidos"] = cursor.rowcount
+            conn.execute("DROP TABLE _carga")
+
+        return resultado
+
     def _registrar_log(
         self, tipo: str, mensagem: str, registros: int, conn: sqlite3.Connection
     ):
@@ -248,104 +775,207 @@ class DatabaseCompleto:
             return stats
 
     def exportar_dados_completos(
-        self, formato: str = "csv", diretorio: str = "exports"
+        self,
+        formato: str = "csv",
+        diretorio: str = "exports",
+        tamanho_lote: Optional[int] = TAMANHO_LOTE_EXPORTACAO,
     ):
         """
         Exporta todos os dados completos.
 
+        Os registros são lidos e gravados em lotes, com memória constante
+        qualquer que seja o tamanho do database; o resumo e as análises são
+        calculados por consultas agregadas no próprio SQLite.
+
         Args:
             formato: Formato de exportação (csv, json)
             diretorio: Diretório de destino
+            tamanho_lote: Registros por lote (None lê tudo de uma vez)
         """
+        if formato not in ("csv", "json"):
+            raise ValueError(f"Formato não suportado: {formato}")
+
         os.makedirs(diretorio, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        with sqlite3.connect(self.db_path) as conn:
-            # Carregar todos os dados
-            df = pd.read_sql_query("SELECT * FROM dados_completos", conn)
+        with self._conectar() as conn:
+            lotes = pd.read_sql_query(
+                "SELECT * FROM dados_completos", conn, chunksize=tamanho_lote
+            )
+            if tamanho_lote is None:
+                lotes = [lotes]
 
-            if formato == "csv":
-                arquivo = f"{diretorio}/database_completo_{timestamp}.csv"
-                df.to_csv(arquivo, index=False, encoding="utf-8-sig")
-            elif formato == "json":
-                arquivo = f"{diretorio}/database_completo_{timestamp}.json"
-                df.to_json(arquivo, orient="records", force_ascii=False, indent=2)
+            arquivo = f"{diretorio}/database_completo_{timestamp}.{formato}"
+            self._gravar_lotes(lotes, arquivo, formato)
 
             self.logger.info(f"📤 Database completo exportado: {arquivo}")
 
             # Criar resumo estruturado
-            self._criar_resumo_completo(df, diretorio, timestamp)
+            self._criar_resumo_completo(conn, diretorio, timestamp)
 
-    def _criar_resumo_completo(self, df: pd.DataFrame, diretorio: str, timestamp: str):
+    def _gravar_lotes(self, lotes: Iterable[pd.DataFrame], arquivo: str, formato: str):
+        """
+        Grava os lotes em um único arquivo, no mesmo formato de
+        ``to_csv``/``to_json(orient="records", indent=2)`` da tabela inteira.
+
+        Args:
+            lotes: DataFrames com as colunas de dados_completos
+            arquivo: Arquivo de destino
+            formato: csv ou json
+        """
+        if formato == "csv":
+            with open(arquivo, "w", encoding="utf-8-sig", newline="") as f:
+                for numero, lote in enumerate(lotes):
+                    lote.to_csv(f, index=False, header=numero == 0)
+            return
+
+        with open(arquivo, "w", encoding="utf-8") as f:
+            f.write("[")
+            separador = ""
+            for lote in lotes:
+                # Registros do lote sem os colchetes da lista
+                registros = lote.to_json(
+                    orient="records", force_ascii=False, indent=2
+                )[1:-2]
+                if registros.strip():
+                    f.write(separador + registros)
+                    separador = ","
+            f.write("\n]")
+
+    def _contagem(self, conn: sqlite3.Connection, coluna: str) -> Dict:
+        """Equivalente SQL de ``value_counts()`` de uma coluna da visão."""
+        return dict(
+            conn.execute(
+                f"""
+                SELECT {coluna}, COUNT(*) AS total
+                FROM dados_completos
+                WHERE {coluna} IS NOT NULL
+                GROUP BY {coluna}
+                ORDER BY total DESC, {coluna}
+            """
+            ).fetchall()
+        )
+
+    def _criar_resumo_completo(
+        self, conn: sqlite3.Connection, diretorio: str, timestamp: str
+    ):
         """
         Cria um resumo completo dos dados.
 
         Args:
-            df: DataFrame com dados completos
+            conn: Conexão com o database
             diretorio: Diretório de destino
             timestamp: Timestamp para nome do arquivo
         """
         self.logger.info("📋 Criando resumo completo...")
 
+        colunas = [
+            linha[1]
+            for linha in conn.execute("PRAGMA table_info(dados_completos)")
+        ]
+        totais = conn.execute(
+            """
+            SELECT
+                COUNT(*),
+                COUNT(DISTINCT co_seq_curso),
+                COUNT(DISTINCT co_seq_orgao),
+                COUNT(DISTINCT id_oferta),
+                AVG(qt_carga_horaria_total),
+                MIN(qt_carga_horaria_total),
+                MAX(qt_carga_horaria_total),
+                COUNT(CASE WHEN tem_deia = 'Sim' THEN 1 END)
+            FROM dados_completos
+        """
+        ).fetchone()
+        (
+            total_registros,
+            total_cursos,
+            total_instituicoes,
+            total_ofertas,
+            carga_media,
+            carga_minima,
+            carga_maxima,
+            total_com_deia,
+        ) = totais
+
+        cursos_por_instituicao = conn.execute(
+            """
+            SELECT no_orgao, COUNT(DISTINCT co_seq_curso)
+            FROM dados_completos
+            WHERE no_orgao IS NOT NULL
+            GROUP BY no_orgao
+            ORDER BY no_orgao
+        """
+        ).fetchall()
+        distribuicao_carga = conn.execute(
+            """
+            SELECT qt_carga_horaria_total, COUNT(*) AS total
+            FROM dados_completos
+            WHERE qt_carga_horaria_total IS NOT NULL
+            GROUP BY qt_carga_horaria_total
+            ORDER BY total DESC, qt_carga_horaria_total
+            LIMIT 10
+        """
+        ).fetchall()
+        top_instituicoes = conn.execute(
+            """
+            SELECT
+                no_orgao,
+                COUNT(DISTINCT co_seq_curso) AS cursos,
+                COUNT(id_oferta) AS ofertas
+            FROM dados_completos
+            WHERE no_orgao IS NOT NULL
+            GROUP BY no_orgao
+            ORDER BY cursos DESC, no_orgao
+            LIMIT 10
+        """
+        ).fetchall()
+        top_cursos = conn.execute(
+            """
+            SELECT no_curso, COUNT(id_oferta) AS ofertas
+            FROM dados_completos
+            WHERE no_curso IS NOT NULL
+            GROUP BY no_curso
+            ORDER BY ofertas DESC, no_curso
+            LIMIT 10
+        """
+        ).fetchall()
+
         resumo = {
             "metadata": {
                 "timestamp": timestamp,
-                "total_registros": len(df),
-                "total_cursos": df["co_seq_curso"].nunique(),
-                "total_instituicoes": df["co_seq_orgao"].nunique(),
-                "total_ofertas": (
-                    df["id_oferta"].nunique() if "id_oferta" in df.columns else 0
-                ),
-                "campos_disponiveis": list(df.columns),
+                "total_registros": total_registros,
+                "total_cursos": total_cursos,
+                "total_instituicoes": total_instituicoes,
+                "total_ofertas": total_ofertas,
+                "campos_disponiveis": colunas,
             },
             "estatisticas_gerais": {
-                "ofertas_por_status": df["status"].value_counts().to_dict(),
-                "cursos_por_instituicao": df.groupby("no_orgao")["co_seq_curso"]
-                .nunique()
-                .to_dict(),
-                "modalidades": df["no_modalidade"].value_counts().to_dict(),
-                "niveis": (
-                    df["no_nivel"].value_counts().to_dict()
-                    if "no_nivel" in df.columns
-                    else {}
-                ),
-                "formatos": (
-                    df["no_formato"].value_counts().to_dict()
-                    if "no_formato" in df.columns
-                    else {}
-                ),
+                "ofertas_por_status": self._contagem(conn, "status"),
+                "cursos_por_instituicao": dict(cursos_por_instituicao),
+                "modalidades": self._contagem(conn, "no_modalidade"),
+                "niveis": self._contagem(conn, "no_nivel"),
+                "formatos": self._contagem(conn, "no_formato"),
             },
             "carga_horaria": {
-                "media": df["qt_carga_horaria_total"].mean(),
-                "minima": df["qt_carga_horaria_total"].min(),
-                "maxima": df["qt_carga_horaria_total"].max(),
-                "distribuicao": df["qt_carga_horaria_total"]
-                .value_counts()
-                .head(10)
-                .to_dict(),
+                "media": carga_media,
+                "minima": carga_minima,
+                "maxima": carga_maxima,
+                "distribuicao": dict(distribuicao_carga),
             },
             "deia": {
-                "total_com_deia": (
-                    df[df["tem_deia"] == "Sim"].shape[0]
-                    if "tem_deia" in df.columns
-                    else 0
-                ),
+                "total_com_deia": total_com_deia,
                 "percentual_deia": (
-                    (df[df["tem_deia"] == "Sim"].shape[0] / len(df) * 100)
-                    if "tem_deia" in df.columns
-                    else 0
+                    total_com_deia / total_registros * 100 if total_registros else 0
                 ),
             },
-            "top_instituicoes": df.groupby("no_orgao")
-            .agg({"co_seq_curso": "nunique", "id_oferta": "count"})
-            .sort_values("co_seq_curso", ascending=False)
-            .head(10)
-            .to_dict("index"),
-            "top_cursos": df.groupby("no_curso")
-            .agg({"id_oferta": "count"})
-            .sort_values("id_oferta", ascending=False)
-            .head(10)
-            .to_dict("index"),
+            "top_instituicoes": {
+                orgao: {"co_seq_curso": cursos, "id_oferta": ofertas}
+                for orgao, cursos, ofertas in top_instituicoes
+            },
+            "top_cursos": {
+                curso: {"id_oferta": ofertas} for curso, ofertas in top_cursos
+            },
         }
 
         # Salvar resumo em JSON
@@ -356,43 +986,38 @@ class DatabaseCompleto:
         self.logger.info(f"📤 Resumo completo salvo: {arquivo_resumo}")
 
         # Criar arquivos de análise específicos
-        self._criar_analises_especificas(df, diretorio, timestamp)
+        self._criar_analises_especificas(conn, diretorio, timestamp)
 
     def _criar_analises_especificas(
-        self, df: pd.DataFrame, diretorio: str, timestamp: str
+        self, conn: sqlite3.Connection, diretorio: str, timestamp: str
     ):
         """
         Cria análises específicas dos dados.
 
         Args:
-            df: DataFrame com dados completos
+            conn: Conexão com o database
             diretorio: Diretório de destino
             timestamp: Timestamp para nome do arquivo
         """
         self.logger.info("📊 Criando análises específicas...")
 
         # Análise por instituição
-        analise_instituicoes = (
-            df.groupby("no_orgao")
-            .agg(
-                {
-                    "co_seq_curso": "nunique",
-                    "id_oferta": "count",
-                    "qt_carga_horaria_total": "mean",
-                    "status": lambda x: (x == "com oferta aberta").sum(),
-                    "tem_deia": lambda x: (x == "Sim").sum(),
-                }
-            )
-            .rename(
-                columns={
-                    "co_seq_curso": "total_cursos",
-                    "id_oferta": "total_ofertas",
-                    "qt_carga_horaria_total": "carga_horaria_media",
-                    "status": "ofertas_abertas",
-                    "tem_deia": "cursos_com_deia",
-                }
-            )
-            .reset_index()
+        analise_instituicoes = pd.read_sql_query(
+            """
+            SELECT
+                no_orgao,
+                COUNT(DISTINCT co_seq_curso) AS total_cursos,
+                COUNT(id_oferta) AS total_ofertas,
+                AVG(qt_carga_horaria_total) AS carga_horaria_media,
+                COUNT(CASE WHEN status = 'com oferta aberta' THEN 1 END)
+                    AS ofertas_abertas,
+                COUNT(CASE WHEN tem_deia = 'Sim' THEN 1 END) AS cursos_com_deia
+            FROM dados_completos
+            WHERE no_orgao IS NOT NULL
+            GROUP BY no_orgao
+            ORDER BY no_orgao
+        """,
+            conn,
         )
 
         arquivo_instituicoes = f"{diretorio}/analise_instituicoes_{timestamp}.csv"
@@ -400,67 +1025,59 @@ class DatabaseCompleto:
             arquivo_instituicoes, index=False, encoding="utf-8-sig"
         )
 
-        # Análise por curso
-        analise_cursos = (
-            df.groupby(["no_curso", "no_orgao"])
-            .agg(
-                {
-                    "id_oferta": "count",
-                    "qt_carga_horaria_total": "first",
-                    "tem_deia": "first",
-                    "no_modalidade": "first",
-                    "status": lambda x: (x == "com oferta aberta").sum(),
-                }
-            )
-            .rename(
-                columns={
-                    "id_oferta": "total_ofertas",
-                    "qt_carga_horaria_total": "carga_horaria",
-                    "tem_deia": "tem_deia",
-                    "no_modalidade": "modalidade",
-                    "status": "ofertas_abertas",
-                }
+        # Análise por curso: carga horária, DEIA e modalidade são o primeiro
+        # valor preenchido do grupo na ordem da visão (co_seq_curso), como o
+        # "first" do pandas; cada coluna tem a sua própria numeração
+        analise_cursos = pd.read_sql_query(
+            """
+            WITH linhas AS (
+                SELECT
+                    no_curso,
+                    no_orgao,
+                    id_oferta,
+                    status,
+                    qt_carga_horaria_total,
+                    tem_deia,
+                    no_modalidade,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY no_curso, no_orgao
+                        ORDER BY qt_carga_horaria_total IS NULL, co_seq_curso
+                    ) AS ordem_carga,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY no_curso, no_orgao
+                        ORDER BY tem_deia IS NULL, co_seq_curso
+                    ) AS ordem_deia,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY no_curso, no_orgao
+                        ORDER BY no_modalidade IS NULL, co_seq_curso
+                    ) AS ordem_modalidade
+                FROM dados_completos
+                WHERE no_curso IS NOT NULL AND no_orgao IS NOT NULL
             )
-            .reset_index()
+            SELECT
+                no_curso,
+                no_orgao,
+                COUNT(id_oferta) AS total_ofertas,
+                MAX(CASE WHEN ordem_carga = 1 THEN qt_carga_horaria_total END)
+                    AS carga_horaria,
+                MAX(CASE WHEN ordem_deia = 1 THEN tem_deia END) AS tem_deia,
+                MAX(CASE WHEN ordem_modalidade = 1 THEN no_modalidade END)
+                    AS modalidade,
+                COUNT(CASE WHEN status = 'com oferta aberta' THEN 1 END)
+                    AS ofertas_abertas
+            FROM linhas
+            GROUP BY no_curso, no_orgao
+            ORDER BY no_curso, no_orgao
+        """,
+            conn,
         )
 
         arquivo_cursos = f"{diretorio}/analise_cursos_{timestamp}.csv"
         analise_cursos.to_csv(arquivo_cursos, index=False, encoding="utf-8-sig")
 
-        # Análise temporal (se houver datas)
-        if "dt_inicio_inscricao" in df.columns:
-            df_temporal = df.copy()
-            df_temporal["ano"] = pd.to_datetime(
-                df_temporal["dt_inicio_inscricao"], errors="coerce"
-            ).dt.year
-
-            analise_temporal = (
-                df_temporal.groupby("ano")
-                .agg(
-                    {
-                        "id_oferta": "count",
-                        "co_seq_curso": "nunique",
-                        "no_orgao": "nunique",
-                    }
-                )
-                .rename(
-                    columns={
-                        "id_oferta": "total_ofertas",
-                        "co_seq_curso": "total_cursos",
-                        "no_orgao": "total_instituicoes",
-                    }
-                )
-                .reset_index()
-            )
-
-            arquivo_temporal = f"{diretorio}/analise_temporal_{timestamp}.csv"
-            analise_temporal.to_csv(arquivo_temporal, index=False, encoding="utf-8-sig")
-
         self.logger.info(f"📤 Análises específicas criadas:")
         self.logger.info(f"   • {arquivo_instituicoes}")
         self.logger.info(f"   • {arquivo_cursos}")
-        if "dt_inicio_inscricao" in df.columns:
-            self.logger.info(f"   • {arquivo_temporal}")
 
 
 def main():
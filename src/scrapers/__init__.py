@@ -7,9 +7,41 @@ Scrapers - Módulos de Coleta de Dados UNA-SUS
 Módulos especializados para coleta de dados da plataforma UNA-SUS:
 - basic: Scraper básico (versão original)
 - enhanced: Scraper melhorado (versão avançada)
+- deia: Busca de descritores DEIA em vários campos e em lote
+- gravacao: Gravação e reprodução offline das respostas do portal
+- cache_http: Cache em disco das respostas HTTP
+- persistencia: Gravação incremental dos dados coletados
+- reclassificacao: Reclassificação DEIA offline, em paralelo
+- registro_ofertas: Registro global das ofertas buscadas em cada coleta
+- registros: Modelo enxuto dos registros (curso uma vez, ofertas à parte)
+- textos: Armazenamento comprimido dos textos dos cursos
 - utils: Utilitários para scraping
 """
 
-from . import basic, enhanced, utils
+from . import (
+    basic,
+    cache_http,
+    deia,
+    enhanced,
+    gravacao,
+    persistencia,
+    reclassificacao,
+    registro_ofertas,
+    registros,
+    textos,
+    utils,
+)
 
-__all__ = ["basic", "enhanced", "utils"]
+__all__ = [
+    "basic",
+    "cache_http",
+    "deia",
+    "enhanced",
+    "gravacao",
+    "persistencia",
+    "reclassificacao",
+    "registro_ofertas",
+    "registros",
+    "textos",
+    "utils",
+]
@@ -3,9 +3,13 @@ import re
 import time
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
+from .deia import obter_buscador
+from .gravacao import criar_adaptador, criar_cache
+from .persistencia import EscritorCSVIncremental
+from .utils import ClienteHTTP
+
 # Configurações da API (CORRIGIDAS)
 url = "https://www.unasus.gov.br/cursos/rest/busca"
 headers = {
@@ -34,6 +38,9 @@ cookies = {
 
 payload = {"busca": "", "ordenacao": "Por nome", "status": "Todos", "proximo": 0}
 
+# Sessão HTTP compartilhada (keep-alive + retentativas com backoff)
+cliente_http = ClienteHTTP()
+
 descritores = [
     "Diversidade, Equidade e Integração",
     "Diversidade, Equidade, Inclusão e Pertencimento",
@@ -51,10 +58,8 @@ descritores = [
 def encontrar_descritor(titulo, descricao, descritores):
     """Encontra descritores DEIA no título e descrição do curso."""
     texto = (titulo or "") + " " + (descricao or "")
-    for descritor in descritores:
-        if descritor.lower() in texto.lower():
-            return descritor
-    return ""
+    encontrados = obter_buscador(tuple(descritores)).encontrados(texto)
+    return encontrados[0] if encontrados else ""
 
 
 def extrair_ofertas_do_curso(id_curso):
@@ -62,7 +67,7 @@ def extrair_ofertas_do_curso(id_curso):
     url_curso = f"https://www.unasus.gov.br/cursos/curso/{id_curso}"
     try:
         print(f"Buscando ofertas do curso {id_curso}...")
-        resp = requests.get(url_curso, headers=headers, timeout=30)
+        resp = cliente_http.get(url_curso, headers=headers, timeout=30)
 
         if resp.status_code != 200:
             print(f"Erro HTTP {resp.status_code} ao acessar curso {id_curso}")
@@ -162,7 +167,7 @@ def buscar_ofertas_encerradas(soup, url_curso):
                 print(f"  🔍 Acessando ofertas encerradas: {url_encerradas}")
 
                 # Acessar a página de ofertas encerradas
-                resp_encerradas = requests.get(
+                resp_encerradas = cliente_http.get(
                     url_encerradas, headers=headers, timeout=30
                 )
                 if resp_encerradas.status_code == 200:
@@ -211,7 +216,7 @@ def extrair_dados_oferta(id_oferta):
 
         # Tentar API REST primeiro
         try:
-            resp_api = requests.get(url_api, headers=api_headers, timeout=30)
+            resp_api = cliente_http.get(url_api, headers=api_headers, timeout=30)
             if resp_api.status_code == 200:
                 response_data = resp_api.json()
                 print("    ✅ Dados obtidos via API REST")
@@ -270,7 +275,7 @@ def extrair_dados_oferta(id_oferta):
 
         # Fallback: tentar extrair da página HTML
         print("    🔄 Tentando extração da página HTML...")
-        resp = requests.get(url_oferta, headers=headers, timeout=30)
+        resp = cliente_http.get(url_oferta, headers=headers, timeout=30)
         soup = BeautifulSoup(resp.text, "html.parser")
 
         # Buscar o div principal com os dados da oferta
@@ -461,91 +466,129 @@ def carregar_ids_processados(csv_path):
         return set()
 
 
-# Loop principal do scraper
-todos_detalhes = []
-pagina = 0
-csv_path = "unasus_ofertas_detalhadas.csv"
-lote = 10  # Salva a cada 10 cursos
-cursos_processados = carregar_ids_processados(csv_path)
-print(f"Cursos já processados: {len(cursos_processados)}")
-print(f"Arquivo de saída: {csv_path}")
+def listar_cursos(payload_busca):
+    """
+    Percorre as páginas da busca, entregando os cursos de cada uma.
 
-while True:
-    try:
-        # CORREÇÃO: usar data=payload em vez de json=payload
-        resp = requests.post(
-            url,
-            data=payload,  # CORRIGIDO!
-            headers=headers,
-            cookies=cookies,  # CORRIGIDO!
-            timeout=30,
-        )
-        data = resp.json()
+    Falhas de conexão repetem a mesma página, com espera crescente.
+
+    Args:
+        payload_busca: Payload da busca (o cursor ``proximo`` é atualizado)
+
+    Yields:
+        Cursos da listagem, na ordem do portal
+    """
+    pagina = 0
+    falhas_consecutivas = 0
+    while True:
+        try:
+            # CORREÇÃO: usar data=payload em vez de json=payload
+            resp = cliente_http.post(
+                url,
+                data=payload_busca,  # CORRIGIDO!
+                headers=headers,
+                cookies=cookies,  # CORRIGIDO!
+                timeout=30,
+            )
+            data = resp.json()
+        except Exception as e:
+            falhas_consecutivas += 1
+            espera = cliente_http.calcular_espera(falhas_consecutivas)
+            print(
+                f"Erro de conexão: {e}. Tentando novamente em {espera:.1f} segundos..."
+            )
+            time.sleep(espera)
+            continue
+
+        falhas_consecutivas = 0
         itens = data.get("results", {}).get("itens", [])
         if not itens:
-            break
-        for curso in itens:
-            id_curso = (
-                curso.get("co_seq_curso")
-                or curso.get("id_curso")
-                or curso.get("co_curso")
-                or curso.get("id")
-            )
-            if not id_curso:
-                continue
-            id_curso_str = str(id_curso)
-            if id_curso_str in cursos_processados:
-                continue  # Pula cursos já processados
-            titulo = curso.get("no_curso", "")
-            descricao = curso.get("ds_curso", "")
-            encontrado = encontrar_descritor(titulo, descricao, descritores)
-            curso["tem_deia"] = "Sim" if encontrado else "Não"
-            curso["deia_encontrado"] = encontrado
-            ofertas = extrair_ofertas_do_curso(id_curso)
-            if not ofertas:
-                todos_detalhes.append(
-                    {**curso, "id_oferta": "", "erro": "Sem ofertas encontradas"}
-                )
-            for id_oferta in ofertas:
-                dados_oferta = extrair_dados_oferta(id_oferta)
-                linha = {**curso, **dados_oferta}
-                todos_detalhes.append(linha)
-                time.sleep(1)
-            cursos_processados.add(id_curso_str)
-            # Salvamento incremental
-            if len(todos_detalhes) >= lote:
-                if os.path.exists(csv_path):
-                    df_existente = pd.read_csv(csv_path, encoding="utf-8-sig")
-                    df_novo = pd.DataFrame(todos_detalhes)
-                    df_final = pd.concat([df_existente, df_novo], ignore_index=True)
-                else:
-                    df_final = pd.DataFrame(todos_detalhes)
-                df_final.to_csv(csv_path, index=False, encoding="utf-8-sig")
-                print(
-                    f"Progresso salvo após {len(cursos_processados)} cursos em {csv_path}"
-                )
-                todos_detalhes = []
+            return
+        yield from itens
         pagina += 1
         print(f"Página {pagina} processada.")
         proximo = data.get("results", {}).get("proximo")
         if not proximo:
-            break
-        payload["proximo"] = proximo
+            return
+        payload_busca["proximo"] = proximo
         time.sleep(1)
-    except Exception as e:
-        print(f"Erro de conexão: {e}. Tentando novamente em 30 segundos...")
-        time.sleep(30)
-        continue
 
-# Salva o restante
-if todos_detalhes:
-    if os.path.exists(csv_path):
-        df_existente = pd.read_csv(csv_path, encoding="utf-8-sig")
-        df_novo = pd.DataFrame(todos_detalhes)
-        df_final = pd.concat([df_existente, df_novo], ignore_index=True)
+
+def linhas_do_curso(curso, id_curso):
+    """
+    Monta as linhas de saída de um curso: uma por oferta.
+
+    Args:
+        curso: Curso da listagem
+        id_curso: ID do curso
+
+    Returns:
+        Linhas do curso (uma linha com erro se não houver ofertas)
+    """
+    titulo = curso.get("no_curso", "")
+    descricao = curso.get("ds_curso", "")
+    encontrado = encontrar_descritor(titulo, descricao, descritores)
+    curso["tem_deia"] = "Sim" if encontrado else "Não"
+    curso["deia_encontrado"] = encontrado
+    ofertas = extrair_ofertas_do_curso(id_curso)
+    if not ofertas:
+        return [{**curso, "id_oferta": "", "erro": "Sem ofertas encontradas"}]
+
+    linhas = []
+    for id_oferta in ofertas:
+        dados_oferta = extrair_dados_oferta(id_oferta)
+        linhas.append({**curso, **dados_oferta})
+        time.sleep(1)
+    return linhas
+
+
+def main(gravar: str = None, reproduzir: str = None, cache_ttl_horas: float = 0):
+    """
+    Loop principal do scraper básico.
+
+    Args:
+        gravar: Arquivo .jsonl onde gravar as respostas do portal
+        reproduzir: Arquivo .jsonl gravado para executar offline
+        cache_ttl_horas: Validade do cache HTTP em disco (0 desativa)
+    """
+    adaptador = criar_adaptador(gravar=gravar, reproduzir=reproduzir)
+    if adaptador:
+        cliente_http.usar_adaptador(adaptador)
+    cliente_http.cache = criar_cache(
+        cache_ttl_horas, gravar=gravar, reproduzir=reproduzir
+    )
+    todos_detalhes = []
+    csv_path = "unasus_ofertas_detalhadas.csv"
+    lote = 10  # Salva a cada 10 cursos
+    cursos_processados = carregar_ids_processados(csv_path)
+    escritor = EscritorCSVIncremental(csv_path)
+    print(f"Cursos já processados: {len(cursos_processados)}")
+    print(f"Arquivo de saída: {csv_path}")
+
+    for curso in listar_cursos(payload.copy()):
+        id_curso = (
+            curso.get("co_seq_curso")
+            or curso.get("id_curso")
+            or curso.get("co_curso")
+            or curso.get("id")
+        )
+        if not id_curso or str(id_curso) in cursos_processados:
+            continue  # Pula cursos sem ID ou já processados
+        todos_detalhes.extend(linhas_do_curso(curso, id_curso))
+        cursos_processados.add(str(id_curso))
+        # Salvamento incremental (anexa apenas o lote novo)
+        if len(todos_detalhes) >= lote:
+            escritor.escrever_lote(todos_detalhes)
+            print(f"Progresso salvo após {len(cursos_processados)} cursos")
+            todos_detalhes = []
+
+    # Salva o restante
+    if todos_detalhes:
+        escritor.escrever_lote(todos_detalhes)
+        print(f"Finalizado! Todos os dados salvos em {csv_path}")
     else:
-        df_final = pd.DataFrame(todos_detalhes)
-    df_final.to_csv(csv_path, index=False, encoding="utf-8-sig")
-    print(f"Finalizado! Todos os dados salvos em {csv_path}")
-else:
-    print("Nenhum dado detalhado coletado.")
+        print("Nenhum dado detalhado coletado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP - Cache em Disco das Respostas do Portal UNA-SUS
+===========================================================
+
+Cache de respostas GET por URL usado pelo ClienteHTTP:
+- Dentro do TTL a resposta é servida do disco, sem acessar a rede
+- Após o TTL a resposta é revalidada com If-None-Match/If-Modified-Since;
+  um 304 renova a entrada e devolve o corpo armazenado
+- O tamanho total é limitado, removendo as entradas menos usadas
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Cabeçalhos da resposta preservados junto com o corpo
+CABECALHOS_ARMAZENADOS = ["Content-Type", "ETag", "Last-Modified"]
+
+
+class CacheHTTP:
+    """
+    Cache de respostas HTTP em disco, seguro para uso entre threads.
+
+    Cada entrada ocupa dois arquivos: ``<chave>.body`` com o corpo bruto e
+    ``<chave>.json`` com status, cabeçalhos e horário de armazenamento.
+    """
+
+    def __init__(
+        self,
+        diretorio: str = "cache/http",
+        ttl: float = 24 * 3600,
+        tamanho_maximo: int = 500 * 1024 * 1024,
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            diretorio: Diretório das entradas (criado se não existir)
+            ttl: Segundos em que uma entrada é servida sem revalidação
+            tamanho_maximo: Limite em bytes para o total de corpos armazenados
+        """
+        self.diretorio = diretorio
+        self.ttl = ttl
+        self.tamanho_maximo = tamanho_maximo
+        self._lock = threading.Lock()
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._tamanho_total = sum(
+            entrada.stat().st_size
+            for entrada in os.scandir(self.diretorio)
+            if entrada.name.endswith(".body")
+        )
+
+    def _caminho(self, url: str, extensao: str) -> str:
+        """Caminho do arquivo da entrada de uma URL."""
+        chave = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.diretorio, f"{chave}.{extensao}")
+
+    def obter(self, url: str) -> Optional[Dict]:
+        """
+        Lê a entrada de uma URL.
+
+        Args:
+            url: URL completa (com query string)
+
+        Returns:
+            Metadados da entrada (com o corpo em ``conteudo``) ou None
+        """
+        caminho_meta = self._caminho(url, "json")
+        try:
+            with open(caminho_meta, "r", encoding="utf-8") as f:
+                entrada = json.load(f)
+            with open(self._caminho(url, "body"), "rb") as f:
+                entrada["conteudo"] = f.read()
+        except (OSError, ValueError):
+            return None
+
+        # Marca o uso para a remoção das entradas menos usadas
+        try:
+            os.utime(caminho_meta)
+        except OSError:
+            pass
+        return entrada
+
+    def fresca(self, entrada: Dict) -> bool:
+        """Indica se a entrada ainda está dentro do TTL."""
+        return time.time() - entrada["armazenado_em"] < self.ttl
+
+    @staticmethod
+    def validadores(entrada: Dict) -> Dict[str, str]:
+        """Cabeçalhos condicionais para revalidar a entrada."""
+        cabecalhos = {}
+        if entrada["headers"].get("ETag"):
+            cabecalhos["If-None-Match"] = entrada["headers"]["ETag"]
+        if entrada["headers"].get("Last-Modified"):
+            cabecalhos["If-Modified-Since"] = entrada["headers"]["Last-Modified"]
+        return cabecalhos
+
+    def armazenar(self, url: str, resp: requests.Response):
+        """
+        Armazena uma resposta 200.
+
+        Respostas com ``Cache-Control: no-store`` não são armazenadas.
+
+        Args:
+            url: URL completa (com query string)
+            resp: Resposta recebida
+        """
+        if "no-store" in resp.headers.get("Cache-Control", ""):
+            return
+
+        entrada = {
+            "url": url,
+            "status_code": resp.status_code,
+            "encoding": resp.encoding,
+            "headers": {
+                nome: resp.headers[nome]
+                for nome in CABECALHOS_ARMAZENADOS
+                if nome in resp.headers
+            },
+            "armazenado_em": time.time(),
+        }
+        conteudo = resp.content
+
+        caminho_corpo = self._caminho(url, "body")
+        with self._lock:
+            tamanho_anterior = (
+                os.path.getsize(caminho_corpo) if os.path.exists(caminho_corpo) else 0
+            )
+            self._gravar_atomico(caminho_corpo, conteudo)
+            self._gravar_atomico(
+                self._caminho(url, "json"),
+                json.dumps(entrada, ensure_ascii=False).encode("utf-8"),
+            )
+            self._tamanho_total += len(conteudo) - tamanho_anterior
+
+            if self._tamanho_total > self.tamanho_maximo:
+                self._remover_excedente()
+
+    def renovar(self, url: str, entrada: Dict):
+        """
+        Reinicia o TTL de uma entrada revalidada (resposta 304).
+
+        Args:
+            url: URL completa (com query string)
+            entrada: Entrada obtida por ``obter``
+        """
+        meta = {chave: valor for chave, valor in entrada.items() if chave != "conteudo"}
+        meta["armazenado_em"] = time.time()
+        with self._lock:
+            self._gravar_atomico(
+                self._caminho(url, "json"),
+                json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+            )
+
+    @staticmethod
+    def resposta(entrada: Dict) -> requests.Response:
+        """
+        Reconstrói um ``requests.Response`` a partir de uma entrada.
+
+        Args:
+            entrada: Entrada obtida por ``obter``
+
+        Returns:
+            Resposta equivalente à original, com ``from_cache = True``
+        """
+        resp = requests.Response()
+        resp.status_code = entrada["status_code"]
+        resp.url = entrada["url"]
+        resp.encoding = entrada["encoding"]
+        resp.headers = CaseInsensitiveDict(entrada["headers"])
+        resp._content = entrada["conteudo"]
+        resp.from_cache = True
+        return resp
+
+    def limpar(self):
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            for entrada in os.scandir(self.diretorio):
+                if entrada.name.endswith((".body", ".json")):
+                    os.remove(entrada.path)
+            self._tamanho_total = 0
+
+    def _remover_excedente(self):
+        """Remove as entradas menos usadas até caber em 90% do limite."""
+        entradas = []
+        for arquivo in os.scandir(self.diretorio):
+            if arquivo.name.endswith(".json"):
+                chave = arquivo.name[: -len(".json")]
+                entradas.append((arquivo.stat().st_mtime, chave))
+        entradas.sort()
+
+        limite = self.tamanho_maximo * 0.9
+        for _, chave in entradas:
+            if self._tamanho_total <= limite:
+                break
+            caminho_corpo = os.path.join(self.diretorio, f"{chave}.body")
+            try:
+                self._tamanho_total -= os.path.getsize(caminho_corpo)
+                os.remove(caminho_corpo)
+            except OSError:
+                pass
+            try:
+                os.remove(os.path.join(self.diretorio, f"{chave}.json"))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _gravar_atomico(caminho: str, conteudo: bytes):
+        """Grava um arquivo por completo ou não grava (tmp + rename)."""
+        temporario = f"{caminho}.{threading.get_ident()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
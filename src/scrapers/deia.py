@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DEIA - Identificação de Descritores de Diversidade, Equidade e Inclusão
+======================================================================
+
+Busca de todos os descritores DEIA de uma só vez:
+- os textos são normalizados sem acentos e em minúsculas, caractere a
+  caractere, de modo que as posições encontradas valem para o texto
+  original
+- os descritores são compilados uma única vez em uma expressão regular
+  em forma de árvore de prefixos (trie), percorrida em uma única passada
+- cada ocorrência informa descritor, campo e posição (não só a mais longa)
+- ``ocorrencias_coluna`` e ``classificar`` processam uma coluna inteira
+  em uma só passada, para reclassificar os dados já coletados sem nova
+  coleta
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Descritores DEIA expandidos
+DESCRITORES_DEIA = [
+    # Descritores originais
+    "Diversidade, Equidade e Integração",
+    "Diversidade, Equidade, Inclusão e Pertencimento",
+    "Diversidade, Equidade, Inclusão, Acessibilidade",
+    "Diversidade, Equidade, Inclusão, Pertencimento",
+    "Diversidade, Igualdade e Inclusão",
+    "Diversidade, Igualdade, Inclusão e Acessibilidade",
+    "Diversidade, Igualdade, Inclusão, Pertencimento",
+    "Equidade, Diversidade e Inclusão",
+    "Inclusão, Diversidade, Equidade e Acessibilidade",
+    "Inclusão, Diversidade, Equidade, Acessibilidade",
+    # Novos descritores e variações
+    "Diversidade e Inclusão",
+    "Equidade e Inclusão",
+    "Diversidade, Equidade e Inclusão",
+    "Inclusão e Diversidade",
+    "Equidade e Diversidade",
+    "Acessibilidade e Inclusão",
+    "Diversidade, Equidade, Inclusão e Acessibilidade",
+    "Inclusão, Equidade e Diversidade",
+    "Diversidade, Inclusão e Equidade",
+    "Equidade, Inclusão e Diversidade",
+    # Termos individuais relacionados
+    "Diversidade",
+    "Equidade",
+    "Inclusão",
+    "Acessibilidade",
+    "Pertencimento",
+    "Inclusivo",
+    "Inclusiva",
+    "Diverso",
+    "Diversa",
+    "Equitativo",
+    "Equitativa",
+    "Acessível",
+    # Termos específicos de saúde
+    "Saúde Mental",
+    "Saúde da População Negra",
+    "Saúde Indígena",
+    "Saúde LGBTQI+",
+    "Saúde da Mulher",
+    "Saúde do Idoso",
+    "Saúde da Criança",
+    "Saúde do Adolescente",
+    "Saúde da Pessoa com Deficiência",
+    "Saúde da População em Situação de Rua",
+    "Saúde da População Privada de Liberdade",
+    "Saúde da População do Campo",
+    "Saúde da População da Floresta",
+    "Saúde da População das Águas",
+    # Termos de vulnerabilidade social
+    "Vulnerabilidade Social",
+    "População Vulnerável",
+    "Grupos Vulneráveis",
+    "População em Situação de Rua",
+    "População Privada de Liberdade",
+    "População do Campo",
+    "População da Floresta",
+    "População das Águas",
+    "População Negra",
+    "População Indígena",
+    "População LGBTQI+",
+    "Pessoa com Deficiência",
+    "Pessoas com Deficiência",
+    "Idoso",
+    "Idosos",
+    "Criança",
+    "Crianças",
+    "Adolescente",
+    "Adolescentes",
+    "Mulher",
+    "Mulheres",
+    "Homem",
+    "Homens",
+    "Trans",
+    "Transgênero",
+    "Transgênera",
+    "Não-binário",
+    "Não-binária",
+    "Gay",
+    "Lésbica",
+    "Bissexual",
+    "Pansexual",
+    "Assexual",
+    "Queer",
+    "Intersexo",
+    "Intersexual",
+    "Negro",
+    "Negra",
+    "Negros",
+    "Negras",
+    "Indígena",
+    "Indígenas",
+    "Quilombola",
+    "Quilombolas",
+    "Ribeirinho",
+    "Ribeirinhos",
+    "Extrativista",
+    "Extrativistas",
+    "Pescador",
+    "Pescadores",
+    "Agricultor",
+    "Agricultores",
+    "Sem-terra",
+    "Sem-terras",
+    "Sem-teto",
+    "Sem-tetos",
+    "Refugiado",
+    "Refugiada",
+    "Refugiados",
+    "Refugiadas",
+    "Imigrante",
+    "Imigrantes",
+    "Migrantes",
+    "Migrantes",
+    "Deslocado",
+    "Deslocada",
+    "Deslocados",
+    "Deslocadas",
+    "Vítima de Violência",
+    "Vítimas de Violência",
+    "Sobrevivente de Violência",
+    "Sobreviventes de Violência",
+    "Vítima de Tráfico",
+    "Vítimas de Tráfico",
+    "Vítima de Exploração",
+    "Vítimas de Exploração",
+    "Vítima de Abuso",
+    "Vítimas de Abuso",
+    "Vítima de Discriminação",
+    "Vítimas de Discriminação",
+    "Vítima de Preconceito",
+    "Vítimas de Preconceito",
+    "Vítima de Racismo",
+    "Vítimas de Racismo",
+    "Vítima de Sexismo",
+    "Vítimas de Sexismo",
+    "Vítima de Homofobia",
+    "Vítimas de Homofobia",
+    "Vítima de Transfobia",
+    "Vítimas de Transfobia",
+    "Vítima de Lesbofobia",
+    "Vítimas de Lesbofobia",
+    "Vítima de Bifobia",
+    "Vítimas de Bifobia",
+    "Vítima de Gordofobia",
+    "Vítimas de Gordofobia",
+    "Vítima de Etarismo",
+    "Vítimas de Etarismo",
+    "Vítima de Capacitismo",
+    "Vítimas de Capacitismo",
+    "Vítima de Classismo",
+    "Vítimas de Classismo",
+    "Vítima de Xenofobia",
+    "Vítimas de Xenofobia",
+    "Vítima de Antissemitismo",
+    "Vítimas de Antissemitismo",
+    "Vítima de Islamofobia",
+    "Vítimas de Islamofobia",
+    "Vítima de Cristofobia",
+    "Vítimas de Cristofobia",
+    "Vítima de Ateofobia",
+    "Vítimas de Ateofobia",
+    "Vítima de Misoginia",
+    "Vítimas de Misoginia",
+    "Vítima de Misandria",
+    "Vítimas de Misandria",
+    "Vítima de Misantropia",
+    "Vítimas de Misantropia",
+    "Vítima de Misoginia",
+    "Vítimas de Misoginia",
+    "Vítima de Misandria",
+    "Vítimas de Misandria",
+    "Vítima de Misantropia",
+    "Vítimas de Misantropia",
+]
+
+# Campos dos registros analisados na busca DEIA
+CAMPOS_DEIA = [
+    "no_curso",
+    "ds_curso",
+    "descricao_oferta",
+    "palavras_chave_curso",
+    "palavras_chave",
+    "texto_pagina_inicial",
+]
+
+# Separa os textos de uma coluna na busca em lote (nunca aparece nos
+# descritores, então nenhuma ocorrência atravessa dois registros)
+SEPARADOR_LOTE = "\x00"
+
+
+class _TabelaNormalizacao(dict):
+    """
+    Tabela para ``str.translate`` que remove acentos e passa para
+    minúsculas, sempre trocando um caractere por exatamente um.
+    """
+
+    def __missing__(self, codigo: int) -> str:
+        caractere = chr(codigo)
+        base = "".join(
+            c
+            for c in unicodedata.normalize("NFD", caractere)
+            if not unicodedata.combining(c)
+        ).lower()
+        if len(base) != 1:
+            base = caractere.lower() if len(caractere.lower()) == 1 else caractere
+        self[codigo] = base
+        return base
+
+
+_TABELA = _TabelaNormalizacao()
+
+
+def normalizar(texto: str) -> str:
+    """
+    Remove acentos e passa para minúsculas, preservando o comprimento.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Texto normalizado (a posição i corresponde à posição i do original)
+    """
+    return texto.translate(_TABELA)
+
+
+def _expressao_trie(padroes: Sequence[str]) -> str:
+    """Monta uma expressão regular em árvore de prefixos para os padrões."""
+    trie: Dict = {}
+    for padrao in padroes:
+        no = trie
+        for caractere in padrao:
+            no = no.setdefault(caractere, {})
+        no[""] = {}
+
+    def montar(no: Dict) -> str:
+        ramos = [
+            re.escape(caractere) + montar(filho)
+            for caractere, filho in sorted(no.items())
+            if caractere
+        ]
+        if not ramos:
+            return ""
+        expressao = ramos[0] if len(ramos) == 1 else f"(?:{'|'.join(ramos)})"
+        # Padrão que termina aqui: o restante é opcional (guloso, então a
+        # ocorrência mais longa na posição vem primeiro)
+        return f"(?:{expressao})?" if "" in no else expressao
+
+    return montar(trie)
+
+
+class BuscadorDEIA:
+    """
+    Buscador de vários descritores compilado uma única vez.
+
+    Encontra todas as ocorrências, inclusive sobrepostas ("Saúde da
+    População Negra", "População Negra" e "Negra" no mesmo trecho), com a
+    mesma semântica de ``descritor.lower() in texto.lower()``, mas
+    ignorando acentos.
+    """
+
+    def __init__(self, descritores: Sequence[str] = DESCRITORES_DEIA):
+        """
+        Compila o buscador.
+
+        Args:
+            descritores: Descritores procurados; a ordem desempata a
+                escolha do descritor principal
+        """
+        self.descritores = list(descritores)
+
+        # Descritor -> ordem na lista e padrão normalizado -> (descritor
+        # original, ordem)
+        self._ordem: Dict[str, int] = {}
+        self._padroes: Dict[str, Tuple[str, int]] = {}
+        for ordem, descritor in enumerate(self.descritores):
+            self._ordem.setdefault(descritor, ordem)
+            padrao = normalizar(descritor)
+            if padrao and padrao not in self._padroes:
+                self._padroes[padrao] = (descritor, ordem)
+
+        # Padrões que são prefixo de outro ocorrem na mesma posição dele
+        self._prefixos = {
+            padrao: [
+                outro
+                for outro in self._padroes
+                if outro != padrao and padrao.startswith(outro)
+            ]
+            for padrao in self._padroes
+        }
+        self._expressao = re.compile(f"(?=({_expressao_trie(list(self._padroes))}))")
+
+    def _varrer(self, normalizado: str):
+        """Gera (posição, padrão) de todas as ocorrências no texto normalizado."""
+        for ocorrencia in self._expressao.finditer(normalizado):
+            padrao = ocorrencia.group(1)
+            if not padrao:
+                continue
+            inicio = ocorrencia.start()
+            yield inicio, padrao
+            for prefixo in self._prefixos[padrao]:
+                yield inicio, prefixo
+
+    def ocorrencias(self, texto: str, campo: Optional[str] = None) -> List[Dict]:
+        """
+        Todas as ocorrências de descritores em um texto.
+
+        Args:
+            texto: Texto analisado
+            campo: Nome do campo de origem, repassado nas ocorrências
+
+        Returns:
+            Lista de dicionários com descritor, campo, inicio, fim e trecho
+            (o texto original da ocorrência), em ordem de posição
+        """
+        if not texto:
+            return []
+
+        return [
+            {
+                "descritor": self._padroes[padrao][0],
+                "campo": campo,
+                "inicio": inicio,
+                "fim": inicio + len(padrao),
+                "trecho": texto[inicio : inicio + len(padrao)],
+            }
+            for inicio, padrao in self._varrer(normalizar(texto))
+        ]
+
+    def ocorrencias_campos(self, campos: Dict[str, str]) -> List[Dict]:
+        """
+        Ocorrências em vários campos de um registro.
+
+        Args:
+            campos: Dicionário campo -> texto (valores vazios são ignorados)
+
+        Returns:
+            Ocorrências de todos os campos (ver ``ocorrencias``)
+        """
+        resultado = []
+        for campo, texto in campos.items():
+            if isinstance(texto, str):
+                resultado.extend(self.ocorrencias(texto, campo))
+        return resultado
+
+    def encontrados(self, texto: str) -> List[str]:
+        """
+        Descritores distintos presentes no texto, na ordem da lista.
+
+        Args:
+            texto: Texto analisado
+
+        Returns:
+            Descritores encontrados
+        """
+        if not texto:
+            return []
+        padroes = {padrao for _, padrao in self._varrer(normalizar(texto))}
+        return [
+            descritor
+            for descritor, _ in sorted(
+                (self._padroes[padrao] for padrao in padroes), key=lambda d: d[1]
+            )
+        ]
+
+    def principal(self, descritores: Sequence[str]) -> str:
+        """
+        Descritor mais específico (mais longo; empate pela ordem da lista).
+
+        Args:
+            descritores: Descritores encontrados
+
+        Returns:
+            Descritor escolhido ou "" se não houver nenhum
+        """
+        if not descritores:
+            return ""
+        return max(descritores, key=lambda d: (len(d), -self._ordem.get(d, 0)))
+
+    def ocorrencias_coluna(
+        self, textos: pd.Series, campo: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Ocorrências em uma coluna inteira, com uma única busca.
+
+        Os textos são unidos por ``SEPARADOR_LOTE`` e normalizados de uma
+        vez; cada ocorrência é atribuída ao seu registro pela posição.
+
+        Args:
+            textos: Coluna de textos (valores não textuais são ignorados)
+            campo: Nome do campo (padrão: nome da série)
+
+        Returns:
+            DataFrame com registro (posição na série), campo, descritor,
+            inicio e fim (posições dentro do texto do registro)
+        """
+        campo = campo if campo is not None else textos.name
+        valores = [
+            valor.replace(SEPARADOR_LOTE, " ") if isinstance(valor, str) else ""
+            for valor in textos.tolist()
+        ]
+        tamanhos = np.fromiter(map(len, valores), dtype=np.int64, count=len(valores))
+        inicios = np.concatenate(([0], np.cumsum(tamanhos + 1)[:-1]))
+
+        posicoes, padroes = [], []
+        for posicao, padrao in self._varrer(normalizar(SEPARADOR_LOTE.join(valores))):
+            posicoes.append(posicao)
+            padroes.append(padrao)
+
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        registros = np.searchsorted(inicios, posicoes, side="right") - 1
+        inicio = posicoes - inicios[registros] if len(posicoes) else posicoes
+        return pd.DataFrame(
+            {
+                "registro": registros,
+                "campo": campo,
+                "descritor": [self._padroes[padrao][0] for padrao in padroes],
+                "inicio": inicio,
+                "fim": inicio + np.fromiter(map(len, padroes), dtype=np.int64),
+            }
+        )
+
+    def classificar(
+        self, dados: pd.DataFrame, campos: Sequence[str] = CAMPOS_DEIA
+    ) -> pd.DataFrame:
+        """
+        Classifica todos os registros de um DataFrame de uma vez.
+
+        Args:
+            dados: Registros coletados
+            campos: Colunas de texto analisadas (as ausentes são ignoradas)
+
+        Returns:
+            DataFrame com o índice de ``dados`` e as colunas tem_deia
+            ("Sim"/"Não"), deia_encontrado (descritor principal),
+            deia_descritores e deia_campos (separados por "; ")
+        """
+        # Registro -> descritores e campos encontrados (sem repetição)
+        descritores: Dict[int, Dict[str, None]] = {}
+        campos_encontrados: Dict[int, Dict[str, None]] = {}
+        for campo in campos:
+            if campo not in dados.columns:
+                continue
+            ocorrencias = self.ocorrencias_coluna(dados[campo], campo)
+            for registro, descritor in zip(
+                ocorrencias["registro"].tolist(), ocorrencias["descritor"].tolist()
+            ):
+                descritores.setdefault(registro, {})[descritor] = None
+                campos_encontrados.setdefault(registro, {})[campo] = None
+
+        resultado = pd.DataFrame(
+            {
+                "tem_deia": "Não",
+                "deia_encontrado": "",
+                "deia_descritores": "",
+                "deia_campos": "",
+            },
+            index=dados.index,
+        )
+        if not descritores:
+            return resultado
+
+        linhas = sorted(descritores)
+        encontrados = [
+            sorted(descritores[linha], key=self._ordem.get) for linha in linhas
+        ]
+        resultado.iloc[linhas, 0] = "Sim"
+        resultado.iloc[linhas, 1] = [self.principal(lista) for lista in encontrados]
+        resultado.iloc[linhas, 2] = ["; ".join(lista) for lista in encontrados]
+        resultado.iloc[linhas, 3] = [
+            "; ".join(campos_encontrados[linha]) for linha in linhas
+        ]
+        return resultado
+
+
+@lru_cache(maxsize=8)
+def obter_buscador(
+    descritores: Tuple[str, ...] = tuple(DESCRITORES_DEIA),
+) -> BuscadorDEIA:
+    """
+    Buscador compilado para uma lista de descritores (reaproveitado).
+
+    Args:
+        descritores: Descritores procurados
+
+    Returns:
+        Buscador compilado
+    """
+    return BuscadorDEIA(descritores)
@@ -3,13 +3,19 @@ import logging
 import os
 import re
 import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
+from .deia import CAMPOS_DEIA, DESCRITORES_DEIA, obter_buscador  # noqa: F401
+from .gravacao import criar_adaptador, criar_cache
+from .persistencia import EscritorCSVIncremental
+from .textos import CAMPOS_ARMAZENADOS, ArmazemTextos, extrair_texto_visivel
+from .utils import ClienteHTTP
+
 # Configurações da API
 URL = "https://www.unasus.gov.br/cursos/rest/busca"
 HEADERS = {
@@ -32,184 +38,8 @@ PAYLOAD_INICIAL = {
     "proximo": 0,
 }
 
-# Descritores DEIA expandidos
-DESCRITORES_DEIA = [
-    # Descritores originais
-    "Diversidade, Equidade e Integração",
-    "Diversidade, Equidade, Inclusão e Pertencimento",
-    "Diversidade, Equidade, Inclusão, Acessibilidade",
-    "Diversidade, Equidade, Inclusão, Pertencimento",
-    "Diversidade, Igualdade e Inclusão",
-    "Diversidade, Igualdade, Inclusão e Acessibilidade",
-    "Diversidade, Igualdade, Inclusão, Pertencimento",
-    "Equidade, Diversidade e Inclusão",
-    "Inclusão, Diversidade, Equidade e Acessibilidade",
-    "Inclusão, Diversidade, Equidade, Acessibilidade",
-    # Novos descritores e variações
-    "Diversidade e Inclusão",
-    "Equidade e Inclusão",
-    "Diversidade, Equidade e Inclusão",
-    "Inclusão e Diversidade",
-    "Equidade e Diversidade",
-    "Acessibilidade e Inclusão",
-    "Diversidade, Equidade, Inclusão e Acessibilidade",
-    "Inclusão, Equidade e Diversidade",
-    "Diversidade, Inclusão e Equidade",
-    "Equidade, Inclusão e Diversidade",
-    # Termos individuais relacionados
-    "Diversidade",
-    "Equidade",
-    "Inclusão",
-    "Acessibilidade",
-    "Pertencimento",
-    "Inclusivo",
-    "Inclusiva",
-    "Diverso",
-    "Diversa",
-    "Equitativo",
-    "Equitativa",
-    "Acessível",
-    # Termos específicos de saúde
-    "Saúde Mental",
-    "Saúde da População Negra",
-    "Saúde Indígena",
-    "Saúde LGBTQI+",
-    "Saúde da Mulher",
-    "Saúde do Idoso",
-    "Saúde da Criança",
-    "Saúde do Adolescente",
-    "Saúde da Pessoa com Deficiência",
-    "Saúde da População em Situação de Rua",
-    "Saúde da População Privada de Liberdade",
-    "Saúde da População do Campo",
-    "Saúde da População da Floresta",
-    "Saúde da População das Águas",
-    # Termos de vulnerabilidade social
-    "Vulnerabilidade Social",
-    "População Vulnerável",
-    "Grupos Vulneráveis",
-    "População em Situação de Rua",
-    "População Privada de Liberdade",
-    "População do Campo",
-    "População da Floresta",
-    "População das Águas",
-    "População Negra",
-    "População Indígena",
-    "População LGBTQI+",
-    "Pessoa com Deficiência",
-    "Pessoas com Deficiência",
-    "Idoso",
-    "Idosos",
-    "Criança",
-    "Crianças",
-    "Adolescente",
-    "Adolescentes",
-    "Mulher",
-    "Mulheres",
-    "Homem",
-    "Homens",
-    "Trans",
-    "Transgênero",
-    "Transgênera",
-    "Não-binário",
-    "Não-binária",
-    "Gay",
-    "Lésbica",
-    "Bissexual",
-    "Pansexual",
-    "Assexual",
-    "Queer",
-    "Intersexo",
-    "Intersexual",
-    "Negro",
-    "Negra",
-    "Negros",
-    "Negras",
-    "Indígena",
-    "Indígenas",
-    "Quilombola",
-    "Quilombolas",
-    "Ribeirinho",
-    "Ribeirinhos",
-    "Extrativista",
-    "Extrativistas",
-    "Pescador",
-    "Pescadores",
-    "Agricultor",
-    "Agricultores",
-    "Sem-terra",
-    "Sem-terras",
-    "Sem-teto",
-    "Sem-tetos",
-    "Refugiado",
-    "Refugiada",
-    "Refugiados",
-    "Refugiadas",
-    "Imigrante",
-    "Imigrantes",
-    "Migrantes",
-    "Migrantes",
-    "Deslocado",
-    "Deslocada",
-    "Deslocados",
-    "Deslocadas",
-    "Vítima de Violência",
-    "Vítimas de Violência",
-    "Sobrevivente de Violência",
-    "Sobreviventes de Violência",
-    "Vítima de Tráfico",
-    "Vítimas de Tráfico",
-    "Vítima de Exploração",
-    "Vítimas de Exploração",
-    "Vítima de Abuso",
-    "Vítimas de Abuso",
-    "Vítima de Discriminação",
-    "Vítimas de Discriminação",
-    "Vítima de Preconceito",
-    "Vítimas de Preconceito",
-    "Vítima de Racismo",
-    "Vítimas de Racismo",
-    "Vítima de Sexismo",
-    "Vítimas de Sexismo",
-    "Vítima de Homofobia",
-    "Vítimas de Homofobia",
-    "Vítima de Transfobia",
-    "Vítimas de Transfobia",
-    "Vítima de Lesbofobia",
-    "Vítimas de Lesbofobia",
-    "Vítima de Bifobia",
-    "Vítimas de Bifobia",
-    "Vítima de Gordofobia",
-    "Vítimas de Gordofobia",
-    "Vítima de Etarismo",
-    "Vítimas de Etarismo",
-    "Vítima de Capacitismo",
-    "Vítimas de Capacitismo",
-    "Vítima de Classismo",
-    "Vítimas de Classismo",
-    "Vítima de Xenofobia",
-    "Vítimas de Xenofobia",
-    "Vítima de Antissemitismo",
-    "Vítimas de Antissemitismo",
-    "Vítima de Islamofobia",
-    "Vítimas de Islamofobia",
-    "Vítima de Cristofobia",
-    "Vítimas de Cristofobia",
-    "Vítima de Ateofobia",
-    "Vítimas de Ateofobia",
-    "Vítima de Misoginia",
-    "Vítimas de Misoginia",
-    "Vítima de Misandria",
-    "Vítimas de Misandria",
-    "Vítima de Misantropia",
-    "Vítimas de Misantropia",
-    "Vítima de Misoginia",
-    "Vítimas de Misoginia",
-    "Vítima de Misandria",
-    "Vítimas de Misandria",
-    "Vítima de Misantropia",
-    "Vítimas de Misantropia",
-]
+# Sessão HTTP compartilhada (keep-alive + retentativas com backoff)
+CLIENTE_HTTP = ClienteHTTP()
 
 
 def setup_logging():
@@ -225,44 +55,80 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
-def encontrar_descritor_deia_melhorado(texto_completo: str) -> str:
-    """Busca descritores DEIA de forma mais abrangente."""
-    if not texto_completo:
-        return ""
+class CachePaginasCurso:
+    """
+    Cache por execução das páginas de curso.
 
-    texto_lower = texto_completo.lower()
-    descritores_encontrados = []
+    Cada URL ``cursos/curso/{id}`` é baixada e parseada uma única vez; a mesma
+    árvore BeautifulSoup é entregue a todos os extratores. As árvores são
+    tratadas como somente leitura e mantidas em um LRU pequeno, pois cada
+    curso só é processado uma vez por execução. Falhas não são guardadas: o
+    próximo extrator tenta baixar a página de novo.
+    """
 
-    for descritor in DESCRITORES_DEIA:
-        if descritor.lower() in texto_lower:
-            descritores_encontrados.append(descritor)
+    def __init__(self, logger: logging.Logger, max_paginas: int = 16):
+        self.logger = logger
+        self.max_paginas = max_paginas
+        self._paginas: "OrderedDict[str, BeautifulSoup]" = OrderedDict()
 
-    # Retorna o descritor mais específico (mais longo) encontrado
-    if descritores_encontrados:
-        return max(descritores_encontrados, key=len)
+    def obter(self, id_curso: str) -> Optional[BeautifulSoup]:
+        """Retorna a página parseada do curso (None se a busca falhou)."""
+        id_curso = str(id_curso)
+        if id_curso in self._paginas:
+            self._paginas.move_to_end(id_curso)
+            return self._paginas[id_curso]
 
-    return ""
+        url_curso = f"https://www.unasus.gov.br/cursos/curso/{id_curso}"
+        soup = None
+        try:
+            resp = CLIENTE_HTTP.get(url_curso, headers=HEADERS, timeout=30)
+            if resp.status_code == 200:
+                soup = BeautifulSoup(resp.text, "html.parser")
+            else:
+                self.logger.error(
+                    f"Erro HTTP {resp.status_code} ao acessar curso {id_curso}"
+                )
+        except Exception as e:
+            self.logger.error(f"Erro ao baixar página do curso {id_curso}: {e}")
 
+        if soup is None:
+            return None
 
-def extrair_texto_pagina_inicial(id_curso: str, logger: logging.Logger) -> str:
-    """Extrai o texto completo da página inicial do curso."""
-    url_curso = f"https://www.unasus.gov.br/cursos/curso/{id_curso}"
+        self._paginas[id_curso] = soup
+        if len(self._paginas) > self.max_paginas:
+            self._paginas.popitem(last=False)
+        return soup
 
-    try:
-        response = requests.get(url_curso, headers=HEADERS, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
 
-        # Remove scripts e estilos
-        for script in soup(["script", "style"]):
-            script.decompose()
+def _obter_pagina_curso(
+    id_curso: str, logger: logging.Logger, cache: Optional[CachePaginasCurso]
+) -> Optional[BeautifulSoup]:
+    """Busca a página do curso no cache informado ou diretamente no portal."""
+    if cache is None:
+        cache = CachePaginasCurso(logger, max_paginas=1)
+    return cache.obter(id_curso)
+
+
+def encontrar_descritor_deia_melhorado(texto_completo: str) -> str:
+    """Busca descritores DEIA de forma mais abrangente."""
+    buscador = obter_buscador()
+
+    # Retorna o descritor mais específico (mais longo) encontrado
+    return buscador.principal(buscador.encontrados(texto_completo))
+
 
-        # Extrai todo o texto da página
-        texto_completo = soup.get_text()
+def extrair_texto_pagina_inicial(
+    id_curso: str, logger: logging.Logger, cache: CachePaginasCurso = None
+) -> str:
+    """Extrai o texto completo da página inicial do curso."""
+    try:
+        soup = _obter_pagina_curso(id_curso, logger, cache)
+        if soup is None:
+            return ""
 
-        # Limpa o texto
-        linhas = (linha.strip() for linha in texto_completo.splitlines())
-        chunks = (frase.strip() for linha in linhas for frase in linha.split("  "))
-        texto_limpo = " ".join(chunk for chunk in chunks if chunk)
+        # Extrai todo o texto da página, ignorando scripts e estilos sem
+        # alterar a árvore compartilhada com os demais extratores
+        texto_limpo = extrair_texto_visivel(soup)
 
         logger.debug(
             f"Texto da página inicial extraído para curso {id_curso}: {len(texto_limpo)} caracteres"
@@ -276,13 +142,14 @@ def extrair_texto_pagina_inicial(id_curso: str, logger: logging.Logger) -> str:
         return ""
 
 
-def extrair_descricao_curso_melhorada(id_curso: str, logger: logging.Logger) -> str:
+def extrair_descricao_curso_melhorada(
+    id_curso: str, logger: logging.Logger, cache: CachePaginasCurso = None
+) -> str:
     """Extrai a descrição do curso de forma mais robusta."""
-    url_curso = f"https://www.unasus.gov.br/cursos/curso/{id_curso}"
-
     try:
-        response = requests.get(url_curso, headers=HEADERS, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = _obter_pagina_curso(id_curso, logger, cache)
+        if soup is None:
+            return ""
 
         # Múltiplas estratégias para encontrar a descrição
         descricao = ""
@@ -354,13 +221,14 @@ def extrair_descricao_curso_melhorada(id_curso: str, logger: logging.Logger) ->
         return ""
 
 
-def extrair_palavras_chave_curso(id_curso: str, logger: logging.Logger) -> str:
+def extrair_palavras_chave_curso(
+    id_curso: str, logger: logging.Logger, cache: CachePaginasCurso = None
+) -> str:
     """Extrai palavras-chave do curso."""
-    url_curso = f"https://www.unasus.gov.br/cursos/curso/{id_curso}"
-
     try:
-        response = requests.get(url_curso, headers=HEADERS, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = _obter_pagina_curso(id_curso, logger, cache)
+        if soup is None:
+            return ""
 
         palavras_chave = ""
 
@@ -423,12 +291,21 @@ def analisar_deia_completo(curso: Dict, logger: logging.Logger) -> Dict:
     # Combina todos os textos
     texto_completo = " ".join(textos_para_analise)
 
-    # Busca descritores DEIA
-    descritor_encontrado = encontrar_descritor_deia_melhorado(texto_completo)
+    # Busca descritores DEIA campo a campo (descritor, campo e posição)
+    buscador = obter_buscador()
+    ocorrencias = buscador.ocorrencias_campos(
+        {campo: curso.get(campo) for campo in CAMPOS_DEIA}
+    )
+    descritor_encontrado = buscador.principal(
+        list(dict.fromkeys(ocorrencia["descritor"] for ocorrencia in ocorrencias))
+    )
 
     # Atualiza o curso
     curso["tem_deia"] = "Sim" if descritor_encontrado else "Não"
     curso["deia_encontrado"] = descritor_encontrado
+    curso["deia_campos"] = "; ".join(
+        dict.fromkeys(ocorrencia["campo"] for ocorrencia in ocorrencias)
+    )
     curso["texto_analisado_deia"] = texto_completo[
         :1000
     ]  # Primeiros 1000 caracteres para debug
@@ -442,30 +319,49 @@ def analisar_deia_completo(curso: Dict, logger: logging.Logger) -> Dict:
 
 
 def processar_curso_melhorado(
-    curso: Dict, id_curso: str, logger: logging.Logger
+    curso: Dict,
+    id_curso: str,
+    logger: logging.Logger,
+    cache: CachePaginasCurso = None,
+    textos: ArmazemTextos = None,
 ) -> List[Dict]:
-    """Processa um curso com coleta completa de dados."""
+    """
+    Processa um curso com coleta completa de dados.
+
+    Com ``textos``, os textos completos do curso são guardados comprimidos
+    para reclassificações DEIA offline.
+    """
     # Extrai dados adicionais do curso
     logger.info(f"Processando curso {id_curso}: {curso.get('no_curso', 'N/A')}")
 
+    # Todos os extratores compartilham a mesma página baixada e parseada
+    if cache is None:
+        cache = CachePaginasCurso(logger)
+
     # Extrai descrição do curso se não existir
     if not curso.get("ds_curso"):
-        descricao = extrair_descricao_curso_melhorada(id_curso, logger)
+        descricao = extrair_descricao_curso_melhorada(id_curso, logger, cache)
         curso["ds_curso"] = descricao
 
     # Extrai palavras-chave do curso
-    palavras_chave_curso = extrair_palavras_chave_curso(id_curso, logger)
+    palavras_chave_curso = extrair_palavras_chave_curso(id_curso, logger, cache)
     curso["palavras_chave_curso"] = palavras_chave_curso
 
     # Extrai texto da página inicial
-    texto_pagina = extrair_texto_pagina_inicial(id_curso, logger)
+    texto_pagina = extrair_texto_pagina_inicial(id_curso, logger, cache)
     curso["texto_pagina_inicial"] = texto_pagina
 
+    # Guarda os textos completos para reclassificações DEIA offline
+    if textos is not None:
+        textos.salvar(
+            id_curso, {campo: curso.get(campo) for campo in CAMPOS_ARMAZENADOS}
+        )
+
     # Analisa DEIA em todos os campos
     curso = analisar_deia_completo(curso, logger)
 
     # Extrai ofertas (mantém a lógica existente)
-    ofertas = extrair_ofertas_do_curso(id_curso, logger)
+    ofertas = extrair_ofertas_do_curso(id_curso, logger, cache)
 
     if not ofertas:
         logger.warning(f"Curso {id_curso} sem ofertas")
@@ -488,19 +384,19 @@ def processar_curso_melhorado(
 
 
 # Funções auxiliares (mantidas do código original)
-def extrair_ofertas_do_curso(id_curso: str, logger: logging.Logger) -> List[str]:
+def extrair_ofertas_do_curso(
+    id_curso: str, logger: logging.Logger, cache: CachePaginasCurso = None
+) -> List[str]:
     """Extrai ofertas de um curso específico com logs detalhados."""
     url_curso = f"https://www.unasus.gov.br/cursos/curso/{id_curso}"
 
     try:
         logger.info(f"Buscando ofertas do curso {id_curso}...")
-        resp = requests.get(url_curso, headers=HEADERS, timeout=30)
+        soup = _obter_pagina_curso(id_curso, logger, cache)
 
-        if resp.status_code != 200:
-            logger.error(f"Erro HTTP {resp.status_code} ao acessar curso {id_curso}")
+        if soup is None:
             return []
 
-        soup = BeautifulSoup(resp.text, "html.parser")
         ofertas = []
 
         # Buscar links de ofertas de várias formas
@@ -602,7 +498,7 @@ def buscar_ofertas_encerradas(
                 logger.info(f"  🔍 Acessando ofertas encerradas: {url_encerradas}")
 
                 # Acessar a página de ofertas encerradas
-                resp_encerradas = requests.get(
+                resp_encerradas = CLIENTE_HTTP.get(
                     url_encerradas, headers=HEADERS, timeout=30
                 )
                 if resp_encerradas.status_code == 200:
@@ -651,7 +547,7 @@ def extrair_dados_oferta(id_oferta: str, logger: logging.Logger) -> Dict:
 
         # Tentar API REST primeiro
         try:
-            resp_api = requests.get(url_api, headers=api_headers, timeout=30)
+            resp_api = CLIENTE_HTTP.get(url_api, headers=api_headers, timeout=30)
             if resp_api.status_code == 200:
                 response_data = resp_api.json()
                 logger.info("    ✅ Dados obtidos via API REST")
@@ -710,7 +606,7 @@ def extrair_dados_oferta(id_oferta: str, logger: logging.Logger) -> Dict:
 
         # Fallback: tentar extrair da página HTML
         logger.info("    🔄 Tentando extração da página HTML...")
-        resp = requests.get(url_oferta, headers=HEADERS, timeout=30)
+        resp = CLIENTE_HTTP.get(url_oferta, headers=HEADERS, timeout=30)
         soup = BeautifulSoup(resp.text, "html.parser")
 
         # Buscar o div principal com os dados da oferta
@@ -882,11 +778,30 @@ def extrair_dados_oferta(id_oferta: str, logger: logging.Logger) -> Dict:
         return {"id_oferta": id_oferta, "erro": str(e)}
 
 
-def main():
-    """Função principal do scraper melhorado."""
+def main(
+    gravar: Optional[str] = None,
+    reproduzir: Optional[str] = None,
+    cache_ttl_horas: float = 0,
+):
+    """
+    Função principal do scraper melhorado.
+
+    Args:
+        gravar: Arquivo .jsonl onde gravar as respostas do portal
+        reproduzir: Arquivo .jsonl gravado para executar offline
+        cache_ttl_horas: Validade do cache HTTP em disco (0 desativa)
+    """
     logger = setup_logging()
     logger.info("=== INICIANDO SCRAPER UNA-SUS MELHORADO ===")
 
+    adaptador = criar_adaptador(gravar=gravar, reproduzir=reproduzir)
+    if adaptador:
+        CLIENTE_HTTP.usar_adaptador(adaptador)
+        logger.info(f"🎞️ Modo {'reprodução' if reproduzir else 'gravação'} ativo")
+    CLIENTE_HTTP.cache = criar_cache(
+        cache_ttl_horas, gravar=gravar, reproduzir=reproduzir
+    )
+
     # Configurações
     csv_path = "unasus_ofertas_melhoradas.csv"
     lote = 10
@@ -907,6 +822,10 @@ def main():
             logger.error(f"Erro ao carregar CSV existente: {e}")
 
     payload = PAYLOAD_INICIAL.copy()
+    falhas_consecutivas = 0
+    cache_paginas = CachePaginasCurso(logger)
+    textos = ArmazemTextos()
+    escritor = EscritorCSVIncremental(csv_path)
     logger.info(f"Arquivo de saída: {csv_path}")
 
     # Loop principal
@@ -914,7 +833,7 @@ def main():
         try:
             logger.info(f"=== PROCESSANDO PÁGINA {pagina + 1} ===")
 
-            response = requests.post(
+            response = CLIENTE_HTTP.post(
                 URL,
                 data=payload,
                 headers=HEADERS,
@@ -923,6 +842,7 @@ def main():
             )
 
             data = response.json()
+            falhas_consecutivas = 0
             itens = data.get("results", {}).get("itens", [])
 
             if not itens:
@@ -945,20 +865,15 @@ def main():
                     continue
 
                 # Processa o curso com as melhorias
-                dados_curso = processar_curso_melhorado(curso, id_curso_str, logger)
+                dados_curso = processar_curso_melhorado(
+                    curso, id_curso_str, logger, cache_paginas, textos
+                )
                 todos_detalhes.extend(dados_curso)
                 cursos_processados.add(id_curso_str)
 
-                # Salvamento incremental
+                # Salvamento incremental (anexa apenas o lote novo)
                 if len(todos_detalhes) >= lote:
-                    if os.path.exists(csv_path):
-                        df_existente = pd.read_csv(csv_path, encoding="utf-8-sig")
-                        df_novo = pd.DataFrame(todos_detalhes)
-                        df_final = pd.concat([df_existente, df_novo], ignore_index=True)
-                    else:
-                        df_final = pd.DataFrame(todos_detalhes)
-
-                    df_final.to_csv(csv_path, index=False, encoding="utf-8-sig")
+                    escritor.escrever_lote(todos_detalhes)
                     logger.info(
                         f"Progresso salvo: {len(cursos_processados)} cursos processados"
                     )
@@ -972,20 +887,17 @@ def main():
             time.sleep(1)
 
         except Exception as e:
-            logger.error(f"Erro de conexão: {e}. Tentando novamente em 30 segundos...")
-            time.sleep(30)
+            falhas_consecutivas += 1
+            espera = CLIENTE_HTTP.calcular_espera(falhas_consecutivas)
+            logger.error(
+                f"Erro de conexão: {e}. Tentando novamente em {espera:.1f} segundos..."
+            )
+            time.sleep(espera)
             continue
 
     # Salva o restante
     if todos_detalhes:
-        if os.path.exists(csv_path):
-            df_existente = pd.read_csv(csv_path, encoding="utf-8-sig")
-            df_novo = pd.DataFrame(todos_detalhes)
-            df_final = pd.concat([df_existente, df_novo], ignore_index=True)
-        else:
-            df_final = pd.DataFrame(todos_detalhes)
-
-        df_final.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        escritor.escrever_lote(todos_detalhes)
         logger.info(f"Finalizado! Todos os dados salvos em {csv_path}")
 
     # Gera relatório final
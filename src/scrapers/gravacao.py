@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gravação - Gravação e Reprodução Offline das Respostas do Portal
+================================================================
+
+Transportes (adaptadores do requests) que podem ser injetados no
+ClienteHTTP para rodar os coletores sem rede:
+- AdaptadorGravacao: acessa o portal normalmente e grava cada resposta
+- AdaptadorReproducao: responde somente a partir de uma gravação
+- criar_adaptador: escolhe o adaptador a partir das opções de execução
+- criar_cache: cache HTTP em disco pedido na execução (nunca junto com
+  gravação ou reprodução)
+- adicionar_opcoes_transporte: opções de linha de comando dos coletores
+
+A gravação é um arquivo JSON Lines com uma resposta por linha, indexada
+por método, URL e corpo da requisição (a busca é um POST paginado).
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .cache_http import CacheHTTP
+
+logger = logging.getLogger(__name__)
+
+
+def chave_requisicao(requisicao: requests.PreparedRequest) -> str:
+    """
+    Chave estável de uma requisição: método, URL completa e corpo.
+
+    Args:
+        requisicao: Requisição preparada
+
+    Returns:
+        Chave textual da requisição
+    """
+    corpo = requisicao.body or b""
+    if isinstance(corpo, str):
+        corpo = corpo.encode("utf-8")
+    resumo = hashlib.sha256(corpo).hexdigest()[:16] if corpo else ""
+    return f"{requisicao.method} {requisicao.url} {resumo}".rstrip()
+
+
+class ArquivoGravacao:
+    """
+    Arquivo de gravação (JSON Lines) com índice em memória.
+
+    Pode ser compartilhado entre threads; cada resposta é gravada uma única
+    vez por chave.
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Abre (ou cria) uma gravação.
+
+        Args:
+            caminho: Arquivo .jsonl da gravação
+        """
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._respostas: Dict[str, Dict] = {}
+
+        if os.path.exists(caminho):
+            with open(caminho, encoding="utf-8") as f:
+                for linha in f:
+                    if linha.strip():
+                        entrada = json.loads(linha)
+                        self._respostas[entrada["chave"]] = entrada
+
+    def __len__(self) -> int:
+        return len(self._respostas)
+
+    def registrar(self, requisicao: requests.PreparedRequest, resp: requests.Response):
+        """Grava a resposta de uma requisição (se ainda não gravada)."""
+        chave = chave_requisicao(requisicao)
+        entrada = {
+            "chave": chave,
+            "metodo": requisicao.method,
+            "url": requisicao.url,
+            "status_code": resp.status_code,
+            "reason": resp.reason,
+            "encoding": resp.encoding,
+            "headers": dict(resp.headers),
+            "conteudo": base64.b64encode(resp.content).decode("ascii"),
+        }
+
+        with self._lock:
+            if chave in self._respostas:
+                return
+            self._respostas[chave] = entrada
+            diretorio = os.path.dirname(self.caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            with open(self.caminho, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+
+    def buscar(
+        self, requisicao: requests.PreparedRequest
+    ) -> Optional[requests.Response]:
+        """
+        Reconstrói a resposta gravada de uma requisição.
+
+        Args:
+            requisicao: Requisição preparada
+
+        Returns:
+            Resposta gravada ou None se a requisição não foi gravada
+        """
+        entrada = self._respostas.get(chave_requisicao(requisicao))
+        if entrada is None:
+            return None
+
+        resp = requests.Response()
+        resp.status_code = entrada["status_code"]
+        resp.reason = entrada["reason"]
+        resp.encoding = entrada["encoding"]
+        resp.headers = CaseInsensitiveDict(entrada["headers"])
+        resp._content = base64.b64decode(entrada["conteudo"])
+        resp.url = requisicao.url
+        resp.request = requisicao
+        return resp
+
+
+class AdaptadorGravacao(HTTPAdapter):
+    """Adaptador HTTP normal que grava cada resposta recebida."""
+
+    def __init__(self, gravacao: ArquivoGravacao, **kwargs):
+        """
+        Args:
+            gravacao: Arquivo onde as respostas são gravadas
+            **kwargs: Opções do HTTPAdapter (pool, retentativas)
+        """
+        self.gravacao = gravacao
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        self.gravacao.registrar(request, resp)
+        return resp
+
+
+class AdaptadorReproducao(BaseAdapter):
+    """
+    Adaptador que responde somente a partir de uma gravação, sem rede.
+
+    Requisições não gravadas recebem um 404 sintético.
+    """
+
+    def __init__(self, gravacao: ArquivoGravacao):
+        """
+        Args:
+            gravacao: Gravação usada para responder
+        """
+        super().__init__()
+        self.gravacao = gravacao
+
+    def send(self, request, **kwargs):
+        resp = self.gravacao.buscar(request)
+        if resp is not None:
+            return resp
+
+        logger.warning(f"⚠️ Requisição não gravada: {chave_requisicao(request)}")
+        resp = requests.Response()
+        resp.status_code = 404
+        resp.reason = "Not Recorded"
+        resp._content = b""
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+def criar_adaptador(
+    gravar: Optional[str] = None,
+    reproduzir: Optional[str] = None,
+    max_conexoes: int = 10,
+) -> Optional[BaseAdapter]:
+    """
+    Cria o transporte conforme o modo de execução.
+
+    Args:
+        gravar: Arquivo .jsonl onde gravar as respostas do portal
+        reproduzir: Arquivo .jsonl de onde reproduzir as respostas (offline)
+        max_conexoes: Tamanho do pool de conexões (modo gravação)
+
+    Returns:
+        Adaptador a injetar no ClienteHTTP ou None (acesso normal à rede)
+
+    Raises:
+        ValueError: se os dois modos forem pedidos ao mesmo tempo
+        FileNotFoundError: se a gravação a reproduzir não existir
+    """
+    if gravar and reproduzir:
+        raise ValueError("Use apenas um modo: gravar ou reproduzir")
+
+    if reproduzir:
+        if not os.path.exists(reproduzir):
+            raise FileNotFoundError(f"Gravação não encontrada: {reproduzir}")
+        return AdaptadorReproducao(ArquivoGravacao(reproduzir))
+
+    if gravar:
+        return AdaptadorGravacao(
+            ArquivoGravacao(gravar),
+            pool_connections=max_conexoes,
+            pool_maxsize=max_conexoes,
+            max_retries=0,
+        )
+
+    return None
+
+
+def criar_cache(
+    cache_ttl_horas: float = 0,
+    gravar: Optional[str] = None,
+    reproduzir: Optional[str] = None,
+) -> Optional[CacheHTTP]:
+    """
+    Cria o cache HTTP em disco, que só é usado quando pedido.
+
+    Nos modos de gravação e reprodução o cache fica desligado: uma resposta
+    servida do disco não passa pelo transporte, então faltaria na gravação
+    (e viraria um 404 sintético ao reproduzir).
+
+    Args:
+        cache_ttl_horas: Validade das entradas em horas (0 desativa)
+        gravar: Arquivo .jsonl da gravação, se houver
+        reproduzir: Arquivo .jsonl da reprodução, se houver
+
+    Returns:
+        Cache a injetar no ClienteHTTP ou None
+    """
+    if not cache_ttl_horas:
+        return None
+    if gravar or reproduzir:
+        logger.warning("⚠️ Cache HTTP desativado nos modos de gravação/reprodução")
+        return None
+    return CacheHTTP(ttl=cache_ttl_horas * 3600)
+
+
+def adicionar_opcoes_transporte(parser: argparse.ArgumentParser):
+    """
+    Adiciona as opções de cache, gravação e reprodução (mutuamente
+    exclusivas) a um parser de linha de comando.
+
+    Args:
+        parser: Parser do coletor
+    """
+    transporte = parser.add_mutually_exclusive_group()
+    transporte.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        help="Usa o cache HTTP em cache/http com esta validade em horas "
+        "(padrão: 0, desativado)",
+    )
+    transporte.add_argument(
+        "--gravar",
+        metavar="ARQUIVO",
+        help="Grava as respostas do portal em ARQUIVO (.jsonl)",
+    )
+    transporte.add_argument(
+        "--reproduzir",
+        metavar="ARQUIVO",
+        help="Executa offline a partir de uma gravação (sem limite de taxa)",
+    )
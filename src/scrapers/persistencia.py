@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistência - Gravação Incremental dos Dados Coletados
+=======================================================
+
+Escritores em fluxo usados pelos scrapers para salvar o progresso sem
+reler nem reescrever o arquivo de saída a cada lote:
+- EscritorCSVIncremental: CSV somente-anexação com cabeçalho estável
+- EscritorJSONL / ler_jsonl: registros em JSON Lines (um objeto por linha),
+  comprimidos com gzip quando o arquivo termina em ``.gz``
+"""
+
+import csv
+import gzip
+import json
+import os
+from typing import Dict, Iterator, List, TextIO
+
+# Nível de compressão gzip dos arquivos .jsonl.gz (6: rápido o bastante
+# para gravar durante a coleta)
+NIVEL_COMPRESSAO = 6
+
+
+def _abrir_texto(caminho: str, modo: str) -> TextIO:
+    """Abre um arquivo de texto UTF-8, com gzip se terminar em ``.gz``."""
+    if caminho.endswith(".gz"):
+        return gzip.open(
+            caminho, f"{modo}t", compresslevel=NIVEL_COMPRESSAO, encoding="utf-8"
+        )
+    return open(caminho, modo, encoding="utf-8")
+
+
+class EscritorCSVIncremental:
+    """
+    Escritor de CSV somente-anexação.
+
+    Cada lote é anexado ao final do arquivo em O(lote) e sincronizado com
+    o disco (fsync). O cabeçalho só é reescrito quando surgem colunas
+    novas; nesse caso o arquivo é reescrito uma única vez em fluxo, com as
+    linhas antigas completadas com valores vazios.
+    """
+
+    def __init__(self, caminho: str, encoding: str = "utf-8-sig"):
+        """
+        Inicializa o escritor.
+
+        Args:
+            caminho: Caminho do arquivo CSV (criado no primeiro lote)
+            encoding: Encoding do arquivo (o BOM é gravado só na criação)
+        """
+        self.caminho = caminho
+        self.encoding = encoding
+        self.colunas = self._ler_cabecalho()
+
+    def _ler_cabecalho(self) -> List[str]:
+        """Lê o cabeçalho do arquivo existente, se houver."""
+        if not os.path.exists(self.caminho) or os.path.getsize(self.caminho) == 0:
+            return []
+
+        with open(self.caminho, newline="", encoding=self.encoding) as f:
+            return next(csv.reader(f), [])
+
+    def escrever_lote(self, registros: List[Dict]) -> int:
+        """
+        Anexa um lote de registros ao arquivo.
+
+        Args:
+            registros: Lista de registros (dicionários)
+
+        Returns:
+            Número de registros gravados
+        """
+        if not registros:
+            return 0
+
+        conhecidas = set(self.colunas)
+        novas = []
+        for registro in registros:
+            for coluna in registro:
+                if coluna not in conhecidas:
+                    conhecidas.add(coluna)
+                    novas.append(coluna)
+
+        arquivo_novo = not self.colunas
+        if novas and not arquivo_novo:
+            self._expandir_cabecalho(self.colunas + novas)
+        else:
+            self.colunas = self.colunas + novas
+
+        # Sem BOM ao anexar: ele só pode aparecer no início do arquivo
+        encoding = self.encoding if arquivo_novo else self.encoding.replace("-sig", "")
+        with open(self.caminho, "a", newline="", encoding=encoding) as f:
+            escritor = csv.DictWriter(f, fieldnames=self.colunas, restval="")
+            if arquivo_novo:
+                escritor.writeheader()
+            escritor.writerows(registros)
+            f.flush()
+            os.fsync(f.fileno())
+
+        return len(registros)
+
+    def _expandir_cabecalho(self, colunas: List[str]):
+        """Reescreve o arquivo com o cabeçalho ampliado (troca atômica)."""
+        temporario = f"{self.caminho}.tmp"
+
+        with open(self.caminho, newline="", encoding=self.encoding) as origem, open(
+            temporario, "w", newline="", encoding=self.encoding
+        ) as destino:
+            leitor = csv.reader(origem)
+            next(leitor, None)
+            escritor = csv.writer(destino)
+            escritor.writerow(colunas)
+            for linha in leitor:
+                escritor.writerow(linha + [""] * (len(colunas) - len(linha)))
+            destino.flush()
+            os.fsync(destino.fileno())
+
+        os.replace(temporario, self.caminho)
+        self.colunas = colunas
+
+
+class EscritorJSONL:
+    """
+    Escritor somente-anexação de JSON Lines.
+
+    Os registros ficam em um buffer limitado e são gravados (com flush) a
+    cada ``tamanho_buffer`` registros, de modo que uma queda perde no
+    máximo um lote; ``sincronizar`` grava o buffer e força o fsync (usado
+    nas fronteiras de checkpoint). Arquivos ``.gz`` são comprimidos em
+    fluxo.
+    """
+
+    def __init__(self, caminho: str, tamanho_buffer: int = 1):
+        """
+        Inicializa o escritor.
+
+        Args:
+            caminho: Caminho do arquivo .jsonl ou .jsonl.gz (criado se não
+                existir)
+            tamanho_buffer: Registros acumulados antes de cada gravação
+        """
+        self.caminho = caminho
+        self.tamanho_buffer = max(1, tamanho_buffer)
+        self.registros_escritos = 0
+        self._buffer: List[str] = []
+        self._arquivo = _abrir_texto(caminho, "a")
+
+    def escrever(self, registros: List[Dict]) -> int:
+        """Acrescenta os registros ao buffer, gravando-o quando cheio."""
+        self._buffer.extend(
+            json.dumps(registro, ensure_ascii=False, default=str) + "\n"
+            for registro in registros
+        )
+        self.registros_escritos += len(registros)
+        if len(self._buffer) >= self.tamanho_buffer:
+            self._descarregar()
+        return len(registros)
+
+    def _descarregar(self):
+        """Grava o buffer no arquivo e faz flush."""
+        if self._buffer:
+            self._arquivo.write("".join(self._buffer))
+            self._buffer.clear()
+        self._arquivo.flush()
+
+    def sincronizar(self):
+        """Garante que tudo que foi escrito está no disco."""
+        self._descarregar()
+        os.fsync(self._arquivo.fileno())
+
+    def fechar(self):
+        """Sincroniza e fecha o arquivo."""
+        if not self._arquivo.closed:
+            self.sincronizar()
+            self._arquivo.close()
+
+
+def ler_jsonl(caminho: str) -> Iterator[Dict]:
+    """
+    Lê um arquivo JSON Lines de forma preguiçosa.
+
+    Uma última linha incompleta (escrita interrompida) é ignorada, assim
+    como o final de um arquivo comprimido que não chegou a ser fechado.
+
+    Args:
+        caminho: Caminho do arquivo .jsonl ou .jsonl.gz
+
+    Yields:
+        Um registro por linha
+    """
+    with _abrir_texto(caminho, "r") as f:
+        try:
+            for linha in f:
+                if not linha.endswith("\n"):
+                    break
+                if linha.strip():
+                    yield json.loads(linha)
+        except EOFError:
+            # Compressão interrompida: valem os registros até o último flush
+            return
+
+
+def ler_jsonl_em_lotes(caminho: str, tamanho_lote: int = 10000) -> Iterator[List[Dict]]:
+    """
+    Lê um arquivo JSON Lines em lotes, sem carregá-lo inteiro.
+
+    Args:
+        caminho: Caminho do arquivo .jsonl ou .jsonl.gz
+        tamanho_lote: Registros por lote
+
+    Yields:
+        Listas com até ``tamanho_lote`` registros
+    """
+    lote = []
+    for registro in ler_jsonl(caminho):
+        lote.append(registro)
+        if len(lote) >= tamanho_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def reparar_jsonl(caminho: str) -> int:
+    """
+    Prepara para anexação um arquivo JSON Lines cuja escrita foi
+    interrompida.
+
+    Arquivos simples perdem só a última linha incompleta; arquivos
+    comprimidos são regravados com os registros legíveis (troca atômica),
+    já que um fluxo gzip truncado não pode ser continuado.
+
+    Args:
+        caminho: Caminho do arquivo .jsonl ou .jsonl.gz
+
+    Returns:
+        Número de registros mantidos
+    """
+    if not caminho.endswith(".gz"):
+        with open(caminho, "rb+") as f:
+            conteudo = f.read()
+            if conteudo and not conteudo.endswith(b"\n"):
+                f.truncate(conteudo.rfind(b"\n") + 1)
+        return sum(1 for _ in ler_jsonl(caminho))
+
+    temporario = f"{caminho[:-3]}.tmp.gz"
+    escritor = EscritorJSONL(temporario, tamanho_buffer=1000)
+    try:
+        for registro in ler_jsonl(caminho):
+            escritor.escrever([registro])
+    finally:
+        escritor.fechar()
+    os.replace(temporario, caminho)
+    return escritor.registros_escritos
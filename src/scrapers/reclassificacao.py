@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reclassificação DEIA - Reclassificação Offline dos Dados Coletados
+==================================================================
+
+Refaz a classificação DEIA de um snapshot (Parquet ou CSV) com a lista de
+descritores atual, sem acessar o portal:
+- os textos longos dos cursos vêm do armazém comprimido (ver textos)
+- os registros são divididos em lotes, classificados em paralelo em
+  processos separados (a busca é limitada por CPU)
+- a lista de descritores pode vir de um arquivo texto, para iterar a
+  taxonomia sem alterar o código
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from .deia import CAMPOS_DEIA, DESCRITORES_DEIA, obter_buscador
+from .textos import CAMINHO_PADRAO, ArmazemTextos
+
+# Registros por lote enviado a cada processo
+TAMANHO_LOTE = 2000
+
+# Colunas gravadas pela classificação
+COLUNAS_DEIA = ["tem_deia", "deia_encontrado", "deia_descritores", "deia_campos"]
+
+
+def _classificar_lote(
+    lote: pd.DataFrame, campos: Sequence[str], descritores: tuple
+) -> pd.DataFrame:
+    """Classifica um lote (executado nos processos do pool)."""
+    return obter_buscador(descritores).classificar(lote, campos)
+
+
+def _normalizar_ids(valores: pd.Series) -> pd.Series:
+    """Códigos de curso como texto ("47017"), como no armazém de textos."""
+    return pd.to_numeric(valores, errors="coerce").astype("Int64").astype("string")
+
+
+def anexar_textos(
+    dados: pd.DataFrame, textos: ArmazemTextos, campos: Sequence[str]
+) -> pd.DataFrame:
+    """
+    Completa os campos de texto com os textos armazenados de cada curso.
+
+    Args:
+        dados: Registros com co_seq_curso
+        textos: Armazém de textos da coleta
+        campos: Campos desejados (os já preenchidos em ``dados`` prevalecem)
+
+    Returns:
+        Cópia de ``dados`` com os campos do armazém
+    """
+    armazenados = textos.carregar(campos=campos)
+    if armazenados.empty or "co_seq_curso" not in dados.columns:
+        return dados
+
+    dados = dados.copy()
+    ids = _normalizar_ids(dados["co_seq_curso"])
+    for campo in armazenados.columns:
+        valores = ids.map(armazenados[campo]).astype(object)
+        if campo in dados.columns:
+            valores = dados[campo].astype(object).where(dados[campo].notna(), valores)
+        dados[campo] = valores.to_numpy()
+    return dados
+
+
+def reclassificar(
+    dados: pd.DataFrame,
+    descritores: Sequence[str] = DESCRITORES_DEIA,
+    campos: Sequence[str] = CAMPOS_DEIA,
+    processos: Optional[int] = None,
+    textos: Optional[ArmazemTextos] = None,
+    tamanho_lote: int = TAMANHO_LOTE,
+) -> pd.DataFrame:
+    """
+    Reclassifica todos os registros com a lista de descritores informada.
+
+    Args:
+        dados: Registros coletados
+        descritores: Descritores DEIA
+        campos: Campos de texto analisados
+        processos: Processos em paralelo (padrão: um por núcleo; 1 executa
+            no processo atual)
+        textos: Armazém com os textos longos dos cursos (opcional)
+        tamanho_lote: Registros por lote
+
+    Returns:
+        Cópia de ``dados`` com as colunas de ``COLUNAS_DEIA`` atualizadas
+    """
+    processos = processos or os.cpu_count() or 1
+    trabalho = dados[[campo for campo in ["co_seq_curso", *campos] if campo in dados]]
+    if textos is not None:
+        trabalho = anexar_textos(trabalho, textos, campos)
+    trabalho = trabalho[[campo for campo in campos if campo in trabalho.columns]]
+
+    lotes = [
+        trabalho.iloc[inicio : inicio + tamanho_lote]
+        for inicio in range(0, len(trabalho), tamanho_lote)
+    ]
+    descritores = tuple(descritores)
+
+    if processos > 1 and len(lotes) > 1:
+        with ProcessPoolExecutor(max_workers=min(processos, len(lotes))) as executor:
+            resultados = list(
+                executor.map(
+                    _classificar_lote, lotes, repeat(campos), repeat(descritores)
+                )
+            )
+    else:
+        resultados = [_classificar_lote(lote, campos, descritores) for lote in lotes]
+
+    classificacao = (
+        pd.concat(resultados)
+        if resultados
+        else obter_buscador(descritores).classificar(trabalho, campos)
+    )
+
+    dados = dados.copy()
+    for coluna in COLUNAS_DEIA:
+        dados[coluna] = classificacao[coluna].to_numpy()
+    return dados
+
+
+def _ler(caminho: str) -> pd.DataFrame:
+    """Lê um snapshot Parquet ou um CSV da coleta."""
+    if caminho.endswith(".parquet"):
+        return pd.read_parquet(caminho)
+    return pd.read_csv(caminho, encoding="utf-8-sig", low_memory=False)
+
+
+def _gravar(dados: pd.DataFrame, caminho: str):
+    """Grava no mesmo formato da entrada (tmp + rename)."""
+    temporario = f"{caminho}.tmp"
+    if caminho.endswith(".parquet"):
+        dados.to_parquet(temporario, index=False, compression="zstd")
+    else:
+        dados.to_csv(temporario, index=False, encoding="utf-8-sig")
+    os.replace(temporario, caminho)
+
+
+def ler_descritores(caminho: str) -> List[str]:
+    """
+    Lê uma lista de descritores (um por linha; "#" inicia comentário).
+
+    Args:
+        caminho: Arquivo texto
+
+    Returns:
+        Descritores na ordem do arquivo
+    """
+    with open(caminho, encoding="utf-8") as f:
+        linhas = (linha.split("#", 1)[0].strip() for linha in f)
+        return [linha for linha in linhas if linha]
+
+
+def reclassificar_arquivo(
+    entrada: str,
+    saida: str = None,
+    descritores: Sequence[str] = DESCRITORES_DEIA,
+    processos: Optional[int] = None,
+    caminho_textos: Optional[str] = CAMINHO_PADRAO,
+) -> Dict:
+    """
+    Reclassifica um snapshot e grava o resultado.
+
+    Args:
+        entrada: Snapshot Parquet ou CSV da coleta
+        saida: Arquivo de saída (padrão: ``<entrada>_deia`` no mesmo formato)
+        descritores: Descritores DEIA
+        processos: Processos em paralelo (padrão: um por núcleo)
+        caminho_textos: Armazém de textos (ignorado se não existir)
+
+    Returns:
+        Dicionário com registros, contagens de DEIA antes/depois,
+        registros alterados, tempo e arquivo de saída
+    """
+    inicio = time.time()
+    if saida is None:
+        base, extensao = os.path.splitext(entrada)
+        saida = f"{base}_deia{extensao}"
+
+    dados = _ler(entrada)
+    textos = (
+        ArmazemTextos(caminho_textos)
+        if caminho_textos and os.path.exists(caminho_textos)
+        else None
+    )
+    try:
+        resultado = reclassificar(
+            dados, descritores, processos=processos, textos=textos
+        )
+    finally:
+        if textos is not None:
+            textos.fechar()
+
+    _gravar(resultado, saida)
+
+    antes = (
+        dados["tem_deia"].astype(object)
+        if "tem_deia" in dados.columns
+        else pd.Series(None, index=dados.index, dtype=object)
+    )
+    return {
+        "registros": len(dados),
+        "deia_antes": int((antes == "Sim").sum()),
+        "deia_depois": int((resultado["tem_deia"] == "Sim").sum()),
+        "alterados": int((antes != resultado["tem_deia"]).sum()),
+        "tempo": time.time() - inicio,
+        "saida": saida,
+    }
+
+
+def main(argv: List[str] = None):
+    """
+    Reclassificação DEIA offline pela linha de comando.
+
+    Args:
+        argv: Argumentos de linha de comando (padrão: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Reclassificação DEIA offline")
+    parser.add_argument("entrada", help="Snapshot Parquet ou CSV da coleta")
+    parser.add_argument(
+        "--saida", default=None, help="Arquivo de saída (padrão: <entrada>_deia)"
+    )
+    parser.add_argument(
+        "--descritores",
+        metavar="ARQUIVO",
+        default=None,
+        help="Lista de descritores, um por linha (padrão: DESCRITORES_DEIA)",
+    )
+    parser.add_argument(
+        "--processos",
+        type=int,
+        default=None,
+        help="Processos em paralelo (padrão: um por núcleo)",
+    )
+    parser.add_argument(
+        "--textos",
+        default=CAMINHO_PADRAO,
+        help=f"Armazém de textos dos cursos (padrão: {CAMINHO_PADRAO})",
+    )
+    args = parser.parse_args(argv)
+
+    descritores = (
+        ler_descritores(args.descritores) if args.descritores else DESCRITORES_DEIA
+    )
+    print(f"🔄 Reclassificando {args.entrada} com {len(descritores)} descritores...")
+
+    resumo = reclassificar_arquivo(
+        args.entrada,
+        args.saida,
+        descritores=descritores,
+        processos=args.processos,
+        caminho_textos=args.textos,
+    )
+
+    print(f"✅ {resumo['registros']:,} registros em {resumo['tempo']:.1f}s")
+    print(f"   • DEIA antes: {resumo['deia_antes']:,}")
+    print(f"   • DEIA depois: {resumo['deia_depois']:,}")
+    print(f"   • Registros alterados: {resumo['alterados']:,}")
+    print(f"📁 Resultado: {resumo['saida']}")
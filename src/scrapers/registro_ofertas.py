@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de Ofertas - Controle Global das Ofertas Buscadas
+==========================================================
+
+Livro-razão das ofertas de todas as coletas, persistido em SQLite:
+- cada oferta é buscada no máximo uma vez por coleta, mesmo quando
+  aparece em vários cursos ou várias vezes na mesma página
+- buscas simultâneas da mesma oferta esperam a primeira terminar
+- o status da última busca (ok/erro), o número de tentativas e os dados
+  ficam gravados, de modo que a retomada de uma coleta não repete ofertas
+  já buscadas com sucesso (as que falharam são buscadas de novo)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict
+
+CAMINHO_PADRAO = os.path.join("data", "registro_ofertas.db")
+
+STATUS_OK = "ok"
+STATUS_ERRO = "erro"
+
+
+class RegistroOfertas:
+    """Ofertas buscadas por coleta, com status, em um banco SQLite."""
+
+    def __init__(self, coleta: str, caminho: str = CAMINHO_PADRAO):
+        """
+        Abre (ou cria) o registro.
+
+        Args:
+            coleta: Identificador da coleta em andamento (id_execucao)
+            caminho: Arquivo SQLite do registro
+        """
+        self.coleta = coleta
+        self.caminho = caminho
+        if os.path.dirname(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        # Ofertas sendo buscadas agora (id_oferta -> resultado futuro)
+        self._em_andamento: Dict[str, Future] = {}
+        self.contagem = {"buscadas": 0, "repetidas": 0, "reaproveitadas": 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ofertas (
+                id_oferta TEXT PRIMARY KEY,
+                id_curso TEXT,
+                coleta TEXT NOT NULL,
+                status TEXT NOT NULL,
+                tentativas INTEGER NOT NULL DEFAULT 1,
+                erro TEXT,
+                dados TEXT,
+                buscada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ofertas_coleta ON ofertas(coleta, status)"
+        )
+        self._conn.commit()
+
+    def obter(
+        self, id_oferta: str, id_curso: str, buscar: Callable[[str], Dict]
+    ) -> Dict:
+        """
+        Dados de uma oferta, buscando-a só se ainda não foi buscada com
+        sucesso nesta coleta.
+
+        Args:
+            id_oferta: ID da oferta
+            id_curso: Curso em que a oferta foi encontrada
+            buscar: Função que busca a oferta no portal (devolve um dicionário,
+                com a chave "erro" em caso de falha)
+
+        Returns:
+            Cópia dos dados da oferta
+        """
+        id_oferta = str(id_oferta)
+        with self._lock:
+            linha = self._conn.execute(
+                """
+                SELECT dados FROM ofertas
+                WHERE id_oferta = ? AND coleta = ? AND status = ?
+            """,
+                (id_oferta, self.coleta, STATUS_OK),
+            ).fetchone()
+            if linha is not None:
+                self.contagem["reaproveitadas"] += 1
+                return json.loads(linha[0])
+
+            futuro = self._em_andamento.get(id_oferta)
+            dono = futuro is None
+            if dono:
+                futuro = self._em_andamento[id_oferta] = Future()
+                self.contagem["buscadas"] += 1
+            else:
+                self.contagem["repetidas"] += 1
+
+        if not dono:
+            return dict(futuro.result())
+
+        dados, falha = None, None
+        try:
+            try:
+                dados = buscar(id_oferta)
+            except Exception as e:
+                falha, dados = e, {"id_oferta": id_oferta, "erro": str(e)}
+            try:
+                self._registrar(id_oferta, id_curso, dados)
+            except Exception as e:
+                falha = falha or e
+        finally:
+            # Resolve o futuro em qualquer caso, para não deixar esperando
+            # as buscas repetidas da mesma oferta
+            with self._lock:
+                self._em_andamento.pop(id_oferta, None)
+            if falha is None and dados is not None:
+                futuro.set_result(dados)
+            else:
+                futuro.set_exception(falha or RuntimeError("Busca interrompida"))
+
+        if falha is not None:
+            raise falha
+        return dict(dados)
+
+    def _registrar(self, id_oferta: str, id_curso: str, dados: Dict):
+        """Grava o resultado de uma busca."""
+        erro = dados.get("erro")
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO ofertas (id_oferta, id_curso, coleta, status, erro, dados)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id_oferta) DO UPDATE SET
+                    id_curso = excluded.id_curso,
+                    coleta = excluded.coleta,
+                    status = excluded.status,
+                    tentativas = ofertas.tentativas + 1,
+                    erro = excluded.erro,
+                    dados = excluded.dados,
+                    buscada_em = CURRENT_TIMESTAMP
+            """,
+                (
+                    id_oferta,
+                    str(id_curso),
+                    self.coleta,
+                    STATUS_ERRO if erro else STATUS_OK,
+                    erro,
+                    json.dumps(dados, ensure_ascii=False, default=str),
+                ),
+            )
+            self._conn.commit()
+
+    def estatisticas(self) -> Dict:
+        """
+        Resumo do registro para a coleta em andamento e no total.
+
+        Returns:
+            Dicionário com buscadas, repetidas (aguardaram uma busca em
+            andamento), reaproveitadas (já gravadas nesta coleta, inclusive
+            antes de uma retomada), erros da coleta e total de ofertas
+            conhecidas
+        """
+        with self._lock:
+            erros, conhecidas = self._conn.execute(
+                """
+                SELECT
+                    COUNT(CASE WHEN coleta = ? AND status = ? THEN 1 END),
+                    COUNT(*)
+                FROM ofertas
+            """,
+                (self.coleta, STATUS_ERRO),
+            ).fetchone()
+            return {**self.contagem, "erros": erros, "conhecidas": conhecidas}
+
+    def fechar(self):
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
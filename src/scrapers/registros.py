@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registros - Modelo Enxuto dos Dados Coletados
+=============================================
+
+A coleta grava um registro por curso, com os campos do curso uma única
+vez e as ofertas em uma lista à parte:
+
+    {"co_seq_curso": 44538, "no_curso": "...", ..., "pagina_coleta": 1,
+     "ofertas": [{"id_oferta": "4453801", "vagas": "30", ...}, ...]}
+
+Os metadados da execução (versão, tipo de coleta, horários) ficam uma
+única vez no snapshot. A visão plana usada pelas análises (uma linha por
+oferta, com os campos do curso repetidos) é montada sob demanda:
+- ``linhas_planas``: um registro -> dicionários planos (Python puro)
+- ``visao_plana``: lote de registros -> DataFrame (junção no pandas)
+- ``tipos_visao_plana``: colunas da visão plana e os tipos dos seus
+  valores, sem montá-la (esquema para gravar a coleta em lotes)
+
+Registros no formato plano antigo (sem ``ofertas``) são aceitos pelas duas
+funções e devolvidos como estão.
+"""
+
+from typing import Dict, Iterable, List, Set
+
+import pandas as pd
+
+# Campos de um registro que vêm da oferta (e não da listagem do curso)
+CAMPOS_OFERTA = [
+    "id_oferta",
+    "url_oferta",
+    "codigo_oferta",
+    "vagas",
+    "publico_alvo",
+    "local_oferta",
+    "formato",
+    "programas_governo",
+    "temas",
+    "decs",
+    "descricao_oferta",
+    "palavras_chave",
+]
+
+# Campos do formato plano antigo que o modelo enxuto não grava mais: os
+# metadados vão para o snapshot e os campos processados eram derivados dos
+# demais
+CAMPOS_DESCARTADOS = ["metadata_coleta", "campos_processados"]
+
+
+def registro_curso(curso: Dict, ofertas: List[Dict], erro: str = None) -> Dict:
+    """
+    Monta o registro enxuto de um curso.
+
+    Args:
+        curso: Campos do curso (listagem)
+        ofertas: Dados de cada oferta, só com campos da oferta
+        erro: Motivo de o curso não ter ofertas (opcional)
+
+    Returns:
+        Registro com os campos do curso e a lista ``ofertas``
+    """
+    registro = {**curso, "ofertas": ofertas}
+    if erro:
+        registro["erro"] = erro
+    return registro
+
+
+def separar_registro_plano(linhas: List[Dict]) -> Dict:
+    """
+    Converte as linhas planas de um curso (formato antigo) em registro
+    enxuto.
+
+    Args:
+        linhas: Linhas planas de um mesmo curso
+
+    Returns:
+        Registro enxuto equivalente
+    """
+    oferta_campos = set(CAMPOS_OFERTA) | {"id_curso", "erro"}
+    curso = {
+        campo: valor
+        for campo, valor in linhas[0].items()
+        if campo not in oferta_campos and campo not in CAMPOS_DESCARTADOS
+    }
+    ofertas = [
+        {
+            campo: linha[campo]
+            for campo in CAMPOS_OFERTA + ["erro"]
+            if campo in linha and (campo != "erro" or linha[campo])
+        }
+        for linha in linhas
+        if linha.get("id_oferta")
+    ]
+    return registro_curso(curso, ofertas, None if ofertas else linhas[0].get("erro"))
+
+
+def linhas_planas(registro: Dict) -> List[Dict]:
+    """
+    Visão plana de um registro: uma linha por oferta (ou uma linha só com
+    o curso, quando não há ofertas).
+
+    Args:
+        registro: Registro enxuto (ou linha plana antiga)
+
+    Returns:
+        Linhas planas, no formato gravado pelas versões anteriores
+    """
+    if "ofertas" not in registro:
+        return [registro]
+
+    curso = {
+        campo: valor
+        for campo, valor in registro.items()
+        if campo not in ("ofertas", "erro")
+    }
+    if not registro["ofertas"]:
+        return [{**curso, "id_oferta": "", "erro": registro.get("erro", "")}]
+    return [
+        {**curso, **oferta, "id_curso": curso.get("co_seq_curso")}
+        for oferta in registro["ofertas"]
+    ]
+
+
+def visao_plana(registros: List[Dict]) -> pd.DataFrame:
+    """
+    Monta a visão plana de um lote de registros com uma junção no pandas.
+
+    Args:
+        registros: Registros enxutos (linhas planas antigas são mantidas)
+
+    Returns:
+        DataFrame com uma linha por oferta, na ordem dos registros
+    """
+    enxutos = [registro for registro in registros if "ofertas" in registro]
+    if len(enxutos) < len(registros):
+        # Lote com formato antigo: achatamento registro a registro
+        return pd.DataFrame(
+            [linha for registro in registros for linha in linhas_planas(registro)]
+        )
+    if not enxutos:
+        return pd.DataFrame()
+
+    cursos = pd.DataFrame(
+        [
+            {
+                campo: valor
+                for campo, valor in registro.items()
+                if campo not in ("ofertas", "erro")
+            }
+            for registro in enxutos
+        ]
+    )
+    cursos["_curso"] = range(len(cursos))
+    erros_curso = pd.Series(
+        [registro.get("erro", "") for registro in enxutos], index=cursos["_curso"]
+    )
+
+    ofertas = pd.DataFrame(
+        [
+            {**oferta, "_curso": posicao}
+            for posicao, registro in enumerate(enxutos)
+            for oferta in registro["ofertas"]
+        ]
+    )
+    if ofertas.empty:
+        ofertas = pd.DataFrame(columns=["_curso", "id_oferta"])
+    # Objeto antes da junção: a junção não converte IDs inteiros em float e a
+    # coluna aceita o "" dos cursos sem oferta
+    ofertas["id_oferta"] = ofertas["id_oferta"].astype(object)
+
+    # Campos da oferta prevalecem sobre os do curso de mesmo nome
+    repetidos = [c for c in ofertas.columns if c in cursos.columns and c != "_curso"]
+    plana = cursos.drop(columns=repetidos).merge(ofertas, on="_curso", how="left")
+
+    sem_oferta = plana["id_oferta"].isna()
+    plana["id_oferta"] = plana["id_oferta"].where(~sem_oferta, "")
+    if "co_seq_curso" in plana.columns:
+        plana["id_curso"] = plana["co_seq_curso"].astype(object).where(~sem_oferta)
+    if "erro" not in plana.columns:
+        plana["erro"] = pd.Series(pd.NA, index=plana.index, dtype=object)
+    plana["erro"] = plana["erro"].where(~sem_oferta, plana["_curso"].map(erros_curso))
+    return plana.drop(columns="_curso")
+
+
+def tipos_visao_plana(registros: Iterable[Dict]) -> Dict[str, Set[type]]:
+    """
+    Colunas da visão plana de uma coleta e os tipos Python dos valores de
+    cada uma, sem montar a visão.
+
+    Args:
+        registros: Registros enxutos (ou linhas planas antigas)
+
+    Returns:
+        Dicionário coluna -> tipos dos valores não nulos, na ordem em que
+        as colunas aparecem
+    """
+    tipos: Dict[str, Set[type]] = {}
+
+    def anotar(campos: Dict):
+        for campo, valor in campos.items():
+            vistos = tipos.setdefault(campo, set())
+            if valor is not None:
+                vistos.add(type(valor))
+
+    for registro in registros:
+        if "ofertas" not in registro:
+            anotar(registro)
+            continue
+        anotar({c: v for c, v in registro.items() if c not in ("ofertas", "erro")})
+        for oferta in registro["ofertas"]:
+            anotar(oferta)
+        if registro["ofertas"]:
+            anotar({"id_curso": registro.get("co_seq_curso")})
+        else:
+            anotar({"id_oferta": "", "erro": registro.get("erro") or None})
+
+    for campo in ("id_oferta", "erro"):
+        tipos.setdefault(campo, set())
+    return tipos
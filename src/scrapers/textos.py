@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Textos - Armazenamento Comprimido dos Textos dos Cursos
+=======================================================
+
+Guarda uma única vez, comprimidos, os textos completos de cada curso
+(página do curso, descrição, palavras-chave), para que a classificação
+DEIA possa ser refeita offline com outra lista de descritores, sem nova
+coleta:
+- um banco SQLite com uma linha por (curso, campo) e o texto em zlib
+- textos iguais aos já armazenados não são regravados (comparação por hash)
+- seguro para uso entre threads (coletas concorrentes)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+from bs4 import BeautifulSoup, CData, NavigableString
+
+CAMINHO_PADRAO = os.path.join("data", "textos_cursos.db")
+
+# Campos longos do curso que não vão para os snapshots da coleta
+CAMPOS_ARMAZENADOS = ["ds_curso", "palavras_chave_curso", "texto_pagina_inicial"]
+
+# Nível de compressão zlib (6: bom equilíbrio entre tamanho e tempo)
+NIVEL_COMPRESSAO = 6
+
+
+def extrair_texto_visivel(soup: BeautifulSoup) -> str:
+    """
+    Texto visível de uma página, sem scripts e estilos e com espaços
+    normalizados.
+
+    Args:
+        soup: Página já parseada (não é alterada)
+
+    Returns:
+        Texto limpo da página
+    """
+    texto_completo = "".join(
+        texto
+        for texto in soup.find_all(string=True)
+        if type(texto) in (NavigableString, CData)
+        and texto.parent.name not in ("script", "style")
+    )
+
+    linhas = (linha.strip() for linha in texto_completo.splitlines())
+    chunks = (frase.strip() for linha in linhas for frase in linha.split("  "))
+    return " ".join(chunk for chunk in chunks if chunk)
+
+
+class ArmazemTextos:
+    """Textos completos dos cursos, comprimidos em um banco SQLite."""
+
+    def __init__(self, caminho: str = CAMINHO_PADRAO):
+        """
+        Abre (ou cria) o armazém.
+
+        Args:
+            caminho: Arquivo SQLite do armazém
+        """
+        self.caminho = caminho
+        if os.path.dirname(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS textos (
+                co_seq_curso TEXT NOT NULL,
+                campo TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                texto BLOB NOT NULL,
+                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (co_seq_curso, campo)
+            )
+        """
+        )
+        self._conn.commit()
+
+    def salvar(self, id_curso, campos: Dict[str, Optional[str]]) -> int:
+        """
+        Grava os textos de um curso (só os novos ou alterados).
+
+        Args:
+            id_curso: Código do curso (co_seq_curso)
+            campos: Dicionário campo -> texto (vazios são ignorados)
+
+        Returns:
+            Quantidade de textos gravados
+        """
+        linhas = []
+        for campo, texto in campos.items():
+            if not isinstance(texto, str) or not texto:
+                continue
+            dados = texto.encode("utf-8")
+            linhas.append(
+                (
+                    str(id_curso),
+                    campo,
+                    hashlib.sha1(dados).hexdigest(),
+                    len(dados),
+                    zlib.compress(dados, NIVEL_COMPRESSAO),
+                )
+            )
+        if not linhas:
+            return 0
+
+        with self._lock:
+            antes = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO textos (co_seq_curso, campo, hash, tamanho, texto)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (co_seq_curso, campo) DO UPDATE SET
+                    hash = excluded.hash,
+                    tamanho = excluded.tamanho,
+                    texto = excluded.texto,
+                    atualizado_em = CURRENT_TIMESTAMP
+                WHERE textos.hash IS NOT excluded.hash
+            """,
+                linhas,
+            )
+            self._conn.commit()
+            return self._conn.total_changes - antes
+
+    def carregar(
+        self, campos: Iterable[str] = None, ids: Iterable = None
+    ) -> pd.DataFrame:
+        """
+        Lê os textos descomprimidos em formato largo.
+
+        Args:
+            campos: Campos a ler (padrão: todos)
+            ids: Cursos a ler (padrão: todos)
+
+        Returns:
+            DataFrame indexado por co_seq_curso (texto) com uma coluna por
+            campo
+        """
+        condicoes, parametros = [], []
+        if campos is not None:
+            campos = list(campos)
+            condicoes.append(f"campo IN ({', '.join('?' for _ in campos)})")
+            parametros.extend(campos)
+        if ids is not None:
+            ids = [str(id_curso) for id_curso in ids]
+            condicoes.append(f"co_seq_curso IN ({', '.join('?' for _ in ids)})")
+            parametros.extend(ids)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        with self._lock:
+            linhas = self._conn.execute(
+                f"SELECT co_seq_curso, campo, texto FROM textos {where}", parametros
+            ).fetchall()
+
+        longo = pd.DataFrame(
+            [
+                (id_curso, campo, zlib.decompress(texto).decode("utf-8"))
+                for id_curso, campo, texto in linhas
+            ],
+            columns=["co_seq_curso", "campo", "texto"],
+        )
+        return longo.pivot(index="co_seq_curso", columns="campo", values="texto")
+
+    def estatisticas(self) -> Dict:
+        """
+        Cursos, textos e bytes armazenados (original e comprimido).
+
+        Returns:
+            Dicionário com cursos, textos, bytes_originais e bytes_comprimidos
+        """
+        with self._lock:
+            cursos, textos, originais, comprimidos = self._conn.execute(
+                """
+                SELECT
+                    COUNT(DISTINCT co_seq_curso),
+                    COUNT(*),
+                    COALESCE(SUM(tamanho), 0),
+                    COALESCE(SUM(LENGTH(texto)), 0)
+                FROM textos
+            """
+            ).fetchone()
+        return {
+            "cursos": cursos,
+            "textos": textos,
+            "bytes_originais": originais,
+            "bytes_comprimidos": comprimidos,
+        }
+
+    def fechar(self):
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Utils - Utilitários para Scraping UNA-SUS
+=========================================
+
+Camada HTTP compartilhada pelos coletores:
+- LimitadorTaxa: orçamento global de requisições por segundo
+- ClienteHTTP: sessão persistente (pool de conexões, keep-alive) com
+  retentativas em 429/5xx usando backoff exponencial com jitter e
+  respeitando o cabeçalho Retry-After e, opcionalmente, cache em disco
+  das respostas GET (ver cache_http) e transporte injetável para
+  gravação/reprodução offline (ver gravacao)
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from .cache_http import CacheHTTP
+
+# Status HTTP considerados transitórios
+STATUS_RETENTAVEIS = {429, 500, 502, 503, 504}
+
+
+class LimitadorTaxa:
+    """
+    Limitador global de requisições por segundo.
+
+    Compartilhado entre todas as threads: cada requisição reserva o próximo
+    horário livre, mantendo a carga sobre o portal constante
+    independentemente do número de workers.
+    """
+
+    def __init__(self, requisicoes_por_segundo: float):
+        """
+        Inicializa o limitador.
+
+        Args:
+            requisicoes_por_segundo: Orçamento global (0 desativa o limite)
+        """
+        self.intervalo = (
+            1.0 / requisicoes_por_segundo if requisicoes_por_segundo > 0 else 0.0
+        )
+        self._lock = threading.Lock()
+        self._proximo_horario = time.monotonic()
+
+    def aguardar(self):
+        """Bloqueia até que a próxima requisição esteja dentro do orçamento."""
+        if not self.intervalo:
+            return
+
+        with self._lock:
+            agora = time.monotonic()
+            horario = max(agora, self._proximo_horario)
+            self._proximo_horario = horario + self.intervalo
+
+        espera = horario - agora
+        if espera > 0:
+            time.sleep(espera)
+
+
+class ClienteHTTP:
+    """
+    Cliente HTTP compartilhado pelos coletores UNA-SUS.
+
+    Reaproveita conexões TCP/TLS entre requisições e trata erros
+    transitórios com backoff exponencial em vez de pausas fixas.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        requisicoes_por_segundo: float = 0.0,
+        max_conexoes: int = 10,
+        max_tentativas: int = 5,
+        backoff_base: float = 1.0,
+        backoff_maximo: float = 60.0,
+        timeout: float = 30,
+        logger: Optional[logging.Logger] = None,
+        cache: Optional[CacheHTTP] = None,
+        adaptador: Optional[BaseAdapter] = None,
+    ):
+        """
+        Inicializa o cliente.
+
+        Args:
+            headers: Cabeçalhos padrão da sessão
+            requisicoes_por_segundo: Orçamento global (0 desativa o limite)
+            max_conexoes: Tamanho do pool de conexões por host
+            max_tentativas: Número máximo de tentativas por requisição
+            backoff_base: Espera base (segundos) da primeira retentativa
+            backoff_maximo: Teto da espera entre tentativas
+            timeout: Timeout padrão das requisições
+            logger: Logger para registrar retentativas
+            cache: Cache em disco para as requisições GET (None desativa)
+            adaptador: Transporte a usar no lugar do HTTPAdapter padrão
+                (ex.: gravação/reprodução offline)
+        """
+        self.max_tentativas = max(1, max_tentativas)
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.limitador = LimitadorTaxa(requisicoes_por_segundo)
+        self.cache = cache
+
+        self.sessao = requests.Session()
+        self.usar_adaptador(
+            adaptador
+            or HTTPAdapter(
+                pool_connections=max_conexoes, pool_maxsize=max_conexoes, max_retries=0
+            )
+        )
+        if headers:
+            self.sessao.headers.update(headers)
+
+    def usar_adaptador(self, adaptador: BaseAdapter):
+        """Monta o transporte da sessão para http e https."""
+        self.sessao.mount("https://", adaptador)
+        self.sessao.mount("http://", adaptador)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Executa um GET com retentativas."""
+        return self.requisitar("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Executa um POST com retentativas."""
+        return self.requisitar("POST", url, **kwargs)
+
+    def requisitar(self, metodo: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executa uma requisição, servindo GETs do cache quando possível.
+
+        Entradas dentro do TTL são devolvidas sem acessar a rede; entradas
+        vencidas são revalidadas com os validadores armazenados (ETag e
+        Last-Modified) e um 304 devolve o corpo do cache.
+
+        Returns:
+            Resposta final (a última recebida, mesmo que com erro HTTP)
+        """
+        if self.cache is None or metodo.upper() != "GET":
+            return self._requisitar_rede(metodo, url, **kwargs)
+
+        url_completa = (
+            requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        )
+        entrada = self.cache.obter(url_completa)
+        if entrada is not None:
+            if self.cache.fresca(entrada):
+                return self.cache.resposta(entrada)
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                **self.cache.validadores(entrada),
+            }
+
+        resp = self._requisitar_rede(metodo, url, **kwargs)
+
+        if resp.status_code == 304 and entrada is not None:
+            self.cache.renovar(url_completa, entrada)
+            return self.cache.resposta(entrada)
+        if resp.status_code == 200:
+            self.cache.armazenar(url_completa, resp)
+        return resp
+
+    def _requisitar_rede(self, metodo: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executa uma requisição respeitando o orçamento e retentando falhas
+        transitórias (erros de conexão, timeouts, 429 e 5xx).
+
+        Returns:
+            Resposta final (a última recebida, mesmo que com erro HTTP)
+
+        Raises:
+            requests.RequestException: se todas as tentativas falharem
+                por erro de conexão/timeout
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        for tentativa in range(1, self.max_tentativas + 1):
+            self.limitador.aguardar()
+            try:
+                resp = self.sessao.request(metodo, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if tentativa == self.max_tentativas:
+                    raise
+                espera = self.calcular_espera(tentativa)
+                motivo = str(e)
+            else:
+                if (
+                    resp.status_code not in STATUS_RETENTAVEIS
+                    or tentativa == self.max_tentativas
+                ):
+                    return resp
+                retry_after = self._ler_retry_after(resp)
+                espera = (
+                    min(retry_after, self.backoff_maximo)
+                    if retry_after is not None
+                    else self.calcular_espera(tentativa)
+                )
+                motivo = f"status {resp.status_code}"
+                resp.close()
+
+            self.logger.warning(
+                f"⚠️ {metodo} {url}: {motivo}. "
+                f"Tentativa {tentativa}/{self.max_tentativas}, "
+                f"aguardando {espera:.1f}s..."
+            )
+            time.sleep(espera)
+
+    def calcular_espera(self, tentativa: int) -> float:
+        """Backoff exponencial com jitter completo para a tentativa informada."""
+        teto = min(self.backoff_maximo, self.backoff_base * (2 ** (tentativa - 1)))
+        return random.uniform(0, teto)
+
+    @staticmethod
+    def _ler_retry_after(resp: requests.Response) -> Optional[float]:
+        """Interpreta o cabeçalho Retry-After (segundos ou data HTTP)."""
+        valor = resp.headers.get("Retry-After")
+        if not valor:
+            return None
+
+        valor = valor.strip()
+        if valor.isdigit():
+            return float(valor)
+
+        try:
+            data = parsedate_to_datetime(valor)
+        except (TypeError, ValueError):
+            return None
+        if data.tzinfo is None:
+            data = data.replace(tzinfo=timezone.utc)
+        return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+
+    def fechar(self):
+        """Fecha a sessão e libera as conexões do pool."""
+        self.sessao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -176,6 +176,7 @@ def mostrar_menu():
     print("  6. 📈 Análise Completa dos Dados")
     print("  7. 📊 Estatísticas Básicas")
     print("  8. 📋 Gerar Relatórios")
+    print("  9. 🔎 Buscar Cursos por Assunto")
     print("  0. ❌ Sair")
     print()
 
@@ -344,58 +345,160 @@ def gerar_relatorios():
         print(f"❌ Erro inesperado: {e}")
 
 
+def origem_busca_mais_recente():
+    """
+    Dados mais recentes da coleta para montar o índice de busca: o
+    snapshot Parquet, o JSON Lines ou o CSV exportado, o que for mais novo.
+
+    Returns:
+        Caminho do arquivo, ou None se não houver coleta
+    """
+    candidatos = []
+
+    try:
+        from analise.snapshot import listar_snapshots, pyarrow_disponivel
+
+        if pyarrow_disponivel():
+            candidatos.extend(listar_snapshots()[-1:])
+    except ImportError:
+        pass
+
+    if os.path.exists("data"):
+        for extensao in (".jsonl.gz", ".csv"):
+            arquivos = sorted(
+                arquivo
+                for arquivo in os.listdir("data")
+                if arquivo.startswith("unasus_database_geral_")
+                and arquivo.endswith(extensao)
+            )
+            candidatos.extend(os.path.join("data", a) for a in arquivos[-1:])
+
+    return max(candidatos, key=os.path.getmtime) if candidatos else None
+
+
+def mostrar_resultados_busca(resultados):
+    """
+    Imprime os cursos encontrados, do mais ao menos relevante.
+
+    Args:
+        resultados: Cursos devolvidos por ``DatabaseCompleto.buscar``
+    """
+    print(f"\n🎯 {len(resultados)} cursos mais relevantes:")
+    for posicao, curso in enumerate(resultados, 1):
+        print(f"  {posicao}. {curso['no_curso']} ({curso['co_seq_curso']})")
+        print(
+            f"     🏢 {curso['no_orgao']} | 📌 {curso['status']} | "
+            f"📚 {curso['total_ofertas']} ofertas"
+        )
+        print(f"     💬 {curso['trecho']}")
+
+
+def pesquisar_interativamente(db):
+    """
+    Pede termos de busca até o usuário teclar ENTER sem digitar nada.
+
+    Args:
+        db: ``DatabaseCompleto`` com o índice textual
+    """
+    while True:
+        termos = input("\n📝 Termos da busca (ENTER para voltar): ").strip()
+        if not termos:
+            break
+
+        resultados = db.buscar(termos, limite=10)
+        if resultados:
+            mostrar_resultados_busca(resultados)
+        else:
+            print("❌ Nenhum curso encontrado")
+
+
+def buscar_cursos():
+    """Busca cursos por assunto no índice textual do database completo."""
+    print("🔎 Busca de cursos por assunto...")
+
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+        from core.database import DatabaseCompleto
+
+        arquivo_db = "database_completo.db"
+        origem = origem_busca_mais_recente()
+        desatualizado = origem is not None and (
+            not os.path.exists(arquivo_db)
+            or os.path.getmtime(origem) > os.path.getmtime(arquivo_db)
+        )
+        novo = not os.path.exists(arquivo_db)
+        db = DatabaseCompleto(arquivo_db)
+
+        if desatualizado:
+            # Atualizar o database a partir da coleta mais recente
+            print(f"🔄 Atualizando o índice com {origem}...")
+            if not db.carregar_dados_completos(origem) and novo:
+                origem = None
+
+        if novo and origem is None:
+            print("❌ Nenhum dado disponível para a busca!")
+            print("💡 Execute primeiro a varredura completa")
+            return
+
+        if not db.busca_disponivel:
+            print("❌ Este SQLite não tem suporte a busca textual (FTS5)")
+            return
+
+        pesquisar_interativamente(db)
+
+    except ImportError as e:
+        print(f"❌ Erro de importação: {e}")
+    except Exception as e:
+        print(f"❌ Erro inesperado: {e}")
+
+
+def executar_coletor_geral():
+    """Executa o coletor geral diretamente, sem o menu de varredura."""
+    try:
+        from coletor_database_geral import main as run_main
+
+        run_main()
+    except ImportError as e:
+        print(f"❌ Erro de importação: {e}")
+    except Exception as e:
+        print(f"❌ Erro inesperado: {e}")
+
+
+# Ação de cada opção do menu e se ela pausa ao terminar
+OPCOES_MENU = {
+    "1": (executar_varredura_completa, True),
+    "2": (verificar_banco_dados, True),
+    "3": (limpar_dados_coletados, True),
+    "4": (executar_coletor_geral, True),
+    "5": (verificar_dependencias, True),
+    "6": (executar_analise_completa, True),
+    "7": (executar_estatisticas_basicas, True),
+    "8": (gerar_relatorios, True),
+    "9": (buscar_cursos, False),
+}
+
+
 def main():
     """Função principal com menu interativo."""
     while True:
         try:
             mostrar_menu()
 
-            opcao = input("📝 Escolha uma opção (0-8): ").strip()
+            opcao = input("📝 Escolha uma opção (0-9): ").strip()
 
             if opcao == "0":
                 print("👋 Até logo!")
                 break
-            elif opcao == "1":
-                print("\n" + "=" * 50)
-                executar_varredura_completa()
-                input("\n⏸️ Pressione ENTER para continuar...")
-            elif opcao == "2":
-                print("\n" + "=" * 50)
-                verificar_banco_dados()
-                input("\n⏸️ Pressione ENTER para continuar...")
-            elif opcao == "3":
-                print("\n" + "=" * 50)
-                limpar_dados_coletados()
-                input("\n⏸️ Pressione ENTER para continuar...")
-            elif opcao == "4":
-                print("\n" + "=" * 50)
-                try:
-                    from coletor_database_geral import main as run_main
-
-                    run_main()
-                except ImportError as e:
-                    print(f"❌ Erro de importação: {e}")
-                except Exception as e:
-                    print(f"❌ Erro inesperado: {e}")
-                input("\n⏸️ Pressione ENTER para continuar...")
-            elif opcao == "5":
-                print("\n" + "=" * 50)
-                verificar_dependencias()
-                input("\n⏸️ Pressione ENTER para continuar...")
-            elif opcao == "6":
-                print("\n" + "=" * 50)
-                executar_analise_completa()
-                input("\n⏸️ Pressione ENTER para continuar...")
-            elif opcao == "7":
-                print("\n" + "=" * 50)
-                executar_estatisticas_basicas()
-                input("\n⏸️ Pressione ENTER para continuar...")
-            elif opcao == "8":
-                print("\n" + "=" * 50)
-                gerar_relatorios()
+
+            if opcao not in OPCOES_MENU:
+                print("❌ Opção inválida! Digite um número de 0 a 9.")
                 input("\n⏸️ Pressione ENTER para continuar...")
-            else:
-                print("❌ Opção inválida! Digite um número de 0 a 8.")
+                continue
+
+            acao, pausar = OPCOES_MENU[opcao]
+            print("\n" + "=" * 50)
+            acao()
+            if pausar:
                 input("\n⏸️ Pressione ENTER para continuar...")
 
         except KeyboardInterrupt:
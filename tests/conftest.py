@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configuração dos testes: torna importáveis os pacotes da raiz (analise)
+e de src/ (scrapers, core), como fazem os scripts do projeto.
+"""
+
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for caminho in (RAIZ, os.path.join(RAIZ, "src")):
+    if caminho not in sys.path:
+        sys.path.insert(0, caminho)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da agregação por programa em uma única passada, comparada com os
+antigos laços que filtravam os dados uma vez por programa.
+"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from analise.cobertura_programatica import CoberturaProgramatica
+from analise.mapeamento_programas import MapeamentoProgramas
+
+DISTINTAS = {
+    "cursos_unicos": "no_curso",
+    "ofertas_unicas": "id_oferta",
+    "instituicoes": "no_orgao",
+    "areas_tematicas": "area_tematica",
+    "niveis": "no_nivel",
+    "modalidades": "no_formato",
+}
+DIMENSOES = {
+    "cobertura_institucional": "no_orgao",
+    "cobertura_nivel": "no_nivel",
+    "cobertura_modalidade": "no_formato",
+}
+
+
+def por_filtro(dados):
+    """Antigo cálculo: uma máscara e um filtro por programa."""
+    resultado = {}
+    for programa in dados["programas_governo"].dropna().unique():
+        if programa == "":
+            continue
+        do_programa = dados[dados["programas_governo"] == programa]
+        vagas = pd.to_numeric(do_programa["vagas"], errors="coerce")
+        resultado[programa] = {
+            "quantidade_cursos": len(do_programa),
+            **{
+                nome: do_programa[coluna].nunique() if coluna in dados else 0
+                for nome, coluna in DISTINTAS.items()
+            },
+            "total_vagas": vagas.sum(),
+            "media_vagas": vagas.mean(),
+            **{
+                chave: do_programa[coluna].value_counts().to_dict()
+                for chave, coluna in DIMENSOES.items()
+            },
+        }
+    return resultado
+
+
+def iguais(a, b):
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    return a == b
+
+
+@pytest.fixture
+def dados():
+    """Um programa por registro (o antigo laço não separava por vírgula)."""
+    return pd.DataFrame(
+        {
+            "programas_governo": [
+                "UNA-SUS",
+                "UNA-SUS",
+                "Mais Médicos",
+                "UNA-SUS",
+                "",
+                None,
+                "PEP",
+            ],
+            "no_curso": ["A", "A", "B", "C", "D", "E", "F"],
+            "id_oferta": [1, 2, 3, 4, 5, 6, 7],
+            "no_orgao": ["UFAL", "UFAL", "UFMG", "UFPE", "UFAL", "UFAL", "UFBA"],
+            "no_nivel": ["Livre", "Livre", "Especialização", None, "Livre", "", "X"],
+            "no_formato": ["EAD", "EAD", "EAD", "Presencial", "EAD", "EAD", "EAD"],
+            "vagas": ["30", "abc", "", "10", "5", "5", ""],
+        }
+    )
+
+
+def test_mapeamento_igual_ao_filtro_por_programa(dados):
+    esperado = por_filtro(dados)
+
+    mapeamento = MapeamentoProgramas(dados).mapear_programas()
+    encontrados = mapeamento["programas_encontrados"]
+
+    assert list(encontrados) == list(esperado)
+    for programa, antigo in esperado.items():
+        novo = encontrados[programa]
+        assert novo["quantidade_cursos"] == antigo["quantidade_cursos"]
+        for nome in DISTINTAS:
+            assert novo[nome] == antigo[nome], (programa, nome)
+        assert iguais(novo["total_vagas"], antigo["total_vagas"])
+        assert iguais(novo["media_vagas_por_oferta"], antigo["media_vagas"])
+    assert encontrados["UNA-SUS"]["total_vagas"] == 40
+    assert math.isnan(encontrados["PEP"]["media_vagas_por_oferta"])
+
+
+def test_cobertura_igual_ao_filtro_por_programa(dados):
+    esperado = por_filtro(dados)
+
+    cobertura = CoberturaProgramatica(dados).analisar_cobertura()
+    por_programa = cobertura["cobertura_por_programa"]
+
+    assert list(por_programa) == list(esperado)
+    for programa, antigo in esperado.items():
+        novo = por_programa[programa]
+        for chave in DIMENSOES:
+            assert novo[chave] == antigo[chave], (programa, chave)
+        assert novo["total_instituicoes"] == antigo["instituicoes"]
+        assert iguais(novo["total_vagas"], antigo["total_vagas"])
+        assert iguais(novo["media_vagas"], antigo["media_vagas"])
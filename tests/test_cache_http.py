@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cache HTTP em disco (TTL e revalidação condicional), usando o
+adaptador de reprodução no lugar da rede.
+"""
+
+import base64
+import json
+
+from scrapers.cache_http import CacheHTTP
+from scrapers.gravacao import AdaptadorReproducao, ArquivoGravacao
+from scrapers.utils import ClienteHTTP
+
+URL = "https://www.unasus.gov.br/cursos/curso/44538"
+
+
+def gravar_resposta(caminho, status, conteudo=b"", headers=None):
+    """Cria uma gravação com uma única resposta GET para ``URL``."""
+    entrada = {
+        "chave": f"GET {URL}",
+        "metodo": "GET",
+        "url": URL,
+        "status_code": status,
+        "reason": "OK" if status == 200 else "Not Modified",
+        "encoding": "utf-8",
+        "headers": headers or {},
+        "conteudo": base64.b64encode(conteudo).decode("ascii"),
+    }
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(json.dumps(entrada) + "\n")
+    return ArquivoGravacao(str(caminho))
+
+
+class AdaptadorContador(AdaptadorReproducao):
+    """Reprodução que guarda as requisições que chegaram à "rede"."""
+
+    def __init__(self, gravacao):
+        super().__init__(gravacao)
+        self.requisicoes = []
+
+    def send(self, request, **kwargs):
+        self.requisicoes.append(request)
+        return super().send(request, **kwargs)
+
+
+def criar_cliente(cache, gravacao):
+    adaptador = AdaptadorContador(gravacao)
+    return ClienteHTTP(cache=cache, adaptador=adaptador, max_tentativas=1), adaptador
+
+
+def test_resposta_dentro_do_ttl_vem_do_disco(tmp_path):
+    gravacao = gravar_resposta(
+        tmp_path / "200.jsonl", 200, b"<html>curso</html>", {"ETag": '"v1"'}
+    )
+    cache = CacheHTTP(diretorio=str(tmp_path / "cache"), ttl=3600)
+    cliente, adaptador = criar_cliente(cache, gravacao)
+
+    primeira = cliente.get(URL)
+    segunda = cliente.get(URL)
+
+    assert primeira.status_code == 200
+    assert not getattr(primeira, "from_cache", False)
+    assert segunda.from_cache
+    assert segunda.content == b"<html>curso</html>"
+    assert len(adaptador.requisicoes) == 1
+
+
+def test_entrada_vencida_revalida_e_304_devolve_corpo_armazenado(tmp_path):
+    cache = CacheHTTP(diretorio=str(tmp_path / "cache"), ttl=0)
+    cliente, _ = criar_cliente(
+        cache,
+        gravar_resposta(
+            tmp_path / "200.jsonl",
+            200,
+            b"corpo original",
+            {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        ),
+    )
+    cliente.get(URL)
+
+    cliente, adaptador = criar_cliente(
+        cache, gravar_resposta(tmp_path / "304.jsonl", 304)
+    )
+    resp = cliente.get(URL)
+
+    assert resp.status_code == 200
+    assert resp.from_cache
+    assert resp.content == b"corpo original"
+    enviados = adaptador.requisicoes[0].headers
+    assert enviados["If-None-Match"] == '"v1"'
+    assert enviados["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+def test_304_renova_o_ttl_da_entrada(tmp_path):
+    cache = CacheHTTP(diretorio=str(tmp_path / "cache"), ttl=3600)
+    cliente, _ = criar_cliente(
+        cache, gravar_resposta(tmp_path / "200.jsonl", 200, b"x", {"ETag": '"v1"'})
+    )
+    cliente.get(URL)
+
+    # Vence a entrada recuando o horário de armazenamento
+    meta = cache._caminho(URL, "json")
+    with open(meta, encoding="utf-8") as f:
+        dados = json.load(f)
+    dados["armazenado_em"] -= 7200
+    with open(meta, "w", encoding="utf-8") as f:
+        json.dump(dados, f)
+    assert not cache.fresca(cache.obter(URL))
+
+    cliente, adaptador = criar_cliente(
+        cache, gravar_resposta(tmp_path / "304.jsonl", 304)
+    )
+    cliente.get(URL)
+    cliente.get(URL)
+
+    assert cache.fresca(cache.obter(URL))
+    assert len(adaptador.requisicoes) == 1
+
+
+def test_no_store_nao_e_armazenado(tmp_path):
+    gravacao = gravar_resposta(
+        tmp_path / "200.jsonl", 200, b"x", {"Cache-Control": "no-store"}
+    )
+    cache = CacheHTTP(diretorio=str(tmp_path / "cache"), ttl=3600)
+    cliente, adaptador = criar_cliente(cache, gravacao)
+
+    cliente.get(URL)
+    cliente.get(URL)
+
+    assert cache.obter(URL) is None
+    assert len(adaptador.requisicoes) == 2
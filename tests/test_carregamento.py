@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do esquema compacto de carregamento (inteiros anuláveis de tipo
+fixo e categóricos).
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+from analise.carregamento import COLUNAS_INTEIRAS, aplicar_esquema, carregar_csv
+
+
+def test_tipo_fixo_independe_dos_valores():
+    pequenos = aplicar_esquema(pd.DataFrame({"co_seq_curso": [1, 2], "vagas": [3, 4]}))
+    grandes = aplicar_esquema(
+        pd.DataFrame({"co_seq_curso": [4511741, None], "vagas": [30000, None]})
+    )
+
+    assert str(pequenos["co_seq_curso"].dtype) == "Int64"
+    assert str(grandes["co_seq_curso"].dtype) == "Int64"
+    assert str(pequenos["vagas"].dtype) == "Int32"
+    assert str(grandes["vagas"].dtype) == "Int32"
+
+
+def test_todas_as_colunas_inteiras_tem_tipo_anulavel():
+    assert set(COLUNAS_INTEIRAS.values()) <= {"Int32", "Int64"}
+    assert COLUNAS_INTEIRAS["id_oferta"] == "Int64"
+
+
+def test_vazios_viram_nulo_sem_aviso():
+    dados = pd.DataFrame({"id_oferta": ["101", "", " ", None, "102"]})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        resultado = aplicar_esquema(dados)
+
+    assert resultado["id_oferta"].tolist() == [101, pd.NA, pd.NA, pd.NA, 102]
+
+
+def test_valores_nao_inteiros_sao_contados_no_aviso():
+    dados = pd.DataFrame({"vagas": ["30", "muitas", "2.5", "", "40"]})
+
+    with pytest.warns(UserWarning, match="vagas: 2 valores"):
+        resultado = aplicar_esquema(dados)
+
+    assert resultado["vagas"].tolist() == [30, pd.NA, pd.NA, pd.NA, 40]
+    assert str(resultado["vagas"].dtype) == "Int32"
+
+
+def test_valor_fora_da_faixa_do_tipo_e_descartado():
+    with pytest.warns(UserWarning, match="rank: 1"):
+        resultado = aplicar_esquema(pd.DataFrame({"rank": [1, 2**40]}))
+
+    assert resultado["rank"].tolist() == [1, pd.NA]
+
+
+def test_categoricos_e_reaplicacao(tmp_path):
+    caminho = tmp_path / "coleta.csv"
+    pd.DataFrame(
+        {
+            "co_seq_curso": [1, 2, 3],
+            "status": ["encerrado", "encerrado", "com oferta aberta"],
+            "vagas": [30, None, 50],
+            "ds_imagem": ["a.png", "b.png", "c.png"],
+        }
+    ).to_csv(caminho, index=False, encoding="utf-8-sig")
+
+    dados = carregar_csv(str(caminho))
+
+    assert isinstance(dados["status"].dtype, pd.CategoricalDtype)
+    assert "ds_imagem" not in dados.columns
+    assert str(dados["vagas"].dtype) == "Int32"
+    assert aplicar_esquema(dados.copy()).dtypes.equals(dados.dtypes)
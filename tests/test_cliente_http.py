@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do limitador de taxa e das retentativas do cliente HTTP, com um
+relógio falso no lugar de time e um transporte com respostas roteirizadas.
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from scrapers import utils
+from scrapers.utils import ClienteHTTP, LimitadorTaxa
+
+URL = "https://www.unasus.gov.br/cursos/busca"
+
+
+class RelogioFalso:
+    """Substitui o módulo time: sleep apenas avança o relógio."""
+
+    def __init__(self):
+        self.agora = 1000.0
+        self.esperas = []
+
+    def monotonic(self):
+        return self.agora
+
+    def sleep(self, segundos):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+
+class AdaptadorRoteirizado(BaseAdapter):
+    """Devolve, em ordem, as respostas (ou exceções) do roteiro."""
+
+    def __init__(self, roteiro):
+        super().__init__()
+        self.roteiro = list(roteiro)
+        self.requisicoes = 0
+
+    def send(self, request, **kwargs):
+        self.requisicoes += 1
+        item = self.roteiro.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        status, headers = item
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers.update(headers)
+        resp._content = b""
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = RelogioFalso()
+    monkeypatch.setattr(utils, "time", relogio)
+    return relogio
+
+
+def criar_cliente(roteiro, **kwargs):
+    adaptador = AdaptadorRoteirizado(roteiro)
+    kwargs.setdefault("max_tentativas", 3)
+    return ClienteHTTP(adaptador=adaptador, **kwargs), adaptador
+
+
+def test_limitador_espaca_requisicoes_pelo_orcamento(relogio):
+    limitador = LimitadorTaxa(5)
+    horarios = []
+    for _ in range(4):
+        limitador.aguardar()
+        horarios.append(relogio.agora)
+
+    assert relogio.esperas == pytest.approx([0.2, 0.2, 0.2])
+    assert horarios == pytest.approx([1000.0, 1000.2, 1000.4, 1000.6])
+
+
+def test_limitador_desativado_nao_espera(relogio):
+    limitador = LimitadorTaxa(0)
+    for _ in range(3):
+        limitador.aguardar()
+
+    assert relogio.esperas == []
+
+
+def test_retenta_status_transitorio_com_backoff(relogio):
+    cliente, adaptador = criar_cliente(
+        [(503, {}), (502, {}), (200, {})], backoff_base=2.0
+    )
+
+    resp = cliente.get(URL)
+
+    assert resp.status_code == 200
+    assert adaptador.requisicoes == 3
+    assert len(relogio.esperas) == 2
+    assert 0 <= relogio.esperas[0] <= 2.0
+    assert 0 <= relogio.esperas[1] <= 4.0
+
+
+def test_status_nao_retentavel_volta_na_hora(relogio):
+    cliente, adaptador = criar_cliente([(404, {})])
+
+    assert cliente.get(URL).status_code == 404
+    assert adaptador.requisicoes == 1
+    assert relogio.esperas == []
+
+
+def test_esgotadas_as_tentativas_devolve_ultima_resposta(relogio):
+    cliente, adaptador = criar_cliente([(503, {})] * 3)
+
+    assert cliente.get(URL).status_code == 503
+    assert adaptador.requisicoes == 3
+    assert len(relogio.esperas) == 2
+
+
+def test_erro_de_conexao_persistente_propaga(relogio):
+    cliente, adaptador = criar_cliente(
+        [requests.ConnectionError("queda")] * 2 + [requests.Timeout("lento")]
+    )
+
+    with pytest.raises(requests.Timeout):
+        cliente.post(URL, data={"pagina": 1})
+    assert adaptador.requisicoes == 3
+
+
+def test_retry_after_em_segundos_define_a_espera(relogio):
+    cliente, _ = criar_cliente(
+        [(429, {"Retry-After": "7"}), (429, {"Retry-After": "600"}), (200, {})],
+        backoff_maximo=30.0,
+    )
+
+    assert cliente.get(URL).status_code == 200
+    assert relogio.esperas == [7.0, 30.0]
+
+
+def test_ler_retry_after_em_data_http():
+    futuro = datetime.now(timezone.utc) + timedelta(seconds=120)
+    passado = datetime.now(timezone.utc) - timedelta(seconds=120)
+
+    def resposta(valor):
+        resp = requests.Response()
+        resp.headers["Retry-After"] = valor
+        return resp
+
+    em_dois_minutos = ClienteHTTP._ler_retry_after(
+        resposta(format_datetime(futuro, usegmt=True))
+    )
+    vencido = ClienteHTTP._ler_retry_after(
+        resposta(format_datetime(passado, usegmt=True))
+    )
+
+    assert 100 < em_dois_minutos <= 120
+    assert vencido == 0.0
+    assert ClienteHTTP._ler_retry_after(resposta("amanhã")) is None
+    assert ClienteHTTP._ler_retry_after(requests.Response()) is None
+
+
+def test_calcular_espera_respeita_o_teto():
+    cliente = ClienteHTTP(backoff_base=1.0, backoff_maximo=5.0)
+
+    for tentativa in range(1, 8):
+        teto = min(5.0, 2 ** (tentativa - 1))
+        assert all(0 <= cliente.calcular_espera(tentativa) <= teto for _ in range(50))
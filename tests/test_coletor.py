@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do coletor geral (pipeline de páginas, retomada por checkpoint e
+modo incremental), usando o adaptador de reprodução no lugar do portal.
+"""
+
+import json
+import logging
+import threading
+
+import pytest
+import requests
+
+from coletor_database_geral import STATUS_ENCERRADO, ColetorDatabaseGeral
+from scrapers.gravacao import AdaptadorReproducao, ArquivoGravacao
+from scrapers.persistencia import EscritorJSONL
+from scrapers.registros import registro_curso
+
+URL_BUSCA = "https://www.unasus.gov.br/cursos/rest/busca"
+URL_CURSO = "https://www.unasus.gov.br/cursos/curso/{}"
+URL_OFERTA = "https://www.unasus.gov.br/cursos/rest/oferta/{}"
+PAYLOAD = {"busca": "", "ordenacao": "Por nome", "status": "Todos"}
+ABERTO = "com oferta aberta"
+
+
+def curso(id_curso, status=ABERTO, status_ordem=1):
+    """Curso como aparece na listagem da busca."""
+    return {
+        "co_seq_curso": id_curso,
+        "no_curso": f"Curso {id_curso}",
+        "status": status,
+        "status_ordem": status_ordem,
+    }
+
+
+def resposta(conteudo):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.encoding = "utf-8"
+    if not isinstance(conteudo, str):
+        conteudo = json.dumps(conteudo)
+    resp._content = conteudo.encode("utf-8")
+    return resp
+
+
+def gravar_portal(caminho, paginas, ofertas):
+    """
+    Grava as respostas do portal: listagem, páginas de curso e ofertas.
+
+    Args:
+        caminho: Arquivo .jsonl da gravação
+        paginas: Lista de ``(cursor, cursos, proximo)`` da listagem
+        ofertas: Dicionário id_curso -> {id_oferta: vagas}
+    """
+    gravacao = ArquivoGravacao(str(caminho))
+    for cursor, cursos, proximo in paginas:
+        busca = requests.Request(
+            "POST", URL_BUSCA, data={**PAYLOAD, "proximo": cursor}
+        ).prepare()
+        conteudo = {"results": {"itens": cursos, "proximo": proximo}}
+        gravacao.registrar(busca, resposta(conteudo))
+
+    for id_curso, vagas_por_oferta in ofertas.items():
+        links = "".join(
+            f'<a href="/cursos/oferta/{id_oferta}">Oferta</a>'
+            for id_oferta in vagas_por_oferta
+        )
+        pagina = requests.Request("GET", URL_CURSO.format(id_curso)).prepare()
+        gravacao.registrar(pagina, resposta(f"<html>{links}</html>"))
+        for id_oferta, vagas in vagas_por_oferta.items():
+            api = requests.Request("GET", URL_OFERTA.format(id_oferta)).prepare()
+            gravacao.registrar(api, resposta({"data": {"qt_vaga": vagas}}))
+    return gravacao
+
+
+class AdaptadorPortal(AdaptadorReproducao):
+    """
+    Reprodução que guarda as URLs pedidas, pode segurar a página de um
+    curso até outra ser pedida e simula a queda da conexão em uma página
+    da listagem.
+    """
+
+    def __init__(self, gravacao, segurar=None, ate=None, queda=None):
+        super().__init__(gravacao)
+        self.urls = []
+        self.corpos = []
+        self.segurar = segurar
+        self.ate = ate
+        self.queda = queda
+        self.liberado = threading.Event()
+        self.liberado_a_tempo = None
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.urls.append(request.url)
+            if request.body:
+                self.corpos.append(request.body)
+        if self.queda and self.queda in (request.body or ""):
+            raise requests.ConnectionError("queda simulada")
+        if request.url == self.ate:
+            self.liberado.set()
+        if request.url == self.segurar:
+            self.liberado_a_tempo = self.liberado.wait(5)
+        return super().send(request, **kwargs)
+
+
+@pytest.fixture
+def portal(tmp_path, monkeypatch):
+    """Gravação com duas páginas: cursos 1-3 e 4-5, uma oferta cada."""
+    monkeypatch.chdir(tmp_path)
+    return gravar_portal(
+        tmp_path / "portal.jsonl",
+        [
+            (0, [curso(1), curso(2), curso(3)], 10),
+            (10, [curso(4), curso(5)], None),
+        ],
+        {i: {f"{i}01": 30} for i in range(1, 6)},
+    )
+
+
+def criar_coletor(adaptador, **kwargs):
+    coletor = ColetorDatabaseGeral(
+        logger=logging.getLogger("teste_coletor"),
+        requisicoes_por_segundo=0,
+        **kwargs,
+    )
+    coletor.cliente.max_tentativas = 1
+    coletor.cliente.usar_adaptador(adaptador)
+    return coletor
+
+
+def test_paginas_concluidas_em_ordem_com_listagem_adiantada(portal, monkeypatch):
+    # O curso 1 só termina depois que a página 2 já está nos workers
+    adaptador = AdaptadorPortal(
+        portal, segurar=URL_CURSO.format(1), ate=URL_CURSO.format(4)
+    )
+    coletor = criar_coletor(adaptador, max_workers=2, paginas_antecipadas=2)
+    checkpoints = []
+    salvar = coletor._salvar_checkpoint
+
+    def registrar_checkpoint(pagina_atual, proximo, status="em_andamento"):
+        checkpoints.append((pagina_atual, proximo, status))
+        salvar(pagina_atual, proximo, status)
+
+    monkeypatch.setattr(coletor, "_salvar_checkpoint", registrar_checkpoint)
+
+    linhas = list(coletor.coletar_dados_completos())
+
+    assert adaptador.liberado_a_tempo
+    assert [linha["co_seq_curso"] for linha in linhas] == [1, 2, 3, 4, 5]
+    assert [linha["pagina_coleta"] for linha in linhas] == [1, 1, 1, 2, 2]
+    assert checkpoints == [
+        (1, 10, "em_andamento"),
+        (2, None, "em_andamento"),
+        (2, None, "concluida"),
+    ]
+
+
+def test_retomada_continua_do_checkpoint(portal):
+    interrompido = criar_coletor(AdaptadorPortal(portal, queda="proximo=10"))
+    with pytest.raises(requests.ConnectionError):
+        list(interrompido.coletar_dados_completos())
+
+    adaptador = AdaptadorPortal(portal)
+    coletor = criar_coletor(adaptador)
+    linhas = list(coletor.coletar_dados_completos(retomar=True))
+
+    assert coletor.id_execucao == interrompido.id_execucao
+    assert [linha["co_seq_curso"] for linha in linhas] == [1, 2, 3, 4, 5]
+    assert [c for c in adaptador.corpos if "proximo=" in c] == [
+        "busca=&ordenacao=Por+nome&status=Todos&proximo=10"
+    ]
+    cursos_buscados = [url for url in adaptador.urls if "/cursos/curso/" in url]
+    assert cursos_buscados == [URL_CURSO.format(4), URL_CURSO.format(5)]
+
+
+def test_incremental_reaproveita_so_encerrados_inalterados(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    referencia = str(tmp_path / "anterior.jsonl.gz")
+    escritor = EscritorJSONL(referencia)
+    escritor.escrever(
+        [
+            registro_curso(
+                curso(1, STATUS_ENCERRADO, 3), [{"id_oferta": "101", "vagas": "91"}]
+            ),
+            registro_curso(
+                curso(2, STATUS_ENCERRADO, 3), [{"id_oferta": "201", "vagas": "92"}]
+            ),
+            registro_curso(curso(3), [{"id_oferta": "301", "vagas": "93"}]),
+        ]
+    )
+    escritor.fechar()
+    # Curso 2 mudou de ordem (nova oferta 202); curso 3 continua aberto
+    gravacao = gravar_portal(
+        tmp_path / "portal.jsonl",
+        [
+            (
+                0,
+                [
+                    curso(1, STATUS_ENCERRADO, 3),
+                    curso(2, STATUS_ENCERRADO, 4),
+                    curso(3),
+                ],
+                None,
+            )
+        ],
+        {1: {"101": 30}, 2: {"201": 30, "202": 30}, 3: {"301": 30}},
+    )
+
+    adaptador = AdaptadorPortal(gravacao)
+    coletor = criar_coletor(adaptador)
+    linhas = list(
+        coletor.coletar_dados_completos(incremental=True, snapshot=referencia)
+    )
+
+    vagas = {str(linha["id_oferta"]): str(linha["vagas"]) for linha in linhas}
+    assert vagas == {"101": "91", "201": "92", "202": "30", "301": "30"}
+    assert URL_CURSO.format(1) not in adaptador.urls
+    assert URL_OFERTA.format(101) not in adaptador.urls
+    assert URL_OFERTA.format(201) not in adaptador.urls
+    assert URL_CURSO.format(2) in adaptador.urls
+    assert coletor.estatisticas_incremental == {
+        "cursos_reaproveitados": 1,
+        "ofertas_reaproveitadas": 1,
+        "ofertas_buscadas": 2,
+    }
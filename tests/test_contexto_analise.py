@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cache de contextos de análise: reaproveitamento enquanto o
+arquivo de dados (e o ``-wal`` do SQLite) não muda e descarte quando muda.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from analise.contexto_analise import hash_arquivo, limpar_contextos, obter_contexto
+
+
+@pytest.fixture(autouse=True)
+def contextos_limpos():
+    limpar_contextos()
+    yield
+    limpar_contextos()
+
+
+class Carregador:
+    """Conta as leituras do arquivo feitas pelo contexto."""
+
+    def __init__(self):
+        self.leituras = 0
+
+    def __call__(self):
+        self.leituras += 1
+        return pd.DataFrame({"no_curso": ["A", "B"], "vagas": ["10", "x"]})
+
+
+def escrever(caminho, conteudo, mtime):
+    """Grava o arquivo com uma data de modificação fixa."""
+    caminho.write_bytes(conteudo)
+    os.utime(caminho, (mtime, mtime))
+
+
+def test_mesmo_arquivo_reaproveita_o_contexto(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    escrever(caminho, b"no_curso\nA\n", 1_000_000)
+    carregar = Carregador()
+
+    primeiro = obter_contexto(str(caminho), carregar)
+    primeiro.numerica("vagas")
+    segundo = obter_contexto(str(caminho), carregar)
+
+    assert segundo is primeiro
+    assert carregar.leituras == 1
+    assert ("numerica", "vagas") in segundo._cache
+
+
+def test_conteudo_alterado_gera_contexto_novo(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    escrever(caminho, b"no_curso\nA\n", 1_000_000)
+    carregar = Carregador()
+    primeiro = obter_contexto(str(caminho), carregar)
+
+    escrever(caminho, b"no_curso\nB\n", 1_000_100)
+    segundo = obter_contexto(str(caminho), carregar)
+
+    assert segundo is not primeiro
+    assert segundo.chave != primeiro.chave
+    assert carregar.leituras == 2
+
+
+def test_arquivo_regravado_sem_mudanca_reaproveita(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    escrever(caminho, b"no_curso\nA\n", 1_000_000)
+    carregar = Carregador()
+    primeiro = obter_contexto(str(caminho), carregar)
+
+    escrever(caminho, b"no_curso\nA\n", 1_000_100)
+
+    assert obter_contexto(str(caminho), carregar) is primeiro
+    assert carregar.leituras == 1
+
+
+def test_wal_entra_no_hash(tmp_path):
+    caminho = tmp_path / "unasus.db"
+    wal = tmp_path / "unasus.db-wal"
+    escrever(caminho, b"SQLite format 3\x00", 1_000_000)
+    sem_wal = hash_arquivo(str(caminho))
+    carregar = Carregador()
+    primeiro = obter_contexto(str(caminho), carregar)
+
+    # Confirmações novas só no -wal: o banco principal não muda
+    escrever(wal, b"quadro 1", 1_000_100)
+    com_wal = hash_arquivo(str(caminho))
+    segundo = obter_contexto(str(caminho), carregar)
+
+    escrever(wal, b"quadro 1 quadro 2", 1_000_200)
+    terceiro = obter_contexto(str(caminho), carregar)
+
+    assert len({sem_wal, com_wal, terceiro.chave}) == 3
+    assert len({id(primeiro), id(segundo), id(terceiro)}) == 3
+    assert carregar.leituras == 3
+
+
+def test_variante_e_falha_de_carregamento(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    escrever(caminho, b"no_curso\nA\n", 1_000_000)
+    carregar = Carregador()
+
+    assert obter_contexto(str(caminho), lambda: None) is None
+    completo = obter_contexto(str(caminho), carregar)
+    filtrado = obter_contexto(str(caminho), carregar, variante="amostra")
+
+    assert filtrado is not completo
+    assert filtrado.chave == f"{completo.chave}:amostra"
+    assert carregar.leituras == 2
+
+
+def test_resultado_memorizado_com_timestamp_da_consulta(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    escrever(caminho, b"no_curso\nA\n", 1_000_000)
+    contexto = obter_contexto(str(caminho), Carregador())
+    execucoes = []
+
+    def analisar():
+        execucoes.append(1)
+        return {"total": 2, "timestamp_analise": "2020-01-01T00:00:00"}
+
+    contexto.resultado("analise_cursos", analisar)
+    repetido = contexto.resultado("analise_cursos", analisar)
+
+    assert execucoes == [1]
+    assert repetido["total"] == 2
+    assert repetido["timestamp_analise"] != "2020-01-01T00:00:00"
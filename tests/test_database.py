@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do database completo normalizado (carga incremental por upsert).
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from core.database import DatabaseCompleto
+
+
+def registro(curso, oferta, **campos):
+    """Linha plana da coleta (uma oferta de um curso)."""
+    base = {
+        "co_seq_curso": curso,
+        "no_curso": f"Curso {curso}",
+        "co_seq_orgao": 10,
+        "sg_orgao": "UFAL",
+        "no_orgao": "Universidade Federal de Alagoas",
+        "status": "com oferta aberta",
+        "id_oferta": oferta,
+        "vagas": "30",
+        "publico_alvo": "Profissionais de saúde",
+        "descricao_oferta": f"Oferta {oferta}",
+    }
+    return {**base, **campos}
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseCompleto(str(tmp_path / "database_completo.db"))
+
+
+def contar(db, tabela):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+
+def test_carga_normaliza_cursos_instituicoes_e_ofertas(db):
+    dados = pd.DataFrame([registro(1, 101), registro(1, 102), registro(2, 201)])
+
+    assert db.carregar_dados_completos(dados)
+
+    assert contar(db, "instituicoes") == 1
+    assert contar(db, "cursos") == 2
+    assert contar(db, "ofertas") == 3
+    assert contar(db, "dados_completos") == 3
+
+
+def test_recarga_dos_mesmos_dados_nao_altera_nada(db):
+    dados = pd.DataFrame([registro(1, 101), registro(2, 201)])
+    db.carregar_dados_completos(dados)
+
+    with sqlite3.connect(db.db_path) as conn:
+        resultado = db._upsert(db._ler_dados(dados), conn)
+        visao = pd.read_sql_query(
+            "SELECT * FROM dados_completos ORDER BY id_oferta", conn
+        )
+
+    assert resultado == {"inseridos": 0, "atualizados": 0, "removidos": 0}
+    assert len(visao) == 2
+    assert visao["vagas"].tolist() == [30, 30]
+
+
+def test_recarga_atualiza_alterados_e_remove_ofertas_encerradas(db):
+    db.carregar_dados_completos(
+        pd.DataFrame([registro(1, 101), registro(1, 102), registro(2, 201)])
+    )
+
+    nova_coleta = pd.DataFrame([registro(1, 101, vagas="50"), registro(2, 201)])
+    with sqlite3.connect(db.db_path) as conn:
+        resultado = db._upsert(db._ler_dados(nova_coleta), conn)
+        vagas = conn.execute(
+            "SELECT vagas FROM ofertas WHERE id_oferta = 101"
+        ).fetchone()[0]
+
+    assert resultado == {"inseridos": 0, "atualizados": 1, "removidos": 1}
+    assert vagas == 50
+    assert contar(db, "ofertas") == 2
+
+
+def test_carga_aceita_csv(db, tmp_path):
+    caminho = tmp_path / "coleta.csv"
+    pd.DataFrame([registro(1, 101), registro(2, 201)]).to_csv(caminho, index=False)
+
+    assert db.carregar_dados_completos(str(caminho))
+    assert contar(db, "dados_completos") == 2
+
+
+def test_arquivo_inexistente_nao_carrega(db, tmp_path):
+    assert not db.carregar_dados_completos(str(tmp_path / "nao_existe.csv"))
+
+
+def test_busca_ignora_acentos_e_ordena_por_relevancia(db):
+    if not db.busca_disponivel:
+        pytest.skip("SQLite sem FTS5")
+    db.carregar_dados_completos(
+        pd.DataFrame(
+            [
+                registro(1, 101, no_curso="Saúde Mental na Atenção Básica"),
+                registro(
+                    2,
+                    201,
+                    no_curso="Gestão do SUS",
+                    descricao_oferta="Inclui um módulo de saude mental",
+                ),
+                registro(3, 301, no_curso="Vigilância Sanitária"),
+            ]
+        )
+    )
+
+    resultados = db.buscar("saude mental")
+
+    assert [curso["co_seq_curso"] for curso in resultados] == [1, 2]
+    assert resultados[0]["total_ofertas"] == 1
+    assert "[" in resultados[0]["trecho"]
+
+
+def test_busca_por_prefixo_e_reindexacao_apos_recarga(db):
+    if not db.busca_disponivel:
+        pytest.skip("SQLite sem FTS5")
+    db.carregar_dados_completos(
+        pd.DataFrame([registro(1, 101, no_curso="Vigilância Epidemiológica")])
+    )
+    assert [c["co_seq_curso"] for c in db.buscar("epidemio")] == [1]
+
+    db.carregar_dados_completos(pd.DataFrame([registro(1, 101, no_curso="Imunização")]))
+
+    assert db.buscar("epidemio") == []
+    assert [c["co_seq_curso"] for c in db.buscar("imunizacao")] == [1]
+
+
+def test_busca_sem_termos_devolve_vazio(db):
+    assert db.buscar("  ") == []
+
+
+def test_carga_de_snapshot_e_json_lines(db, tmp_path):
+    pytest.importorskip("pyarrow")
+    from analise.snapshot import salvar_snapshot
+    from scrapers.persistencia import EscritorJSONL
+    from scrapers.registros import separar_registro_plano
+
+    linhas = [registro(1, 101), registro(1, 102), registro(2, 201)]
+    snapshot = salvar_snapshot(
+        pd.DataFrame(linhas), "20250801_100000", diretorio=str(tmp_path / "snap")
+    )
+    jsonl = str(tmp_path / "coleta.jsonl.gz")
+    escritor = EscritorJSONL(jsonl)
+    escritor.escrever(
+        [separar_registro_plano(linhas[:2]), separar_registro_plano(linhas[2:])]
+    )
+    escritor.fechar()
+
+    assert db.carregar_dados_completos(snapshot)
+    assert contar(db, "dados_completos") == 3
+
+    outro = DatabaseCompleto(str(tmp_path / "outro.db"))
+    assert outro.carregar_dados_completos(jsonl)
+    assert contar(outro, "dados_completos") == 3
+
+
+def test_curso_sem_oferta_nao_vira_oferta(db, tmp_path):
+    from scrapers.persistencia import EscritorJSONL
+    from scrapers.registros import registro_curso, separar_registro_plano
+
+    curso = {k: v for k, v in registro(2, None).items() if k != "id_oferta"}
+    jsonl = str(tmp_path / "coleta.jsonl.gz")
+    escritor = EscritorJSONL(jsonl)
+    escritor.escrever(
+        [
+            separar_registro_plano([registro(1, 101)]),
+            registro_curso(curso, [], erro="Nenhuma oferta encontrada"),
+        ]
+    )
+    escritor.fechar()
+
+    assert db.carregar_dados_completos(jsonl)
+
+    assert contar(db, "cursos") == 2
+    assert contar(db, "ofertas") == 1
+    if db.busca_disponivel:
+        totais = {c["co_seq_curso"]: c["total_ofertas"] for c in db.buscar("curso")}
+        assert totais == {1: 1, 2: 0}
+
+
+def test_chave_em_branco_conta_como_ausente(db):
+    dados = pd.DataFrame(
+        [registro(1, 101), registro(2, ""), registro(3, "  ", co_seq_orgao="")]
+    )
+
+    assert db.carregar_dados_completos(dados)
+
+    assert contar(db, "cursos") == 3
+    assert contar(db, "ofertas") == 1
+    assert contar(db, "instituicoes") == 1
+
+
+def test_analise_por_curso_igual_ao_first_do_pandas(db, tmp_path):
+    # Cursos 1 e 2 têm o mesmo nome e instituição; o curso 1 vem primeiro,
+    # mas sem carga horária, que então vem do curso 2
+    dados = pd.DataFrame(
+        [
+            registro(
+                2,
+                201,
+                no_curso="Saúde Mental",
+                qt_carga_horaria_total=60,
+                tem_deia="Não",
+                no_modalidade="Presencial",
+            ),
+            registro(
+                1,
+                101,
+                no_curso="Saúde Mental",
+                qt_carga_horaria_total=None,
+                tem_deia="Sim",
+                no_modalidade="EAD",
+            ),
+            registro(
+                1,
+                102,
+                no_curso="Saúde Mental",
+                qt_carga_horaria_total=None,
+                tem_deia="Sim",
+                no_modalidade="EAD",
+                status="encerrado",
+            ),
+            registro(
+                3,
+                301,
+                no_curso="Gestão do SUS",
+                qt_carga_horaria_total=30,
+                tem_deia=None,
+                no_modalidade="EAD",
+            ),
+        ]
+    )
+    db.carregar_dados_completos(dados)
+
+    with sqlite3.connect(db.db_path) as conn:
+        df = pd.read_sql_query("SELECT * FROM dados_completos", conn)
+        db._criar_analises_especificas(conn, str(tmp_path), "teste")
+    # Implementação anterior, sobre a visão inteira em memória
+    esperado = (
+        df.groupby(["no_curso", "no_orgao"])
+        .agg(
+            {
+                "id_oferta": "count",
+                "qt_carga_horaria_total": "first",
+                "tem_deia": "first",
+                "no_modalidade": "first",
+                "status": lambda x: (x == "com oferta aberta").sum(),
+            }
+        )
+        .rename(
+            columns={
+                "id_oferta": "total_ofertas",
+                "qt_carga_horaria_total": "carga_horaria",
+                "no_modalidade": "modalidade",
+                "status": "ofertas_abertas",
+            }
+        )
+        .reset_index()
+    )
+    esperado.to_csv(tmp_path / "antes.csv", index=False, encoding="utf-8-sig")
+    esperado = pd.read_csv(tmp_path / "antes.csv", encoding="utf-8-sig")
+    analise = pd.read_csv(tmp_path / "analise_cursos_teste.csv", encoding="utf-8-sig")
+
+    pd.testing.assert_frame_equal(analise, esperado, check_dtype=False)
+    assert analise["carga_horaria"].tolist() == [30, 60]
+    assert analise["tem_deia"].tolist()[1] == "Sim"
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do buscador DEIA contra a semântica anterior
+(``descritor.lower() in texto.lower()``, descritor mais longo como principal).
+"""
+
+import pandas as pd
+import pytest
+
+from scrapers.deia import DESCRITORES_DEIA, BuscadorDEIA
+
+TEXTOS = [
+    "Curso de Saúde Mental na Atenção Primária",
+    "Atenção à Saúde da População Negra e à População Indígena",
+    "Promoção de Diversidade, Equidade e Inclusão no SUS",
+    "Cuidado à pessoa idosa e às crianças com deficiência",
+    "ACESSIBILIDADE E INCLUSÃO DE PESSOAS COM DEFICIÊNCIA",
+    "Saúde LGBTQI+ e população trans",
+    "Manejo clínico da hipertensão arterial",
+    "Transporte sanitário e transferência de pacientes",
+    "",
+]
+
+
+def referencia(texto):
+    """Descritores encontrados pela implementação anterior."""
+    return [d for d in DESCRITORES_DEIA if d.lower() in texto.lower()]
+
+
+def principal_referencia(texto):
+    encontrados = referencia(texto)
+    return max(encontrados, key=len) if encontrados else ""
+
+
+@pytest.fixture(scope="module")
+def buscador():
+    return BuscadorDEIA()
+
+
+@pytest.mark.parametrize("texto", TEXTOS)
+def test_encontrados_igual_a_busca_por_substring(buscador, texto):
+    assert buscador.encontrados(texto) == referencia(texto)
+
+
+@pytest.mark.parametrize("texto", TEXTOS)
+def test_principal_e_o_descritor_mais_longo(buscador, texto):
+    assert buscador.principal(buscador.encontrados(texto)) == principal_referencia(
+        texto
+    )
+
+
+def test_ocorrencias_sobrepostas_e_posicoes_no_texto_original(buscador):
+    texto = "Atenção à Saúde da População Negra"
+
+    ocorrencias = buscador.ocorrencias(texto, "no_curso")
+    descritores = {o["descritor"] for o in ocorrencias}
+
+    assert {"Saúde da População Negra", "População Negra"} <= descritores
+    for ocorrencia in ocorrencias:
+        trecho = texto[ocorrencia["inicio"] : ocorrencia["fim"]]
+        assert trecho == ocorrencia["trecho"]
+        assert trecho.lower() == ocorrencia["descritor"].lower()
+        assert ocorrencia["campo"] == "no_curso"
+
+
+def test_texto_sem_acentos_tambem_e_encontrado(buscador):
+    assert "Saúde Mental" in buscador.encontrados("saude mental na APS")
+
+
+def test_classificar_igual_a_busca_por_substring_campo_a_campo(buscador):
+    dados = pd.DataFrame(
+        {
+            "no_curso": TEXTOS,
+            "descricao_oferta": list(reversed(TEXTOS)),
+        },
+        index=range(100, 100 + len(TEXTOS)),
+    )
+
+    resultado = buscador.classificar(dados, ["no_curso", "descricao_oferta"])
+
+    assert resultado.index.equals(dados.index)
+    for indice, linha in dados.iterrows():
+        esperados = set(referencia(linha["no_curso"])) | set(
+            referencia(linha["descricao_oferta"])
+        )
+        classificado = resultado.loc[indice]
+        assert classificado["tem_deia"] == ("Sim" if esperados else "Não")
+        descritores = classificado["deia_descritores"]
+        assert set(descritores.split("; ") if descritores else []) == esperados
+        if esperados:
+            assert classificado["deia_encontrado"] == max(
+                sorted(esperados, key=DESCRITORES_DEIA.index), key=len
+            )
+
+
+def test_classificar_ignora_campos_ausentes_e_valores_nulos(buscador):
+    dados = pd.DataFrame({"no_curso": [None, float("nan"), "Saúde do Idoso"]})
+
+    resultado = buscador.classificar(dados, ["no_curso", "inexistente"])
+
+    assert resultado["tem_deia"].tolist() == ["Não", "Não", "Sim"]
+    assert resultado["deia_campos"].tolist() == ["", "", "no_curso"]
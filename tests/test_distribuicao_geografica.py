@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da distribuição geográfica vetorizada, comparada com a antiga
+implementação linha a linha (iterrows) em um conjunto pequeno.
+"""
+
+import pandas as pd
+import pytest
+
+from analise.distribuicao_geografica import DistribuicaoGeografica
+from analise.geolocalizacao import REGIOES
+
+# Antigo mapeamento por substring, do qual vem o "PA" dentro de "PARANA"
+ESTADOS_SUBSTRING = {
+    "AC": ["ACRE", "AC"],
+    "AL": ["ALAGOAS", "AL"],
+    "AP": ["AMAPA", "AP"],
+    "AM": ["AMAZONAS", "AM"],
+    "BA": ["BAHIA", "BA"],
+    "CE": ["CEARA", "CE"],
+    "DF": ["DISTRITO FEDERAL", "DF", "BRASILIA"],
+    "ES": ["ESPIRITO SANTO", "ES"],
+    "GO": ["GOIAS", "GO"],
+    "MA": ["MARANHAO", "MA"],
+    "MT": ["MATO GROSSO", "MT"],
+    "MS": ["MATO GROSSO DO SUL", "MS"],
+    "MG": ["MINAS GERAIS", "MG"],
+    "PA": ["PARA", "PA"],
+    "PB": ["PARAIBA", "PB"],
+    "PR": ["PARANA", "PR"],
+    "PE": ["PERNAMBUCO", "PE"],
+    "PI": ["PIAUI", "PI"],
+    "RJ": ["RIO DE JANEIRO", "RJ"],
+    "RN": ["RIO GRANDE DO NORTE", "RN"],
+    "RS": ["RIO GRANDE DO SUL", "RS"],
+    "RO": ["RONDONIA", "RO"],
+    "RR": ["RORAIMA", "RR"],
+    "SC": ["SANTA CATARINA", "SC"],
+    "SP": ["SAO PAULO", "SP"],
+    "SE": ["SERGIPE", "SE"],
+    "TO": ["TOCANTINS", "TO"],
+}
+
+
+def estado_por_substring(texto):
+    """Antigo ``extrair_estado``: primeira variação contida no texto."""
+    if pd.isna(texto) or texto == "":
+        return "Não identificado"
+    texto = str(texto).upper()
+    for sigla, variacoes in ESTADOS_SUBSTRING.items():
+        if any(variacao in texto for variacao in variacoes):
+            return sigla
+    return "Não identificado"
+
+
+def distribuicao_linha_a_linha(dados, extrair_estado):
+    """
+    Antiga agregação por estado e região, registro a registro.
+
+    Returns:
+        (por estado, por região, registros sem estado identificado)
+    """
+    regiao_por_estado = {e: r for r, estados in REGIOES.items() for e in estados}
+    grupos = {}
+    sem_identificacao = 0
+    for _, registro in dados.iterrows():
+        estado = extrair_estado(registro["no_orgao"])
+        if estado not in regiao_por_estado:
+            sem_identificacao += 1
+            continue
+        for chave in (estado, regiao_por_estado[estado]):
+            grupo = grupos.setdefault(
+                chave,
+                {
+                    "cursos": 0,
+                    "vagas": 0,
+                    "instituicoes": set(),
+                    "programas": set(),
+                    "cursos_unicos": set(),
+                },
+            )
+            grupo["cursos"] += 1
+            grupo["instituicoes"].add(registro["no_orgao"])
+            grupo["cursos_unicos"].add(registro["no_curso"])
+            if registro["programas_governo"]:
+                grupo["programas"].add(registro["programas_governo"])
+            vagas = pd.to_numeric(registro["vagas"], errors="coerce")
+            if not pd.isna(vagas):
+                grupo["vagas"] += vagas
+    return grupos, sem_identificacao
+
+
+@pytest.fixture
+def dados():
+    """Um programa por registro, vagas vazias ou inválidas e um órgão federal."""
+    return pd.DataFrame(
+        {
+            "no_curso": ["Saúde Mental", "Saúde Mental", "APS", "APS", "Vacinas"],
+            "no_orgao": [
+                "Universidade Federal de Alagoas",
+                "Universidade Federal de Alagoas",
+                "Universidade Federal de Alagoas",
+                "Universidade Federal do Amazonas",
+                "Ministério da Saúde",
+            ],
+            "programas_governo": ["UNA-SUS", "Mais Médicos", "", "UNA-SUS", "UNA-SUS"],
+            "vagas": ["30", "", "abc", "50", "10"],
+        }
+    )
+
+
+def test_igual_a_implementacao_linha_a_linha(dados):
+    analise = DistribuicaoGeografica(dados)
+    resultado = analise.analisar_distribuicao()
+    grupos, sem_identificacao = distribuicao_linha_a_linha(
+        dados, analise.extrair_estado
+    )
+
+    assert resultado["estados_sem_identificacao"] == sem_identificacao == 1
+    agregados = {
+        **resultado["distribuicao_por_estado"],
+        **resultado["distribuicao_por_regiao"],
+    }
+    for chave, agregado in agregados.items():
+        antigo = grupos.get(chave)
+        if antigo is None:
+            assert agregado["cursos"] == agregado["ofertas"] == 0
+            continue
+        assert agregado["cursos"] == agregado["ofertas"] == antigo["cursos"]
+        assert agregado["vagas"] == antigo["vagas"]
+        for campo in ("instituicoes", "programas", "cursos_unicos"):
+            assert set(agregado[campo]) == antigo[campo]
+            assert agregado[f"total_{campo}"] == len(antigo[campo])
+    assert resultado["distribuicao_por_estado"]["AL"]["vagas"] == 30
+    assert resultado["distribuicao_por_regiao"]["NORDESTE"]["total_programas"] == 2
+
+
+def test_pa_nao_casa_dentro_de_parana():
+    dados = pd.DataFrame(
+        {
+            "no_curso": ["Curso"],
+            "no_orgao": ["Secretaria de Saúde do Paraná"],
+            "programas_governo": ["UNA-SUS"],
+            "vagas": ["20"],
+        }
+    )
+
+    resultado = DistribuicaoGeografica(dados).analisar_distribuicao()
+
+    assert estado_por_substring("Secretaria de Saúde do Paraná") == "PA"
+    assert resultado["distribuicao_por_estado"]["PR"]["cursos"] == 1
+    assert resultado["distribuicao_por_estado"]["PA"]["cursos"] == 0
+    assert resultado["distribuicao_por_regiao"]["SUL"]["vagas"] == 20
+
+
+def test_sem_identificacao_usa_sigla_e_local_da_oferta():
+    # Antes só o nome da instituição era consultado: as três linhas ficavam
+    # sem estado; agora a sigla e o local da oferta também contam
+    dados = pd.DataFrame(
+        {
+            "no_curso": ["A", "B", "C"],
+            "no_orgao": ["Fundação Oswaldo Cruz", "Instituto X", "Instituto Y"],
+            "sg_orgao": ["FIOCRUZ", "UFMG", "IY"],
+            "local_oferta": ["Curitiba", "", ""],
+            "programas_governo": ["UNA-SUS", "UNA-SUS", "UNA-SUS"],
+            "vagas": ["1", "2", "3"],
+        }
+    )
+    analise = DistribuicaoGeografica(dados)
+
+    resultado = analise.analisar_distribuicao()
+    _, sem_identificacao = distribuicao_linha_a_linha(dados, analise.extrair_estado)
+
+    assert sem_identificacao == 3
+    assert resultado["estados_sem_identificacao"] == 1
+    assert resultado["distribuicao_por_estado"]["PR"]["cursos"] == 1
+    assert resultado["distribuicao_por_estado"]["MG"]["cursos"] == 1
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do cache de páginas de curso do scraper melhorado, usando o
+adaptador de reprodução no lugar do portal.
+"""
+
+import base64
+import json
+import logging
+
+import requests
+
+from scrapers import enhanced
+from scrapers.gravacao import AdaptadorReproducao, ArquivoGravacao
+from scrapers.utils import ClienteHTTP
+
+URL = "https://www.unasus.gov.br/cursos/curso/44538"
+
+
+class AdaptadorInstavel(AdaptadorReproducao):
+    """Reprodução cuja primeira requisição cai; as seguintes respondem."""
+
+    def __init__(self, gravacao):
+        super().__init__(gravacao)
+        self.requisicoes = 0
+
+    def send(self, request, **kwargs):
+        self.requisicoes += 1
+        if self.requisicoes == 1:
+            raise requests.ConnectionError("queda simulada")
+        return super().send(request, **kwargs)
+
+
+def test_falha_nao_fica_no_cache(tmp_path, monkeypatch):
+    caminho = tmp_path / "portal.jsonl"
+    entrada = {
+        "chave": f"GET {URL}",
+        "metodo": "GET",
+        "url": URL,
+        "status_code": 200,
+        "reason": "OK",
+        "encoding": "utf-8",
+        "headers": {},
+        "conteudo": base64.b64encode(b"<html><p>Curso</p></html>").decode("ascii"),
+    }
+    caminho.write_text(json.dumps(entrada) + "\n", encoding="utf-8")
+    adaptador = AdaptadorInstavel(ArquivoGravacao(str(caminho)))
+    monkeypatch.setattr(
+        enhanced, "CLIENTE_HTTP", ClienteHTTP(adaptador=adaptador, max_tentativas=1)
+    )
+    cache = enhanced.CachePaginasCurso(logging.getLogger("teste_enhanced"))
+
+    assert cache.obter("44538") is None
+    pagina = cache.obter("44538")
+    assert cache.obter("44538") is pagina
+
+    assert pagina.p.text == "Curso"
+    assert adaptador.requisicoes == 2
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes das estatísticas por coluna do relatório de coleta, comparadas com
+o antigo laço sobre cada registro e cada campo.
+"""
+
+import pandas as pd
+
+from analise.estatisticas_basicas import EstatisticasColunas
+
+CAMPOS_VAGAS = ["vagas", "numero_vagas", "qt_vagas", "vagas_disponiveis"]
+
+
+def relatorio_linha_a_linha(linhas):
+    """Antigo cálculo do relatório: preenchimento e vagas registro a registro."""
+    preenchidos = {
+        campo: sum(1 for linha in linhas if linha.get(campo)) for campo in linhas[0]
+    }
+    vagas = [
+        valor
+        for linha in linhas
+        for campo in CAMPOS_VAGAS
+        for valor in [linha.get(campo, 0)]
+        if isinstance(valor, (int, float)) and valor > 0
+    ]
+    return preenchidos, vagas
+
+
+def lotes():
+    primeiro = [
+        {"co_seq_curso": 1, "no_curso": "A", "vagas": 30, "erro": None},
+        {"co_seq_curso": 1, "no_curso": "A", "vagas": None, "erro": ""},
+    ]
+    segundo = [
+        {"co_seq_curso": 2, "no_curso": "", "vagas": 10, "qt_vagas": 5},
+        {"co_seq_curso": 3, "no_curso": "C", "erro": "Sem ofertas encontradas"},
+    ]
+    return [primeiro, segundo]
+
+
+def test_igual_ao_laco_por_registro():
+    linhas = [linha for lote in lotes() for linha in lote]
+    preenchidos, vagas = relatorio_linha_a_linha(linhas)
+
+    estatisticas = EstatisticasColunas(CAMPOS_VAGAS)
+    for lote in lotes():
+        estatisticas.adicionar(pd.DataFrame(lote))
+
+    assert estatisticas.linhas == len(linhas)
+    assert {c: estatisticas.preenchidos[c] for c in preenchidos} == preenchidos
+    assert estatisticas.numericos == {
+        "soma": sum(vagas),
+        "quantidade": len(vagas),
+        "minimo": min(vagas),
+        "maximo": max(vagas),
+    }
+
+
+def test_colunas_ausentes_de_um_lote_contam_como_nulas():
+    estatisticas = EstatisticasColunas(CAMPOS_VAGAS)
+    for lote in lotes():
+        estatisticas.adicionar(pd.DataFrame(lote))
+
+    assert estatisticas.tipos["qt_vagas"]["nulo"] == 3
+    assert sum(estatisticas.tipos["vagas"].values()) == 4
+    assert set(estatisticas.bytes) == set(estatisticas.tipos)
+
+
+def test_vagas_em_texto_entram_nas_estatisticas():
+    # As ofertas gravam vagas como texto; o antigo isinstance as ignorava
+    linhas = [{"vagas": "30"}, {"vagas": "abc"}, {"vagas": "10"}]
+    _, antigas = relatorio_linha_a_linha(linhas)
+
+    estatisticas = EstatisticasColunas(CAMPOS_VAGAS)
+    estatisticas.adicionar(pd.DataFrame(linhas))
+
+    assert antigas == []
+    assert estatisticas.numericos["soma"] == 40
+    assert estatisticas.numericos["quantidade"] == 2
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do localizador de UF (nomes, siglas de instituição e siglas isoladas).
+"""
+
+import pandas as pd
+import pytest
+
+from analise.geolocalizacao import NAO_IDENTIFICADO, LocalizadorEstados
+
+
+@pytest.fixture(scope="module")
+def localizador():
+    return LocalizadorEstados()
+
+
+@pytest.mark.parametrize(
+    "texto, esperado",
+    [
+        # Nomes de estados e capitais, com ou sem acento
+        ("Universidade Federal de Alagoas", "AL"),
+        ("Universidade Federal do Maranhão", "MA"),
+        ("Secretaria de Saúde de São Paulo", "SP"),
+        ("Universidade Federal do Pará", "PA"),
+        ("Fundação Oswaldo Cruz - Mato Grosso do Sul", "MS"),
+        ("Universidade Federal de Mato Grosso", "MT"),
+        ("Universidade do Estado do Rio de Janeiro", "RJ"),
+        ("Hospital de Maceió", "AL"),
+        # Siglas de instituições
+        ("UFMG", "MG"),
+        ("UNIFESP", "SP"),
+        ("UFRGS", "RS"),
+        ("UnB", "DF"),
+        ("UERJ - Universidade do Estado", "RJ"),
+        # Siglas de UF isoladas e em maiúsculas
+        ("SES-BA", "BA"),
+        ("FIOCRUZ - MS", "MS"),
+        ("Polo SE", "SE"),
+    ],
+)
+def test_identifica_uf(localizador, texto, esperado):
+    assert localizador.localizar(texto) == esperado
+
+
+@pytest.mark.parametrize(
+    "texto",
+    [
+        # Falsos positivos do antigo teste por substring
+        "Universidade Federal",
+        "Ministério da Saúde",
+        "Programa para a Saúde da Família",
+        "SE/UNA-SUS",
+        # Acentos não quebram a palavra em siglas isoladas
+        "CURSO DE SÉRIE HISTÓRICA",
+        "PÁGINA DO ALUNO",
+        # Minúsculas não são siglas
+        "se o curso estiver aberto",
+        "",
+        None,
+        float("nan"),
+    ],
+)
+def test_nao_identifica(localizador, texto):
+    assert localizador.localizar(texto) == NAO_IDENTIFICADO
+
+
+def test_nome_do_estado_prevalece_sobre_sigla_isolada(localizador):
+    assert localizador.localizar("SES-BA em parceria com Sergipe") == "SE"
+
+
+def test_localizar_colunas_consulta_colunas_em_ordem(localizador):
+    dados = pd.DataFrame(
+        {
+            "no_orgao": ["Universidade Federal de Alagoas", "Ministério", None],
+            "sg_orgao": ["UFPE", "UFMG", "Outro"],
+            "local_oferta": ["RJ", "RJ", "Curitiba"],
+        }
+    )
+
+    estados = localizador.localizar_colunas(
+        dados, ["no_orgao", "sg_orgao", "local_oferta"]
+    )
+
+    assert estados.tolist() == ["AL", "MG", "PR"]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da gravação/reprodução offline e da sua combinação com o cache
+HTTP em disco.
+"""
+
+import argparse
+import base64
+import json
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+from scrapers.cache_http import CacheHTTP
+from scrapers.gravacao import (
+    AdaptadorReproducao,
+    ArquivoGravacao,
+    adicionar_opcoes_transporte,
+    criar_adaptador,
+    criar_cache,
+)
+from scrapers.utils import ClienteHTTP
+
+URLS = [
+    "https://www.unasus.gov.br/cursos/curso/44538",
+    "https://www.unasus.gov.br/cursos/rest/oferta/4453801",
+]
+
+
+@pytest.fixture
+def portal(tmp_path, monkeypatch):
+    """Faz o HTTPAdapter responder a partir de uma gravação, sem rede."""
+    caminho = tmp_path / "portal.jsonl"
+    with open(caminho, "w", encoding="utf-8") as f:
+        for url in URLS:
+            entrada = {
+                "chave": f"GET {url}",
+                "metodo": "GET",
+                "url": url,
+                "status_code": 200,
+                "reason": "OK",
+                "encoding": "utf-8",
+                "headers": {"ETag": '"v1"'},
+                "conteudo": base64.b64encode(url.encode()).decode("ascii"),
+            }
+            f.write(json.dumps(entrada) + "\n")
+
+    rede = AdaptadorReproducao(ArquivoGravacao(str(caminho)))
+    requisicoes = []
+
+    def enviar(self, request, **kwargs):
+        requisicoes.append(request.url)
+        return rede.send(request, **kwargs)
+
+    monkeypatch.setattr(HTTPAdapter, "send", enviar)
+    monkeypatch.chdir(tmp_path)
+    return requisicoes
+
+
+def test_cache_e_opcional():
+    assert criar_cache() is None
+    assert criar_cache(0) is None
+    assert isinstance(criar_cache(24), CacheHTTP)
+
+
+def test_cache_desligado_na_gravacao_e_reproducao(tmp_path):
+    assert criar_cache(24, gravar=str(tmp_path / "g.jsonl")) is None
+    assert criar_cache(24, reproduzir=str(tmp_path / "g.jsonl")) is None
+
+
+def test_gravacao_com_cache_aquecido_reproduz_tudo(portal, tmp_path):
+    # Execução anterior deixou as respostas no cache padrão (cache/http)
+    com_cache = ClienteHTTP(cache=CacheHTTP(ttl=3600), max_tentativas=1)
+    for url in URLS:
+        com_cache.get(url)
+
+    gravacao = str(tmp_path / "gravacao.jsonl")
+    gravando = ClienteHTTP(
+        cache=criar_cache(24, gravar=gravacao),
+        adaptador=criar_adaptador(gravar=gravacao),
+        max_tentativas=1,
+    )
+    for url in URLS:
+        assert gravando.get(url).status_code == 200
+
+    reproduzindo = ClienteHTTP(
+        adaptador=criar_adaptador(reproduzir=gravacao), max_tentativas=1
+    )
+    respostas = [reproduzindo.get(url) for url in URLS]
+
+    assert len(ArquivoGravacao(gravacao)) == len(URLS)
+    assert [r.status_code for r in respostas] == [200, 200]
+    assert [r.content for r in respostas] == [url.encode() for url in URLS]
+    assert portal == URLS + URLS
+
+
+def test_opcoes_de_cache_e_gravacao_sao_exclusivas():
+    parser = argparse.ArgumentParser()
+    adicionar_opcoes_transporte(parser)
+
+    assert parser.parse_args([]).cache_ttl == 0
+    assert parser.parse_args(["--cache-ttl", "12"]).cache_ttl == 12
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--gravar", "g.jsonl", "--cache-ttl", "12"])
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--reproduzir", "g.jsonl", "--gravar", "h.jsonl"])
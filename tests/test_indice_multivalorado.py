@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do índice longo das colunas multivaloradas, comparado com a
+separação linha a linha dos textos por vírgula.
+"""
+
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from analise.indice_multivalorado import IndiceMultivalorado, explodir_coluna
+from analise.mapeamento_programas import MapeamentoProgramas
+
+
+def separar_linha_a_linha(valores):
+    """Pares (posição, valor) de cada registro, sem vazios nem repetidos."""
+    pares = []
+    for posicao, texto in enumerate(valores):
+        if pd.isna(texto):
+            continue
+        vistos = []
+        for parte in str(texto).split(","):
+            parte = parte.strip()
+            if parte and parte not in vistos:
+                vistos.append(parte)
+        pares.extend((posicao, parte) for parte in vistos)
+    return pares
+
+
+@pytest.fixture
+def dados():
+    return pd.DataFrame(
+        {
+            "programas_governo": [
+                "UNA-SUS, Mais Médicos",
+                "UNA-SUS",
+                " Mais Médicos ,UNA-SUS, UNA-SUS",
+                "",
+                None,
+                "PEP,",
+            ],
+            "temas": ["Saúde Mental", None, "APS, Saúde Mental", "APS", "", "APS"],
+            "no_curso": ["A", "B", "C", "D", "E", "F"],
+            "vagas": ["10", "20", "30", "40", "50", "60"],
+        },
+        index=[10, 11, 12, 13, 14, 15],
+    )
+
+
+def test_explodir_igual_a_separacao_linha_a_linha(dados):
+    for coluna in ("programas_governo", "temas"):
+        indice = explodir_coluna(dados[coluna])
+
+        pares = list(zip(indice["registro"], indice["valor"].astype(str)))
+        assert pares == separar_linha_a_linha(dados[coluna])
+
+
+def test_contagens_e_registros_iguais_ao_laco(dados):
+    indices = IndiceMultivalorado(dados)
+    pares = separar_linha_a_linha(dados["programas_governo"])
+
+    contagens = indices.contagens("programas_governo")
+    registros = indices.registros("programas_governo", "Mais Médicos")
+
+    assert contagens.to_dict() == dict(Counter(valor for _, valor in pares))
+    assert list(contagens) == sorted(contagens, reverse=True)
+    assert registros["no_curso"].tolist() == ["A", "C"]
+    assert indices.campos() == ["programas_governo", "temas"]
+
+
+def test_registro_com_varios_programas_conta_para_cada_um(dados):
+    pares = separar_linha_a_linha(dados["programas_governo"])
+    vagas = pd.to_numeric(dados["vagas"]).to_numpy()
+    esperado = Counter()
+    for posicao, programa in pares:
+        esperado[programa] += vagas[posicao]
+
+    mapeamento = MapeamentoProgramas(dados).mapear_programas()
+
+    assert mapeamento["vagas_por_programa"] == dict(esperado)
+    assert mapeamento["cursos_por_programa"] == dict(
+        Counter(programa for _, programa in pares)
+    )
+    # Antes "UNA-SUS, Mais Médicos" formava um programa à parte
+    assert "UNA-SUS, Mais Médicos" not in mapeamento["programas_encontrados"]
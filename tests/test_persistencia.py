@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da persistência em JSON Lines (leitura e reparo de arquivos cuja
+escrita foi interrompida).
+"""
+
+import shutil
+
+from scrapers.persistencia import (
+    EscritorJSONL,
+    ler_jsonl,
+    ler_jsonl_em_lotes,
+    reparar_jsonl,
+)
+
+
+def registros(inicio, fim):
+    return [{"id_oferta": str(i), "no_curso": f"Saúde {i}"} for i in range(inicio, fim)]
+
+
+def copia_interrompida(tmp_path, nome):
+    """
+    Grava 5 registros com buffer de 2 e copia o arquivo sem fechá-lo,
+    como ficaria no disco após uma queda: só os 4 primeiros foram gravados.
+    """
+    origem = str(tmp_path / f"origem_{nome}")
+    escritor = EscritorJSONL(origem, tamanho_buffer=2)
+    escritor.escrever(registros(0, 2))
+    escritor.escrever(registros(2, 4))
+    escritor.escrever(registros(4, 5))
+
+    destino = str(tmp_path / nome)
+    shutil.copyfile(origem, destino)
+    escritor.fechar()
+    return destino
+
+
+def test_gz_completo_e_lido_inteiro(tmp_path):
+    caminho = str(tmp_path / "dados.jsonl.gz")
+    escritor = EscritorJSONL(caminho)
+    escritor.escrever(registros(0, 3))
+    escritor.fechar()
+
+    assert list(ler_jsonl(caminho)) == registros(0, 3)
+
+
+def test_gz_interrompido_vale_ate_o_ultimo_flush(tmp_path):
+    caminho = copia_interrompida(tmp_path, "dados.jsonl.gz")
+
+    assert list(ler_jsonl(caminho)) == registros(0, 4)
+
+
+def test_gz_com_bytes_finais_cortados(tmp_path):
+    caminho = str(tmp_path / "dados.jsonl.gz")
+    escritor = EscritorJSONL(caminho)
+    escritor.escrever(registros(0, 50))
+    escritor.fechar()
+    with open(caminho, "rb+") as f:
+        f.truncate(len(f.read()) - 12)
+
+    lidos = list(ler_jsonl(caminho))
+
+    assert lidos == registros(0, len(lidos))
+
+
+def test_reparar_gz_interrompido_permite_anexar(tmp_path):
+    caminho = copia_interrompida(tmp_path, "dados.jsonl.gz")
+
+    assert reparar_jsonl(caminho) == 4
+    escritor = EscritorJSONL(caminho)
+    escritor.escrever(registros(4, 6))
+    escritor.fechar()
+
+    assert list(ler_jsonl(caminho)) == registros(0, 6)
+    assert not (tmp_path / "dados.jsonl.tmp.gz").exists()
+
+
+def test_reparar_jsonl_descarta_linha_incompleta(tmp_path):
+    caminho = str(tmp_path / "dados.jsonl")
+    escritor = EscritorJSONL(caminho)
+    escritor.escrever(registros(0, 2))
+    escritor.fechar()
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write('{"id_oferta": "2", "no_cu')
+
+    assert list(ler_jsonl(caminho)) == registros(0, 2)
+    assert reparar_jsonl(caminho) == 2
+
+    escritor = EscritorJSONL(caminho)
+    escritor.escrever(registros(2, 3))
+    escritor.fechar()
+    assert list(ler_jsonl(caminho)) == registros(0, 3)
+
+
+def test_leitura_em_lotes(tmp_path):
+    caminho = str(tmp_path / "dados.jsonl.gz")
+    escritor = EscritorJSONL(caminho, tamanho_buffer=100)
+    escritor.escrever(registros(0, 7))
+    escritor.fechar()
+
+    lotes = list(ler_jsonl_em_lotes(caminho, tamanho_lote=3))
+
+    assert [len(lote) for lote in lotes] == [3, 3, 1]
+    assert [r for lote in lotes for r in lote] == registros(0, 7)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da reclassificação DEIA offline: o resultado em lotes, no pool de
+processos, é o mesmo da classificação no processo atual.
+"""
+
+import pandas as pd
+import pytest
+
+from scrapers.deia import BuscadorDEIA
+from scrapers.reclassificacao import (
+    COLUNAS_DEIA,
+    ler_descritores,
+    reclassificar,
+    reclassificar_arquivo,
+)
+from scrapers.textos import ArmazemTextos
+
+TITULOS = [
+    "Curso de Saúde Mental na Atenção Primária",
+    "Atenção à Saúde da População Negra e à População Indígena",
+    "Manejo clínico da hipertensão arterial",
+    "Cuidado à pessoa idosa e às crianças com deficiência",
+    None,
+]
+DESCRICOES = [
+    "Promoção de Diversidade, Equidade e Inclusão no SUS",
+    "",
+    "Saúde LGBTQI+ e população trans",
+    None,
+]
+
+
+@pytest.fixture
+def dados():
+    """Registros com índice não sequencial e campos que se combinam."""
+    quantidade = 37
+    return pd.DataFrame(
+        {
+            "co_seq_curso": range(1000, 1000 + quantidade),
+            "no_curso": [TITULOS[i % len(TITULOS)] for i in range(quantidade)],
+            "ds_curso": [DESCRICOES[i % len(DESCRICOES)] for i in range(quantidade)],
+            "vagas": ["10"] * quantidade,
+        },
+        index=range(500, 500 + 2 * quantidade, 2),
+    )
+
+
+def test_pool_igual_ao_processo_atual(dados):
+    no_processo = reclassificar(dados, processos=1, tamanho_lote=5)
+    no_pool = reclassificar(dados, processos=3, tamanho_lote=5)
+    de_uma_vez = BuscadorDEIA().classificar(dados)
+
+    pd.testing.assert_frame_equal(no_pool, no_processo)
+    pd.testing.assert_frame_equal(no_pool[COLUNAS_DEIA], de_uma_vez[COLUNAS_DEIA])
+    pd.testing.assert_frame_equal(no_pool.drop(columns=COLUNAS_DEIA), dados)
+    assert (no_pool["tem_deia"] == "Sim").any()
+    assert (no_pool["tem_deia"] == "Não").any()
+
+
+def test_pool_com_descritores_proprios(dados):
+    descritores = ["hipertensão", "população trans"]
+
+    no_processo = reclassificar(dados, descritores, processos=1, tamanho_lote=4)
+    no_pool = reclassificar(dados, descritores, processos=2, tamanho_lote=4)
+
+    pd.testing.assert_frame_equal(no_pool, no_processo)
+    assert set(no_pool["deia_encontrado"]) == {"", *descritores}
+
+
+def test_textos_do_armazem_completam_os_registros(tmp_path, dados):
+    armazem = ArmazemTextos(str(tmp_path / "textos.db"))
+    armazem.salvar(1002, {"texto_pagina_inicial": "Curso sobre população trans"})
+    armazem.salvar(1000, {"ds_curso": "texto armazenado sobre população trans"})
+
+    resultado = reclassificar(
+        dados, ["população trans", "equidade"], processos=2, textos=armazem
+    )
+
+    assert resultado.loc[504, "deia_campos"] == "ds_curso; texto_pagina_inicial"
+    # O texto já presente no registro prevalece sobre o armazenado
+    assert resultado.loc[500, "deia_descritores"] == "equidade"
+    assert "texto_pagina_inicial" not in resultado.columns
+
+
+def test_reclassificar_arquivo_csv(tmp_path, dados):
+    entrada = tmp_path / "coleta.csv"
+    dados.assign(tem_deia="Não").to_csv(entrada, index=False, encoding="utf-8-sig")
+    lista = tmp_path / "descritores.txt"
+    lista.write_text("# taxonomia de teste\nhipertensão\n\nequidade  # SUS\n")
+
+    descritores = ler_descritores(str(lista))
+    resumo = reclassificar_arquivo(
+        str(entrada), descritores=descritores, processos=2, caminho_textos=None
+    )
+    gravado = pd.read_csv(resumo["saida"], encoding="utf-8-sig")
+
+    assert descritores == ["hipertensão", "equidade"]
+    assert resumo["saida"] == str(tmp_path / "coleta_deia.csv")
+    assert resumo["deia_antes"] == 0
+    assert resumo["deia_depois"] == resumo["alterados"]
+    assert resumo["deia_depois"] == (gravado["tem_deia"] == "Sim").sum() > 0
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do registro de ofertas (busca única por coleta e nova tentativa
+das ofertas que falharam).
+"""
+
+import threading
+import time
+
+import pytest
+
+from scrapers.registro_ofertas import RegistroOfertas
+
+
+class Portal:
+    """Busca de ofertas falsa que conta as chamadas por oferta."""
+
+    def __init__(self, falhas=0, espera=0.0):
+        self.chamadas = {}
+        self.falhas = falhas
+        self.espera = espera
+        self._lock = threading.Lock()
+
+    def buscar(self, id_oferta):
+        with self._lock:
+            self.chamadas[id_oferta] = self.chamadas.get(id_oferta, 0) + 1
+            chamada = self.chamadas[id_oferta]
+        time.sleep(self.espera)
+        if chamada <= self.falhas:
+            return {"id_oferta": id_oferta, "erro": "Timeout"}
+        return {"id_oferta": id_oferta, "vagas": "30"}
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "registro_ofertas.db")
+
+
+def test_oferta_repetida_e_buscada_uma_vez(caminho):
+    registro = RegistroOfertas("coleta1", caminho)
+    portal = Portal()
+
+    primeira = registro.obter("101", "1", portal.buscar)
+    segunda = registro.obter("101", "2", portal.buscar)
+
+    assert primeira == segunda == {"id_oferta": "101", "vagas": "30"}
+    assert portal.chamadas == {"101": 1}
+    assert registro.estatisticas()["reaproveitadas"] == 1
+
+
+def test_buscas_simultaneas_esperam_a_primeira(caminho):
+    registro = RegistroOfertas("coleta1", caminho)
+    portal = Portal(espera=0.2)
+    resultados = []
+
+    threads = [
+        threading.Thread(
+            target=lambda: resultados.append(registro.obter(101, "1", portal.buscar))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(resultados) == 4
+    assert portal.chamadas == {"101": 1}
+    estatisticas = registro.estatisticas()
+    assert estatisticas["buscadas"] == 1
+    assert estatisticas["repetidas"] + estatisticas["reaproveitadas"] == 3
+
+
+def test_oferta_com_erro_e_buscada_de_novo(caminho):
+    registro = RegistroOfertas("coleta1", caminho)
+    portal = Portal(falhas=1)
+
+    assert "erro" in registro.obter("101", "1", portal.buscar)
+    assert registro.obter("101", "1", portal.buscar)["vagas"] == "30"
+    assert registro.obter("101", "1", portal.buscar)["vagas"] == "30"
+
+    assert portal.chamadas == {"101": 2}
+    tentativas = registro._conn.execute(
+        "SELECT tentativas, status FROM ofertas WHERE id_oferta = '101'"
+    ).fetchone()
+    assert tentativas == (2, "ok")
+
+
+def test_retomada_reaproveita_so_ofertas_buscadas_com_sucesso(caminho):
+    registro = RegistroOfertas("coleta1", caminho)
+    registro.obter("101", "1", Portal().buscar)
+    registro.obter("102", "1", Portal(falhas=1).buscar)
+    registro.fechar()
+
+    retomada = RegistroOfertas("coleta1", caminho)
+    portal = Portal()
+    retomada.obter("101", "1", portal.buscar)
+    retomada.obter("102", "1", portal.buscar)
+
+    assert portal.chamadas == {"102": 1}
+
+
+def test_nova_coleta_busca_de_novo(caminho):
+    RegistroOfertas("coleta1", caminho).obter("101", "1", Portal().buscar)
+
+    portal = Portal()
+    RegistroOfertas("coleta2", caminho).obter("101", "1", portal.buscar)
+
+    assert portal.chamadas == {"101": 1}
+
+
+def test_falha_na_gravacao_libera_quem_espera(caminho):
+    registro = RegistroOfertas("coleta1", caminho)
+
+    def falhar(*args):
+        raise OSError("disco cheio")
+
+    registro._registrar = falhar
+    portal = Portal(espera=0.2)
+    erros = []
+
+    def obter():
+        try:
+            registro.obter("101", "1", portal.buscar)
+        except OSError as e:
+            erros.append(e)
+
+    threads = [threading.Thread(target=obter) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(erros) == 3
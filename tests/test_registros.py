@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do modelo enxuto dos registros: a visão plana deve reproduzir as
+linhas gravadas pelas versões anteriores (uma por oferta).
+"""
+
+import pandas as pd
+
+from scrapers.registros import (
+    linhas_planas,
+    registro_curso,
+    separar_registro_plano,
+    visao_plana,
+)
+
+
+def curso(id_curso, nome):
+    return {
+        "co_seq_curso": id_curso,
+        "no_curso": nome,
+        "no_orgao": "Universidade Federal de São Paulo",
+        "pagina_coleta": 1,
+    }
+
+
+def oferta(id_oferta, **campos):
+    return {
+        "id_oferta": id_oferta,
+        "url_oferta": f"https://www.unasus.gov.br/cursos/oferta/{id_oferta}",
+        "vagas": "30",
+        "temas": "Saúde Mental",
+        **campos,
+    }
+
+
+def linhas_antigas():
+    """Linhas planas como eram gravadas antes do modelo enxuto."""
+    metadados = {"metadata_coleta": "{}", "campos_processados": 3}
+    return [
+        {**curso(1, "Saúde da Família"), **oferta("101"), "id_curso": 1, **metadados},
+        {**curso(1, "Saúde da Família"), **oferta("102"), "id_curso": 1, **metadados},
+        {**curso(2, "Atenção Básica"), **oferta("201", vagas="50"), "id_curso": 2},
+        {**curso(3, "Sem Oferta"), "id_oferta": "", "erro": "Nenhuma oferta"},
+    ]
+
+
+def registros_enxutos():
+    return [
+        registro_curso(curso(1, "Saúde da Família"), [oferta("101"), oferta("102")]),
+        registro_curso(curso(2, "Atenção Básica"), [oferta("201", vagas="50")]),
+        registro_curso(curso(3, "Sem Oferta"), [], erro="Nenhuma oferta"),
+    ]
+
+
+def comparavel(df):
+    """Ordena colunas e troca ausentes por None para comparar quadros."""
+    df = df[sorted(df.columns)].astype(object)
+    return df.where(df.notna(), None).reset_index(drop=True)
+
+
+def test_separar_registro_plano_descarta_metadados():
+    linhas = linhas_antigas()
+
+    assert separar_registro_plano(linhas[:2]) == registros_enxutos()[0]
+    assert separar_registro_plano(linhas[3:]) == registros_enxutos()[2]
+
+
+def test_linhas_planas_reproduzem_formato_antigo():
+    antigas = [
+        {
+            k: v
+            for k, v in linha.items()
+            if k not in ("metadata_coleta", "campos_processados")
+        }
+        for linha in linhas_antigas()
+    ]
+
+    planas = [linha for r in registros_enxutos() for linha in linhas_planas(r)]
+
+    assert planas == antigas
+
+
+def test_visao_plana_igual_as_linhas_planas():
+    registros = registros_enxutos()
+    esperado = pd.DataFrame([linha for r in registros for linha in linhas_planas(r)])
+
+    plana = visao_plana(registros)
+
+    assert list(plana["id_oferta"]) == ["101", "102", "201", ""]
+    pd.testing.assert_frame_equal(comparavel(plana), comparavel(esperado))
+
+
+def test_visao_plana_curso_sem_oferta():
+    plana = visao_plana(registros_enxutos())
+    linha = plana[plana["co_seq_curso"] == 3].iloc[0]
+
+    assert linha["id_oferta"] == ""
+    assert linha["erro"] == "Nenhuma oferta"
+    assert pd.isna(linha["id_curso"])
+    assert plana[plana["co_seq_curso"] != 3]["erro"].isna().all()
+
+
+def test_visao_plana_mantem_ids_inteiros():
+    registros = [
+        registro_curso(curso(1, "A"), [{"id_oferta": 101}, {"id_oferta": 102}]),
+        registro_curso(curso(2, "B"), []),
+    ]
+
+    plana = visao_plana(registros)
+
+    assert list(plana["id_oferta"]) == [101, 102, ""]
+    assert list(plana["id_curso"][:2]) == [1, 1]
+
+
+def test_campo_da_oferta_prevalece_sobre_o_do_curso():
+    registros = [registro_curso({**curso(1, "A"), "vagas": "0"}, [oferta("101")])]
+
+    assert visao_plana(registros).loc[0, "vagas"] == "30"
+
+
+def test_linhas_antigas_sao_mantidas():
+    antigas = linhas_antigas()
+
+    plana = visao_plana(antigas)
+
+    pd.testing.assert_frame_equal(comparavel(plana), comparavel(pd.DataFrame(antigas)))
+
+
+def test_lote_vazio():
+    assert visao_plana([]).empty
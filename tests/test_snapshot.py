@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do snapshot Parquet das coletas (gravação em lotes, particionamento
+por data e leitura com filtros).
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from analise.snapshot import (  # noqa: E402
+    EscritorSnapshot,
+    carregar_snapshot,
+    exportar_snapshot,
+    listar_snapshots,
+    metadados_snapshot,
+)
+from scrapers.registros import (  # noqa: E402
+    registro_curso,
+    tipos_visao_plana,
+    visao_plana,
+)
+
+
+def lotes_de_registros():
+    """Dois lotes da coleta: o segundo traz uma coluna nova e um curso sem oferta."""
+    primeiro = [
+        registro_curso(
+            {"co_seq_curso": 1, "no_curso": "Saúde Mental", "pagina_coleta": 1},
+            [{"id_oferta": "101", "vagas": "30"}, {"id_oferta": "102", "vagas": "40"}],
+        )
+    ]
+    segundo = [
+        registro_curso(
+            {"co_seq_curso": 2, "no_curso": "Atenção Básica", "pagina_coleta": 2},
+            [{"id_oferta": "201", "vagas": "", "temas": ["SUS", "APS"]}],
+        ),
+        registro_curso(
+            {"co_seq_curso": 3, "no_curso": "Sem Oferta", "pagina_coleta": 2},
+            [],
+            erro="Sem ofertas encontradas",
+        ),
+    ]
+    return [primeiro, segundo]
+
+
+def gravar(tmp_path, lotes, timestamp="20250801_100000", **kwargs):
+    tipos = tipos_visao_plana(r for lote in lotes for r in lote)
+    escritor = EscritorSnapshot(
+        timestamp, tipos, diretorio=str(tmp_path / "snapshots"), **kwargs
+    )
+    for lote in lotes:
+        escritor.escrever(visao_plana(lote))
+    return escritor.fechar()
+
+
+def test_escritor_grava_lotes_com_esquema_fixo(tmp_path):
+    lotes = lotes_de_registros()
+
+    caminho = gravar(tmp_path, lotes, metadados={"id_execucao": "x"})
+    dados = carregar_snapshot(caminho)
+
+    assert caminho.endswith(
+        os.path.join(
+            "data_coleta=2025-08-01", "coleta=20250801_100000", "dados.parquet"
+        )
+    )
+    assert dados["co_seq_curso"].tolist() == [1, 1, 2, 3]
+    assert dados["id_oferta"].tolist() == [101, 102, 201, pd.NA]
+    assert dados["vagas"].tolist() == [30, 40, pd.NA, pd.NA]
+    assert str(dados["vagas"].dtype) == "Int32"
+    assert dados["temas"].isna()[:2].all()
+    assert dados["temas"].iloc[2] == '["SUS", "APS"]'
+    assert dados["erro"].iloc[3] == "Sem ofertas encontradas"
+    assert dados["pagina_coleta"].tolist() == [1, 1, 2, 2]
+    assert metadados_snapshot(caminho) == {"id_execucao": "x"}
+
+
+def test_escritor_igual_a_visao_plana_inteira(tmp_path):
+    lotes = lotes_de_registros()
+    inteira = visao_plana([r for lote in lotes for r in lote])
+
+    dados = carregar_snapshot(gravar(tmp_path, lotes), incluir_volumosas=True)
+
+    assert sorted(dados.columns) == sorted(inteira.columns)
+    assert dados["no_curso"].tolist() == inteira["no_curso"].tolist()
+
+
+def test_descartar_nao_deixa_arquivo(tmp_path):
+    tipos = tipos_visao_plana(lotes_de_registros()[0])
+    escritor = EscritorSnapshot(
+        "20250801_100000", tipos, diretorio=str(tmp_path / "snapshots")
+    )
+    escritor.escrever(visao_plana(lotes_de_registros()[0]))
+
+    escritor.descartar()
+
+    assert not os.path.exists(escritor.caminho)
+    assert not os.path.exists(f"{escritor.caminho}.tmp")
+
+
+def test_exportacao_csv_em_lotes(tmp_path, monkeypatch):
+    import analise.snapshot as snapshot
+
+    monkeypatch.setattr(snapshot, "TAMANHO_LOTE_EXPORTACAO", 2)
+    caminho = gravar(tmp_path, lotes_de_registros())
+
+    exportados = exportar_snapshot(caminho, ["csv"], destino=str(tmp_path))
+    csv = pd.read_csv(exportados["csv"], encoding="utf-8-sig")
+
+    assert exportados["csv"].endswith("unasus_database_geral_20250801_100000.csv")
+    assert csv["id_oferta"].tolist()[:3] == [101, 102, 201]
+    assert len(csv) == 4
+    with open(exportados["csv"], "rb") as f:
+        assert f.read().count(b"co_seq_curso") == 1
+
+
+def gravar_coletas(tmp_path, timestamps):
+    """Uma coleta por timestamp, com as vagas diferindo de uma para outra."""
+    caminhos = []
+    for numero, timestamp in enumerate(timestamps):
+        lote = [
+            registro_curso(
+                {
+                    "co_seq_curso": 1,
+                    "no_curso": "Saúde Mental",
+                    "ds_imagem": "imagem.png",
+                },
+                [{"id_oferta": "101", "vagas": str(10 * (numero + 1))}],
+            )
+        ]
+        caminhos.append(gravar(tmp_path, [lote], timestamp=timestamp))
+    return caminhos
+
+
+def test_listar_snapshots_em_ordem_cronologica(tmp_path):
+    caminhos = gravar_coletas(
+        tmp_path, ["20250801_180000", "20250731_090000", "20250801_100000"]
+    )
+
+    listados = listar_snapshots(str(tmp_path / "snapshots"))
+
+    assert listados == [caminhos[1], caminhos[2], caminhos[0]]
+    assert listar_snapshots(str(tmp_path / "inexistente")) == []
+
+
+def test_diretorio_particionado_filtra_por_data_e_valor(tmp_path):
+    gravar_coletas(tmp_path, ["20250731_090000", "20250801_100000", "20250801_180000"])
+    raiz = str(tmp_path / "snapshots")
+
+    todas = carregar_snapshot(raiz)
+    do_dia = carregar_snapshot(raiz, filtros=[("data_coleta", "=", "2025-08-01")])
+    maiores = carregar_snapshot(
+        raiz, colunas=["coleta", "vagas"], filtros=[("vagas", ">", 15)]
+    )
+
+    assert len(todas) == 3
+    assert "ds_imagem" not in todas.columns
+    assert {"data_coleta", "coleta"} <= set(todas.columns)
+    assert sorted(do_dia["coleta"].astype(str)) == [
+        "20250801_100000",
+        "20250801_180000",
+    ]
+    assert list(maiores.columns) == ["coleta", "vagas"]
+    assert sorted(maiores["vagas"].tolist()) == [20, 30]
+
+
+def test_padrao_e_o_snapshot_mais_recente(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        carregar_snapshot()
+
+    gravar_coletas(tmp_path / "data", ["20250801_180000", "20250731_090000"])
+
+    dados = carregar_snapshot(incluir_volumosas=True)
+
+    assert dados["vagas"].tolist() == [10]
+    assert dados["ds_imagem"].tolist() == ["imagem.png"]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do armazém comprimido dos textos dos cursos: textos iguais não são
+regravados, alterados são, e a leitura devolve o texto original.
+"""
+
+import threading
+
+from bs4 import BeautifulSoup
+
+from scrapers.textos import ArmazemTextos, extrair_texto_visivel
+
+MARCA = "2000-01-01 00:00:00"
+
+
+def marcar_gravacoes(armazem):
+    """Fixa ``atualizado_em`` para detectar linhas regravadas depois."""
+    armazem._conn.execute("UPDATE textos SET atualizado_em = ?", (MARCA,))
+    armazem._conn.commit()
+
+
+def datas(armazem):
+    """Data de gravação de cada texto, por "curso/campo"."""
+    linhas = armazem._conn.execute(
+        "SELECT co_seq_curso, campo, atualizado_em FROM textos"
+    )
+    return {f"{id_curso}/{campo}": data for id_curso, campo, data in linhas}
+
+
+def test_textos_iguais_nao_sao_regravados(tmp_path):
+    armazem = ArmazemTextos(str(tmp_path / "textos.db"))
+    campos = {"ds_curso": "Curso de saúde " * 50, "palavras_chave_curso": "APS"}
+
+    assert armazem.salvar(44538, campos) == 2
+    marcar_gravacoes(armazem)
+
+    assert armazem.salvar(44538, campos) == 0
+    assert armazem.salvar("44538", dict(campos)) == 0
+    assert set(datas(armazem).values()) == {MARCA}
+
+
+def test_so_o_texto_alterado_e_regravado(tmp_path):
+    armazem = ArmazemTextos(str(tmp_path / "textos.db"))
+    armazem.salvar(1, {"ds_curso": "antigo", "palavras_chave_curso": "APS"})
+    marcar_gravacoes(armazem)
+
+    gravados = armazem.salvar(1, {"ds_curso": "novo", "palavras_chave_curso": "APS"})
+
+    assert gravados == 1
+    assert datas(armazem)["1/palavras_chave_curso"] == MARCA
+    assert datas(armazem)["1/ds_curso"] != MARCA
+    assert armazem.carregar().loc["1", "ds_curso"] == "novo"
+
+
+def test_vazios_sao_ignorados(tmp_path):
+    armazem = ArmazemTextos(str(tmp_path / "textos.db"))
+
+    assert armazem.salvar(1, {"ds_curso": "", "palavras_chave_curso": None}) == 0
+    assert armazem.estatisticas()["textos"] == 0
+
+
+def test_carregar_devolve_o_texto_original_com_filtros(tmp_path):
+    armazem = ArmazemTextos(str(tmp_path / "textos.db"))
+    texto = "Educação em saúde indígena, quilombola e LGBTQIA+ " * 100
+    armazem.salvar(1, {"ds_curso": texto, "palavras_chave_curso": "DEIA"})
+    armazem.salvar(2, {"ds_curso": "outro"})
+
+    todos = armazem.carregar()
+    so_descricao = armazem.carregar(campos=["ds_curso"], ids=[1])
+    estatisticas = armazem.estatisticas()
+
+    assert todos.loc["1", "ds_curso"] == texto
+    assert todos.loc["1", "palavras_chave_curso"] == "DEIA"
+    assert list(so_descricao.index) == ["1"]
+    assert list(so_descricao.columns) == ["ds_curso"]
+    assert estatisticas["cursos"] == 2
+    assert estatisticas["textos"] == 3
+    assert estatisticas["bytes_comprimidos"] < estatisticas["bytes_originais"]
+
+
+def test_gravacoes_concorrentes(tmp_path):
+    armazem = ArmazemTextos(str(tmp_path / "textos.db"))
+    gravados = []
+
+    def gravar(inicio):
+        for id_curso in range(inicio, inicio + 20):
+            gravados.append(armazem.salvar(id_curso, {"ds_curso": f"curso {id_curso}"}))
+
+    threads = [threading.Thread(target=gravar, args=(i * 20,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(gravados) == 80
+    assert armazem.estatisticas()["cursos"] == 80
+    armazem.fechar()
+
+
+def test_texto_visivel_sem_scripts_e_estilos():
+    soup = BeautifulSoup(
+        "<html><head><style>p {}</style><script>var x;</script></head>"
+        "<body><h1>Curso</h1>\n  <p>Saúde   da  família</p><!-- nota --></body>"
+        "</html>",
+        "html.parser",
+    )
+
+    assert extrair_texto_visivel(soup) == "Curso Saúde da família"